@@ -7,6 +7,7 @@ rarity validation, cache operations, and TCGPlayer scraping logic.
 """
 
 import asyncio
+from contextlib import asynccontextmanager
 from datetime import datetime, timezone, timedelta
 from typing import Any, Dict, List, Optional
 from unittest.mock import AsyncMock, MagicMock, Mock, patch
@@ -316,21 +317,25 @@ def cache_query_test_cases():
             "card_rarity": "Ultra Rare",
             "art_variant": None,
             "expected_query": {
-                "card_number": "LOB-001",
-                "card_rarity": {"$regex": "^ultra rare$", "$options": "i"},
+                "price_lookup_key": {"$regex": "^LOB\\-001\\|ultra\\ rare\\|"},
             },
         },
         {
             "card_number": "LOB-005",
             "card_rarity": "Secret Rare",
             "art_variant": "7",
-            "expected_or_clause": True,  # Should include $or clause for art variant alternatives
+            # Matches the requested art or prices without an art variant
+            "expected_query": {
+                "price_lookup_key": {"$in": ["LOB-005|secret rare|7", "LOB-005|secret rare|"]},
+            },
         },
         {
             "card_number": "BPT-005", 
             "card_rarity": "Ultimate Rare",
             "art_variant": "arkana",
-            "expected_or_clause": True,
+            "expected_query": {
+                "price_lookup_key": {"$in": ["BPT-005|ultimate rare|arkana", "BPT-005|ultimate rare|"]},
+            },
         },
     ]
 
@@ -444,8 +449,7 @@ def integration_test_patches():
             patch("ygoapi.price_scraping.get_price_cache_collection"),
             patch("ygoapi.price_scraping.get_card_variants_collection"),
             patch("ygoapi.price_scraping.get_memory_manager"),
-            patch("ygoapi.price_scraping.asyncio.run"),
-            patch("ygoapi.price_scraping.async_playwright"),
+            patch("ygoapi.price_scraping.BrowserPool"),
         ]
     
     return _create_patches
@@ -484,4 +488,15 @@ def create_mock_database_response(data: List[Dict[str, Any]], find_one: bool = F
         mock_collection.find_one.return_value = data[0] if data else None
     else:
         mock_collection.find.return_value = data
-    return mock_collection
\ No newline at end of file
+    return mock_collection
+
+def create_mock_browser_pool(page: AsyncMock) -> MagicMock:
+    """Create a mock browser pool whose acquire() leases the given page."""
+    mock_pool = MagicMock()
+
+    @asynccontextmanager
+    async def _acquire():
+        yield page
+
+    mock_pool.acquire.side_effect = _acquire
+    return mock_pool
@@ -7,8 +7,9 @@ proper data flow and system behavior.
 
 import json
 import os
+import re
 from datetime import datetime, timezone
-from unittest.mock import MagicMock, Mock, patch
+from unittest.mock import AsyncMock, MagicMock, Mock, patch
 
 import pytest
 
@@ -87,6 +88,8 @@ class TestCardSetServiceIntegration:
         mock_collection = Mock()
         mock_collection.delete_many.return_value = Mock(deleted_count=0)
         mock_collection.insert_many.return_value = Mock(inserted_ids=["id1", "id2"])
+        # Rebuilds write into a staging collection from the same database
+        mock_collection.database.get_collection.return_value = mock_collection
         mock_collection.estimated_document_count.return_value = 2
         mock_get_collection.return_value = mock_collection
 
@@ -133,7 +136,8 @@ class TestPriceScrapingIntegration:
         mock_cache_collection.return_value = mock_cache_instance
         mock_cache_instance.find_one.return_value = None  # No cached data initially
         mock_cache_instance.find.return_value = []  # Empty cache lookup
-        mock_cache_instance.replace_one.return_value = Mock(upserted_id="new_id", modified_count=0)
+        mock_cache_instance.find_one_and_update.return_value = None  # No existing price to touch
+        mock_cache_instance.find_one_and_replace.return_value = None
         mock_cache_instance.list_indexes.return_value = []  # Empty indexes list to prevent iteration error
         mock_cache_instance.create_index.return_value = None
         
@@ -168,9 +172,9 @@ class TestPriceScrapingIntegration:
         # Test price scraping integration
         service = PriceScrapingService()
         
-        # CRITICAL FIX: Mock asyncio.run to avoid async complexity
-        with patch('asyncio.run') as mock_asyncio_run:
-            mock_asyncio_run.return_value = {
+        # Mock the browser scrape so no Chromium is launched
+        with patch.object(service, 'scrape_price_from_tcgplayer_basic', new_callable=AsyncMock) as mock_scrape:
+            mock_scrape.return_value = {
                 "tcgplayer_price": 25.99,
                 "tcgplayer_market_price": 24.50,
                 "tcgplayer_url": "https://tcgplayer.com/test",
@@ -187,8 +191,8 @@ class TestPriceScrapingIntegration:
         assert result["success"] is True
         assert result["tcgplayer_price"] == 25.99
 
-        # Verify cache was updated (replace_one should have been called)
-        mock_cache_instance.replace_one.assert_called()
+        # Verify cache was updated (find_one_and_replace should have been called)
+        mock_cache_instance.find_one_and_replace.assert_called()
 
     @patch("ygoapi.price_scraping.get_price_cache_collection")
     def test_cache_retrieval_integration(self, mock_cache_collection):
@@ -207,8 +211,11 @@ class TestPriceScrapingIntegration:
             "last_price_updt": datetime.now(timezone.utc),
         }
         
-        # The cache lookup uses find() method that returns a list
-        mock_cache_instance.find.return_value = [cached_data]
+        # The cache lookup is a single find_one on price_lookup_key; the startup
+        # check for un-backfilled documents finds none
+        mock_cache_instance.find_one.side_effect = (
+            lambda query, *args, **kwargs: None if "$exists" in str(query) else cached_data
+        )
 
         service = PriceScrapingService()
         result = service.find_cached_price_data("LOB-001", "Blue-Eyes White Dragon", "Ultra Rare")
@@ -374,6 +381,8 @@ class TestDataFlow:
         mock_collection = Mock()
         mock_collection.delete_many.return_value = Mock(deleted_count=0)
         mock_collection.insert_many.return_value = Mock(inserted_ids=["id1"])
+        # Rebuilds write into a staging collection from the same database
+        mock_collection.database.get_collection.return_value = mock_collection
         mock_collection.estimated_document_count.return_value = 1
         mock_collection.find.return_value = [{"set_name": "Test Set", "set_code": "TS", "num_of_cards": 100}]
         mock_get_collection.return_value = mock_collection
@@ -408,6 +417,8 @@ class TestDataFlow:
         mock_cache_collection.return_value = mock_cache_instance
         mock_cache_instance.list_indexes.return_value = []  # Prevent initialization errors
         mock_cache_instance.create_index.return_value = None
+        mock_cache_instance.find_one_and_update.return_value = None  # No existing price to touch
+        mock_cache_instance.find_one_and_replace.return_value = None
         
         # Mock variants collection instance
         mock_variants_instance = Mock()
@@ -435,9 +446,22 @@ class TestDataFlow:
             "last_price_updt": datetime.now(timezone.utc),
         }
         
-        # For cache lookup, use find method returning list, first empty then has data
-        mock_cache_instance.find.side_effect = [[], [cached_data]]  # First empty, then has data
-        mock_cache_instance.replace_one.return_value = Mock(upserted_id="new_id", modified_count=0)
+        # Cache starts empty; lookups return what save_price_data wrote for the same lookup key
+        saved_documents = []
+
+        def find_one_and_replace(query, document, **kwargs):
+            saved_documents.append(document)
+            return None
+
+        def find_one(query, *args, **kwargs):
+            lookup = query.get("price_lookup_key", {})
+            for document in reversed(saved_documents):
+                if "$regex" in lookup and re.match(lookup["$regex"], document["price_lookup_key"]):
+                    return document
+            return None
+
+        mock_cache_instance.find_one.side_effect = find_one
+        mock_cache_instance.find_one_and_replace.side_effect = find_one_and_replace
 
         # Setup scraping response
         mock_response = Mock()
@@ -447,9 +471,9 @@ class TestDataFlow:
 
         service = PriceScrapingService()
 
-        # 1. First scrape (cache miss) - mock asyncio.run to avoid complexity
-        with patch('asyncio.run') as mock_asyncio_run:
-            mock_asyncio_run.return_value = {
+        # 1. First scrape (cache miss) - mock the browser scrape to avoid complexity
+        with patch.object(service, 'scrape_price_from_tcgplayer_basic', new_callable=AsyncMock) as mock_scrape:
+            mock_scrape.return_value = {
                 "tcgplayer_price": 25.99,
                 "tcgplayer_market_price": 24.50,
                 "tcgplayer_url": "https://tcgplayer.com/test",
@@ -0,0 +1,274 @@
+"""
+Unit tests for browser_pool.py module.
+
+Tests context leasing, recycling after navigations, errors and memory pressure,
+request blocking, and shutdown of the pooled browser without launching a real
+Chromium.
+"""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from ygoapi.browser_pool import BrowserPool, RequestBlocker
+
+
+def create_mock_playwright():
+    """Create a mock async_playwright() whose browser hands out fresh contexts."""
+    mock_browser = MagicMock()
+    mock_browser.is_connected.return_value = True
+    mock_browser.close = AsyncMock()
+
+    def _new_context(**kwargs):
+        mock_context = MagicMock()
+        mock_context.close = AsyncMock()
+        mock_context.route = AsyncMock()
+        mock_page = MagicMock()
+        mock_context.new_page = AsyncMock(return_value=mock_page)
+        return mock_context
+
+    mock_browser.new_context = AsyncMock(side_effect=_new_context)
+
+    mock_p = MagicMock()
+    mock_p.chromium.launch = AsyncMock(return_value=mock_browser)
+    mock_p.stop = AsyncMock()
+
+    mock_async_playwright = MagicMock()
+    mock_async_playwright.return_value.start = AsyncMock(return_value=mock_p)
+    return mock_async_playwright, mock_p, mock_browser
+
+
+@pytest.fixture
+def mock_playwright():
+    """Patch Playwright in the browser pool module."""
+    mock_async_playwright, mock_p, mock_browser = create_mock_playwright()
+    with patch("ygoapi.browser_pool.async_playwright", mock_async_playwright):
+        yield mock_p, mock_browser
+
+
+class TestBrowserPool:
+    """Test BrowserPool leasing and recycling."""
+
+    @pytest.mark.asyncio
+    async def test_pool_starts_lazily_with_warm_contexts(self, mock_playwright):
+        """Test the browser is launched once and contexts are pre-created."""
+        mock_p, mock_browser = mock_playwright
+        pool = BrowserPool(size=3)
+
+        assert pool.get_stats()["browser_launches"] == 0
+
+        async with pool.acquire() as page:
+            assert page is not None
+
+        stats = pool.get_stats()
+        assert stats["browser_launches"] == 1
+        assert stats["contexts_created"] == 3
+        assert stats["idle_contexts"] == 3
+        assert stats["leases"] == 1
+        mock_p.chromium.launch.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_pool_reuses_contexts(self, mock_playwright):
+        """Test consecutive leases reuse the same warm page."""
+        pool = BrowserPool(size=1)
+
+        async with pool.acquire() as first_page:
+            pass
+        async with pool.acquire() as second_page:
+            pass
+
+        assert first_page is second_page
+        assert pool.get_stats()["contexts_created"] == 1
+
+    @pytest.mark.asyncio
+    async def test_context_recycled_after_max_navigations(self, mock_playwright):
+        """Test a context is replaced once it reaches the navigation limit."""
+        pool = BrowserPool(size=1, max_navigations=2)
+
+        async with pool.acquire() as page:
+            # Simulate two main-frame navigations reported by Playwright
+            on_navigated = page.on.call_args[0][1]
+            on_navigated(MagicMock(parent_frame=None))
+            on_navigated(MagicMock(parent_frame=None))
+
+        async with pool.acquire() as next_page:
+            assert next_page is not page
+
+        stats = pool.get_stats()
+        assert stats["recycled_for_navigations"] == 1
+        assert stats["contexts_created"] == 2
+
+    @pytest.mark.asyncio
+    async def test_subframe_navigations_not_counted(self, mock_playwright):
+        """Test iframe navigations don't count toward the recycle limit."""
+        pool = BrowserPool(size=1, max_navigations=1)
+
+        async with pool.acquire() as page:
+            on_navigated = page.on.call_args[0][1]
+            on_navigated(MagicMock(parent_frame=MagicMock()))
+
+        async with pool.acquire() as next_page:
+            assert next_page is page
+
+    @pytest.mark.asyncio
+    async def test_context_recycled_after_error(self, mock_playwright):
+        """Test a context that raised during a scrape is replaced."""
+        pool = BrowserPool(size=1)
+
+        with pytest.raises(RuntimeError):
+            async with pool.acquire():
+                raise RuntimeError("scrape failed")
+
+        stats = pool.get_stats()
+        assert stats["recycled_after_error"] == 1
+        assert stats["idle_contexts"] == 1
+
+    @pytest.mark.asyncio
+    async def test_context_recycled_under_memory_pressure(self, mock_playwright):
+        """Test contexts are recycled when the memory manager reports a warning."""
+        memory_manager = MagicMock()
+        memory_manager.is_memory_warning.return_value = True
+        pool = BrowserPool(size=1, memory_manager=memory_manager)
+
+        async with pool.acquire():
+            pass
+
+        assert pool.get_stats()["recycled_for_memory_pressure"] == 1
+
+    @pytest.mark.asyncio
+    async def test_close_discards_leased_context(self, mock_playwright):
+        """Test contexts leased during a shutdown are closed instead of returned."""
+        mock_p, mock_browser = mock_playwright
+        pool = BrowserPool(size=1)
+
+        async with pool.acquire():
+            await pool.close()
+
+        assert pool.get_stats()["idle_contexts"] == 0
+        mock_browser.close.assert_awaited_once()
+        mock_p.stop.assert_awaited_once()
+
+    def test_run_and_shutdown_from_sync_code(self, mock_playwright):
+        """Test the pool can be driven and shut down from synchronous code."""
+        mock_p, mock_browser = mock_playwright
+        pool = BrowserPool(size=1)
+
+        async def lease():
+            async with pool.acquire():
+                return "ok"
+
+        assert pool.run(lease(), timeout=5) == "ok"
+
+        pool.shutdown()
+
+        mock_browser.close.assert_awaited_once()
+        assert pool.get_stats()["browser_running"] is False
+
+    def test_shutdown_without_start_is_noop(self):
+        """Test shutdown does nothing when the pool was never used."""
+        pool = BrowserPool(size=1)
+        pool.shutdown()
+        assert pool.get_stats()["browser_running"] is False
+
+    @pytest.mark.asyncio
+    async def test_contexts_route_requests_through_blocker(self, mock_playwright):
+        """Test every new context registers the request blocker."""
+        pool = BrowserPool(size=2)
+
+        async with pool.acquire():
+            pass
+
+        for pooled in list(pool._idle._queue):
+            pooled.context.route.assert_awaited_once_with("**/*", pool.request_blocker.handle)
+        assert pool.get_stats()["request_blocking"]["blocked_requests"] == 0
+
+    @pytest.mark.asyncio
+    async def test_request_blocking_can_be_disabled(self, mock_playwright):
+        """Test no route is registered when blocking is turned off."""
+        pool = BrowserPool(size=1, block_requests=False)
+
+        async with pool.acquire():
+            pass
+
+        pooled = pool._idle._queue[0]
+        pooled.context.route.assert_not_awaited()
+        assert pool.get_stats()["request_blocking"] is None
+
+
+def create_mock_route(url, resource_type):
+    """Create a mock Playwright route for a request."""
+    route = MagicMock()
+    route.request.url = url
+    route.request.resource_type = resource_type
+    route.abort = AsyncMock()
+    route.continue_ = AsyncMock()
+    return route
+
+
+class TestRequestBlocker:
+    """Test RequestBlocker decisions and counters."""
+
+    @pytest.fixture
+    def blocker(self):
+        return RequestBlocker(
+            blocked_resource_types=["image", "media", "font"],
+            blocked_domains=["google-analytics.com", "doubleclick.net"],
+            allowlist=["tcgplayer-cdn.tcgplayer.com/product"],
+        )
+
+    @pytest.mark.asyncio
+    async def test_blocks_resource_types(self, blocker):
+        """Test images, fonts and media are aborted."""
+        route = create_mock_route("https://tcgplayer-cdn.tcgplayer.com/card/1.jpg", "image")
+
+        await blocker.handle(route)
+
+        route.abort.assert_awaited_once()
+        route.continue_.assert_not_awaited()
+        stats = blocker.get_stats()
+        assert stats["blocked_requests"] == 1
+        assert stats["blocked_by_resource_type"] == {"image": 1}
+
+    @pytest.mark.asyncio
+    async def test_blocks_tracker_domains_and_subdomains(self, blocker):
+        """Test tracker hosts and their subdomains are aborted."""
+        route = create_mock_route("https://stats.g.doubleclick.net/collect", "xhr")
+
+        await blocker.handle(route)
+
+        route.abort.assert_awaited_once()
+        assert blocker.get_stats()["blocked_by_domain"] == {"doubleclick.net": 1}
+
+    @pytest.mark.asyncio
+    async def test_allows_documents_and_scripts(self, blocker):
+        """Test page documents and first-party scripts go through."""
+        for url, resource_type in [
+            ("https://www.tcgplayer.com/search/yugioh/product?q=test", "document"),
+            ("https://www.tcgplayer.com/app.js", "script"),
+            ("https://notdoubleclick.net/x", "xhr"),
+        ]:
+            route = create_mock_route(url, resource_type)
+            await blocker.handle(route)
+            route.continue_.assert_awaited_once()
+
+        assert blocker.get_stats()["allowed_requests"] == 3
+
+    @pytest.mark.asyncio
+    async def test_allowlist_overrides_blocking(self, blocker):
+        """Test allowlisted URLs are never blocked."""
+        route = create_mock_route("https://tcgplayer-cdn.tcgplayer.com/product/123_200w.jpg", "image")
+
+        await blocker.handle(route)
+
+        route.continue_.assert_awaited_once()
+        assert blocker.get_stats()["allowlisted_requests"] == 1
+
+    @pytest.mark.asyncio
+    async def test_route_errors_are_swallowed(self, blocker):
+        """Test interception failures don't propagate into the scrape."""
+        route = create_mock_route("https://www.tcgplayer.com/", "document")
+        route.continue_.side_effect = Exception("Target closed")
+
+        await blocker.handle(route)
+
+        assert blocker.get_stats()["route_errors"] == 1
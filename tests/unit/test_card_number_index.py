@@ -0,0 +1,127 @@
+"""
+Unit tests for card_number_index.py module.
+
+Tests exact-match variant lookups, the explicit regex fallback, and warming
+and maintaining the in-process card number -> card name map.
+"""
+
+import time
+from unittest.mock import Mock
+
+import pytest
+
+from ygoapi.card_number_index import CardNumberIndex
+
+
+@pytest.fixture
+def collection():
+    """Mock variants collection with no matching documents."""
+    collection = Mock()
+    collection.find_one.return_value = None
+    return collection
+
+
+class TestCardNumberIndex:
+    """Test CardNumberIndex functionality."""
+
+    def test_exact_lookup_normalizes_card_number(self, collection):
+        """Test lookups query the canonical key with one indexed find_one."""
+        collection.find_one.return_value = {"card_number_key": "RA04-EN016", "card_name": "Test Card"}
+        index = CardNumberIndex()
+
+        result = index.find_variant(collection, " ra04-en016")
+
+        assert result["card_name"] == "Test Card"
+        collection.find_one.assert_called_once_with(
+            {"$or": [{"card_number_key": "RA04-EN016"}, {"set_code": "RA04-EN016"}]},
+            {"_id": 0}
+        )
+        assert index.get_name("RA04-EN016") == "Test Card"
+        assert index.get_stats()["exact_hits"] == 1
+
+    def test_miss_without_regex_fallback(self, collection):
+        """Test a miss returns None after the single exact query."""
+        index = CardNumberIndex()
+
+        assert index.find_variant(collection, "LOB-999") is None
+        assert collection.find_one.call_count == 1
+        assert index.get_stats()["lookup_misses"] == 1
+
+    def test_regex_fallback_escapes_input(self, collection):
+        """Test the explicit fallback scans set_code then card_name with an escaped pattern."""
+        collection.find_one.side_effect = [None, None, {"card_name": "Card (Alt)"}]
+        index = CardNumberIndex(regex_fallback=True)
+
+        result = index.find_variant(collection, "Card (Alt)")
+
+        assert result == {"card_name": "Card (Alt)"}
+        set_code_query = collection.find_one.call_args_list[1][0][0]
+        card_name_query = collection.find_one.call_args_list[2][0][0]
+        assert set_code_query == {"set_code": {"$regex": r"Card\ \(Alt\)", "$options": "i"}}
+        assert card_name_query == {"card_name": {"$regex": r"Card\ \(Alt\)", "$options": "i"}}
+        assert index.get_stats()["regex_fallback_hits"] == 1
+        # Fuzzy matches are not remembered as the name of this card number
+        assert index.get_name("CARD (ALT)") is None
+
+    def test_regex_fallback_override_per_call(self, collection):
+        """Test callers can opt out of an enabled fallback."""
+        index = CardNumberIndex(regex_fallback=True)
+
+        index.find_variant(collection, "LOB-999", regex_fallback=False)
+
+        assert collection.find_one.call_count == 1
+
+    def test_blank_card_number_not_queried(self, collection):
+        """Test empty card numbers never reach MongoDB."""
+        index = CardNumberIndex()
+
+        assert index.find_variant(collection, "  ") is None
+        collection.find_one.assert_not_called()
+
+    def test_warm_streams_projection(self, collection):
+        """Test warming projects only the mapped fields and falls back to set_code."""
+        collection.find.return_value = iter([
+            {"card_number_key": "LOB-001", "set_code": "LOB-001", "card_name": "Blue-Eyes White Dragon"},
+            {"set_code": "sdy-006", "card_name": "Dark Magician"},
+            {"set_code": "XYZ-000"},
+        ])
+        index = CardNumberIndex()
+
+        assert index.warm(collection) == 2
+
+        projection = collection.find.call_args[0][1]
+        assert projection == {"_id": 0, "card_number_key": 1, "set_code": 1, "card_name": 1}
+        assert index.get_name("SDY-006") == "Dark Magician"
+        stats = index.get_stats()
+        assert stats["warmed"] is True
+        assert stats["warm_runs"] == 1
+
+    def test_warm_failure_is_logged_not_raised(self, collection):
+        """Test a failing warm leaves the map usable."""
+        collection.find.side_effect = Exception("Database error")
+        index = CardNumberIndex()
+
+        assert index.warm(collection) == 0
+        assert index.get_stats()["warm_errors"] == 1
+
+    def test_warm_in_background(self, collection):
+        """Test background warming fills the map from a daemon thread."""
+        collection.find.return_value = iter([{"set_code": "LOB-001", "card_name": "Blue-Eyes White Dragon"}])
+        index = CardNumberIndex()
+
+        index.warm_in_background(collection)
+
+        deadline = time.time() + 5
+        while not index.get_stats()["warmed"] and time.time() < deadline:
+            time.sleep(0.01)
+        assert index.get_name("LOB-001") == "Blue-Eyes White Dragon"
+
+    def test_clear_forgets_names(self):
+        """Test clear empties the map."""
+        index = CardNumberIndex()
+        index.remember("LOB-001", "Blue-Eyes White Dragon")
+
+        index.clear()
+
+        assert index.get_name("LOB-001") is None
+        assert index.get_stats()["size"] == 0
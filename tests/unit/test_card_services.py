@@ -5,6 +5,7 @@ Tests all card service classes including CardSetService, CardVariantService,
 and CardLookupService with comprehensive coverage of edge cases and error scenarios.
 """
 
+import json
 from datetime import datetime, timezone
 from typing import Any, Dict, List
 from unittest.mock import Mock, patch
@@ -13,7 +14,9 @@ import pytest
 import requests
 
 from tests.fixtures.mock_services import MockMongoDBData, MockYGOProDeckAPI
+from ygoapi import card_services as card_services_module
 from ygoapi.card_services import (
+    CacheRebuildInProgressError,
     CardLookupService,
     CardSetService,
     CardVariantService,
@@ -69,6 +72,17 @@ class TestCardSetService:
 
         assert "API returned status 500" in str(exc_info.value)
 
+    @patch("ygoapi.card_services.requests.get")
+    def test_fetch_all_card_sets_uses_rate_limiter(self, mock_get, card_set_service_instance):
+        """Test the set list fetch draws from the same limiter as the set fetches."""
+        mock_get.return_value = Mock(status_code=200, json=Mock(return_value=[]))
+        card_set_service_instance.rate_limiter = Mock()
+
+        card_set_service_instance.fetch_all_card_sets()
+
+        card_set_service_instance.rate_limiter.acquire.assert_called_once()
+        assert CardSetService().rate_limiter is CardVariantService().rate_limiter
+
     @patch("ygoapi.card_services.requests.get")
     def test_fetch_all_card_sets_network_error(self, mock_get, card_set_service_instance):
         """Test network error handling during card sets fetch."""
@@ -84,15 +98,17 @@ class TestCardSetService:
     def test_upload_card_sets_to_cache_success(
         self, mock_fetch, mock_get_collection, card_set_service_instance
     ):
-        """Test successful upload of card sets to cache."""
+        """Test card sets are built in a staging collection and swapped in."""
         # Setup mocks
         mock_collection = Mock()
+        mock_collection.name = "YGO_SETS_CACHE_V1"
         mock_get_collection.return_value = mock_collection
         mock_fetch.return_value = MockYGOProDeckAPI.get_card_sets_response()["data"]
+        mock_staging = mock_collection.database.get_collection.return_value
 
-        # Setup delete and insert results
-        mock_collection.delete_many.return_value.deleted_count = 5
-        mock_collection.insert_many.return_value.inserted_ids = ["id1", "id2"]
+        # Setup count and insert results
+        mock_collection.estimated_document_count.return_value = 5
+        mock_staging.insert_many.return_value.inserted_ids = ["id1", "id2"]
 
         # Execute
         result = card_set_service_instance.upload_card_sets_to_cache()
@@ -102,10 +118,33 @@ class TestCardSetService:
         assert result["previous_documents_cleared"] == 5
         assert "upload_timestamp" in result
 
-        # Verify database operations
-        mock_collection.delete_many.assert_called_once()
-        mock_collection.insert_many.assert_called()
-        mock_collection.create_index.assert_called()
+        # Verify database operations never touch the live collection's documents
+        staging_name = mock_collection.database.get_collection.call_args[0][0]
+        assert staging_name.startswith("YGO_SETS_CACHE_V1_STAGING_")
+        mock_staging.insert_many.assert_called()
+        mock_staging.create_index.assert_called()
+        mock_staging.rename.assert_called_once_with("YGO_SETS_CACHE_V1", dropTarget=True)
+        mock_collection.delete_many.assert_not_called()
+        mock_collection.insert_many.assert_not_called()
+
+    @patch("ygoapi.card_services.get_card_sets_collection")
+    @patch.object(CardSetService, "fetch_all_card_sets")
+    def test_upload_card_sets_failure_keeps_live_collection(
+        self, mock_fetch, mock_get_collection, card_set_service_instance
+    ):
+        """Test a failed upload drops the staging collection and leaves the live one alone."""
+        mock_collection = Mock()
+        mock_get_collection.return_value = mock_collection
+        mock_fetch.return_value = MockYGOProDeckAPI.get_card_sets_response()["data"]
+        mock_staging = mock_collection.database.get_collection.return_value
+        mock_staging.insert_many.side_effect = Exception("Write error")
+
+        with pytest.raises(Exception):
+            card_set_service_instance.upload_card_sets_to_cache()
+
+        mock_staging.rename.assert_not_called()
+        mock_staging.drop.assert_called_once()
+        mock_collection.delete_many.assert_not_called()
 
     @patch("ygoapi.card_services.get_card_sets_collection")
     def test_get_cached_card_sets_success(self, mock_get_collection, card_set_service_instance):
@@ -267,6 +306,7 @@ class TestCardVariantService:
         assert "set_name" in variant
         assert "set_code" in variant
         assert "_uploaded_at" in variant
+        assert variant["card_number_key"] == variant["set_code"].strip().upper()
 
     def test_create_card_variants_empty_input(self, card_variant_service_instance):
         """Test card variant creation with empty input."""
@@ -316,8 +356,10 @@ class TestCardVariantService:
         mock_fetch.return_value = MockYGOProDeckAPI.get_cards_response()["data"]
 
         # Setup database operation mocks
-        mock_collection.delete_many.return_value.deleted_count = 10
-        mock_collection.insert_many.return_value.inserted_ids = ["id1", "id2"]
+        mock_collection.name = "YGO_CARD_VARIANT_CACHE_V1"
+        mock_collection.estimated_document_count.return_value = 10
+        mock_staging = mock_collection.database.get_collection.return_value
+        mock_staging.bulk_write.return_value = Mock(upserted_count=2, matched_count=0)
 
         # Execute
         result = card_variant_service_instance.upload_card_variants_to_cache()
@@ -325,11 +367,496 @@ class TestCardVariantService:
         # Verify
         assert "statistics" in result
         assert "total_variants_created" in result
-        assert "previous_variants_cleared" in result
+        assert result["previous_variants_cleared"] == 10
+
+        # Verify database operations go to the staging collection, which is then swapped in
+        mock_staging.create_index.assert_called()
+        mock_staging.rename.assert_called_once_with("YGO_CARD_VARIANT_CACHE_V1", dropTarget=True)
+        mock_collection.delete_many.assert_not_called()
+        mock_collection.bulk_write.assert_not_called()
+        assert result["total_variants_created"] == 2
+
+    @patch("ygoapi.card_services.CARD_PROCESSING_BATCH_SIZE", 2)
+    @patch("ygoapi.card_services.get_card_variants_collection")
+    @patch.object(CardVariantService, "fetch_cards_from_set")
+    @patch("ygoapi.card_services.CardSetService")
+    def test_upload_card_variants_streams_batched_upserts(
+        self,
+        mock_card_set_service_class,
+        mock_fetch,
+        mock_get_collection,
+        card_variant_service_instance,
+    ):
+        """Test variants are upserted in unordered batches keyed on _variant_id as sets arrive."""
+        mock_collection = Mock()
+        mock_get_collection.return_value = mock_collection
+        mock_staging = mock_collection.database.get_collection.return_value
+        # The second set repeats the first, so its variants match existing documents
+        mock_staging.bulk_write.side_effect = [
+            Mock(upserted_count=2, matched_count=0),
+            Mock(upserted_count=1, matched_count=1),
+            Mock(upserted_count=0, matched_count=2),
+        ]
+        mock_card_set_service_class.return_value.get_cached_card_sets.return_value = [
+            {"set_name": "Test Set", "set_code": "TS"},
+            {"set_name": "Reprint Set", "set_code": "RS"},
+        ]
+        card = {
+            "id": 1,
+            "name": "Test Card",
+            "card_sets": [
+                {"set_name": "Test Set", "set_code": "TS-001", "set_rarity": "Common"},
+                {"set_name": "Test Set", "set_code": "TS-001", "set_rarity": "Rare"},
+                {"set_name": "Test Set", "set_code": "TS-002", "set_rarity": "Common"},
+            ],
+        }
+        mock_fetch.return_value = [card]
+
+        result = card_variant_service_instance.upload_card_variants_to_cache()
+
+        batches = [call[0][0] for call in mock_staging.bulk_write.call_args_list]
+        assert [len(batch) for batch in batches] == [2, 2, 2]
+        assert all(call[1]["ordered"] is False for call in mock_staging.bulk_write.call_args_list)
+        operation = batches[0][0]
+        assert operation._filter == {"_variant_id": operation._doc["$setOnInsert"]["_variant_id"]}
+        assert operation._upsert is True
+        assert result["total_variants_created"] == 3
+        assert result["statistics"]["duplicate_variants_skipped"] == 3
+        # The unique index exists before the first upsert
+        mock_staging.create_index.assert_any_call("_variant_id", unique=True)
+        mock_staging.insert_many.assert_not_called()
+
+    @patch("ygoapi.card_services.CARD_VARIANT_REBUILD_MAX_FAILED_FRACTION", 0.5)
+    @patch("ygoapi.card_services.CARD_VARIANT_FETCH_RETRY_BACKOFF_SECONDS", 0)
+    @patch("ygoapi.card_services.get_card_variants_collection")
+    @patch.object(CardVariantService, "fetch_cards_from_set")
+    @patch("ygoapi.card_services.CardSetService")
+    def test_upload_card_variants_retries_and_isolates_failures(
+        self,
+        mock_card_set_service_class,
+        mock_fetch,
+        mock_get_collection,
+        card_variant_service_instance,
+    ):
+        """Test a flaky set is retried and a failing set doesn't abort the rebuild."""
+        mock_collection = Mock()
+        mock_get_collection.return_value = mock_collection
+        mock_collection.database.get_collection.return_value.bulk_write.side_effect = lambda batch, ordered: Mock(upserted_count=len(batch), matched_count=0)
+        mock_card_set_service_class.return_value.get_cached_card_sets.return_value = [
+            {"set_name": "Flaky Set", "set_code": "FS"},
+            {"set_name": "Broken Set", "set_code": "BS"},
+            {"set_name": "Test Set", "set_code": "TS"},
+        ]
+        cards = MockYGOProDeckAPI.get_cards_response()["data"]
+        flaky_calls = []
+
+        def fetch(set_name):
+            if set_name == "Broken Set":
+                raise Exception("API returned status 500")
+            if set_name == "Flaky Set" and not flaky_calls:
+                flaky_calls.append(set_name)
+                raise Exception("API returned status 429")
+            return cards
+
+        mock_fetch.side_effect = fetch
+
+        result = card_variant_service_instance.upload_card_variants_to_cache()
+
+        stats = result["statistics"]
+        assert stats["processed_sets"] == 2
+        assert stats["failed_sets"] == 1
+        assert stats["fetch_retries"] == 1
+        assert stats["processing_errors"][0]["set_name"] == "Broken Set"
+        # The broken set is tried once plus every retry
+        assert [call[0][0] for call in mock_fetch.call_args_list].count("Broken Set") == 4
+
+    @patch("ygoapi.card_services.CARD_VARIANT_FETCH_MAX_RETRIES", 0)
+    @patch("ygoapi.card_services.get_card_set_sync_ledger_collection")
+    @patch("ygoapi.card_services.get_card_variants_collection")
+    @patch.object(CardVariantService, "fetch_cards_from_set")
+    @patch("ygoapi.card_services.CardSetService")
+    def test_sync_card_variants_fetches_only_new_and_changed_sets(
+        self,
+        mock_card_set_service_class,
+        mock_fetch,
+        mock_get_collection,
+        mock_get_ledger,
+        card_variant_service_instance,
+    ):
+        """Test the set-list diff decides which sets are fetched, updated and removed."""
+        mock_card_set_service_class.return_value.fetch_all_card_sets.return_value = [
+            {"set_name": "Same Set", "set_code": "SS", "num_of_cards": 10, "tcg_date": "2020-01-01"},
+            {"set_name": "Changed Set", "set_code": "CS", "num_of_cards": 12, "tcg_date": "2021-01-01"},
+            {"set_name": "New Set", "set_code": "NS", "num_of_cards": 5, "tcg_date": "2025-01-01"},
+            {"set_name": "Broken Set", "set_code": "BS", "num_of_cards": 5, "tcg_date": "2025-02-01"},
+        ]
+        mock_ledger = Mock()
+        mock_get_ledger.return_value = mock_ledger
+        mock_ledger.find.return_value = [
+            {"_id": "Same Set", "set_code": "SS", "num_of_cards": 10, "tcg_date": "2020-01-01"},
+            {"_id": "Changed Set", "set_code": "CS", "num_of_cards": 10, "tcg_date": "2021-01-01"},
+            {"_id": "Gone Set", "set_code": "GS", "num_of_cards": 3, "tcg_date": "2019-01-01"},
+        ]
+        mock_collection = Mock()
+        mock_get_collection.return_value = mock_collection
+        mock_collection.bulk_write.return_value = Mock(upserted_count=1, matched_count=0)
+        mock_collection.delete_many.return_value.deleted_count = 1
+
+        def fetch(set_name):
+            if set_name == "Broken Set":
+                raise Exception("API returned status 500")
+            return [{
+                "id": 1,
+                "name": "Test Card",
+                "card_sets": [{"set_name": set_name, "set_code": f"{set_name[:2].upper()}-001", "set_rarity": "Common"}],
+            }]
+
+        mock_fetch.side_effect = fetch
+
+        result = card_variant_service_instance.sync_card_variants()
+
+        stats = result["statistics"]
+        assert sorted(call[0][0] for call in mock_fetch.call_args_list) == ["Broken Set", "Changed Set", "New Set"]
+        assert stats["new_sets"] == 2
+        assert stats["changed_sets"] == 1
+        assert stats["unchanged_sets"] == 1
+        assert stats["removed_sets"] == 1
+        assert stats["synced_sets"] == 2
+        assert stats["failed_sets"] == 1
+        assert stats["variants_upserted"] == 2
+        # Stale variants of each synced set plus every variant of the removed set
+        assert stats["variants_deleted"] == 3
+        mock_collection.delete_many.assert_any_call({"set_name": "Gone Set"})
+        mock_ledger.delete_one.assert_called_once_with({"_id": "Gone Set"})
+        recorded = [call[0][0][0]._doc for call in mock_ledger.bulk_write.call_args_list]
+        assert sorted(entry["set_name"] for entry in recorded) == ["Changed Set", "New Set"]
+        assert all(entry["variant_count"] == 1 and "last_fetched_at" in entry for entry in recorded)
+        new_set_operations = next(
+            call[0][0] for call in mock_collection.bulk_write.call_args_list
+            if call[0][0][0]._doc["set_name"] == "New Set"
+        )
+        mock_collection.delete_many.assert_any_call({
+            "set_name": "New Set",
+            "_variant_id": {"$nin": [operation._filter["_variant_id"] for operation in new_set_operations]}
+        })
+
+    @patch("ygoapi.card_services.get_card_set_sync_ledger_collection")
+    @patch("ygoapi.card_services.get_card_variants_collection")
+    @patch.object(CardVariantService, "fetch_cards_from_set")
+    @patch("ygoapi.card_services.CardSetService")
+    def test_sync_refuses_empty_set_list(
+        self,
+        mock_card_set_service_class,
+        mock_fetch,
+        mock_get_collection,
+        mock_get_ledger,
+        card_variant_service_instance,
+    ):
+        """Test an empty cardsets.php response never deletes anything."""
+        mock_card_set_service_class.return_value.fetch_all_card_sets.return_value = []
+        mock_collection = Mock()
+        mock_get_collection.return_value = mock_collection
+        mock_ledger = Mock()
+        mock_get_ledger.return_value = mock_ledger
+        mock_ledger.find.return_value = [{"_id": "Some Set", "set_code": "SS"}]
+
+        with pytest.raises(ValueError):
+            card_variant_service_instance.sync_card_variants(force=True)
+
+        mock_collection.delete_many.assert_not_called()
+        mock_ledger.delete_one.assert_not_called()
+        mock_fetch.assert_not_called()
+
+    @patch("ygoapi.card_services.CARD_VARIANT_FETCH_MAX_RETRIES", 0)
+    @patch("ygoapi.card_services.get_card_set_sync_ledger_collection")
+    @patch("ygoapi.card_services.get_card_variants_collection")
+    @patch.object(CardVariantService, "fetch_cards_from_set")
+    @patch("ygoapi.card_services.CardSetService")
+    def test_sync_keeps_set_when_fetch_comes_back_empty(
+        self,
+        mock_card_set_service_class,
+        mock_fetch,
+        mock_get_collection,
+        mock_get_ledger,
+        card_variant_service_instance,
+    ):
+        """Test an empty fetch for a set with cards fails the set instead of wiping it."""
+        mock_card_set_service_class.return_value.fetch_all_card_sets.return_value = [
+            {"set_name": "Changed Set", "set_code": "CS", "num_of_cards": 12, "tcg_date": "2021-01-01"},
+        ]
+        mock_ledger = Mock()
+        mock_get_ledger.return_value = mock_ledger
+        mock_ledger.find.return_value = [
+            {"_id": "Changed Set", "set_code": "CS", "num_of_cards": 10, "tcg_date": "2021-01-01", "variant_count": 10},
+        ]
+        mock_collection = Mock()
+        mock_get_collection.return_value = mock_collection
+        mock_fetch.return_value = []
+
+        result = card_variant_service_instance.sync_card_variants()
+
+        stats = result["statistics"]
+        assert stats["failed_sets"] == 1
+        assert stats["synced_sets"] == 0
+        assert stats["processing_errors"][0]["set_name"] == "Changed Set"
+        mock_collection.delete_many.assert_not_called()
+        mock_ledger.bulk_write.assert_not_called()
+
+    @patch("ygoapi.card_services.CARD_VARIANT_SYNC_MAX_REMOVED_SETS", 2)
+    @patch("ygoapi.card_services.get_card_set_sync_ledger_collection")
+    @patch("ygoapi.card_services.get_card_variants_collection")
+    @patch.object(CardVariantService, "fetch_cards_from_set")
+    @patch("ygoapi.card_services.CardSetService")
+    def test_sync_refuses_mass_removal_unless_forced(
+        self,
+        mock_card_set_service_class,
+        mock_fetch,
+        mock_get_collection,
+        mock_get_ledger,
+        card_variant_service_instance,
+    ):
+        """Test a truncated set list can't wipe the ledger unless the sync is forced."""
+        kept_set = {"set_name": "Set 0", "set_code": "S0", "num_of_cards": 1, "tcg_date": "2020-01-01"}
+        mock_card_set_service_class.return_value.fetch_all_card_sets.return_value = [kept_set]
+        mock_collection = Mock()
+        mock_get_collection.return_value = mock_collection
+        mock_collection.delete_many.return_value.deleted_count = 1
+        mock_ledger = Mock()
+        mock_get_ledger.return_value = mock_ledger
+        mock_ledger.find.return_value = [{**kept_set, "_id": "Set 0"}] + [
+            {"_id": f"Set {i}", "set_code": f"S{i}", "num_of_cards": 1, "tcg_date": "2020-01-01"}
+            for i in range(1, 6)
+        ]
+
+        with pytest.raises(ValueError):
+            card_variant_service_instance.sync_card_variants()
+        mock_collection.delete_many.assert_not_called()
+
+        result = card_variant_service_instance.sync_card_variants(force=True)
+
+        assert result["statistics"]["removed_sets"] == 5
+        assert mock_ledger.delete_one.call_count == 5
+
+    @patch("ygoapi.card_services.get_card_set_sync_ledger_collection")
+    @patch("ygoapi.card_services.get_card_variants_collection")
+    @patch.object(CardVariantService, "fetch_cards_from_set")
+    @patch("ygoapi.card_services.CardSetService")
+    def test_failed_variant_rebuild_keeps_live_collection_and_ledger(
+        self,
+        mock_card_set_service_class,
+        mock_fetch,
+        mock_get_collection,
+        mock_get_ledger,
+        card_variant_service_instance,
+    ):
+        """Test a rebuild that fails before the swap leaves live variants and the ledger untouched."""
+        mock_card_set_service_class.return_value.get_cached_card_sets.return_value = [
+            {"set_name": "Test Set", "set_code": "TS"}
+        ]
+        mock_fetch.return_value = MockYGOProDeckAPI.get_cards_response()["data"]
+        mock_collection = Mock()
+        mock_get_collection.return_value = mock_collection
+        mock_staging = mock_collection.database.get_collection.return_value
+        mock_staging.bulk_write.return_value = Mock(upserted_count=1, matched_count=0)
+        mock_staging.rename.side_effect = Exception("rename failed")
+        mock_ledger = Mock()
+        mock_get_ledger.return_value = mock_ledger
+
+        with pytest.raises(Exception):
+            card_variant_service_instance.upload_card_variants_to_cache()
+
+        mock_staging.drop.assert_called_once()
+        mock_collection.delete_many.assert_not_called()
+        mock_ledger.delete_many.assert_not_called()
+        mock_ledger.bulk_write.assert_not_called()
+
+    @patch("ygoapi.card_services.CARD_VARIANT_FETCH_MAX_RETRIES", 0)
+    @patch("ygoapi.card_services.get_card_set_sync_ledger_collection")
+    @patch("ygoapi.card_services.get_card_variants_collection")
+    @patch.object(CardVariantService, "fetch_cards_from_set")
+    @patch("ygoapi.card_services.CardSetService")
+    def test_rebuild_with_too_many_failed_sets_is_not_promoted(
+        self,
+        mock_card_set_service_class,
+        mock_fetch,
+        mock_get_collection,
+        mock_get_ledger,
+        card_variant_service_instance,
+    ):
+        """Test an outage that fails most sets keeps the live variants and the ledger."""
+        mock_card_set_service_class.return_value.get_cached_card_sets.return_value = [
+            {"set_name": "Test Set", "set_code": "TS"},
+            {"set_name": "Broken Set", "set_code": "BS"},
+        ]
+        cards = MockYGOProDeckAPI.get_cards_response()["data"]
+
+        def fetch(set_name):
+            if set_name == "Broken Set":
+                raise Exception("API returned status 503")
+            return cards
+
+        mock_fetch.side_effect = fetch
+        mock_collection = Mock()
+        mock_get_collection.return_value = mock_collection
+        mock_staging = mock_collection.database.get_collection.return_value
+        mock_staging.bulk_write.side_effect = lambda batch, ordered: Mock(upserted_count=len(batch), matched_count=0)
+        mock_ledger = Mock()
+        mock_get_ledger.return_value = mock_ledger
+
+        with pytest.raises(Exception, match="keeping the existing card variants"):
+            card_variant_service_instance.upload_card_variants_to_cache()
+
+        mock_staging.rename.assert_not_called()
+        mock_staging.drop.assert_called_once()
+        mock_ledger.delete_many.assert_not_called()
+        mock_ledger.bulk_write.assert_not_called()
+
+    @patch("ygoapi.card_services.CardSetService")
+    @patch("ygoapi.card_services.get_card_set_sync_ledger_collection")
+    @patch("ygoapi.card_services.get_card_variants_collection")
+    @patch("ygoapi.card_services.requests.get")
+    def test_empty_card_dump_is_not_promoted(
+        self,
+        mock_get,
+        mock_get_collection,
+        mock_get_ledger,
+        mock_card_set_service_class,
+        card_variant_service_instance,
+    ):
+        """Test a dump without any variants never replaces the live collection."""
+        response = mock_get.return_value.__enter__.return_value
+        response.status_code = 200
+        response.iter_content.side_effect = lambda chunk_size: iter([b'{"data": []}'])
+        mock_collection = Mock()
+        mock_get_collection.return_value = mock_collection
+        mock_staging = mock_collection.database.get_collection.return_value
+        mock_ledger = Mock()
+        mock_get_ledger.return_value = mock_ledger
+
+        with pytest.raises(Exception, match="no variants"):
+            card_variant_service_instance.build_card_variants_from_dump()
+
+        mock_staging.rename.assert_not_called()
+        mock_staging.drop.assert_called_once()
+        mock_ledger.delete_many.assert_not_called()
+
+    @patch("ygoapi.card_services.get_card_variants_collection")
+    def test_variant_rebuilds_and_syncs_are_serialized(self, mock_get_collection, card_variant_service_instance):
+        """Test a sync or second rebuild is refused while a variant rebuild holds the lock."""
+        with card_services_module._card_variants_write_lock:
+            with pytest.raises(CacheRebuildInProgressError):
+                card_variant_service_instance.sync_card_variants()
+            with pytest.raises(CacheRebuildInProgressError):
+                card_variant_service_instance.build_card_variants_from_dump()
+            with pytest.raises(CacheRebuildInProgressError):
+                card_variant_service_instance.upload_card_variants_to_cache()
+
+        mock_get_collection.assert_not_called()
+        # The lock is released again after a refused call
+        assert card_services_module._card_variants_write_lock.acquire(blocking=False)
+        card_services_module._card_variants_write_lock.release()
+
+    @patch("ygoapi.card_services.get_card_set_sync_ledger_collection")
+    @patch("ygoapi.card_services.get_card_variants_collection")
+    @patch.object(CardVariantService, "fetch_cards_from_set")
+    @patch("ygoapi.card_services.CardSetService")
+    def test_full_upload_resets_sync_ledger(
+        self,
+        mock_card_set_service_class,
+        mock_fetch,
+        mock_get_collection,
+        mock_get_ledger,
+        card_variant_service_instance,
+    ):
+        """Test a full upload records every processed set in a fresh ledger."""
+        mock_card_set_service_class.return_value.get_cached_card_sets.return_value = [
+            {"set_name": "Test Set", "set_code": "TS", "num_of_cards": 2, "tcg_date": "2020-01-01"}
+        ]
+        mock_fetch.return_value = MockYGOProDeckAPI.get_cards_response()["data"]
+        mock_collection = Mock()
+        mock_get_collection.return_value = mock_collection
+        mock_collection.database.get_collection.return_value.bulk_write.return_value = Mock(
+            upserted_count=1, matched_count=0
+        )
+        mock_ledger = Mock()
+        mock_get_ledger.return_value = mock_ledger
+
+        card_variant_service_instance.upload_card_variants_to_cache()
+
+        mock_ledger.delete_many.assert_called_once_with({})
+        entry = mock_ledger.bulk_write.call_args[0][0][0]._doc
+        assert entry["_id"] == "Test Set"
+        assert entry["num_of_cards"] == 2
+
+    @patch("ygoapi.card_services.CARD_DUMP_CHUNK_BYTES", 16)
+    @patch("ygoapi.card_services.CardSetService")
+    @patch("ygoapi.card_services.get_card_set_sync_ledger_collection")
+    @patch("ygoapi.card_services.get_card_variants_collection")
+    @patch("ygoapi.card_services.requests.get")
+    def test_build_card_variants_from_dump(
+        self,
+        mock_get,
+        mock_get_collection,
+        mock_get_ledger,
+        mock_card_set_service_class,
+        card_variant_service_instance,
+    ):
+        """Test one streamed cardinfo.php download produces variants for every set."""
+        dump = json.dumps({"data": [
+            {"id": 1, "name": "Blue-Eyes White Dragon", "card_sets": [
+                {"set_name": "Legend of Blue Eyes White Dragon", "set_code": "LOB-001", "set_rarity": "Ultra Rare"},
+                {"set_name": "Starter Deck: Kaiba", "set_code": "SDK-001", "set_rarity": "Ultra Rare"},
+            ]},
+            {"id": 2, "name": "Dark Magician", "card_sets": [
+                {"set_name": "Legend of Blue Eyes White Dragon", "set_code": "LOB-005", "set_rarity": "Ultra Rare"},
+            ]},
+        ]}).encode()
+        response = mock_get.return_value.__enter__.return_value
+        response.status_code = 200
+        response.iter_content.side_effect = lambda chunk_size: (
+            dump[i:i + chunk_size] for i in range(0, len(dump), chunk_size)
+        )
+        mock_collection = Mock()
+        mock_get_collection.return_value = mock_collection
+        mock_staging = mock_collection.database.get_collection.return_value
+        mock_staging.bulk_write.side_effect = lambda batch, ordered: Mock(upserted_count=len(batch), matched_count=0)
+        mock_ledger = Mock()
+        mock_get_ledger.return_value = mock_ledger
+        mock_card_set_service_class.return_value.fetch_all_card_sets.return_value = [
+            {"set_name": "Legend of Blue Eyes White Dragon", "set_code": "LOB", "num_of_cards": 126},
+            {"set_name": "Starter Deck: Kaiba", "set_code": "SDK", "num_of_cards": 50},
+            {"set_name": "Unreleased Set", "set_code": "UNR", "num_of_cards": 1},
+        ]
+
+        result = card_variant_service_instance.build_card_variants_from_dump()
+
+        mock_get.assert_called_once()
+        assert mock_get.call_args[0][0].endswith("/cardinfo.php")
+        assert mock_get.call_args[1]["stream"] is True
+        assert result["total_variants_created"] == 3
+        stats = result["statistics"]
+        assert stats["total_cards_processed"] == 2
+        assert stats["total_sets"] == 2
+        upserted_codes = sorted(
+            operation._doc["$setOnInsert"]["set_code"]
+            for call in mock_staging.bulk_write.call_args_list
+            for operation in call[0][0]
+        )
+        assert upserted_codes == ["LOB-001", "LOB-005", "SDK-001"]
+        mock_staging.rename.assert_called_once()
+        ledger_entries = {operation._doc["_id"]: operation._doc for operation in mock_ledger.bulk_write.call_args[0][0]}
+        assert set(ledger_entries) == {"Legend of Blue Eyes White Dragon", "Starter Deck: Kaiba"}
+        assert ledger_entries["Legend of Blue Eyes White Dragon"]["variant_count"] == 2
+
+    @patch("ygoapi.card_services.requests.get")
+    def test_fetch_cards_from_set_uses_rate_limiter(self, mock_get, card_variant_service_instance):
+        """Test every set fetch takes a token from the shared limiter first."""
+        mock_get.return_value = Mock(status_code=400)
+        card_variant_service_instance.rate_limiter = Mock()
+
+        card_variant_service_instance.fetch_cards_from_set("Test Set")
 
-        # Verify database operations
-        mock_collection.delete_many.assert_called_once()
-        mock_collection.create_index.assert_called()
+        card_variant_service_instance.rate_limiter.acquire.assert_called_once()
 
     @patch("ygoapi.card_services.get_card_variants_collection")
     def test_get_cached_card_variants_success(
@@ -506,8 +1033,8 @@ class TestIntegrationScenarios:
 
         mock_collection = Mock()
         mock_get_collection.return_value = mock_collection
-        mock_collection.delete_many.return_value.deleted_count = 0
         mock_collection.insert_many.return_value.inserted_ids = ["id1", "id2"]
+        mock_collection.database.get_collection.return_value = mock_collection
 
         # Execute workflow
         service = CardSetService()
@@ -0,0 +1,115 @@
+"""
+Unit tests for coalescing.py module.
+
+Tests single-flight deduplication of concurrent calls, error propagation
+and statistics.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from ygoapi.coalescing import SingleFlight
+
+
+class TestSingleFlight:
+    """Test SingleFlight functionality."""
+
+    def test_single_call_executes_function(self):
+        """Test a lone caller runs the function and is not marked shared."""
+        flight = SingleFlight()
+
+        result, shared = flight.do("key", lambda x: x * 2, 21)
+
+        assert result == 42
+        assert shared is False
+        assert flight.get_stats()["executions"] == 1
+
+    def test_concurrent_callers_share_one_execution(self):
+        """Test concurrent callers with the same key run the function once."""
+        flight = SingleFlight()
+        started = threading.Event()
+        release = threading.Event()
+        executions = []
+
+        def slow_work():
+            executions.append(1)
+            started.set()
+            release.wait(timeout=5)
+            return "price"
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            leader = executor.submit(flight.do, "LOB-001", slow_work)
+            assert started.wait(timeout=5)
+            followers = [executor.submit(flight.do, "LOB-001", slow_work) for _ in range(3)]
+
+            # Wait until all followers are blocked on the in-flight call
+            deadline = time.time() + 5
+            while flight.get_stats()["deduplicated"] < 3 and time.time() < deadline:
+                time.sleep(0.01)
+            release.set()
+
+            results = [leader.result(timeout=5)] + [f.result(timeout=5) for f in followers]
+
+        assert len(executions) == 1
+        assert [r[0] for r in results] == ["price"] * 4
+        assert [r[1] for r in results].count(True) == 3
+
+        stats = flight.get_stats()
+        assert stats["calls"] == 4
+        assert stats["executions"] == 1
+        assert stats["deduplicated"] == 3
+        assert stats["in_flight"] == 0
+        assert stats["dedup_rate"] == 0.75
+
+    def test_different_keys_do_not_share(self):
+        """Test calls with different keys run independently."""
+        flight = SingleFlight()
+
+        flight.do("a", lambda: 1)
+        flight.do("b", lambda: 2)
+
+        assert flight.get_stats()["executions"] == 2
+        assert flight.get_stats()["deduplicated"] == 0
+
+    def test_key_released_after_completion(self):
+        """Test sequential calls with the same key each execute."""
+        flight = SingleFlight()
+
+        flight.do("a", lambda: 1)
+        result, shared = flight.do("a", lambda: 2)
+
+        assert result == 2
+        assert shared is False
+        assert flight.in_flight() == 0
+
+    def test_exception_propagates_to_followers(self):
+        """Test followers receive the leader's exception."""
+        flight = SingleFlight()
+        started = threading.Event()
+        release = threading.Event()
+
+        def failing_work():
+            started.set()
+            release.wait(timeout=5)
+            raise ValueError("scrape failed")
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            leader = executor.submit(flight.do, "key", failing_work)
+            assert started.wait(timeout=5)
+            follower = executor.submit(flight.do, "key", failing_work)
+
+            deadline = time.time() + 5
+            while flight.get_stats()["deduplicated"] < 1 and time.time() < deadline:
+                time.sleep(0.01)
+            release.set()
+
+            with pytest.raises(ValueError):
+                leader.result(timeout=5)
+            with pytest.raises(ValueError):
+                follower.result(timeout=5)
+
+        assert flight.get_stats()["errors"] == 1
+        assert flight.in_flight() == 0
@@ -24,6 +24,8 @@ from ygoapi.database import (
     get_database_manager,
     get_mongo_client,
     get_price_cache_collection,
+    get_staging_collection,
+    promote_staging_collection,
     test_database_connection,
 )
 
@@ -417,6 +419,50 @@ class TestGlobalFunctions:
         assert result is True
         # When database is disabled, function returns True without calling manager
 
+    def test_get_staging_collection_names_are_unique(self):
+        """Test every rebuild gets its own staging collection next to the live one."""
+        live_collection = Mock()
+        live_collection.name = "YGO_CARD_VARIANT_CACHE_V1"
+        live_collection.database.list_collection_names.return_value = []
+
+        staging_collection = get_staging_collection(live_collection)
+        get_staging_collection(live_collection)
+
+        first_name, second_name = [call[0][0] for call in live_collection.database.get_collection.call_args_list]
+        assert first_name.startswith("YGO_CARD_VARIANT_CACHE_V1_STAGING_")
+        assert first_name != second_name
+        assert staging_collection is live_collection.database.get_collection.return_value
+        live_collection.database.drop_collection.assert_not_called()
+
+    def test_get_staging_collection_drops_only_stale_leftovers(self):
+        """Test old staging collections are dropped while recent ones (other rebuilds) are kept."""
+        live_collection = Mock()
+        live_collection.name = "YGO_SETS_CACHE_V1"
+        live_collection.database.list_collection_names.return_value = [
+            "YGO_SETS_CACHE_V1",
+            "YGO_SETS_CACHE_V1_STAGING_20200101000000_abcd1234",
+            "YGO_SETS_CACHE_V1_STAGING_29990101000000_ef567890",
+            "YGO_CARD_VARIANT_CACHE_V1_STAGING_20200101000000_abcd1234",
+        ]
+
+        get_staging_collection(live_collection)
+
+        live_collection.database.drop_collection.assert_called_once_with(
+            "YGO_SETS_CACHE_V1_STAGING_20200101000000_abcd1234"
+        )
+
+    def test_promote_staging_collection_renames_over_live(self):
+        """Test the staging collection replaces the live one with a single rename."""
+        live_collection = Mock()
+        live_collection.name = "YGO_SETS_CACHE_V1"
+        live_collection.estimated_document_count.return_value = 42
+        staging_collection = Mock()
+
+        assert promote_staging_collection(staging_collection, live_collection) == 42
+
+        staging_collection.rename.assert_called_once_with("YGO_SETS_CACHE_V1", dropTarget=True)
+        live_collection.delete_many.assert_not_called()
+
 
 class TestErrorHandling:
     """Test error handling scenarios."""
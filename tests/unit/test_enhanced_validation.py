@@ -94,13 +94,12 @@ class TestEnhancedRarityValidation:
         mock_collection.find.return_value = [{"set_rarity": "Ghost Rare"}]  # Different rarity in cache
         mock_get_collection.return_value = mock_collection
         
-        # Test: Request for "Ghost Rare" should fall back to cache validation
+        # Test: The API set table is authoritative, so the card's cached variants aren't queried
         result = service.validate_card_rarity("LOB-001", "Ghost Rare")
         
         assert result is True  # Should allow due to graceful fallback
-        # Verify both API and cache were attempted
         mock_requests.assert_called_once()
-        mock_collection.find.assert_called_once()
+        mock_collection.find.assert_not_called()
 
     @patch("ygoapi.price_scraping.requests.get")
     @patch("ygoapi.price_scraping.extract_set_code")
@@ -343,6 +342,112 @@ class TestEnhancedRarityValidation:
         assert service._are_rarities_equivalent("Collector's Rare", "PRISMATIC COLLECTOR'S RARE") is True
 
 
+class TestSetRarityTableCache:
+    """Test the per-set rarity tables shared by validations of the same set."""
+
+    @pytest.fixture
+    def service(self):
+        """Create a PriceScrapingService instance for testing."""
+        with patch("ygoapi.price_scraping.get_memory_manager"):
+            return PriceScrapingService()
+
+    def _set_response(self, card_count):
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {
+            "data": [
+                {
+                    "name": f"Card {i}",
+                    "card_sets": [
+                        {"set_code": f"LOB-{i:03d}", "set_rarity": "Ultra Rare"},
+                        {"set_code": f"SDK-{i:03d}", "set_rarity": "Common"},
+                    ]
+                }
+                for i in range(1, card_count + 1)
+            ]
+        }
+        return mock_response
+
+    @patch("ygoapi.price_scraping.requests.get")
+    @patch("ygoapi.price_scraping.get_card_variants_collection")
+    def test_one_upstream_call_per_set(self, mock_get_collection, mock_requests, service):
+        """Test validating every card of a set fetches the set once."""
+        mock_get_collection.return_value = MagicMock()
+        mock_requests.return_value = self._set_response(200)
+
+        results = [service.validate_card_rarity(f"LOB-{i:03d}", "Ultra Rare") for i in range(1, 201)]
+
+        assert all(results)
+        mock_requests.assert_called_once()
+        table, source = service._get_set_rarity_table("LOB")
+        assert source == "ygo_api"
+        assert table["LOB-001"] == {"ultra rare"}
+        # Printings from other sets are not part of this set's table
+        assert "SDK-001" not in table
+
+    @patch("ygoapi.price_scraping.requests.get")
+    @patch("ygoapi.price_scraping.get_card_variants_collection")
+    def test_warm_set_rarity_table(self, mock_get_collection, mock_requests, service):
+        """Test a set can be warmed before its cards are validated."""
+        mock_get_collection.return_value = MagicMock()
+        mock_requests.return_value = self._set_response(3)
+
+        assert service.warm_set_rarity_table("lob") == 3
+        assert service.validate_card_rarity("LOB-002", "Ultra Rare") is True
+        # Rarities the set data doesn't list still fall through to the scrape
+        assert service.validate_card_rarity("LOB-002", "Common") is True
+
+        mock_requests.assert_called_once()
+
+    @patch("ygoapi.price_scraping.requests.get")
+    @patch("ygoapi.price_scraping.get_card_variants_collection")
+    def test_set_fetch_uses_shared_rate_limiter(self, mock_get_collection, mock_requests, service):
+        """Test loading a rarity table takes a token from the YGOPRODeck limiter."""
+        mock_get_collection.return_value = MagicMock()
+        mock_requests.return_value = self._set_response(1)
+        service.ygo_api_rate_limiter = MagicMock()
+
+        service.warm_set_rarity_table("LOB")
+
+        service.ygo_api_rate_limiter.acquire.assert_called_once()
+
+    @patch("ygoapi.price_scraping.requests.get")
+    @patch("ygoapi.price_scraping.get_card_variants_collection")
+    def test_table_built_from_variant_cache_when_api_fails(self, mock_get_collection, mock_requests, service):
+        """Test the variant cache fills the table when the YGO API is unavailable."""
+        mock_requests.side_effect = requests.exceptions.RequestException("API unavailable")
+        mock_collection = MagicMock()
+        mock_collection.find.return_value = [
+            {"set_code": "LOB-001", "set_rarity": "Ultra Rare"},
+            {"set_code": "LOB-001", "set_rarity": "Secret Rare"},
+        ]
+        mock_get_collection.return_value = mock_collection
+
+        assert service.validate_card_rarity("LOB-001", "Secret Rare") is True
+        assert service.validate_card_rarity("LOB-001", "Ultra Rare") is True
+
+        mock_requests.assert_called_once()
+        mock_collection.find.assert_called_once()
+        assert mock_collection.find.call_args[0][0] == {"set_code": {"$regex": "^LOB-", "$options": "i"}}
+        _, source = service._get_set_rarity_table("LOB")
+        assert source == "variant_cache"
+
+    @patch("ygoapi.price_scraping.requests.get")
+    @patch("ygoapi.price_scraping.get_card_variants_collection")
+    def test_loaded_table_is_authoritative_for_missing_cards(self, mock_get_collection, mock_requests, service):
+        """Test a card missing from a loaded table doesn't trigger a per-card variants query."""
+        mock_requests.side_effect = requests.exceptions.RequestException("API unavailable")
+        mock_collection = MagicMock()
+        mock_collection.find.return_value = [{"set_code": "LOB-001", "set_rarity": "Ultra Rare"}]
+        mock_get_collection.return_value = mock_collection
+
+        assert service.validate_card_rarity("LOB-099", "Ultra Rare") is True
+        assert service.validate_card_rarity("LOB-100", "Common") is True
+
+        # Only the one set-wide query that built the table
+        mock_collection.find.assert_called_once()
+
+
 class TestValidationIntegrationScenarios:
     """Integration tests for the complete validation flow."""
 
@@ -567,7 +672,7 @@ class TestCacheStalenessHandling:
             "tcgplayer_price": 25.99,
             "last_price_updt": now,  # Fresh data
         }
-        mock_collection.find.return_value = [fresh_data]
+        mock_collection.find_one.return_value = fresh_data
         
         result = service._find_cached_price_data_with_staleness_info(
             "LOB-001", "Blue-Eyes White Dragon", "Ultra Rare"
@@ -591,7 +696,7 @@ class TestCacheStalenessHandling:
             "tcgplayer_price": 25.99,
             "last_price_updt": stale_time,
         }
-        mock_collection.find.return_value = [stale_data]
+        mock_collection.find_one.return_value = stale_data
         
         result = service._find_cached_price_data_with_staleness_info(
             "LOB-001", "Blue-Eyes White Dragon", "Ultra Rare"
@@ -606,7 +711,7 @@ class TestCacheStalenessHandling:
     def test_find_cached_price_data_with_staleness_info_no_data(self, mock_get_collection, service):
         """Test _find_cached_price_data_with_staleness_info with no data found."""
         mock_collection = mock_get_collection.return_value
-        mock_collection.find.return_value = []  # No data found
+        mock_collection.find_one.return_value = None  # No data found
         
         result = service._find_cached_price_data_with_staleness_info(
             "MISSING-001", "Missing Card", "Ultra Rare"
@@ -625,7 +730,7 @@ class TestCacheStalenessHandling:
             "tcgplayer_price": 25.99,
             # Missing last_price_updt
         }
-        mock_collection.find.return_value = [data_without_timestamp]
+        mock_collection.find_one.return_value = data_without_timestamp
         
         result = service._find_cached_price_data_with_staleness_info(
             "LOB-001", "Blue-Eyes White Dragon", "Ultra Rare"
@@ -646,7 +751,7 @@ class TestCacheStalenessHandling:
             "tcgplayer_price": 45.00,
             "last_price_updt": now,
         }
-        mock_collection.find.return_value = [data_with_art]
+        mock_collection.find_one.return_value = data_with_art
         
         result = service._find_cached_price_data_with_staleness_info(
             "LOB-005", "Dark Magician", "Secret Rare", "7th"
@@ -678,7 +783,8 @@ class TestCacheStalenessHandling:
                 "last_price_updt": now,  # Newer entry
             }
         ]
-        mock_collection.find.return_value = cache_entries
+        # The newest entry is picked by a server-side sort
+        mock_collection.find_one.return_value = cache_entries[1]
         
         result = service._find_cached_price_data_with_staleness_info(
             "LOB-001", "Blue-Eyes White Dragon", "Ultra Rare"
@@ -688,6 +794,7 @@ class TestCacheStalenessHandling:
         assert result["is_fresh"] is True
         assert result["data"]["tcgplayer_price"] == 25.99  # Should pick newer entry
         assert result["last_updated"] == now
+        assert mock_collection.find_one.call_args[1]["sort"] == [("last_price_updt", -1)]
 
     @patch("ygoapi.price_scraping.get_price_cache_collection")
     def test_find_cached_price_data_with_staleness_info_database_disabled(self, mock_get_collection, service):
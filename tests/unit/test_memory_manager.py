@@ -7,11 +7,13 @@ with comprehensive coverage of edge cases and error scenarios.
 
 import gc
 import os
+import time
 from unittest.mock import MagicMock, Mock, patch
 
 import pytest
 
 from ygoapi.memory_manager import (
+    AdvancedCache,
     MemoryManager,
     get_memory_manager,
     monitor_memory,
@@ -399,6 +401,44 @@ class TestMemoryManagerCoverageEnhancement:
         assert usage["limit_mb"] == 1
 
 
+class TestAdvancedCache:
+    """Test AdvancedCache functionality."""
+
+    def test_delete_removes_entry(self):
+        """Test delete() drops a key and reports whether it existed."""
+        cache = AdvancedCache(max_size=10)
+        cache.set("key", "value")
+
+        assert cache.delete("key") is True
+        assert cache.get("key") is None
+        assert cache.delete("key") is False
+        assert cache.get_stats()["deletes"] == 1
+
+    def test_per_key_ttl_expires_entry(self):
+        """Test a ttl passed to set() expires only that key."""
+        cache = AdvancedCache(max_size=10)
+        cache.set("short", "value", ttl=0.01)
+        cache.set("long", "value")
+
+        time.sleep(0.02)
+
+        assert cache.get("short") is None
+        assert cache.get("long") == "value"
+        assert cache.get_stats()["expired"] == 1
+
+    def test_delete_matching_removes_selected_keys(self):
+        """Test delete_matching() drops only keys accepted by the predicate."""
+        cache = AdvancedCache(max_size=10)
+        for key in ("LOB-001|ultra rare|", "LOB-001|ultra rare|1", "LOB-002|ultra rare|"):
+            cache.set(key, key)
+
+        removed = cache.delete_matching(lambda key: key.startswith("LOB-001|"))
+
+        assert removed == 2
+        assert cache.size() == 1
+        assert cache.get("LOB-002|ultra rare|") == "LOB-002|ultra rare|"
+
+
 class TestGlobalMemoryManagerFunctions:
     """Test global memory manager functions."""
 
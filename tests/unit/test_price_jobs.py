@@ -0,0 +1,246 @@
+"""
+Unit tests for price_jobs.py module.
+
+Tests the in-process and MongoDB-backed price scrape job queues, the default
+job handler and queue backend selection.
+"""
+
+import threading
+import time
+from datetime import timedelta
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from ygoapi.price_jobs import (
+    JOB_STATUS_COMPLETED,
+    JOB_STATUS_FAILED,
+    JOB_STATUS_QUEUED,
+    JOB_STATUS_RUNNING,
+    InProcessPriceJobQueue,
+    MongoPriceJobQueue,
+    PriceJobQueue,
+    create_price_job_queue,
+    run_price_job,
+)
+from ygoapi.utils import get_current_utc_datetime
+
+
+def wait_for_status(job_queue, job_id, statuses, timeout=5.0):
+    """Poll a job until it reaches one of the given statuses."""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        job = job_queue.get_job(job_id)
+        if job and job["status"] in statuses:
+            return job
+        time.sleep(0.01)
+    raise AssertionError(f"Job {job_id} did not reach {statuses}")
+
+
+class TestInProcessPriceJobQueue:
+    """Test the in-process job queue."""
+
+    @pytest.fixture
+    def make_queue(self):
+        """Create queues and shut their workers down after the test."""
+        queues = []
+
+        def _make(handler, **kwargs):
+            job_queue = InProcessPriceJobQueue(handler, **kwargs)
+            queues.append(job_queue)
+            return job_queue
+
+        yield _make
+        for job_queue in queues:
+            job_queue.shutdown()
+
+    def test_submit_runs_job_and_stores_result(self, make_queue):
+        """Test a submitted job is run by a worker and its result kept."""
+        job_queue = make_queue(lambda payload: {"success": True, "card_number": payload["card_number"]})
+
+        job_id = job_queue.submit({"card_number": "LOB-001"})
+        job = wait_for_status(job_queue, job_id, {JOB_STATUS_COMPLETED})
+
+        assert job["result"] == {"success": True, "card_number": "LOB-001"}
+        assert job["started_at"] is not None
+        assert job["finished_at"] is not None
+        assert job_queue.get_stats()["completed"] == 1
+
+    def test_job_status_is_queued_then_running(self, make_queue):
+        """Test status moves from queued to running while the handler works."""
+        release = threading.Event()
+        job_queue = make_queue(lambda payload: release.wait(timeout=5) and {"success": True}, workers=1)
+
+        job_id = job_queue.submit({"card_number": "LOB-001"})
+        assert job_queue.get_job(job_id)["status"] in {JOB_STATUS_QUEUED, JOB_STATUS_RUNNING}
+        wait_for_status(job_queue, job_id, {JOB_STATUS_RUNNING})
+
+        release.set()
+        wait_for_status(job_queue, job_id, {JOB_STATUS_COMPLETED})
+
+    def test_failed_job_records_error(self, make_queue):
+        """Test handler exceptions mark the job failed."""
+        def failing_handler(payload):
+            raise RuntimeError("browser crashed")
+
+        job_queue = make_queue(failing_handler)
+
+        job_id = job_queue.submit({"card_number": "LOB-001"})
+        job = wait_for_status(job_queue, job_id, {JOB_STATUS_FAILED})
+
+        assert job["error"] == "browser crashed"
+        assert job_queue.get_stats()["failed"] == 1
+
+    def test_interactive_jobs_run_before_background_jobs(self, make_queue):
+        """Test lower priority values are claimed first."""
+        order = []
+        gate = threading.Event()
+
+        def handler(payload):
+            gate.wait(timeout=5)
+            order.append(payload["card_number"])
+            return {"success": True}
+
+        job_queue = make_queue(handler, workers=1)
+        blocker = job_queue.submit({"card_number": "FIRST"})
+        wait_for_status(job_queue, blocker, {JOB_STATUS_RUNNING})
+
+        background = job_queue.submit({"card_number": "BACKGROUND"}, priority=10)
+        interactive = job_queue.submit({"card_number": "INTERACTIVE"})
+        gate.set()
+        wait_for_status(job_queue, background, {JOB_STATUS_COMPLETED})
+        wait_for_status(job_queue, interactive, {JOB_STATUS_COMPLETED})
+
+        assert order == ["FIRST", "INTERACTIVE", "BACKGROUND"]
+
+    def test_incomplete_backend_fails_at_construction(self):
+        """Test a queue backend missing storage methods can't be instantiated."""
+        class IncompleteQueue(PriceJobQueue):
+            def get_job(self, job_id):
+                return None
+
+        with pytest.raises(TypeError):
+            IncompleteQueue(lambda payload: {})
+
+    def test_unknown_job_returns_none(self, make_queue):
+        """Test unknown job ids return None."""
+        job_queue = make_queue(lambda payload: {})
+        assert job_queue.get_job("missing") is None
+
+    def test_expired_jobs_are_purged(self, make_queue):
+        """Test finished jobs older than the TTL are forgotten."""
+        job_queue = make_queue(lambda payload: {"success": True}, result_ttl_seconds=60)
+
+        job_id = job_queue.submit({"card_number": "LOB-001"})
+        wait_for_status(job_queue, job_id, {JOB_STATUS_COMPLETED})
+        job_queue._jobs[job_id]["finished_at"] = get_current_utc_datetime() - timedelta(seconds=120)
+
+        job_queue.submit({"card_number": "LOB-002"})
+
+        assert job_queue.get_job(job_id) is None
+
+    def test_workers_start_lazily(self, make_queue):
+        """Test no worker threads exist until the first submit."""
+        job_queue = make_queue(lambda payload: {})
+        assert job_queue.get_stats()["workers"] == 0
+
+        job_queue.submit({"card_number": "LOB-001"})
+
+        assert job_queue.get_stats()["workers"] == job_queue.worker_count
+
+
+class TestMongoPriceJobQueue:
+    """Test the MongoDB-backed job queue with a mocked collection."""
+
+    @pytest.fixture
+    def collection(self):
+        return MagicMock()
+
+    def test_indexes_created(self, collection):
+        """Test claim and TTL indexes are created on startup."""
+        MongoPriceJobQueue(lambda payload: {}, collection, result_ttl_seconds=600)
+
+        index_names = [call[1]["name"] for call in collection.create_index.call_args_list]
+        assert "status_priority_created" in index_names
+        ttl_call = collection.create_index.call_args_list[index_names.index("finished_at_ttl")]
+        assert ttl_call[1]["expireAfterSeconds"] == 600
+
+    def test_submit_inserts_queued_document(self, collection):
+        """Test submit inserts a queued job keyed by its id."""
+        job_queue = MongoPriceJobQueue(lambda payload: {}, collection)
+
+        with patch.object(job_queue, "start"):
+            job_id = job_queue.submit({"card_number": "LOB-001"})
+
+        document = collection.insert_one.call_args[0][0]
+        assert document["_id"] == job_id
+        assert document["status"] == JOB_STATUS_QUEUED
+
+    def test_claim_takes_queued_or_abandoned_jobs(self, collection):
+        """Test claiming is atomic, priority-ordered and reclaims expired leases."""
+        collection.find_one_and_update.return_value = {"job_id": "abc", "payload": {}}
+        job_queue = MongoPriceJobQueue(lambda payload: {}, collection)
+
+        job = job_queue._claim()
+
+        assert job["job_id"] == "abc"
+        query, update = collection.find_one_and_update.call_args[0]
+        assert {"status": JOB_STATUS_QUEUED} in query["$or"]
+        assert update["$set"]["status"] == JOB_STATUS_RUNNING
+        assert update["$set"]["worker_id"] == job_queue.worker_id
+        assert collection.find_one_and_update.call_args[1]["sort"][0] == ("priority", 1)
+
+    def test_run_job_records_result_for_owning_worker(self, collection):
+        """Test results are written only while this worker still owns the job."""
+        job_queue = MongoPriceJobQueue(lambda payload: {"success": True}, collection)
+
+        job_queue._run_job({"job_id": "abc", "payload": {}})
+
+        query, update = collection.update_one.call_args[0]
+        assert query == {"_id": "abc", "worker_id": job_queue.worker_id}
+        assert update["$set"]["status"] == JOB_STATUS_COMPLETED
+        assert update["$set"]["result"] == {"success": True}
+
+    def test_get_job_hides_internal_fields(self, collection):
+        """Test lease bookkeeping is not returned to callers."""
+        collection.find_one.return_value = {
+            "_id": "abc", "job_id": "abc", "status": JOB_STATUS_RUNNING,
+            "worker_id": "host-1", "lease_expires_at": get_current_utc_datetime(),
+        }
+        job_queue = MongoPriceJobQueue(lambda payload: {}, collection)
+
+        job = job_queue.get_job("abc")
+
+        assert job == {"job_id": "abc", "status": JOB_STATUS_RUNNING}
+
+
+class TestJobQueueFactory:
+    """Test backend selection and the default handler."""
+
+    def test_memory_backend_by_default(self):
+        """Test the in-process queue is the default."""
+        assert isinstance(create_price_job_queue(backend="memory"), InProcessPriceJobQueue)
+
+    @patch("ygoapi.price_jobs.get_price_jobs_collection", return_value=None)
+    def test_mongodb_backend_falls_back_without_database(self, mock_collection):
+        """Test MongoDB backend falls back to memory when the database is unavailable."""
+        assert isinstance(create_price_job_queue(backend="mongodb"), InProcessPriceJobQueue)
+
+    @patch("ygoapi.price_jobs.get_price_jobs_collection")
+    def test_mongodb_backend(self, mock_collection):
+        """Test MongoDB backend is used when the database is available."""
+        mock_collection.return_value = MagicMock()
+        assert isinstance(create_price_job_queue(backend="mongodb"), MongoPriceJobQueue)
+
+    @patch("ygoapi.price_scraping.price_scraping_service")
+    def test_run_price_job_looks_up_card_name(self, mock_service):
+        """Test the default handler resolves the card name before scraping."""
+        mock_service.lookup_card_name.return_value = "Blue-Eyes White Dragon"
+        mock_service.scrape_card_price.return_value = {"success": True}
+
+        result = run_price_job({"card_number": "LOB-001", "card_rarity": "Ultra Rare", "force_refresh": True})
+
+        assert result == {"success": True}
+        kwargs = mock_service.scrape_card_price.call_args[1]
+        assert kwargs["card_name"] == "Blue-Eyes White Dragon"
+        assert kwargs["force_refresh"] is True
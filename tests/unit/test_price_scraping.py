@@ -5,14 +5,21 @@ Tests PriceScrapingService class and all price scraping functionality with compr
 coverage of success cases, error handling, and edge scenarios.
 """
 
+import asyncio
 import os
-from datetime import datetime, timezone
-from unittest.mock import MagicMock, Mock, patch
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock, Mock, patch
 
 import pytest
 import requests
 
+from ygoapi.config import PRICE_CACHE_EXPIRY_DAYS, PRICE_CACHE_STATS_TTL_SECONDS
 from ygoapi.price_scraping import PriceScrapingService
+from ygoapi.write_behind import WriteBehindBuffer
+
+from tests.fixtures.test_price_scraping_fixtures import create_mock_browser_pool
 
 
 class TestPriceScrapingService:
@@ -93,24 +100,26 @@ class TestPriceScrapingService:
     def test_find_cached_price_data_success(self, mock_get_collection, service):
         """Test successful cached price data retrieval."""
         mock_collection = Mock()
-        mock_collection.find.return_value = [{
+        mock_collection.find_one.return_value = {
             "card_number": "LOB-001",
             "card_name": "Blue-Eyes White Dragon",
             "card_rarity": "ultra rare",
             "tcgplayer_price": 25.99,
             "last_price_updt": datetime.now(timezone.utc)
-        }]
+        }
         mock_get_collection.return_value = mock_collection
 
         result = service.find_cached_price_data("LOB-001", "Blue-Eyes White Dragon", "Ultra Rare")
         assert result is not None
         assert result["tcgplayer_price"] == 25.99
+        query = mock_collection.find_one.call_args[0][0]
+        assert query == {"price_lookup_key": {"$regex": "^LOB\\-001\\|ultra\\ rare\\|"}}
 
     @patch("ygoapi.price_scraping.get_price_cache_collection")
     def test_find_cached_price_data_not_found(self, mock_get_collection, service):
         """Test cached price data when not found."""
         mock_collection = Mock()
-        mock_collection.find.return_value = []
+        mock_collection.find_one.return_value = None
         mock_get_collection.return_value = mock_collection
 
         result = service.find_cached_price_data("LOB-001", "Blue-Eyes White Dragon", "Ultra Rare")
@@ -120,8 +129,9 @@ class TestPriceScrapingService:
     def test_get_cache_stats_success(self, mock_get_collection, service):
         """Test successful cache statistics retrieval."""
         mock_collection = Mock()
-        mock_collection.count_documents.return_value = 150
-        mock_collection.distinct.return_value = ["LOB-001", "SDK-001", "MRD-001"]
+        mock_collection.aggregate.return_value = iter([
+            {"total": [{"count": 150}], "fresh": [{"count": 100}], "unique_cards": [{"count": 3}]}
+        ])
         mock_get_collection.return_value = mock_collection
 
         result = service.get_cache_stats()
@@ -142,7 +152,7 @@ class TestPriceScrapingService:
         with patch.object(service, 'validate_card_rarity', return_value=True), \
              patch.object(service, 'find_cached_price_data', return_value=None), \
              patch.object(service, 'save_price_data', return_value=True), \
-             patch('ygoapi.price_scraping.asyncio.run') as mock_run:
+             patch.object(service, 'scrape_price_from_tcgplayer_basic', new_callable=AsyncMock) as mock_run:
 
             # Mock the async scraping result
             mock_run.return_value = {
@@ -181,9 +191,9 @@ class TestPriceScrapingService:
         """Test card price scraping with request failure."""
         with patch.object(service, 'validate_card_rarity', return_value=True), \
              patch.object(service, 'find_cached_price_data', return_value=None), \
-             patch('ygoapi.price_scraping.asyncio.run') as mock_run:
+             patch.object(service, 'scrape_price_from_tcgplayer_basic', new_callable=AsyncMock) as mock_run:
 
-            # Mock asyncio.run to raise an exception
+            # Mock the browser scrape to raise an exception
             mock_run.side_effect = Exception("Network error")
 
             result = service.scrape_card_price("LOB-001", "Blue-Eyes White Dragon", "Ultra Rare")
@@ -208,7 +218,8 @@ class TestPriceScrapingService:
     def test_save_price_to_cache_success(self, mock_get_collection, service):
         """Test successful price data saving to cache."""
         mock_collection = Mock()
-        mock_collection.replace_one.return_value = Mock(upserted_id="123", modified_count=1)
+        mock_collection.find_one_and_update.return_value = None
+        mock_collection.find_one_and_replace.return_value = None
         mock_get_collection.return_value = mock_collection
 
         price_data = {
@@ -253,12 +264,13 @@ class TestPriceScrapingIntegration:
 
         mock_cache_collection = Mock()
         mock_cache_collection.find.return_value = []  # No cached data
-        mock_cache_collection.replace_one.return_value = Mock(upserted_id="123")
+        mock_cache_collection.find_one_and_update.return_value = None
+        mock_cache_collection.find_one_and_replace.return_value = None
         mock_cache.return_value = mock_cache_collection
 
         service = PriceScrapingService()
         
-        with patch('ygoapi.price_scraping.asyncio.run') as mock_run:
+        with patch.object(service, 'scrape_price_from_tcgplayer_basic', new_callable=AsyncMock) as mock_run:
             mock_run.return_value = {
                 "tcgplayer_price": 25.99,
                 "tcgplayer_market_price": 28.50
@@ -278,7 +290,7 @@ class TestPriceScrapingIntegration:
             "tcgplayer_price": 25.99,
             "last_price_updt": datetime.now(timezone.utc)
         }
-        mock_cache_collection.find.return_value = [cached_data]
+        mock_cache_collection.find_one.return_value = cached_data
         mock_cache.return_value = mock_cache_collection
 
         service = PriceScrapingService()
@@ -300,7 +312,7 @@ class TestPriceScrapingErrorHandling:
         
         with patch.object(service, 'validate_card_rarity', return_value=True), \
              patch.object(service, 'find_cached_price_data', return_value=None), \
-             patch('ygoapi.price_scraping.asyncio.run') as mock_run:
+             patch.object(service, 'scrape_price_from_tcgplayer_basic', new_callable=AsyncMock) as mock_run:
             
             mock_run.side_effect = Exception("timeout")
             
@@ -316,7 +328,7 @@ class TestPriceScrapingErrorHandling:
         
         with patch.object(service, 'validate_card_rarity', return_value=True), \
              patch.object(service, 'find_cached_price_data', return_value=None), \
-             patch('ygoapi.price_scraping.asyncio.run') as mock_run:
+             patch.object(service, 'scrape_price_from_tcgplayer_basic', new_callable=AsyncMock) as mock_run:
             
             mock_run.return_value = {"error": "No price data found"}
             
@@ -331,11 +343,1241 @@ class TestPriceScrapingErrorHandling:
         
         with patch.object(service, 'validate_card_rarity', return_value=True), \
              patch.object(service, 'find_cached_price_data', return_value=None), \
-             patch('ygoapi.price_scraping.asyncio.run') as mock_run:
+             patch.object(service, 'scrape_price_from_tcgplayer_basic', new_callable=AsyncMock) as mock_run:
             
             mock_run.side_effect = Exception("HTTP 404 error")
             
             result = service.scrape_card_price("LOB-001", "Blue-Eyes White Dragon", "Ultra Rare")
             
             assert result["success"] is False
-            assert "error" in result
\ No newline at end of file
+            assert "error" in result
+
+class TestBatchPriceScraping:
+    """Test batch price lookups with bulk cache resolution."""
+
+    @pytest.fixture
+    def service(self):
+        """Create a PriceScrapingService with a mocked cache collection."""
+        service = PriceScrapingService()
+        service._initialized = True
+        service.cache_collection = Mock()
+        service.variants_collection = None
+        return service
+
+    def test_batch_resolves_cache_in_one_query(self, service):
+        """Test fresh hits come from one cache query and only misses are scraped."""
+        service.cache_collection.find.return_value = [
+            {
+                "card_number": "LOB-001",
+                "card_rarity": "Ultra Rare",
+                "tcgplayer_price": 25.99,
+                "last_price_updt": datetime.now(timezone.utc),
+            }
+        ]
+        items = [
+            {"card_number": "LOB-001", "card_name": "Blue-Eyes White Dragon", "card_rarity": "Ultra Rare"},
+            {"card_number": "LOB-005", "card_name": "Dark Magician", "card_rarity": "Ultra Rare"},
+        ]
+
+        with patch.object(service, 'save_price_data', return_value=True), \
+             patch.object(service, 'scrape_price_from_tcgplayer_basic', new_callable=AsyncMock) as mock_scrape:
+            mock_scrape.return_value = {"tcgplayer_price": 45.00, "tcgplayer_market_price": 50.00}
+
+            results = service.scrape_card_prices_batch(items)
+
+        service.cache_collection.find.assert_called_once()
+        assert len(service.cache_collection.find.call_args[0][0]["$or"]) == 2
+        assert results[0]["cached"] is True
+        assert results[0]["tcgplayer_price"] == 25.99
+        assert results[1]["cached"] is False
+        assert results[1]["tcgplayer_price"] == 45.00
+        mock_scrape.assert_awaited_once()
+
+    def test_batch_force_refresh_skips_cache(self, service):
+        """Test force_refresh scrapes every item without a cache query."""
+        items = [{"card_number": f"LOB-00{i}", "card_name": "Card", "card_rarity": "Common"} for i in range(3)]
+
+        with patch.object(service, 'save_price_data', return_value=True), \
+             patch.object(service, 'scrape_price_from_tcgplayer_basic', new_callable=AsyncMock) as mock_scrape:
+            mock_scrape.return_value = {"tcgplayer_price": 1.00}
+
+            results = service.scrape_card_prices_batch(items, force_refresh=True)
+
+        service.cache_collection.find.assert_not_called()
+        assert mock_scrape.await_count == 3
+        assert all(result["success"] for result in results)
+
+    def test_batch_respects_concurrency_cap(self, service):
+        """Test no more than max_concurrency scrapes run at once."""
+        service.cache_collection.find.return_value = []
+        items = [{"card_number": f"LOB-0{i:02d}", "card_name": "Card", "card_rarity": "Common"} for i in range(6)]
+        in_flight = {"current": 0, "peak": 0}
+
+        async def slow_scrape(*args, **kwargs):
+            in_flight["current"] += 1
+            in_flight["peak"] = max(in_flight["peak"], in_flight["current"])
+            await asyncio.sleep(0.02)
+            in_flight["current"] -= 1
+            return {"tcgplayer_price": 1.00}
+
+        with patch.object(service, 'save_price_data', return_value=True), \
+             patch.object(service, 'scrape_price_from_tcgplayer_basic', side_effect=slow_scrape):
+            results = service.scrape_card_prices_batch(items, max_concurrency=2)
+
+        assert len(results) == 6
+        assert all(result["success"] for result in results)
+        assert in_flight["peak"] <= 2
+
+    def test_batch_looks_up_missing_card_names(self, service):
+        """Test card names are resolved for scraped items that lack one."""
+        service.cache_collection.find.return_value = []
+
+        with patch.object(service, 'lookup_card_name', return_value="Dark Magician") as mock_lookup, \
+             patch.object(service, 'save_price_data', return_value=True), \
+             patch.object(service, 'scrape_price_from_tcgplayer_basic', new_callable=AsyncMock) as mock_scrape:
+            mock_scrape.return_value = {"tcgplayer_price": 1.00}
+
+            results = service.scrape_card_prices_batch([{"card_number": "LOB-005", "card_rarity": "Ultra Rare"}])
+
+        mock_lookup.assert_called_once_with("LOB-005")
+        assert results[0]["card_name"] == "Dark Magician"
+
+    def test_bulk_cache_lookup_applies_art_variant_rules(self, service):
+        """Test documents are matched back to items with the single-lookup rules."""
+        now = datetime.now(timezone.utc)
+        service.cache_collection.find.return_value = [
+            {"card_number": "LOB-005", "card_rarity": "Secret Rare", "art_variant": "7th", "last_price_updt": now},
+            {"card_number": "LOB-005", "card_rarity": "Secret Rare", "art_variant": "1st", "last_price_updt": now},
+            {"card_number": "LOB-001", "card_rarity": "ULTRA RARE", "last_price_updt": now},
+        ]
+        items = [
+            {"card_number": "LOB-005", "card_rarity": "Secret Rare", "art_variant": "7"},
+            {"card_number": "LOB-005", "card_rarity": "Secret Rare", "art_variant": "3"},
+            {"card_number": "LOB-001", "card_rarity": "Ultra Rare"},
+        ]
+
+        entries = service._find_cached_price_data_bulk(items)
+
+        assert entries[0]["data"]["art_variant"] == "7th"
+        assert entries[1] is None
+        assert entries[2]["is_fresh"] is True
+
+
+class TestScrapeCoalescing:
+    """Test coalescing of concurrent scrapes for the same card."""
+
+    @pytest.fixture
+    def service(self):
+        """Create a PriceScrapingService with the database disabled."""
+        service = PriceScrapingService()
+        service._initialized = True
+        service.cache_collection = None
+        service.variants_collection = None
+        return service
+
+    def test_scrape_key_is_normalized(self, service):
+        """Test equivalent card identities produce the same key."""
+        assert service._get_scrape_key("lob-001 ", "ULTRA  RARE", "7th") == \
+            service._get_scrape_key("LOB-001", "ultra rare", "seventh")
+        assert service._get_scrape_key("LOB-001", "Ultra Rare", None) != \
+            service._get_scrape_key("LOB-001", "Secret Rare", None)
+
+    def test_concurrent_identical_requests_share_one_scrape(self, service):
+        """Test identical concurrent cache misses trigger a single scrape and save."""
+        scrape_calls = []
+
+        async def slow_scrape(*args, **kwargs):
+            scrape_calls.append(args)
+            await asyncio.sleep(0.2)
+            return {"tcgplayer_price": 25.99}
+
+        with patch.object(service, 'save_price_data', return_value=True) as mock_save, \
+             patch.object(service, 'scrape_price_from_tcgplayer_basic', side_effect=slow_scrape):
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                futures = [
+                    executor.submit(service.scrape_card_price, "LOB-001", "Blue-Eyes White Dragon", "Ultra Rare")
+                    for _ in range(4)
+                ]
+                results = [future.result(timeout=10) for future in futures]
+
+        assert all(result["tcgplayer_price"] == 25.99 for result in results)
+        assert len(scrape_calls) == 1
+        mock_save.assert_called_once()
+
+        stats = service.get_scraping_stats()["coalescing"]
+        assert stats["executions"] == 1
+        assert stats["deduplicated"] == 3
+
+
+class TestStaleWhileRevalidate:
+    """Test serving stale prices while refreshing them in the background."""
+
+    @pytest.fixture
+    def service(self):
+        """Create a PriceScrapingService with a mocked cache collection."""
+        service = PriceScrapingService()
+        service._initialized = True
+        service.cache_collection = Mock()
+        service.variants_collection = None
+        return service
+
+    def _cached_document(self, age):
+        return {
+            "card_number": "LOB-001",
+            "card_name": "Blue-Eyes White Dragon",
+            "card_rarity": "Ultra Rare",
+            "tcgplayer_price": 20.00,
+            "last_price_updt": datetime.now(timezone.utc) - age,
+        }
+
+    def test_stale_within_window_served_immediately(self, service):
+        """Test stale data inside the window is returned and refreshed in the background."""
+        service.cache_collection.find_one.return_value = self._cached_document(timedelta(days=8))
+        refreshed = threading.Event()
+
+        def fake_scrape(*args, **kwargs):
+            refreshed.set()
+            return {"success": True}
+
+        with patch.object(service, '_coalesced_validate_and_scrape', side_effect=fake_scrape) as mock_scrape:
+            result = service.scrape_card_price("LOB-001", "Blue-Eyes White Dragon", "Ultra Rare")
+            assert refreshed.wait(timeout=5)
+
+        assert result["success"] is True
+        assert result["cached"] is True
+        assert result["stale"] is True
+        assert result["revalidating"] is True
+        assert result["cache_age_hours"] >= 24 * 8 - 1
+        assert result["tcgplayer_price"] == 20.00
+        # Background refresh skips validation like any stale hit
+        assert mock_scrape.call_args[0][4] == "stale_hit"
+
+    def test_revalidation_is_deduplicated(self, service):
+        """Test repeated stale reads schedule only one background refresh."""
+        service.cache_collection.find_one.return_value = self._cached_document(timedelta(days=8))
+        release = threading.Event()
+
+        def slow_scrape(*args, **kwargs):
+            release.wait(timeout=5)
+            return {"success": True}
+
+        with patch.object(service, '_coalesced_validate_and_scrape', side_effect=slow_scrape) as mock_scrape:
+            for _ in range(3):
+                service.scrape_card_price("LOB-001", "Blue-Eyes White Dragon", "Ultra Rare")
+            release.set()
+            service._revalidation_executor.submit(lambda: None).result(timeout=5)
+
+        assert mock_scrape.call_count == 1
+        stats = service.get_revalidation_stats()
+        assert stats["stale_served"] == 3
+        assert stats["scheduled"] == 1
+        assert stats["deduplicated"] == 2
+        assert stats["completed"] == 1
+        assert stats["pending"] == 0
+
+    def test_past_hard_expiry_scrapes_synchronously(self, service):
+        """Test data older than the hard expiry blocks on a fresh scrape."""
+        service.cache_collection.find_one.return_value = self._cached_document(timedelta(days=30))
+
+        with patch.object(service, 'save_price_data', return_value=True), \
+             patch.object(service, 'scrape_price_from_tcgplayer_basic', new_callable=AsyncMock) as mock_scrape:
+            mock_scrape.return_value = {"tcgplayer_price": 25.99}
+
+            result = service.scrape_card_price("LOB-001", "Blue-Eyes White Dragon", "Ultra Rare")
+
+        assert result["cached"] is False
+        assert result["tcgplayer_price"] == 25.99
+        assert "stale" not in result
+
+    @patch("ygoapi.price_scraping.PRICE_CACHE_SWR_WINDOW_DAYS", 0)
+    def test_window_disabled(self, service):
+        """Test a zero window disables stale serving."""
+        info = service._get_staleness_info("LOB-001", [self._cached_document(timedelta(days=8))])
+
+        assert info["is_fresh"] is False
+        assert info["within_revalidate_window"] is False
+
+
+class TestProductUrlMemo:
+    """Test reusing resolved TCGPlayer product pages on refresh."""
+
+    PRODUCT_URL = "https://www.tcgplayer.com/product/12345/yugioh-legend-of-blue-eyes-white-dragon-blue-eyes-white-dragon"
+
+    @pytest.fixture
+    def service(self):
+        """Create a PriceScrapingService with a mocked cache collection."""
+        service = PriceScrapingService()
+        service._initialized = True
+        service.cache_collection = Mock()
+        service.cache_collection.find_one.return_value = None
+        service.variants_collection = None
+        return service
+
+    def test_memo_keyed_by_normalized_identity(self, service):
+        """Test remembered URLs are found regardless of case and rarity spelling."""
+        service._remember_product_url("lob-001", "ultra rare", None, self.PRODUCT_URL)
+
+        assert service._get_known_product_url("LOB-001", "Ultra Rare", None) == self.PRODUCT_URL
+        assert service._get_known_product_url("LOB-001", "Ultra Rare", "7") is None
+        stats = service.get_product_url_memo_stats()
+        assert stats["memo_hits"] == 1
+        assert stats["misses"] == 1
+
+    def test_memo_falls_back_to_cached_price_document(self, service):
+        """Test the URL saved with an earlier price is used and memoized."""
+        service.cache_collection.find_one.return_value = {"tcgplayer_url": self.PRODUCT_URL}
+
+        assert service._get_known_product_url("LOB-001", "Ultra Rare", None) == self.PRODUCT_URL
+        assert service._get_known_product_url("LOB-001", "Ultra Rare", None) == self.PRODUCT_URL
+
+        service.cache_collection.find_one.assert_called_once()
+        query = service.cache_collection.find_one.call_args[0][0]
+        assert query["price_lookup_key"] == "LOB-001|ultra rare|"
+        stats = service.get_product_url_memo_stats()
+        assert stats["db_hits"] == 1
+        assert stats["memo_hits"] == 1
+
+    def test_search_urls_are_not_remembered(self, service):
+        """Test only product page URLs are stored."""
+        service._remember_product_url("LOB-001", "Ultra Rare", None, "https://www.tcgplayer.com/search/yugioh/product?q=x")
+
+        assert service.product_url_memo.size() == 0
+
+    def test_refresh_passes_known_url_and_remembers_result(self, service):
+        """Test a scrape receives the known URL and stores where it ended up."""
+        service._remember_product_url("LOB-001", "Ultra Rare", None, self.PRODUCT_URL)
+
+        with patch.object(service, 'save_price_data', return_value=True), \
+             patch.object(service, 'scrape_price_from_tcgplayer_basic', new_callable=AsyncMock) as mock_scrape:
+            mock_scrape.return_value = {
+                "tcgplayer_price": 25.99,
+                "tcgplayer_url": self.PRODUCT_URL,
+                "product_url_reused": True,
+            }
+            service._validate_and_scrape("LOB-001", "Blue-Eyes White Dragon", "Ultra Rare", None, "stale_hit")
+
+        assert mock_scrape.call_args.kwargs["product_url"] == self.PRODUCT_URL
+        assert service._get_known_product_url("LOB-001", "Ultra Rare", None) == self.PRODUCT_URL
+
+    def test_failed_refresh_forgets_mismatched_url(self, service):
+        """Test a known URL is dropped when the page no longer matched and search failed."""
+        service._remember_product_url("LOB-001", "Ultra Rare", None, self.PRODUCT_URL)
+
+        with patch.object(service, 'scrape_price_from_tcgplayer_basic', new_callable=AsyncMock) as mock_scrape:
+            mock_scrape.return_value = {"error": "No suitable variant found", "product_url_reused": False}
+            service._validate_and_scrape("LOB-001", "Blue-Eyes White Dragon", "Ultra Rare", None, "stale_hit")
+
+        assert service.product_url_memo.size() == 0
+
+    @pytest.mark.asyncio
+    async def test_known_product_page_skips_search(self, service):
+        """Test a matching known page is read without visiting search results."""
+        mock_page = AsyncMock()
+        mock_page.url = self.PRODUCT_URL
+        mock_page.evaluate.side_effect = [True, {"tcg_price": 25.99, "tcg_market_price": 28.50}]
+        service.browser_pool = create_mock_browser_pool(mock_page)
+
+        with patch.object(service, 'select_best_tcgplayer_variant', new_callable=AsyncMock) as mock_select:
+            result = await service.scrape_price_from_tcgplayer_basic(
+                "Blue-Eyes White Dragon", "Ultra Rare", None, "LOB-001", product_url=self.PRODUCT_URL
+            )
+
+        mock_page.goto.assert_awaited_once()
+        assert mock_page.goto.await_args[0][0] == self.PRODUCT_URL
+        mock_select.assert_not_awaited()
+        assert result["product_url_reused"] is True
+        assert result["tcgplayer_price"] == 25.99
+        assert service.get_product_url_memo_stats()["reused"] == 1
+
+    @pytest.mark.asyncio
+    async def test_mismatched_product_page_falls_back_to_search(self, service):
+        """Test search runs when the known page no longer shows the card."""
+        mock_page = AsyncMock()
+        mock_page.url = self.PRODUCT_URL
+        mock_page.evaluate.side_effect = [False, 3, True, {"tcg_price": 30.00, "tcg_market_price": 31.00}]
+        service.browser_pool = create_mock_browser_pool(mock_page)
+
+        result = await service.scrape_price_from_tcgplayer_basic(
+            "Blue-Eyes White Dragon", "Ultra Rare", None, "LOB-001", product_url=self.PRODUCT_URL
+        )
+
+        assert mock_page.goto.await_count == 2
+        assert "/search/" in mock_page.goto.await_args_list[1][0][0]
+        assert result["product_url_reused"] is False
+        assert result["tcgplayer_price"] == 30.00
+        assert service.get_product_url_memo_stats()["mismatches"] == 1
+
+
+class TestProductIdRefresh:
+    """Test TCGPlayer product id extraction and refreshes by product id."""
+
+    @pytest.fixture
+    def service(self):
+        """Create a PriceScrapingService with a mocked cache collection."""
+        service = PriceScrapingService()
+        service._initialized = True
+        service.cache_collection = Mock()
+        service.cache_collection.find_one_and_update.return_value = None
+        service.cache_collection.find_one_and_replace.return_value = None
+        service.variants_collection = None
+        return service
+
+    @pytest.mark.asyncio
+    async def test_scrape_returns_product_id(self, service):
+        """Test the product id is parsed from the final product URL."""
+        mock_page = AsyncMock()
+        mock_page.url = "https://www.tcgplayer.com/product/626754/yugioh-black-metal-dragon"
+        mock_page.evaluate.side_effect = [5, True, {"tcg_price": 1.0, "tcg_market_price": 2.0}]
+        service.browser_pool = create_mock_browser_pool(mock_page)
+
+        result = await service.scrape_price_from_tcgplayer_basic("Black Metal Dragon", "Secret Rare", None, "RA04-EN016")
+
+        assert result["tcgplayer_product_id"] == "626754"
+
+    @pytest.mark.asyncio
+    async def test_product_id_mode_opens_product_page(self, service):
+        """Test scraping by product id navigates straight to the product page."""
+        mock_page = AsyncMock()
+        mock_page.url = "https://www.tcgplayer.com/product/626754/yugioh-black-metal-dragon"
+        mock_page.evaluate.side_effect = [True, {"tcg_price": 1.0, "tcg_market_price": 2.0}]
+        service.browser_pool = create_mock_browser_pool(mock_page)
+
+        result = await service.scrape_price_from_tcgplayer_basic(
+            "Black Metal Dragon", "Secret Rare", None, "RA04-EN016", product_id="626754"
+        )
+
+        mock_page.goto.assert_awaited_once()
+        assert mock_page.goto.await_args[0][0] == "https://www.tcgplayer.com/product/626754"
+        assert result["product_url_reused"] is True
+
+    def test_save_derives_product_id_from_url(self, service):
+        """Test saved prices carry the product id even if the scrape didn't set it."""
+        service.save_price_data({
+            "card_number": "RA04-EN016",
+            "card_name": "Black Metal Dragon",
+            "card_rarity": "Secret Rare",
+            "tcgplayer_url": "https://www.tcgplayer.com/product/626754/yugioh-black-metal-dragon",
+        })
+
+        document = service.cache_collection.find_one_and_replace.call_args[0][1]
+        assert document["tcgplayer_product_id"] == "626754"
+
+    def test_refresh_groups_documents_by_product_id(self, service):
+        """Test each product is scraped once and saved to every matching document."""
+        service.cache_collection.find.return_value = [
+            {"card_number": "RA04-EN016", "card_name": "Black Metal Dragon", "card_rarity": "Secret Rare",
+             "art_variant": None, "tcgplayer_product_id": "626754"},
+            {"card_number": "RA04-EN016", "card_name": "Black Metal Dragon", "card_rarity": "Secret Rare",
+             "art_variant": "", "tcgplayer_product_id": "626754"},
+            {"card_number": "LOB-001", "card_name": "Blue-Eyes White Dragon", "card_rarity": "Ultra Rare",
+             "art_variant": None, "tcgplayer_product_id": "12345"},
+        ]
+
+        with patch.object(service, 'save_price_data', return_value=True) as mock_save, \
+             patch.object(service, 'scrape_price_from_tcgplayer_basic', new_callable=AsyncMock) as mock_scrape:
+            mock_scrape.return_value = {
+                "tcgplayer_price": 10.0,
+                "tcgplayer_url": "https://www.tcgplayer.com/product/626754/x",
+                "tcgplayer_product_id": "626754",
+                "product_url_reused": True,
+            }
+            results = service.refresh_prices_by_product_id(["626754", "12345"])
+
+        assert mock_scrape.await_count == 2
+        assert sorted(call.kwargs["product_id"] for call in mock_scrape.await_args_list) == ["12345", "626754"]
+        assert mock_save.call_count == 3
+        by_id = {result["tcgplayer_product_id"]: result for result in results}
+        assert by_id["626754"]["documents"] == 2
+        query = service.cache_collection.find.call_args[0][0]
+        assert query == {"tcgplayer_product_id": {"$in": ["626754", "12345"]}}
+
+    def test_refresh_without_ids_selects_stale_products(self, service):
+        """Test the default refresh targets expired prices with a known product id."""
+        service.cache_collection.find.return_value = []
+
+        assert service.refresh_prices_by_product_id(limit=10) == []
+
+        query = service.cache_collection.find.call_args[0][0]
+        assert "$lt" in query["last_price_updt"]
+        assert service.cache_collection.find.call_args[1]["limit"] == 10
+
+    def test_refresh_failure_reported_per_product(self, service):
+        """Test a failed product scrape is reported without saving."""
+        service.cache_collection.find.return_value = [
+            {"card_number": "LOB-001", "card_name": "Blue-Eyes White Dragon", "card_rarity": "Ultra Rare",
+             "tcgplayer_product_id": "12345"},
+        ]
+
+        with patch.object(service, 'save_price_data') as mock_save, \
+             patch.object(service, 'scrape_price_from_tcgplayer_basic', new_callable=AsyncMock) as mock_scrape:
+            mock_scrape.return_value = {"error": "No results found on TCGPlayer"}
+            results = service.refresh_prices_by_product_id(["12345"])
+
+        assert results[0]["success"] is False
+        mock_save.assert_not_called()
+
+
+class TestPriceLookupKey:
+    """Test the normalized price_lookup_key used for indexed cache lookups."""
+
+    @pytest.fixture
+    def service(self):
+        """Create a PriceScrapingService with a mocked cache collection."""
+        service = PriceScrapingService()
+        service._initialized = True
+        service.cache_collection = Mock()
+        service.cache_collection.find_one_and_update.return_value = None
+        service.cache_collection.find_one_and_replace.return_value = None
+        service.cache_collection.find_one.return_value = None
+        service.variants_collection = None
+        return service
+
+    def test_lookup_key_is_canonical(self, service):
+        """Test card number, rarity and art variant spellings share one key."""
+        assert service._get_price_lookup_key("lob-005 ", "Secret  Rare", "7th") == "LOB-005|secret rare|7"
+        assert service._get_price_lookup_key("LOB-005", "secret rare", "seventh") == "LOB-005|secret rare|7"
+        assert service._get_price_lookup_key("LOB-001", "Ultra Rare", None) == "LOB-001|ultra rare|"
+
+    def test_save_writes_lookup_key(self, service):
+        """Test saved prices carry the lookup key for the requested art variant."""
+        service.save_price_data(
+            {"card_number": "LOB-005", "card_name": "Dark Magician", "card_rarity": "Secret Rare"},
+            requested_art_variant="7th"
+        )
+
+        document = service.cache_collection.find_one_and_replace.call_args[0][1]
+        assert document["price_lookup_key"] == "LOB-005|secret rare|7"
+
+    def test_legacy_query_used_until_backfilled(self, service):
+        """Test documents without a lookup key are still found during the migration."""
+        legacy_document = {
+            "card_number": "LOB-001",
+            "card_rarity": "Ultra Rare",
+            "last_price_updt": datetime.now(timezone.utc),
+        }
+        service._legacy_lookup_fallback = True
+        service.cache_collection.find_one.side_effect = [None, legacy_document]
+
+        result = service.find_cached_price_data("LOB-001", "Blue-Eyes White Dragon", "Ultra Rare")
+
+        assert result is legacy_document
+        legacy_query = service.cache_collection.find_one.call_args_list[1][0][0]
+        assert legacy_query["card_rarity"]["$options"] == "i"
+
+    def test_no_legacy_query_once_backfilled(self, service):
+        """Test a miss costs exactly one indexed query after the backfill."""
+        service.find_cached_price_data("LOB-001", "Blue-Eyes White Dragon", "Ultra Rare")
+
+        service.cache_collection.find_one.assert_called_once()
+
+    def test_backfill_sets_keys_in_unordered_batches(self, service):
+        """Test the backfill writes a key to every document missing one."""
+        service._legacy_lookup_fallback = True
+        service.cache_collection.find.return_value = [
+            {"_id": 1, "card_number": "LOB-001", "card_rarity": "Ultra Rare", "art_variant": None},
+            {"_id": 2, "card_number": "LOB-005", "card_rarity": "Secret Rare", "art_variant": "7th"},
+            {"_id": 3, "card_number": "LOB-006", "card_rarity": "Common"},
+        ]
+        service.cache_collection.bulk_write.side_effect = lambda operations, ordered: Mock(
+            modified_count=len(operations)
+        )
+
+        stats = service.backfill_price_lookup_keys(batch_size=2)
+
+        assert stats["scanned"] == 3
+        assert stats["updated"] == 3
+        assert service.cache_collection.bulk_write.call_count == 2
+        assert service.cache_collection.bulk_write.call_args[1]["ordered"] is False
+        first_batch = service.cache_collection.bulk_write.call_args_list[0][0][0]
+        assert first_batch[1]._doc == {"$set": {"price_lookup_key": "LOB-005|secret rare|7"}}
+        assert service._legacy_lookup_fallback is False
+
+    def test_bulk_lookup_matches_on_lookup_key(self, service):
+        """Test batch lookups match keyed documents regardless of stored spelling."""
+        service.cache_collection.find.return_value = [
+            {
+                "card_number": "lob-001",
+                "card_rarity": "ULTRA RARE",
+                "price_lookup_key": "LOB-001|ultra rare|",
+                "tcgplayer_price": 25.99,
+                "last_price_updt": datetime.now(timezone.utc),
+            }
+        ]
+
+        entries = service._find_cached_price_data_bulk([{"card_number": "LOB-001", "card_rarity": "Ultra Rare"}])
+
+        assert entries[0]["data"]["tcgplayer_price"] == 25.99
+
+
+class TestPriceL1Cache:
+    """Test the in-process L1 cache in front of the price cache collection."""
+
+    @pytest.fixture
+    def service(self):
+        """Create a PriceScrapingService with a mocked cache collection."""
+        service = PriceScrapingService()
+        service._initialized = True
+        service.cache_collection = Mock()
+        service.cache_collection.find_one_and_update.return_value = None
+        service.cache_collection.find_one_and_replace.return_value = None
+        service.variants_collection = None
+        return service
+
+    def _document(self, age=timedelta(0)):
+        return {
+            "card_number": "LOB-001",
+            "card_rarity": "Ultra Rare",
+            "price_lookup_key": "LOB-001|ultra rare|",
+            "tcgplayer_price": 25.99,
+            "last_price_updt": datetime.now(timezone.utc) - age,
+        }
+
+    def test_repeated_reads_served_from_l1(self, service):
+        """Test a fresh document is read from MongoDB once and then from memory."""
+        service.cache_collection.find_one.return_value = self._document()
+
+        first = service.find_cached_price_data("LOB-001", "Blue-Eyes White Dragon", "Ultra Rare")
+        second = service.find_cached_price_data("lob-001", "Blue-Eyes White Dragon", "ultra rare")
+
+        assert first is second
+        assert service.cache_collection.find_one.call_count == 1
+        stats = service.price_l1_cache.get_stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+
+    def test_ttl_bounded_by_remaining_freshness(self, service):
+        """Test an entry never outlives the document's freshness."""
+        almost_stale = timedelta(days=PRICE_CACHE_EXPIRY_DAYS) - timedelta(seconds=30)
+        with patch.object(service.price_l1_cache, "set") as mock_set:
+            service._remember_l1_document("LOB-001|ultra rare|", self._document(age=almost_stale))
+
+        assert 0 < mock_set.call_args[1]["ttl"] <= 30
+
+    def test_stale_documents_not_cached(self, service):
+        """Test stale documents always go back to MongoDB."""
+        service.cache_collection.find_one.return_value = self._document(age=timedelta(days=10))
+
+        service._find_cached_price_data_with_staleness_info("LOB-001", "", "Ultra Rare")
+        service._find_cached_price_data_with_staleness_info("LOB-001", "", "Ultra Rare")
+
+        assert service.cache_collection.find_one.call_count == 2
+        assert service.price_l1_cache.size() == 0
+
+    def test_save_invalidates_all_art_variants(self, service):
+        """Test saving a price drops L1 entries for the card and rarity."""
+        service.price_l1_cache.set("LOB-001|ultra rare|", self._document())
+        service.price_l1_cache.set("LOB-001|ultra rare|1", self._document())
+        service.price_l1_cache.set("LOB-001|secret rare|", self._document())
+
+        service.save_price_data({"card_number": "LOB-001", "card_name": "Blue-Eyes", "card_rarity": "Ultra Rare"})
+
+        assert service.price_l1_cache.get("LOB-001|ultra rare|") is None
+        assert service.price_l1_cache.get("LOB-001|ultra rare|1") is None
+        assert service.price_l1_cache.get("LOB-001|secret rare|") is not None
+
+    def test_bulk_lookup_queries_only_l1_misses(self, service):
+        """Test batch lookups only send uncached items to MongoDB."""
+        service.price_l1_cache.set("LOB-001|ultra rare|", self._document())
+        service.cache_collection.find.return_value = []
+
+        entries = service._find_cached_price_data_bulk([
+            {"card_number": "LOB-001", "card_rarity": "Ultra Rare"},
+            {"card_number": "LOB-002", "card_rarity": "Ultra Rare"},
+        ])
+
+        assert entries[0]["is_fresh"] is True
+        assert entries[1] is None
+        queries = service.cache_collection.find.call_args[0][0]["$or"]
+        assert len(queries) == 1
+
+    def test_cache_stats_include_l1(self, service):
+        """Test /cards/price/cache-stats exposes L1 counters."""
+        service.cache_collection.aggregate.return_value = iter([
+            {"total": [{"count": 1}], "fresh": [{"count": 1}], "unique_cards": [{"count": 1}]}
+        ])
+
+        stats = service.get_cache_stats()
+
+        assert set(["hits", "misses", "size"]) <= set(stats["l1_cache"])
+
+
+class TestNegativeCache:
+    """Test remembering cards that can't be priced."""
+
+    @pytest.fixture
+    def service(self):
+        """Create a PriceScrapingService with mocked cache and negative cache collections."""
+        service = PriceScrapingService()
+        service._initialized = True
+        service.cache_collection = Mock()
+        service.cache_collection.find_one.return_value = None
+        service.variants_collection = None
+        service.negative_cache_collection = Mock()
+        service.negative_cache_collection.find_one.return_value = None
+        return service
+
+    def _not_found(self):
+        return {"tcgplayer_price": None, "tcgplayer_url": None, "error": "No results found on TCGPlayer"}
+
+    def test_not_found_scrape_is_remembered(self, service):
+        """Test a card TCGPlayer doesn't list is not scraped again on retry."""
+        with patch.object(service, "validate_card_rarity", return_value=True) as mock_validate, \
+             patch.object(service, "scrape_price_from_tcgplayer_basic", new_callable=AsyncMock) as mock_run:
+            mock_run.return_value = self._not_found()
+            first = service.scrape_card_price("LOB-999", "Missing Card", "Ultra Rare")
+            second = service.scrape_card_price("lob-999", "Missing Card", "ultra rare")
+
+        assert first["success"] is False
+        assert second["success"] is False
+        assert second["negative_cached"] is True
+        assert second["error"] == "No results found on TCGPlayer"
+        assert mock_run.call_count == 1
+        assert mock_validate.call_count == 1
+
+        key, document = service.negative_cache_collection.replace_one.call_args[0]
+        assert key == {"_id": "LOB-999|ultra rare|"}
+        assert document["reason"] == "not_found"
+        assert document["expires_at"] > document["created_at"]
+
+    def test_invalid_rarity_is_remembered(self, service):
+        """Test a rejected rarity is answered from the negative cache."""
+        with patch.object(service, "validate_card_rarity", return_value=False) as mock_validate:
+            service.scrape_card_price("LOB-001", "Blue-Eyes White Dragon", "Rainbow Rare")
+            result = service.scrape_card_price("LOB-001", "Blue-Eyes White Dragon", "Rainbow Rare")
+
+        assert result["negative_cached"] is True
+        assert "Invalid rarity" in result["error"]
+        assert mock_validate.call_count == 1
+
+    def test_transient_errors_not_remembered(self, service):
+        """Test timeouts and other failures are retried normally."""
+        with patch.object(service, "validate_card_rarity", return_value=True), \
+             patch.object(service, "scrape_price_from_tcgplayer_basic", new_callable=AsyncMock) as mock_run:
+            mock_run.return_value = {"error": "Timeout 60000ms exceeded"}
+            service.scrape_card_price("LOB-001", "Blue-Eyes White Dragon", "Ultra Rare")
+
+        assert service.negative_cache.size() == 0
+        service.negative_cache_collection.replace_one.assert_not_called()
+
+    def test_force_refresh_bypasses_and_clears(self, service):
+        """Test force_refresh scrapes anyway and forgets the entry on success."""
+        service._remember_negative_result("LOB-001", "Ultra Rare", None, "not_found", "No results found on TCGPlayer")
+        price_data = {
+            "tcgplayer_price": 25.99,
+            "tcgplayer_url": "https://www.tcgplayer.com/product/12345",
+        }
+
+        with patch.object(service, "validate_card_rarity", return_value=True), \
+             patch.object(service, "save_price_data", return_value=True), \
+             patch.object(service, "scrape_price_from_tcgplayer_basic", new_callable=AsyncMock) as mock_run:
+            mock_run.return_value = price_data
+            result = service.scrape_card_price("LOB-001", "Blue-Eyes White Dragon", "Ultra Rare", force_refresh=True)
+
+        assert result["success"] is True
+        mock_run.assert_awaited_once()
+        assert service.negative_cache.get("LOB-001|ultra rare|") is None
+        service.negative_cache_collection.delete_one.assert_called_once_with({"_id": "LOB-001|ultra rare|"})
+
+    def test_entry_loaded_from_mongodb_is_mirrored(self, service):
+        """Test entries written by another instance are found and mirrored in memory."""
+        expires_at = datetime.now(timezone.utc) + timedelta(minutes=30)
+        service.negative_cache_collection.find_one.return_value = {
+            "_id": "LOB-999|ultra rare|",
+            "reason": "not_found",
+            "error": "No results found on TCGPlayer",
+            "expires_at": expires_at,
+        }
+
+        first = service._find_negative_result("LOB-999", "Ultra Rare", None)
+        second = service._find_negative_result("LOB-999", "Ultra Rare", None)
+
+        assert first["expires_at"] == expires_at
+        assert second == first
+        service.negative_cache_collection.find_one.assert_called_once()
+        stats = service.get_negative_cache_stats()
+        assert stats["db_hits"] == 1
+        assert stats["memory_hits"] == 1
+
+
+class TestPriceHistory:
+    """Test appending scraped prices to the history collection."""
+
+    @pytest.fixture
+    def service(self):
+        """Create a PriceScrapingService with mocked cache and history collections."""
+        service = PriceScrapingService()
+        service._initialized = True
+        service.cache_collection = Mock()
+        service.cache_collection.find_one_and_update.return_value = None
+        service.cache_collection.find_one_and_replace.return_value = None
+        service.variants_collection = None
+        service.history_collection = Mock()
+        return service
+
+    def test_save_appends_history_snapshot(self, service):
+        """Test every saved price is also recorded in the history collection."""
+        service.save_price_data(
+            {
+                "card_number": "LOB-001",
+                "card_name": "Blue-Eyes White Dragon",
+                "card_rarity": "Ultra Rare",
+                "tcgplayer_price": 25.99,
+                "tcgplayer_market_price": 24.5,
+                "tcgplayer_url": "https://www.tcgplayer.com/product/12345",
+            }
+        )
+
+        saved = service.cache_collection.find_one_and_replace.call_args[0][1]
+        snapshot = service.history_collection.insert_one.call_args[0][0]
+        assert snapshot["recorded_at"] == saved["last_price_updt"]
+        assert snapshot["card"]["price_lookup_key"] == "LOB-001|ultra rare|"
+        assert snapshot["card"]["tcgplayer_product_id"] == "12345"
+        assert snapshot["tcgplayer_price"] == 25.99
+        assert snapshot["tcgplayer_market_price"] == 24.5
+
+    def test_history_failure_does_not_fail_save(self, service):
+        """Test a history write error doesn't affect the cache write."""
+        service.history_collection.insert_one.side_effect = Exception("write failed")
+
+        assert service.save_price_data({"card_number": "LOB-001", "card_name": "Blue-Eyes", "card_rarity": "Ultra Rare"})
+
+    def test_history_downsampled_per_day(self, service):
+        """Test the aggregation filters the range and groups by day server-side."""
+        service.history_collection.aggregate.return_value = [
+            {"_id": "2024-01-01", "min_price": 20.0, "max_price": 25.0, "last_price": 22.5, "samples": 3},
+        ]
+        start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        end = datetime(2024, 2, 1, tzinfo=timezone.utc)
+
+        points = service.get_price_history("lob-001", "ultra rare", None, start, end)
+
+        assert points == [
+            {"date": "2024-01-01", "min_price": 20.0, "max_price": 25.0, "last_price": 22.5, "samples": 3}
+        ]
+        pipeline = service.history_collection.aggregate.call_args[0][0]
+        assert pipeline[0]["$match"] == {
+            "card.price_lookup_key": "LOB-001|ultra rare|",
+            "recorded_at": {"$gte": start, "$lt": end},
+        }
+        assert pipeline[2]["$group"]["last_price"] == {"$last": "$tcgplayer_price"}
+
+    def test_history_unavailable_without_collection(self, service):
+        """Test None is returned when history isn't stored."""
+        service.history_collection = None
+
+        assert service.get_price_history("LOB-001", "Ultra Rare") is None
+
+
+class TestCacheStatsAggregation:
+    """Test the memoized $facet cache statistics."""
+
+    @pytest.fixture
+    def service(self):
+        """Create a PriceScrapingService with a mocked cache collection."""
+        service = PriceScrapingService()
+        service._initialized = True
+        service.cache_collection = Mock()
+        service.cache_collection.find_one_and_update.return_value = None
+        service.cache_collection.find_one_and_replace.return_value = None
+        service.cache_collection.aggregate.side_effect = lambda pipeline: iter([
+            {"total": [{"count": 10}], "fresh": [{"count": 4}], "unique_cards": [{"count": 7}]}
+        ])
+        service.variants_collection = None
+        return service
+
+    def test_counts_from_one_facet_aggregation(self, service):
+        """Test total, fresh, stale and unique counts come from a single aggregation."""
+        stats = service.get_cache_stats()
+
+        assert stats["total_entries"] == 10
+        assert stats["fresh_entries"] == 4
+        assert stats["stale_entries"] == 6
+        assert stats["unique_cards"] == 7
+        service.cache_collection.aggregate.assert_called_once()
+        facets = service.cache_collection.aggregate.call_args[0][0][0]["$facet"]
+        assert set(facets) == {"total", "fresh", "unique_cards"}
+        service.cache_collection.count_documents.assert_not_called()
+        service.cache_collection.distinct.assert_not_called()
+
+    def test_counts_memoized_with_incremental_saves(self, service):
+        """Test saves adjust the memoized counts without re-running the aggregation."""
+        service.get_cache_stats()
+
+        expired = datetime.now(timezone.utc) - timedelta(days=PRICE_CACHE_EXPIRY_DAYS + 1)
+        service.cache_collection.find_one_and_replace.return_value = None
+        service.save_price_data({"card_number": "LOB-001", "card_name": "Blue-Eyes", "card_rarity": "Ultra Rare"})
+        service.cache_collection.find_one_and_replace.return_value = {"last_price_updt": expired}
+        service.save_price_data({"card_number": "LOB-002", "card_name": "Mystical Elf", "card_rarity": "Common"})
+
+        stats = service.get_cache_stats()
+
+        service.cache_collection.aggregate.assert_called_once()
+        assert stats["total_entries"] == 11
+        assert stats["fresh_entries"] == 6
+        assert stats["stale_entries"] == 5
+        assert stats["saves_since_count"] == 2
+
+    def test_refreshing_fresh_entry_keeps_fresh_count(self, service):
+        """Test re-saving an entry that was already fresh doesn't move it from stale to fresh."""
+        service.get_cache_stats()
+
+        recent = datetime.now(timezone.utc) - timedelta(hours=1)
+        service.cache_collection.find_one_and_replace.return_value = {"last_price_updt": recent}
+        for _ in range(3):
+            service.save_price_data({"card_number": "LOB-001", "card_name": "Blue-Eyes", "card_rarity": "Ultra Rare"})
+        service.cache_collection.find_one_and_update.return_value = {"last_price_updt": recent}
+        service.save_price_data({"card_number": "LOB-001", "card_name": "Blue-Eyes", "card_rarity": "Ultra Rare"})
+
+        stats = service.get_cache_stats()
+
+        assert stats["total_entries"] == 10
+        assert stats["fresh_entries"] == 4
+        assert stats["stale_entries"] == 6
+        assert stats["saves_since_count"] == 4
+
+    def test_counts_recomputed_after_ttl(self, service):
+        """Test the aggregation runs again once the memoized counts expire."""
+        service.get_cache_stats()
+        service._cache_counts_computed_at -= PRICE_CACHE_STATS_TTL_SECONDS + 1
+
+        stats = service.get_cache_stats()
+
+        assert service.cache_collection.aggregate.call_count == 2
+        assert stats["saves_since_count"] == 0
+
+
+class TestPriceWriteBehind:
+    """Test saving prices through the write-behind buffer."""
+
+    @pytest.fixture
+    def service(self):
+        """Create a PriceScrapingService with write-behind enabled on a mocked collection."""
+        service = PriceScrapingService()
+        service._initialized = True
+        service.cache_collection = Mock()
+        service.cache_collection.find_one.return_value = None
+        service.cache_collection.find.return_value = []
+        service.cache_collection.bulk_write.side_effect = lambda operations, ordered: Mock(
+            upserted_count=len(operations), modified_count=0
+        )
+        service.variants_collection = None
+        service.price_writer = WriteBehindBuffer(
+            lambda: service.cache_collection,
+            max_batch_size=100,
+            flush_interval_seconds=60,
+            on_flush=service._count_bulk_saved_prices,
+        )
+        yield service
+        service.price_writer.shutdown(timeout=1)
+
+    def _save(self, service, card_number="LOB-001", price=25.99):
+        return service.save_price_data({
+            "card_number": card_number,
+            "card_name": "Blue-Eyes White Dragon",
+            "card_rarity": "Ultra Rare",
+            "tcgplayer_price": price,
+        })
+
+    def test_save_is_buffered(self, service):
+        """Test saves skip the per-document replace_one."""
+        assert self._save(service) is True
+
+        service.cache_collection.replace_one.assert_not_called()
+        assert service.price_writer.size() == 1
+
+    def test_read_your_writes(self, service):
+        """Test buffered prices are returned by single and bulk lookups."""
+        self._save(service)
+
+        cached = service.find_cached_price_data("LOB-001", "Blue-Eyes White Dragon", "Ultra Rare")
+        entries = service._find_cached_price_data_bulk([{"card_number": "LOB-001", "card_rarity": "Ultra Rare"}])
+
+        assert cached["tcgplayer_price"] == 25.99
+        assert entries[0]["data"]["tcgplayer_price"] == 25.99
+        service.cache_collection.find_one.assert_not_called()
+
+    def test_flush_writes_batch_and_updates_counts(self, service):
+        """Test one bulk write covers all saves and feeds the cache stats counters."""
+        service.cache_collection.aggregate.side_effect = lambda pipeline: iter([
+            {"total": [{"count": 10}], "fresh": [{"count": 4}], "unique_cards": [{"count": 7}]}
+        ])
+        service.get_cache_stats()
+        for card_number in ("LOB-001", "LOB-002", "LOB-003"):
+            self._save(service, card_number)
+
+        assert service.price_writer.flush() == 3
+
+        service.cache_collection.bulk_write.assert_called_once()
+        stats = service.get_cache_stats()
+        assert stats["total_entries"] == 13
+        assert stats["write_behind"]["flushed_operations"] == 3
+
+
+class TestPriceChangeDetection:
+    """Test that unchanged prices only refresh the timestamp."""
+
+    @pytest.fixture
+    def service(self):
+        """Create a PriceScrapingService with a mocked cache collection."""
+        service = PriceScrapingService()
+        service._initialized = True
+        service.cache_collection = Mock()
+        service.variants_collection = None
+        return service
+
+    def _price_data(self):
+        return {
+            "card_number": "LOB-001",
+            "card_name": "Blue-Eyes White Dragon",
+            "card_rarity": "Ultra Rare",
+            "tcgplayer_price": 25.99,
+            "tcgplayer_market_price": 24.5,
+            "tcgplayer_url": "https://www.tcgplayer.com/product/12345",
+        }
+
+    def test_unchanged_price_issues_minimal_set(self, service):
+        """Test a refresh with identical prices and URL issues a minimal $set."""
+        service.cache_collection.find_one_and_update.return_value = {"last_price_updt": datetime.now(timezone.utc)}
+
+        assert service.save_price_data(self._price_data()) is True
+
+        query, update = service.cache_collection.find_one_and_update.call_args[0]
+        assert query["tcgplayer_price"] == 25.99
+        assert query["tcgplayer_market_price"] == 24.5
+        assert query["tcgplayer_url"] == "https://www.tcgplayer.com/product/12345"
+        assert "tcgplayer_price" not in update["$set"]
+        assert "created_at" not in update["$set"]
+        assert "last_price_updt" in update["$set"]
+        service.cache_collection.find_one_and_replace.assert_not_called()
+        assert service.get_price_change_stats()["unchanged"] == 1
+
+    def test_unchanged_price_backfills_product_id_and_lookup_key(self, service):
+        """Test a legacy document without a product id gets one on an unchanged re-scrape."""
+        service.cache_collection.find_one_and_update.return_value = {"last_price_updt": datetime.now(timezone.utc)}
+
+        service.save_price_data(self._price_data())
+
+        update = service.cache_collection.find_one_and_update.call_args[0][1]
+        assert update["$set"]["tcgplayer_product_id"] == "12345"
+        assert update["$set"]["price_lookup_key"] == service._get_price_lookup_key("LOB-001", "Ultra Rare", None)
+
+    def test_unchanged_price_keeps_stored_product_id(self, service):
+        """Test a scrape without a product id doesn't clear the stored one."""
+        service.cache_collection.find_one_and_update.return_value = {"last_price_updt": datetime.now(timezone.utc)}
+        price_data = {**self._price_data(), "tcgplayer_url": "https://www.tcgplayer.com/search/all/product?q=LOB-001"}
+
+        service.save_price_data(price_data)
+
+        update = service.cache_collection.find_one_and_update.call_args[0][1]
+        assert "tcgplayer_product_id" not in update["$set"]
+
+    def test_changed_price_replaces_document(self, service):
+        """Test a moved price falls back to replacing the whole document."""
+        service.cache_collection.find_one_and_update.return_value = None
+        service.cache_collection.find_one_and_replace.return_value = {"last_price_updt": datetime.now(timezone.utc)}
+
+        assert service.save_price_data(self._price_data()) is True
+
+        service.cache_collection.find_one_and_replace.assert_called_once()
+        stats = service.get_price_change_stats()
+        assert stats["changed"] == 1
+        assert stats["change_rate"] == 1.0
+
+    def test_new_price_counted_separately(self, service):
+        """Test first-time saves don't count toward the change rate."""
+        service.cache_collection.find_one_and_update.return_value = None
+        service.cache_collection.find_one_and_replace.return_value = None
+
+        service.save_price_data(self._price_data())
+
+        stats = service.get_price_change_stats()
+        assert stats["new"] == 1
+        assert stats["change_rate"] == 0.0
+
+
+class TestCardNumberLookup:
+    """Test exact card number lookups and the card name map."""
+
+    @pytest.fixture
+    def service(self):
+        """Create a PriceScrapingService with a mocked variants collection."""
+        service = PriceScrapingService()
+        service._initialized = True
+        service.cache_collection = Mock()
+        service.variants_collection = Mock()
+        return service
+
+    def test_lookup_uses_exact_card_number_key(self, service):
+        """Test the lookup matches the canonical key instead of a regex."""
+        service.variants_collection.find_one.return_value = {
+            "card_number_key": "LOB-001",
+            "card_name": "Blue-Eyes White Dragon"
+        }
+
+        result = service.lookup_card_info_from_cache(" lob-001 ")
+
+        assert result["card_name"] == "Blue-Eyes White Dragon"
+        query = service.variants_collection.find_one.call_args[0][0]
+        assert query == {"$or": [{"card_number_key": "LOB-001"}, {"set_code": "LOB-001"}]}
+
+    def test_regex_fallback_disabled_by_default(self, service):
+        """Test a miss doesn't scan the collection with regexes unless asked to."""
+        service.variants_collection.find_one.return_value = None
+
+        assert service.lookup_card_info_from_cache("LOB-999") is None
+        assert service.variants_collection.find_one.call_count == 1
+
+    def test_card_name_served_from_map(self, service):
+        """Test a looked-up card name is answered from memory afterwards."""
+        service.variants_collection.find_one.return_value = {
+            "card_number_key": "LOB-001",
+            "card_name": "Blue-Eyes White Dragon"
+        }
+
+        assert service.lookup_card_name("LOB-001") == "Blue-Eyes White Dragon"
+        assert service.lookup_card_name("lob-001") == "Blue-Eyes White Dragon"
+
+        assert service.variants_collection.find_one.call_count == 1
+        assert service.get_scraping_stats()["card_number_index"]["map_hits"] == 1
+
+    def test_invalidate_variant_caches(self, service):
+        """Test a swapped-in variants collection clears the name map and rarity tables."""
+        service.card_number_index.remember("LOB-001", "Blue-Eyes White Dragon")
+        service.rarity_tables.set("LOB", ({"LOB-001": {"ultra rare"}}, "variant_cache"))
+
+        with patch("ygoapi.price_scraping.CARD_NUMBER_MAP_WARM_ON_STARTUP", False):
+            service.invalidate_variant_caches()
+
+        assert service.card_number_index.get_name("LOB-001") is None
+        assert service.rarity_tables.get("LOB") is None
+
+    def test_api_card_name_remembered(self, service):
+        """Test names found through the YGO API aren't fetched again."""
+        service.variants_collection.find_one.return_value = None
+
+        with patch.object(service, "lookup_card_name_from_ygo_api", return_value="Dark Magician") as mock_api:
+            assert service.lookup_card_name("SDY-006") == "Dark Magician"
+            assert service.lookup_card_name("SDY-006") == "Dark Magician"
+
+        mock_api.assert_called_once_with("SDY-006")
+
+    def test_prepare_backfills_and_warms(self, service):
+        """Test older variants get card_number_key before the map is warmed."""
+        collection = Mock()
+        collection.find_one.return_value = {"_id": 1}
+        collection.update_many.return_value = Mock(modified_count=2)
+        collection.find.return_value = [
+            {"set_code": "LOB-001", "card_name": "Blue-Eyes White Dragon"},
+            {"card_number_key": "SDY-006", "set_code": "SDY-006", "card_name": "Dark Magician"},
+        ]
+
+        with patch("ygoapi.price_scraping.CARD_NUMBER_MAP_WARM_ON_STARTUP", True):
+            service._prepare_card_number_index(collection)
+
+        collection.create_index.assert_called_once_with("card_number_key")
+        backfill_filter, pipeline = collection.update_many.call_args[0]
+        assert backfill_filter["card_number_key"] == {"$exists": False}
+        assert pipeline[0]["$set"]["card_number_key"] == {"$toUpper": {"$trim": {"input": "$set_code"}}}
+        assert service.card_number_index.get_name("LOB-001") == "Blue-Eyes White Dragon"
+        assert service.card_number_index.get_stats()["size"] == 2
+
+
+class TestSiblingPrefetch:
+    """Test speculative scrapes of a card's other rarities."""
+
+    @pytest.fixture
+    def service(self):
+        """Create a PriceScrapingService whose variants list three rarities of LOB-001."""
+        service = PriceScrapingService()
+        service._initialized = True
+        service.cache_collection = Mock()
+        service.cache_collection.find_one.return_value = None
+        service.cache_collection.find_one_and_update.return_value = None
+        service.cache_collection.find_one_and_replace.return_value = None
+        service.negative_cache_collection = None
+        service.variants_collection = Mock()
+        service.variants_collection.find.return_value = [
+            {"set_rarity": "Ultra Rare", "art_variant": None},
+            {"set_rarity": "Secret Rare", "art_variant": None},
+            {"set_rarity": "Secret Rare", "art_variant": None},
+            {"set_rarity": "Common", "art_variant": None},
+        ]
+        yield service
+        service._prefetch_executor.shutdown(wait=True)
+
+    def _drain(self, service):
+        """Wait for every queued prefetch task."""
+        service._prefetch_executor.shutdown(wait=True)
+
+    def test_disabled_by_default(self, service):
+        """Test nothing is scheduled unless prefetch is turned on."""
+        assert service._schedule_sibling_prefetch("LOB-001", "Blue-Eyes White Dragon", "Ultra Rare", None) is False
+        assert service.get_prefetch_stats()["enabled"] is False
+
+    @patch("ygoapi.price_scraping.PRICE_SIBLING_PREFETCH_ENABLED", True)
+    def test_missing_siblings_prefetched_once(self, service):
+        """Test each other rarity is scraped once and the requested one is skipped."""
+        with patch.object(service, "_find_cached_price_data_bulk", return_value=[None, None]), \
+             patch.object(service, "_coalesced_validate_and_scrape", return_value={"success": True}) as mock_scrape:
+            service._prefetch_siblings("LOB-001", "Blue-Eyes White Dragon", "Ultra Rare", None)
+            self._drain(service)
+
+        rarities = sorted(call[0][2] for call in mock_scrape.call_args_list)
+        assert rarities == ["Common", "Secret Rare"]
+        assert all(call[0][4] == "prefetch" for call in mock_scrape.call_args_list)
+        stats = service.get_prefetch_stats()
+        assert stats["queued"] == 2
+        assert stats["completed"] == 2
+        assert stats["budget_used"] == 2
+
+    @patch("ygoapi.price_scraping.PRICE_SIBLING_PREFETCH_ENABLED", True)
+    def test_fresh_siblings_skipped(self, service):
+        """Test siblings with a fresh cached price are not scraped."""
+        fresh = {"is_stale": False, "last_updated": datetime.now(timezone.utc)}
+        with patch.object(service, "_find_cached_price_data_bulk", return_value=[fresh, None]), \
+             patch.object(service, "_get_cache_status", side_effect=["fresh_hit", "miss"]), \
+             patch.object(service, "_coalesced_validate_and_scrape", return_value={"success": True}) as mock_scrape:
+            service._prefetch_siblings("LOB-001", "Blue-Eyes White Dragon", "Ultra Rare", None)
+            self._drain(service)
+
+        assert mock_scrape.call_count == 1
+        assert service.get_prefetch_stats()["skipped_fresh"] == 1
+
+    @patch("ygoapi.price_scraping.PRICE_SIBLING_PREFETCH_ENABLED", True)
+    @patch("ygoapi.price_scraping.PRICE_SIBLING_PREFETCH_BUDGET", 1)
+    def test_global_budget_limits_prefetch(self, service):
+        """Test prefetch stops once the budget for the window is spent."""
+        with patch.object(service, "_find_cached_price_data_bulk", return_value=[None, None]), \
+             patch.object(service, "_coalesced_validate_and_scrape", return_value={"success": True}) as mock_scrape:
+            service._prefetch_siblings("LOB-001", "Blue-Eyes White Dragon", "Ultra Rare", None)
+            self._drain(service)
+
+        assert mock_scrape.call_count == 1
+        stats = service.get_prefetch_stats()
+        assert stats["skipped_budget"] == 1
+        assert service._take_prefetch_budget() is False
+
+    @patch("ygoapi.price_scraping.PRICE_SIBLING_PREFETCH_ENABLED", True)
+    def test_prefetched_price_hit_counted(self, service):
+        """Test a later fresh hit on a prefetched price is counted."""
+        with patch.object(service, "_find_cached_price_data_bulk", return_value=[None, None]), \
+             patch.object(service, "_coalesced_validate_and_scrape", return_value={"success": True}):
+            service._prefetch_siblings("LOB-001", "Blue-Eyes White Dragon", "Ultra Rare", None)
+            self._drain(service)
+
+        service._count_prefetch_hit("lob-001", "secret rare", None)
+        service._count_prefetch_hit("LOB-001", "Secret Rare", None)
+
+        assert service.get_prefetch_stats()["hits"] == 1
+
+    def test_successful_miss_scrape_schedules_prefetch(self, service):
+        """Test a foreground scrape triggers prefetch but a prefetch scrape doesn't."""
+        price_data = {"tcgplayer_price": 10.0, "tcgplayer_url": "https://www.tcgplayer.com/product/1"}
+        with patch.object(service, "validate_card_rarity", return_value=True), \
+             patch.object(service, "scrape_price_from_tcgplayer_basic", new_callable=AsyncMock) as mock_run, \
+             patch.object(service, "_schedule_sibling_prefetch") as mock_schedule:
+            mock_run.return_value = price_data
+            service._validate_and_scrape("LOB-001", "Blue-Eyes White Dragon", "Ultra Rare", None, "miss")
+            service._validate_and_scrape("LOB-001", "Blue-Eyes White Dragon", "Secret Rare", None, "prefetch")
+
+        mock_schedule.assert_called_once_with("LOB-001", "Blue-Eyes White Dragon", "Ultra Rare", None)
@@ -14,6 +14,11 @@ from unittest.mock import AsyncMock, MagicMock, Mock, patch
 import pytest
 import requests
 
+from ygoapi.config import (
+    TCGPLAYER_PRICE_READY_SELECTOR,
+    TCGPLAYER_PRODUCT_LINK_SELECTOR,
+    TCGPLAYER_SEARCH_READY_SELECTOR,
+)
 from ygoapi.price_scraping import PriceScrapingService
 
 # Import test fixtures
@@ -134,7 +139,7 @@ class TestArtVariantHandling:
         
         # Setup cache data with art variants
         cache_data = sample_cached_price_data.copy()
-        mock_collection.find.return_value = [cache_data[1]]  # Data with art variant "7"
+        mock_collection.find_one.return_value = cache_data[1]  # Data with art variant "7"
         
         # Test finding data with different but equivalent art variant formats
         result = service.find_cached_price_data("LOB-005", "Dark Magician", "Secret Rare", "7th")
@@ -142,10 +147,9 @@ class TestArtVariantHandling:
         assert result is not None
         assert result["art_variant"] == "7"
         
-        # Verify the query was constructed correctly with $or clause for alternatives
-        query_call = mock_collection.find.call_args[0][0]
-        assert "$or" in query_call
-        assert any("art_variant" in condition for condition in query_call["$or"])
+        # Verify the lookup keys cover the canonical art variant and prices without one
+        query_call = mock_collection.find_one.call_args[0][0]
+        assert query_call["price_lookup_key"]["$in"] == ["LOB-005|secret rare|7", "LOB-005|secret rare|"]
 
 
 class TestRarityValidation:
@@ -258,7 +262,7 @@ class TestCacheOperations:
     def test_find_cached_price_data_query_combinations(self, mock_get_collection, service, cache_query_test_cases):
         """Test find_cached_price_data() with various query combinations."""
         mock_collection = mock_get_collection.return_value
-        mock_collection.find.return_value = []
+        mock_collection.find_one.return_value = None
         
         for case in cache_query_test_cases:
             service.find_cached_price_data(
@@ -268,13 +272,10 @@ class TestCacheOperations:
                 case.get("art_variant")
             )
             
-            # Verify query construction
-            query_call = mock_collection.find.call_args[0][0]
-            assert "card_number" in query_call
-            assert "card_rarity" in query_call
-            
-            if case.get("expected_or_clause"):
-                assert "$or" in query_call
+            # Verify query construction: one indexed find_one, newest first
+            query_call = mock_collection.find_one.call_args[0][0]
+            assert query_call == case["expected_query"]
+            assert mock_collection.find_one.call_args[1]["sort"] == [("last_price_updt", -1)]
 
     @patch("ygoapi.price_scraping.get_price_cache_collection")
     def test_cache_ttl_expiration_and_freshness(self, mock_get_collection, service):
@@ -289,7 +290,7 @@ class TestCacheOperations:
             "tcgplayer_price": 25.99,
             "last_price_updt": now,  # Fresh data
         }
-        mock_collection.find.return_value = [fresh_data]
+        mock_collection.find_one.return_value = fresh_data
         
         result = service.find_cached_price_data("LOB-001", "Blue-Eyes White Dragon", "Ultra Rare")
         assert result is not None
@@ -302,7 +303,9 @@ class TestCacheOperations:
             "tcgplayer_price": 25.99,
             "last_price_updt": now - timedelta(days=10),  # Stale data
         }
-        mock_collection.find.return_value = [stale_data]
+        mock_collection.find_one.return_value = stale_data
+        # The fresh document is held in the L1 cache until it is invalidated
+        service.price_l1_cache.clear()
         
         result = service.find_cached_price_data("LOB-001", "Blue-Eyes White Dragon", "Ultra Rare")
         assert result is None  # Should reject stale data
@@ -311,10 +314,8 @@ class TestCacheOperations:
     def test_save_price_data_with_art_variants(self, mock_get_collection, service):
         """Test save_price_data() with different art variants."""
         mock_collection = mock_get_collection.return_value
-        mock_result = MagicMock()
-        mock_result.upserted_id = "test_id"
-        mock_result.modified_count = 1
-        mock_collection.replace_one.return_value = mock_result
+        mock_collection.find_one_and_update.return_value = None
+        mock_collection.find_one_and_replace.return_value = None
         
         # Test saving with art variant
         price_data = {
@@ -328,7 +329,7 @@ class TestCacheOperations:
         assert result is True
         
         # Verify the document structure
-        save_call = mock_collection.replace_one.call_args
+        save_call = mock_collection.find_one_and_replace.call_args
         document = save_call[0][1]  # Second argument is the document
         assert document["art_variant"] == "7th"
         assert document["card_number"] == "LOB-005"
@@ -353,8 +354,9 @@ class TestCacheOperations:
         mock_collection = mock_get_collection.return_value
         
         # Setup mock responses for cache stats
-        mock_collection.count_documents.return_value = 150
-        mock_collection.distinct.return_value = ["LOB-001", "LOB-005", "BPT-005"]
+        mock_collection.aggregate.return_value = iter([
+            {"total": [{"count": 150}], "fresh": [{"count": 150}], "unique_cards": [{"count": 3}]}
+        ])
         
         stats = service.get_cache_stats()
         
@@ -532,8 +534,7 @@ class TestIntegrationScenarios:
 
     @patch("ygoapi.price_scraping.get_card_variants_collection")
     @patch("ygoapi.price_scraping.get_price_cache_collection")
-    @patch("ygoapi.price_scraping.asyncio.run")
-    def test_end_to_end_scraping_with_mocked_dependencies(self, mock_asyncio, mock_cache, mock_variants, service):
+    def test_end_to_end_scraping_with_mocked_dependencies(self, mock_cache, mock_variants, service):
         """Test end-to-end scraping with mocked external dependencies."""
         # Setup mocks
         mock_variants_collection = MagicMock()
@@ -549,13 +550,14 @@ class TestIntegrationScenarios:
         mock_cache.return_value = mock_cache_collection
         
         # Mock successful scraping
-        mock_asyncio.return_value = {
-            "tcgplayer_price": 25.99,
-            "tcgplayer_market_price": 28.50,
-            "tcgplayer_url": "https://tcgplayer.com/test"
-        }
-        
-        result = service.scrape_card_price("LOB-001", "Blue-Eyes White Dragon", "Ultra Rare")
+        with patch.object(service, "scrape_price_from_tcgplayer_basic", new_callable=AsyncMock) as mock_scrape:
+            mock_scrape.return_value = {
+                "tcgplayer_price": 25.99,
+                "tcgplayer_market_price": 28.50,
+                "tcgplayer_url": "https://tcgplayer.com/test"
+            }
+            
+            result = service.scrape_card_price("LOB-001", "Blue-Eyes White Dragon", "Ultra Rare")
         
         assert result["success"] is True
         assert result["cached"] is False
@@ -563,24 +565,13 @@ class TestIntegrationScenarios:
 
     def test_memory_cleanup_and_playwright_resource_management(self, service):
         """Test memory management and cleanup paths."""
-        # Test cleanup registration and proper mock setup
-        mock_browser = MagicMock()
-        mock_playwright = MagicMock()
-        
-        # Set the attributes before calling cleanup
-        service._browser = mock_browser
-        service._playwright = mock_playwright
+        service.browser_pool = MagicMock()
         
         # Call cleanup
         service.cleanup_playwright()
         
-        # Verify cleanup was called
-        mock_browser.close.assert_called_once()
-        mock_playwright.stop.assert_called_once()
-        
-        # Verify references are cleared
-        assert service._browser is None
-        assert service._playwright is None
+        # Verify the browser pool was shut down
+        service.browser_pool.shutdown.assert_called_once()
 
     @patch("ygoapi.price_scraping.get_card_variants_collection")
     @patch("ygoapi.price_scraping.get_price_cache_collection")
@@ -597,7 +588,7 @@ class TestIntegrationScenarios:
         for req in requests:
             with patch.object(service, "validate_card_rarity", return_value=True), \
                  patch.object(service, "find_cached_price_data", return_value=None), \
-                 patch("ygoapi.price_scraping.asyncio.run") as mock_run:
+                 patch.object(service, "scrape_price_from_tcgplayer_basic", new_callable=AsyncMock) as mock_run:
                 
                 mock_run.return_value = {"tcgplayer_price": 25.99}
                 result = service.scrape_card_price(req["card_number"], req["card_name"], req["card_rarity"])
@@ -612,9 +603,8 @@ class TestIntegrationScenarios:
         """Test side effects (cache saves, cleanup calls, logging)."""
         # Setup mocks
         mock_cache_collection = MagicMock()
-        mock_result = MagicMock()
-        mock_result.upserted_id = "test_id"
-        mock_cache_collection.replace_one.return_value = mock_result
+        mock_cache_collection.find_one_and_update.return_value = None
+        mock_cache_collection.find_one_and_replace.return_value = None
         mock_cache.return_value = mock_cache_collection
         
         # Test saving price data
@@ -629,10 +619,10 @@ class TestIntegrationScenarios:
         
         # Verify side effects
         assert result is True
-        mock_cache_collection.replace_one.assert_called_once()
+        mock_cache_collection.find_one_and_replace.assert_called_once()
         
         # Verify document structure includes timestamps
-        call_args = mock_cache_collection.replace_one.call_args
+        call_args = mock_cache_collection.find_one_and_replace.call_args
         document = call_args[0][1]
         assert "last_price_updt" in document
         assert "created_at" in document
@@ -725,7 +715,7 @@ class TestErrorHandlingEnhancements:
             "tcgplayer_price": 45.00,
             "last_price_updt": datetime.now(timezone.utc)
         }
-        mock_collection.find.return_value = [cache_data]
+        mock_collection.find_one.return_value = cache_data
         mock_get_collection.return_value = mock_collection
         
         # Test with equivalent art variant format
@@ -808,17 +798,17 @@ class TestAdditionalCoverageEnhancements:
 
     @patch("ygoapi.price_scraping.get_card_variants_collection")
     def test_lookup_card_info_from_cache_broad_search(self, mock_get_collection, service):
-        """Test lookup_card_info_from_cache with broad search fallback."""
+        """Test lookup_card_info_from_cache with explicit regex fallback."""
         mock_collection = mock_get_collection.return_value
         
         # First call returns None (no exact match)
         # Second call returns a result (broad search)
         mock_collection.find_one.side_effect = [
-            None,  # No exact set_code match
+            None,  # No exact card_number_key/set_code match
             {"card_name": "Test Card", "set_code": "TEST-001"}  # Broad search match
         ]
         
-        result = service.lookup_card_info_from_cache("TEST")
+        result = service.lookup_card_info_from_cache("TEST", regex_fallback=True)
         
         assert result is not None
         assert result["card_name"] == "Test Card"
@@ -865,134 +855,170 @@ class TestAdditionalCoverageEnhancements:
     @pytest.mark.asyncio
     async def test_scrape_price_from_tcgplayer_basic_no_results(self, service):
         """Test TCGPlayer scraping when no results found."""
-        with patch("ygoapi.price_scraping.async_playwright") as mock_playwright:
-            mock_browser = AsyncMock()
-            mock_context = AsyncMock()
-            mock_page = AsyncMock()
-            
-            # Setup playwright chain
-            mock_p = AsyncMock()
-            mock_p.chromium.launch.return_value = mock_browser
-            mock_browser.new_context.return_value = mock_context
-            mock_context.new_page.return_value = mock_page
-            
-            # Mock no results scenario
-            mock_page.evaluate.return_value = 0  # results_count = 0
-            
-            mock_playwright.return_value.__aenter__.return_value = mock_p
-            
-            result = await service.scrape_price_from_tcgplayer_basic(
-                "Test Card", "Ultra Rare", None, "TEST-001"
-            )
-            
-            assert "error" in result
-            assert "No results found" in result["error"]
+        mock_page = AsyncMock()
+        service.browser_pool = create_mock_browser_pool(mock_page)
+        
+        # Mock no results scenario
+        mock_page.evaluate.return_value = 0  # results_count = 0
+        
+        result = await service.scrape_price_from_tcgplayer_basic(
+            "Test Card", "Ultra Rare", None, "TEST-001"
+        )
+        
+        assert "error" in result
+        assert "No results found" in result["error"]
 
     @pytest.mark.asyncio
     async def test_scrape_price_from_tcgplayer_basic_product_page_direct(self, service):
         """Test direct landing on product page."""
-        with patch("ygoapi.price_scraping.async_playwright") as mock_playwright:
-            mock_browser = AsyncMock()
-            mock_context = AsyncMock()
-            mock_page = AsyncMock()
-            
-            # Setup playwright chain
-            mock_p = AsyncMock()
-            mock_p.chromium.launch.return_value = mock_browser
-            mock_browser.new_context.return_value = mock_context
-            mock_context.new_page.return_value = mock_page
-            
-            # Mock direct product page scenario
-            mock_page.evaluate.side_effect = [
-                5,  # results_count > 0
-                True,  # is_product_page = True
-                {"tcg_price": 25.99, "tcg_market_price": 28.50}  # price extraction
-            ]
-            mock_page.url = "https://tcgplayer.com/product/12345"
-            
-            mock_playwright.return_value.__aenter__.return_value = mock_p
-            
-            result = await service.scrape_price_from_tcgplayer_basic(
-                "Blue-Eyes White Dragon", "Ultra Rare", None, "LOB-001"
-            )
-            
-            assert result["tcgplayer_price"] == 25.99
-            assert result["tcgplayer_market_price"] == 28.50
+        mock_page = AsyncMock()
+        service.browser_pool = create_mock_browser_pool(mock_page)
+        
+        # Mock direct product page scenario
+        mock_page.evaluate.side_effect = [
+            5,  # results_count > 0
+            True,  # is_product_page = True
+            {"tcg_price": 25.99, "tcg_market_price": 28.50}  # price extraction
+        ]
+        mock_page.url = "https://tcgplayer.com/product/12345"
+        
+        result = await service.scrape_price_from_tcgplayer_basic(
+            "Blue-Eyes White Dragon", "Ultra Rare", None, "LOB-001"
+        )
+        
+        assert result["tcgplayer_price"] == 25.99
+        assert result["tcgplayer_market_price"] == 28.50
+        service.browser_pool.acquire.assert_called_once()
 
     @pytest.mark.asyncio
     async def test_scrape_price_from_tcgplayer_basic_with_art_variant_search(self, service):
         """Test scraping with art variant search terms."""
-        with patch("ygoapi.price_scraping.async_playwright") as mock_playwright, \
-             patch("ygoapi.price_scraping.extract_art_version", return_value=None):
-            
-            mock_browser = AsyncMock()
-            mock_context = AsyncMock()
-            mock_page = AsyncMock()
-            
-            mock_p = AsyncMock()
-            mock_p.chromium.launch.return_value = mock_browser
-            mock_browser.new_context.return_value = mock_context
-            mock_context.new_page.return_value = mock_page
-            
-            # Mock search with art variant
-            mock_page.evaluate.side_effect = [
-                3,  # results_count > 0
-                False,  # is_product_page = False
-                {"tcg_price": 45.00, "tcg_market_price": 50.00}  # price extraction
-            ]
-            mock_page.url = "https://tcgplayer.com/product/12347"
-            
-            # Mock variant selection to return an async mock that acts like a coroutine
-            async def mock_select_variant(*args, **kwargs):
-                return "https://tcgplayer.com/product/12347"
+        mock_page = AsyncMock()
+        service.browser_pool = create_mock_browser_pool(mock_page)
+        
+        # Mock search with art variant
+        mock_page.evaluate.side_effect = [
+            3,  # results_count > 0
+            False,  # is_product_page = False
+            {"tcg_price": 45.00, "tcg_market_price": 50.00}  # price extraction
+        ]
+        mock_page.url = "https://tcgplayer.com/product/12347"
+        
+        # Mock variant selection to return an async mock that acts like a coroutine
+        async def mock_select_variant(*args, **kwargs):
+            return "https://tcgplayer.com/product/12347"
+        
+        with patch("ygoapi.price_scraping.extract_art_version", return_value=None), \
+             patch.object(service, "select_best_tcgplayer_variant", side_effect=mock_select_variant):
+            result = await service.scrape_price_from_tcgplayer_basic(
+                "Dark Magician", "Secret Rare", "7", "LOB-005"
+            )
             
-            with patch.object(service, "select_best_tcgplayer_variant", side_effect=mock_select_variant):
-                mock_playwright.return_value.__aenter__.return_value = mock_p
-                
-                result = await service.scrape_price_from_tcgplayer_basic(
-                    "Dark Magician", "Secret Rare", "7", "LOB-005"
-                )
-                
-                assert result["tcgplayer_price"] == 45.00
+            assert result["tcgplayer_price"] == 45.00
 
     @pytest.mark.asyncio
     async def test_scrape_price_from_tcgplayer_basic_no_suitable_variant(self, service):
         """Test when no suitable variant is found."""
-        with patch("ygoapi.price_scraping.async_playwright") as mock_playwright:
-            mock_browser = AsyncMock()
-            mock_context = AsyncMock()
-            mock_page = AsyncMock()
-            
-            mock_p = AsyncMock()
-            mock_p.chromium.launch.return_value = mock_browser
-            mock_browser.new_context.return_value = mock_context
-            mock_context.new_page.return_value = mock_page
-            
-            mock_page.evaluate.side_effect = [
-                5,  # results_count > 0
-                False,  # is_product_page = False
-            ]
-            
-            # Mock no suitable variant found with proper async function
-            async def mock_select_variant(*args, **kwargs):
-                return None
+        mock_page = AsyncMock()
+        service.browser_pool = create_mock_browser_pool(mock_page)
+        
+        mock_page.evaluate.side_effect = [
+            5,  # results_count > 0
+            False,  # is_product_page = False
+        ]
+        
+        # Mock no suitable variant found with proper async function
+        async def mock_select_variant(*args, **kwargs):
+            return None
+        
+        with patch.object(service, "select_best_tcgplayer_variant", side_effect=mock_select_variant):
+            result = await service.scrape_price_from_tcgplayer_basic(
+                "Test Card", "Ultra Rare", None, "TEST-001"
+            )
             
-            with patch.object(service, "select_best_tcgplayer_variant", side_effect=mock_select_variant):
-                mock_playwright.return_value.__aenter__.return_value = mock_p
-                
-                result = await service.scrape_price_from_tcgplayer_basic(
-                    "Test Card", "Ultra Rare", None, "TEST-001"
-                )
-                
-                assert "error" in result
-                assert "No suitable variant found" in result["error"]
+            assert "error" in result
+            assert "No suitable variant found" in result["error"]
+
+    @pytest.mark.asyncio
+    async def test_scrape_waits_for_selectors_instead_of_networkidle(self, service):
+        """Test navigation uses an early wait condition followed by selector waits."""
+        mock_page = AsyncMock()
+        service.browser_pool = create_mock_browser_pool(mock_page)
+        mock_page.evaluate.side_effect = [3, False, {"tcg_price": 1.0, "tcg_market_price": 2.0}]
+        mock_page.url = "https://tcgplayer.com/product/12347"
+
+        async def mock_select_variant(*args, **kwargs):
+            return "https://tcgplayer.com/product/12347"
+
+        with patch.object(service, "select_best_tcgplayer_variant", side_effect=mock_select_variant):
+            await service.scrape_price_from_tcgplayer_basic("Dark Magician", "Secret Rare", None, "LOB-005")
+
+        assert mock_page.goto.await_count == 2
+        for call in mock_page.goto.await_args_list:
+            assert call.kwargs["wait_until"] == "domcontentloaded"
+        waited = [call.args[0] for call in mock_page.wait_for_selector.await_args_list]
+        assert waited == [
+            TCGPLAYER_SEARCH_READY_SELECTOR,
+            TCGPLAYER_PRODUCT_LINK_SELECTOR,
+            TCGPLAYER_PRICE_READY_SELECTOR,
+        ]
+
+    @pytest.mark.asyncio
+    async def test_scrape_records_phase_timings(self, service):
+        """Test each phase's duration is returned and added to the metrics."""
+        mock_page = AsyncMock()
+        service.browser_pool = create_mock_browser_pool(mock_page)
+        mock_page.evaluate.side_effect = [3, False, {"tcg_price": 1.0, "tcg_market_price": 2.0}]
+        mock_page.url = "https://tcgplayer.com/product/12347"
+
+        async def mock_select_variant(*args, **kwargs):
+            return "https://tcgplayer.com/product/12347"
+
+        with patch.object(service, "select_best_tcgplayer_variant", side_effect=mock_select_variant):
+            result = await service.scrape_price_from_tcgplayer_basic("Dark Magician", "Secret Rare", None, "LOB-005")
+
+        assert set(result["phase_timings_ms"]) == {
+            "goto", "results_wait", "variant_extraction", "product_load", "price_extraction", "total"
+        }
+        assert all(elapsed >= 0 for elapsed in result["phase_timings_ms"].values())
+
+        phases = service.get_scraping_stats()["phase_timings"]["phases"]
+        assert phases["variant_extraction"]["count"] == 1
+        assert phases["total"]["count"] == 1
+
+    @pytest.mark.asyncio
+    async def test_scrape_no_results_records_partial_timings(self, service):
+        """Test phases that never ran are left out of the timings."""
+        mock_page = AsyncMock()
+        service.browser_pool = create_mock_browser_pool(mock_page)
+        mock_page.evaluate.return_value = 0
+
+        result = await service.scrape_price_from_tcgplayer_basic("Test Card", "Ultra Rare", None, "TEST-001")
+
+        assert set(result["phase_timings_ms"]) == {"goto", "results_wait", "total"}
+        phases = service.get_phase_timing_stats()["phases"]
+        assert phases["product_load"]["count"] == 0
+
+    @pytest.mark.asyncio
+    async def test_selector_timeout_does_not_fail_scrape(self, service):
+        """Test the page is still read when a readiness selector never appears."""
+        mock_page = AsyncMock()
+        service.browser_pool = create_mock_browser_pool(mock_page)
+        mock_page.wait_for_selector.side_effect = Exception("Timeout 15000ms exceeded")
+        mock_page.evaluate.side_effect = [5, True, {"tcg_price": 25.99, "tcg_market_price": 28.50}]
+        mock_page.url = "https://tcgplayer.com/product/12345"
+
+        result = await service.scrape_price_from_tcgplayer_basic("Blue-Eyes White Dragon", "Ultra Rare", None, "LOB-001")
+
+        assert result["tcgplayer_price"] == 25.99
+        assert service.get_phase_timing_stats()["selector_timeouts"] == {"results_wait": 1, "product_load": 1}
 
     def test_scrape_card_price_force_refresh(self, service):
         """Test scrape_card_price with force_refresh=True."""
         with patch.object(service, "validate_card_rarity", return_value=True), \
              patch.object(service, "find_cached_price_data", return_value={"cached": "data"}), \
              patch.object(service, "save_price_data", return_value=True), \
-             patch("ygoapi.price_scraping.asyncio.run") as mock_run:
+             patch.object(service, "scrape_price_from_tcgplayer_basic", new_callable=AsyncMock) as mock_run:
             
             mock_run.return_value = {
                 "tcgplayer_price": 25.99,
@@ -1012,7 +1038,7 @@ class TestAdditionalCoverageEnhancements:
         with patch.object(service, "validate_card_rarity", return_value=True), \
              patch.object(service, "find_cached_price_data", return_value=None), \
              patch.object(service, "save_price_data", return_value=True), \
-             patch("ygoapi.price_scraping.asyncio.run") as mock_run:
+             patch.object(service, "scrape_price_from_tcgplayer_basic", new_callable=AsyncMock) as mock_run:
             
             mock_run.return_value = {
                 "tcgplayer_price": 45.00,
@@ -1041,12 +1067,9 @@ class TestAdditionalCoverageEnhancements:
 
     @patch("ygoapi.price_scraping.get_price_cache_collection")
     def test_save_price_data_no_changes(self, mock_get_collection, service):
-        """Test save_price_data when no changes are made."""
+        """Test save_price_data when the stored price is unchanged."""
         mock_collection = mock_get_collection.return_value
-        mock_result = MagicMock()
-        mock_result.upserted_id = None
-        mock_result.modified_count = 0
-        mock_collection.replace_one.return_value = mock_result
+        mock_collection.find_one_and_update.return_value = {"last_price_updt": datetime.now(timezone.utc)}
         
         price_data = {
             "card_number": "LOB-001",
@@ -1055,13 +1078,15 @@ class TestAdditionalCoverageEnhancements:
         }
         
         result = service.save_price_data(price_data)
-        assert result is False  # Should return False when no changes made
+        assert result is True  # The unchanged entry's timestamp is still refreshed
+        mock_collection.find_one_and_replace.assert_not_called()
 
     @patch("ygoapi.price_scraping.get_price_cache_collection")
     def test_save_price_data_exception_handling(self, mock_get_collection, service):
         """Test save_price_data exception handling."""
         mock_collection = mock_get_collection.return_value
-        mock_collection.replace_one.side_effect = Exception("Database error")
+        mock_collection.find_one_and_update.return_value = None
+        mock_collection.find_one_and_replace.side_effect = Exception("Database error")
         
         price_data = {"card_number": "LOB-001", "tcgplayer_price": 25.99}
         result = service.save_price_data(price_data)
@@ -1072,8 +1097,9 @@ class TestAdditionalCoverageEnhancements:
     def test_get_cache_stats_with_fresh_stale_calculation(self, mock_get_collection, service):
         """Test cache stats with fresh/stale entry calculation."""
         mock_collection = mock_get_collection.return_value
-        mock_collection.count_documents.side_effect = [100, 60]  # total, fresh
-        mock_collection.distinct.return_value = ["LOB-001", "LOB-005"]
+        mock_collection.aggregate.return_value = iter([
+            {"total": [{"count": 100}], "fresh": [{"count": 60}], "unique_cards": [{"count": 2}]}
+        ])
         
         stats = service.get_cache_stats()
         
@@ -1086,34 +1112,24 @@ class TestAdditionalCoverageEnhancements:
     def test_get_cache_stats_exception_handling(self, mock_get_collection, service):
         """Test cache stats exception handling."""
         mock_collection = mock_get_collection.return_value
-        mock_collection.count_documents.side_effect = Exception("Database error")
+        mock_collection.aggregate.side_effect = Exception("Database error")
         
         stats = service.get_cache_stats()
         assert stats == {}
 
     def test_cleanup_playwright_with_exceptions(self, service):
         """Test playwright cleanup with exceptions during cleanup."""
-        mock_browser = MagicMock()
-        mock_browser.close.side_effect = Exception("Cleanup error")
-        mock_playwright = MagicMock()
-        mock_playwright.stop.side_effect = Exception("Stop error")
-        
-        service._browser = mock_browser
-        service._playwright = mock_playwright
+        service.browser_pool = MagicMock()
+        service.browser_pool.shutdown.side_effect = Exception("Cleanup error")
         
         # Should not raise exception despite cleanup errors
         service.cleanup_playwright()
         
-        assert service._browser is None
-        assert service._playwright is None
+        service.browser_pool.shutdown.assert_called_once()
 
     def test_cleanup_playwright_without_resources(self, service):
-        """Test cleanup when no resources are set."""
-        service._browser = None
-        service._playwright = None
-        
+        """Test cleanup when the browser pool was never started."""
         # Should complete without errors
         service.cleanup_playwright()
         
-        assert service._browser is None
-        assert service._playwright is None
\ No newline at end of file
+        assert service.browser_pool.get_stats()["browser_running"] is False
@@ -0,0 +1,79 @@
+"""
+Unit tests for rate_limiter.py module.
+
+Tests token bucket bursts, pacing, timeouts, concurrent callers and the
+shared YGOPRODeck limiter.
+"""
+
+import threading
+import time
+
+from ygoapi.rate_limiter import TokenBucket, get_ygo_api_rate_limiter
+
+
+class TestTokenBucket:
+    """Test TokenBucket functionality."""
+
+    def test_burst_up_to_capacity_is_immediate(self):
+        """Test a full bucket hands out capacity tokens without waiting."""
+        bucket = TokenBucket(rate_per_second=1, capacity=3)
+
+        started = time.monotonic()
+        assert all(bucket.acquire() for _ in range(3))
+
+        assert time.monotonic() - started < 0.5
+        assert bucket.get_stats()["waited"] == 0
+
+    def test_empty_bucket_waits_for_refill(self):
+        """Test callers block until the next token is added."""
+        bucket = TokenBucket(rate_per_second=20, capacity=1)
+        bucket.acquire()
+
+        started = time.monotonic()
+        assert bucket.acquire() is True
+
+        assert time.monotonic() - started >= 0.03
+        stats = bucket.get_stats()
+        assert stats["waited"] == 1
+        assert stats["avg_wait_ms"] > 0
+
+    def test_timeout_returns_false(self):
+        """Test acquire gives up once the timeout expires."""
+        bucket = TokenBucket(rate_per_second=0.1, capacity=1)
+        bucket.acquire()
+
+        assert bucket.acquire(timeout=0.05) is False
+        assert bucket.get_stats()["timeouts"] == 1
+
+    def test_zero_rate_disables_limiting(self):
+        """Test a non-positive rate never blocks."""
+        bucket = TokenBucket(rate_per_second=0, capacity=1)
+
+        assert all(bucket.acquire(timeout=0) for _ in range(100))
+
+    def test_concurrent_callers_share_the_rate(self):
+        """Test threads together stay within burst plus rate times elapsed time."""
+        bucket = TokenBucket(rate_per_second=50, capacity=5)
+        acquired_at = []
+        lock = threading.Lock()
+
+        def worker():
+            for _ in range(5):
+                bucket.acquire()
+                with lock:
+                    acquired_at.append(time.monotonic())
+
+        started = time.monotonic()
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # 20 tokens with 5 available up front need at least 15 / 50 seconds of refill
+        assert len(acquired_at) == 20
+        assert max(acquired_at) - started >= 0.25
+
+    def test_global_limiter_is_shared(self):
+        """Test every caller gets the same YGOPRODeck limiter."""
+        assert get_ygo_api_rate_limiter() is get_ygo_api_rate_limiter()
@@ -7,12 +7,14 @@ success cases, error handling, and edge scenarios.
 
 import json
 import time
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from unittest.mock import MagicMock, Mock, patch
 
 import pytest
 from flask import Flask
 
+from ygoapi.card_services import CacheRebuildInProgressError
+from ygoapi.config import PRICE_HISTORY_DEFAULT_DAYS
 from ygoapi.routes import register_routes
 
 
@@ -320,6 +322,246 @@ class TestPriceCacheStatsEndpoint:
         assert data["success"] is False
 
 
+class TestStalePriceResponse:
+    """Test stale-while-revalidate responses from the price endpoint."""
+
+    @patch("ygoapi.routes.price_scraping_service")
+    def test_stale_response_is_marked(self, mock_service, client):
+        """Test stale cached data is flagged with its age."""
+        mock_service.scrape_card_price.return_value = {
+            "success": True,
+            "tcgplayer_price": 20.00,
+            "cached": True,
+            "stale": True,
+            "last_updated": datetime(2020, 1, 1, tzinfo=timezone.utc),
+        }
+
+        response = client.post(
+            "/cards/price",
+            data=json.dumps({"card_number": "LOB-001", "card_name": "Blue-Eyes", "card_rarity": "Ultra Rare"}),
+            content_type="application/json",
+        )
+
+        assert response.status_code == 200
+        data = response.get_json()
+        assert data["is_cached"] is True
+        assert data["is_stale"] is True
+        assert data["cache_age_hours"] > 0
+        assert data["message"] == "Stale price data retrieved from cache"
+
+
+class TestAsyncPriceJobs:
+    """Test async price scraping and job polling endpoints."""
+
+    @patch("ygoapi.routes.price_scraping_service")
+    @patch("ygoapi.routes.get_price_job_queue")
+    def test_async_price_request_returns_job_id(self, mock_get_queue, mock_service, client):
+        """Test async requests are queued and answered with 202."""
+        mock_get_queue.return_value.submit.return_value = "job123"
+
+        response = client.post(
+            "/cards/price",
+            data=json.dumps({"card_number": "LOB-001", "card_rarity": "Ultra Rare", "async": True}),
+            content_type="application/json",
+        )
+
+        assert response.status_code == 202
+        data = response.get_json()
+        assert data["job_id"] == "job123"
+        assert data["status"] == "queued"
+        assert data["status_url"] == "/cards/price/jobs/job123"
+        mock_service.scrape_card_price.assert_not_called()
+        payload = mock_get_queue.return_value.submit.call_args[0][0]
+        assert payload["card_number"] == "LOB-001"
+
+    @patch("ygoapi.routes.get_price_job_queue")
+    def test_get_completed_job_formats_result(self, mock_get_queue, client):
+        """Test completed jobs return the same body as a synchronous request."""
+        mock_get_queue.return_value.get_job.return_value = {
+            "job_id": "job123",
+            "status": "completed",
+            "payload": {"card_number": "LOB-001", "card_name": "", "card_rarity": "Ultra Rare"},
+            "result": {
+                "success": True,
+                "card_name": "Blue-Eyes White Dragon",
+                "tcgplayer_price": 25.99,
+                "cached": False,
+            },
+            "created_at": None,
+            "started_at": None,
+            "finished_at": None,
+        }
+
+        response = client.get("/cards/price/jobs/job123")
+
+        assert response.status_code == 200
+        data = response.get_json()
+        assert data["status"] == "completed"
+        assert data["result"]["data"]["tcg_price"] == 25.99
+        assert data["result"]["data"]["card_name"] == "Blue-Eyes White Dragon"
+        assert data["result_status_code"] == 200
+
+    @patch("ygoapi.routes.get_price_job_queue")
+    def test_get_pending_and_failed_jobs(self, mock_get_queue, client):
+        """Test pending jobs report status only and failed jobs include the error."""
+        mock_get_queue.return_value.get_job.return_value = {"job_id": "job123", "status": "running"}
+        data = client.get("/cards/price/jobs/job123").get_json()
+        assert data["status"] == "running"
+        assert "result" not in data
+
+        mock_get_queue.return_value.get_job.return_value = {
+            "job_id": "job123", "status": "failed", "error": "timeout"
+        }
+        data = client.get("/cards/price/jobs/job123").get_json()
+        assert data["status"] == "failed"
+        assert data["error"] == "timeout"
+
+    @patch("ygoapi.routes.get_price_job_queue")
+    def test_get_unknown_job(self, mock_get_queue, client):
+        """Test unknown or expired jobs return 404."""
+        mock_get_queue.return_value.get_job.return_value = None
+
+        response = client.get("/cards/price/jobs/missing")
+
+        assert response.status_code == 404
+        assert response.get_json()["success"] is False
+
+
+class TestPriceScrapingStatsEndpoint:
+    """Test price scraping statistics endpoint."""
+
+    @patch("ygoapi.routes.price_scraping_service")
+    def test_get_scraping_stats_success(self, mock_service, client):
+        """Test successful scraping stats retrieval."""
+        mock_service.get_scraping_stats.return_value = {
+            "coalescing": {"calls": 10, "deduplicated": 4},
+        }
+
+        response = client.get("/cards/price/scraping-stats")
+
+        assert response.status_code == 200
+        data = response.get_json()
+        assert data["success"] is True
+        assert data["scraping_stats"]["coalescing"]["deduplicated"] == 4
+
+    @patch("ygoapi.routes.price_scraping_service")
+    def test_get_scraping_stats_error(self, mock_service, client):
+        """Test scraping stats with error."""
+        mock_service.get_scraping_stats.side_effect = Exception("boom")
+
+        response = client.get("/cards/price/scraping-stats")
+
+        assert response.status_code == 500
+        assert response.get_json()["success"] is False
+
+
+class TestBatchPriceEndpoint:
+    """Test batch card price endpoint."""
+
+    @patch("ygoapi.routes.price_scraping_service")
+    def test_batch_price_success(self, mock_service, client):
+        """Test a batch request returns one result per item in order."""
+        mock_service.scrape_card_prices_batch.return_value = [
+            {"success": True, "card_number": "LOB-001", "cached": True, "tcgplayer_price": 25.99},
+            {"success": True, "card_number": "LOB-005", "cached": False, "tcgplayer_price": 45.00},
+        ]
+
+        request_data = {
+            "items": [
+                {"card_number": "LOB-001", "card_rarity": "Ultra Rare"},
+                {"card_number": "LOB-005", "card_rarity": "Secret Rare", "art_variant": "7th"},
+            ],
+            "force_refresh": "true",
+        }
+
+        response = client.post(
+            "/cards/price/batch",
+            data=json.dumps(request_data),
+            content_type="application/json",
+        )
+
+        assert response.status_code == 200
+        data = response.get_json()
+        assert data["success"] is True
+        assert [r["card_number"] for r in data["results"]] == ["LOB-001", "LOB-005"]
+        assert data["summary"]["total"] == 2
+        assert data["summary"]["cached"] == 1
+        assert data["summary"]["scraped"] == 1
+
+        items = mock_service.scrape_card_prices_batch.call_args[0][0]
+        assert items[1]["art_variant"] == "7th"
+        assert mock_service.scrape_card_prices_batch.call_args[1]["force_refresh"] is True
+
+    @patch("ygoapi.routes.price_scraping_service")
+    def test_batch_price_invalid_items_reported_in_place(self, mock_service, client):
+        """Test invalid items get an error result without failing the batch."""
+        mock_service.scrape_card_prices_batch.return_value = [
+            {"success": True, "card_number": "LOB-001", "cached": True},
+        ]
+
+        request_data = {
+            "items": [
+                {"card_number": "LOB-002"},
+                {"card_number": "LOB-001", "card_rarity": "Ultra Rare"},
+                "not-an-object",
+            ]
+        }
+
+        response = client.post(
+            "/cards/price/batch",
+            data=json.dumps(request_data),
+            content_type="application/json",
+        )
+
+        assert response.status_code == 200
+        data = response.get_json()
+        assert data["results"][0]["success"] is False
+        assert "card_rarity is required" in data["results"][0]["error"]
+        assert data["results"][1]["success"] is True
+        assert data["results"][2]["success"] is False
+        assert data["summary"]["failed"] == 2
+        assert len(mock_service.scrape_card_prices_batch.call_args[0][0]) == 1
+
+    def test_batch_price_requires_items(self, client):
+        """Test a batch without items is rejected."""
+        response = client.post(
+            "/cards/price/batch",
+            data=json.dumps({"items": []}),
+            content_type="application/json",
+        )
+
+        assert response.status_code == 400
+        assert "items must be a non-empty list" in response.get_json()["error"]
+
+    @patch("ygoapi.routes.PRICE_BATCH_MAX_ITEMS", 2)
+    def test_batch_price_too_many_items(self, client):
+        """Test batches above the configured size are rejected."""
+        items = [{"card_number": f"LOB-00{i}", "card_rarity": "Common"} for i in range(3)]
+
+        response = client.post(
+            "/cards/price/batch",
+            data=json.dumps({"items": items}),
+            content_type="application/json",
+        )
+
+        assert response.status_code == 400
+        assert "at most 2 items" in response.get_json()["error"]
+
+    @patch("ygoapi.routes.price_scraping_service")
+    def test_batch_price_server_error(self, mock_service, client):
+        """Test batch endpoint error handling."""
+        mock_service.scrape_card_prices_batch.side_effect = Exception("Database error")
+
+        response = client.post(
+            "/cards/price/batch",
+            data=json.dumps({"items": [{"card_number": "LOB-001", "card_rarity": "Ultra Rare"}]}),
+            content_type="application/json",
+        )
+
+        assert response.status_code == 500
+        assert response.get_json()["success"] is False
+
+
 class TestCardSetsEndpoints:
     """Test card sets related endpoints."""
 
@@ -493,6 +735,88 @@ class TestCardVariantsEndpoints:
         assert data["success"] is True
         assert "statistics" in data
 
+    @patch("ygoapi.routes.card_variant_service")
+    def test_upload_card_variants_bulk_mode(self, mock_service, client):
+        """Test ?mode=bulk builds from the full dump and unknown modes are rejected."""
+        mock_service.build_card_variants_from_dump.return_value = {"total_variants_created": 3, "statistics": {}}
+
+        response = client.post("/cards/upload-variants?mode=bulk")
+
+        assert response.status_code == 200
+        assert response.get_json()["mode"] == "bulk"
+        mock_service.build_card_variants_from_dump.assert_called_once()
+        mock_service.upload_card_variants_to_cache.assert_not_called()
+
+        response = client.post("/cards/upload-variants?mode=everything")
+        assert response.status_code == 400
+
+    @patch("ygoapi.routes.card_lookup_service")
+    @patch("ygoapi.routes.price_scraping_service")
+    @patch("ygoapi.routes.card_variant_service")
+    def test_upload_card_variants_invalidates_variant_caches(
+        self, mock_service, mock_price_service, mock_lookup_service, client
+    ):
+        """Test in-process card number maps are reset only after a successful rebuild."""
+        mock_service.upload_card_variants_to_cache.return_value = {"total_variants_created": 1, "statistics": {}}
+
+        assert client.post("/cards/upload-variants").status_code == 200
+
+        mock_price_service.invalidate_variant_caches.assert_called_once()
+        mock_lookup_service.card_number_index.clear.assert_called_once()
+
+        mock_service.upload_card_variants_to_cache.side_effect = Exception("Upload error")
+        assert client.post("/cards/upload-variants").status_code == 500
+        mock_price_service.invalidate_variant_caches.assert_called_once()
+
+    @patch("ygoapi.routes.card_lookup_service")
+    @patch("ygoapi.routes.price_scraping_service")
+    @patch("ygoapi.routes.card_variant_service")
+    def test_sync_card_variants(self, mock_service, mock_price_service, mock_lookup_service, client):
+        """Test the incremental sync endpoint returns the sync statistics and resets variant caches."""
+        mock_service.sync_card_variants.return_value = {
+            "statistics": {"new_sets": 2, "changed_sets": 1, "synced_sets": 3}
+        }
+
+        response = client.post("/cards/sync-variants")
+
+        assert response.status_code == 200
+        data = response.get_json()
+        assert data["success"] is True
+        assert data["statistics"]["synced_sets"] == 3
+        mock_price_service.invalidate_variant_caches.assert_called_once()
+        mock_lookup_service.card_number_index.clear.assert_called_once()
+
+        mock_service.sync_card_variants.side_effect = Exception("API down")
+        response = client.post("/cards/sync-variants")
+        assert response.status_code == 500
+        assert response.get_json()["success"] is False
+
+    @patch("ygoapi.routes.card_variant_service")
+    def test_variant_write_in_progress_returns_conflict(self, mock_service, client):
+        """Test overlapping rebuilds and syncs are answered with 409."""
+        busy = CacheRebuildInProgressError("Another card variant rebuild or sync is already running")
+        mock_service.upload_card_variants_to_cache.side_effect = busy
+        mock_service.sync_card_variants.side_effect = busy
+
+        assert client.post("/cards/upload-variants").status_code == 409
+        response = client.post("/cards/sync-variants")
+        assert response.status_code == 409
+        assert "already running" in response.get_json()["error"]
+
+    @patch("ygoapi.routes.card_variant_service")
+    def test_sync_card_variants_refused_and_forced(self, mock_service, client):
+        """Test a refused sync returns 409 and ?force=true is passed through."""
+        mock_service.sync_card_variants.side_effect = ValueError("Sync would remove 500 of 600 synced sets")
+
+        response = client.post("/cards/sync-variants")
+
+        assert response.status_code == 409
+        assert "500 of 600" in response.get_json()["error"]
+        mock_service.sync_card_variants.assert_called_with(force=False)
+
+        client.post("/cards/sync-variants?force=true")
+        mock_service.sync_card_variants.assert_called_with(force=True)
+
     @patch("ygoapi.routes.card_variant_service")
     def test_get_card_variants_from_cache_success(self, mock_service, client):
         """Test successful card variants retrieval."""
@@ -1086,3 +1410,110 @@ class TestErrorHandlingEnhancement:
         # Verify error handler is registered
         assert 500 in test_app.error_handler_spec[None]
         assert 404 in test_app.error_handler_spec[None]
+
+
+class TestRefreshProductsEndpoint:
+    """Test refreshing cached prices by TCGPlayer product id."""
+
+    @patch("ygoapi.routes.price_scraping_service")
+    def test_refresh_products_success(self, mock_service, client):
+        """Test product ids are passed through and summarized."""
+        mock_service.refresh_prices_by_product_id.return_value = [
+            {"success": True, "tcgplayer_product_id": "12345", "documents": 2, "saved": 2},
+            {"success": False, "tcgplayer_product_id": "67890", "documents": 1, "error": "No suitable variant found"},
+        ]
+
+        response = client.post(
+            "/cards/price/refresh-products",
+            data=json.dumps({"product_ids": ["12345", 67890]}),
+            content_type="application/json",
+        )
+
+        assert response.status_code == 200
+        data = response.get_json()
+        assert data["summary"]["products"] == 2
+        assert data["summary"]["documents"] == 3
+        assert data["summary"]["successful"] == 1
+        assert data["summary"]["failed"] == 1
+        assert mock_service.refresh_prices_by_product_id.call_args[0][0] == ["12345", "67890"]
+
+    @patch("ygoapi.routes.price_scraping_service")
+    def test_refresh_products_defaults_to_stale(self, mock_service, client):
+        """Test an empty body refreshes the stalest known products."""
+        mock_service.refresh_prices_by_product_id.return_value = []
+
+        response = client.post("/cards/price/refresh-products", data="{}", content_type="application/json")
+
+        assert response.status_code == 200
+        assert mock_service.refresh_prices_by_product_id.call_args[0][0] is None
+
+    @patch("ygoapi.routes.price_scraping_service")
+    def test_refresh_products_rejects_invalid_ids(self, mock_service, client):
+        """Test non-numeric product ids are rejected."""
+        response = client.post(
+            "/cards/price/refresh-products",
+            data=json.dumps({"product_ids": ["abc"]}),
+            content_type="application/json",
+        )
+
+        assert response.status_code == 400
+        mock_service.refresh_prices_by_product_id.assert_not_called()
+
+
+class TestPriceHistoryEndpoint:
+    """Test the daily price history endpoint."""
+
+    @patch("ygoapi.routes.price_scraping_service")
+    def test_history_success(self, mock_service, client):
+        """Test the range is parsed and daily points are returned."""
+        mock_service.get_price_history.return_value = [
+            {"date": "2024-01-01", "min_price": 20.0, "max_price": 25.0, "last_price": 22.5, "samples": 3},
+        ]
+
+        response = client.get(
+            "/cards/price/history?card_number=LOB-001&card_rarity=Ultra%20Rare"
+            "&start=2024-01-01&end=2024-02-01T00:00:00Z"
+        )
+
+        assert response.status_code == 200
+        data = response.get_json()
+        assert data["interval"] == "day"
+        assert data["points"][0]["last_price"] == 22.5
+        args = mock_service.get_price_history.call_args[0]
+        assert args[:3] == ("LOB-001", "Ultra Rare", None)
+        assert args[3] == datetime(2024, 1, 1, tzinfo=timezone.utc)
+        assert args[4] == datetime(2024, 2, 1, tzinfo=timezone.utc)
+
+    @patch("ygoapi.routes.price_scraping_service")
+    def test_history_defaults_to_recent_days(self, mock_service, client):
+        """Test omitting start and end returns the default trailing window."""
+        mock_service.get_price_history.return_value = []
+
+        response = client.get("/cards/price/history?card_number=LOB-001&card_rarity=Ultra%20Rare")
+
+        assert response.status_code == 200
+        start, end = mock_service.get_price_history.call_args[0][3:]
+        assert end - start == timedelta(days=PRICE_HISTORY_DEFAULT_DAYS)
+
+    @patch("ygoapi.routes.price_scraping_service")
+    def test_history_validation(self, mock_service, client):
+        """Test missing fields, bad dates and oversized ranges are rejected."""
+        for query in [
+            "card_number=LOB-001",
+            "card_number=LOB-001&card_rarity=Ultra%20Rare&start=yesterday",
+            "card_number=LOB-001&card_rarity=Ultra%20Rare&start=2024-02-01&end=2024-01-01",
+            "card_number=LOB-001&card_rarity=Ultra%20Rare&start=2020-01-01&end=2024-01-01",
+        ]:
+            response = client.get(f"/cards/price/history?{query}")
+            assert response.status_code == 400, query
+
+        mock_service.get_price_history.assert_not_called()
+
+    @patch("ygoapi.routes.price_scraping_service")
+    def test_history_unavailable(self, mock_service, client):
+        """Test a 503 when the history collection is unavailable."""
+        mock_service.get_price_history.return_value = None
+
+        response = client.get("/cards/price/history?card_number=LOB-001&card_rarity=Ultra%20Rare")
+
+        assert response.status_code == 503
@@ -0,0 +1,121 @@
+"""
+Unit tests for scraping_runtime.py module.
+
+Tests the background event loop thread, the thread-safe submit API,
+timeouts, shutdown and the global runtime instance.
+"""
+
+import asyncio
+import concurrent.futures
+import threading
+
+import pytest
+
+from ygoapi.scraping_runtime import ScrapingRuntime, get_scraping_runtime
+
+
+@pytest.fixture
+def runtime():
+    """Create a ScrapingRuntime and shut it down after the test."""
+    runtime = ScrapingRuntime(name="test-scraping-runtime")
+    yield runtime
+    runtime.shutdown()
+
+
+class TestScrapingRuntime:
+    """Test ScrapingRuntime functionality."""
+
+    def test_loop_starts_lazily(self, runtime):
+        """Test the loop thread is only started on first use."""
+        assert runtime.is_running() is False
+
+        runtime.start()
+
+        assert runtime.is_running() is True
+        assert runtime.get_stats()["loop_starts"] == 1
+
+    def test_submit_returns_concurrent_future(self, runtime):
+        """Test submit() returns a concurrent.futures.Future with the result."""
+        async def add(a, b):
+            await asyncio.sleep(0)
+            return a + b
+
+        future = runtime.submit(add(2, 3))
+
+        assert isinstance(future, concurrent.futures.Future)
+        assert future.result(timeout=5) == 5
+
+    def test_coroutines_share_one_loop(self, runtime):
+        """Test every submission runs on the same persistent loop and thread."""
+        async def current_loop_and_thread():
+            return asyncio.get_running_loop(), threading.current_thread().name
+
+        first = runtime.run(current_loop_and_thread(), timeout=5)
+        second = runtime.run(current_loop_and_thread(), timeout=5)
+
+        assert first == second
+        assert first[1] == "test-scraping-runtime"
+
+    def test_submit_from_many_threads(self, runtime):
+        """Test concurrent submissions from worker threads all complete."""
+        async def slow_echo(value):
+            await asyncio.sleep(0.01)
+            return value
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=5) as executor:
+            results = list(executor.map(lambda i: runtime.run(slow_echo(i), timeout=5), range(10)))
+
+        assert results == list(range(10))
+        stats = runtime.get_stats()
+        assert stats["submitted"] == 10
+        assert stats["completed"] == 10
+
+    def test_run_propagates_exceptions(self, runtime):
+        """Test exceptions raised by the coroutine reach the caller."""
+        async def fail():
+            raise ValueError("boom")
+
+        with pytest.raises(ValueError):
+            runtime.run(fail(), timeout=5)
+
+        assert runtime.get_stats()["failed"] == 1
+
+    def test_run_timeout_cancels_task(self, runtime):
+        """Test a timed-out coroutine is cancelled on the loop."""
+        cancelled = threading.Event()
+
+        async def never_finishes():
+            try:
+                await asyncio.sleep(60)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        with pytest.raises(concurrent.futures.TimeoutError):
+            runtime.run(never_finishes(), timeout=0.05)
+
+        assert cancelled.wait(timeout=5)
+        assert runtime.get_stats()["timed_out"] == 1
+
+    def test_shutdown_stops_loop_and_allows_restart(self, runtime):
+        """Test shutdown joins the thread and the runtime can start again."""
+        async def answer():
+            return 42
+
+        runtime.run(answer(), timeout=5)
+        runtime.shutdown()
+
+        assert runtime.is_running() is False
+
+        assert runtime.run(answer(), timeout=5) == 42
+        assert runtime.get_stats()["loop_starts"] == 2
+
+    def test_shutdown_without_start_is_noop(self):
+        """Test shutdown does nothing when the loop never started."""
+        runtime = ScrapingRuntime()
+        runtime.shutdown()
+        assert runtime.is_running() is False
+
+    def test_global_runtime_is_singleton(self):
+        """Test get_scraping_runtime() returns a shared instance."""
+        assert get_scraping_runtime() is get_scraping_runtime()
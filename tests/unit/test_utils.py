@@ -16,6 +16,7 @@ from ygoapi.utils import (
     extract_art_version,
     extract_booster_set_name,
     extract_set_code,
+    extract_tcgplayer_product_id,
     filter_cards_by_set,
     normalize_rarity,
     normalize_rarity_for_matching,
@@ -31,6 +32,7 @@ from ygoapi.utils import (
     format_datetime_for_api,
     map_rarity_to_tcgplayer_filter,
     map_set_code_to_tcgplayer_name,
+    iter_json_array_items,
 )
 
 
@@ -264,6 +266,64 @@ class TestBoosterSetExtraction:
             assert result is None
 
 
+class TestTCGPlayerProductIdExtraction:
+    """Test TCGPlayer product id extraction."""
+
+    def test_extract_product_id_from_url(self):
+        """Test the numeric id is read from product URLs."""
+        test_cases = [
+            ("https://www.tcgplayer.com/product/626754/yugioh-quarter-century-stampede-black-metal-dragon-secret-rare", "626754"),
+            ("https://www.tcgplayer.com/product/12345?Language=English", "12345"),
+            ("/product/987", "987"),
+        ]
+
+        for url, expected in test_cases:
+            assert extract_tcgplayer_product_id(url) == expected
+
+    def test_extract_product_id_invalid_url(self):
+        """Test URLs without a numeric product id return None."""
+        invalid_urls = [
+            "https://www.tcgplayer.com/search/yugioh/product?q=dragon",
+            "https://tcgplayer.com/product/yugioh-metal-raiders-card-ultra-rare",
+            "",
+            None,
+        ]
+
+        for url in invalid_urls:
+            assert extract_tcgplayer_product_id(url) is None
+
+
+class TestJsonArrayStreaming:
+    """Test incremental parsing of large JSON array responses."""
+
+    def _chunks(self, payload, size):
+        data = payload.encode("utf-8")
+        return [data[i:i + size] for i in range(0, len(data), size)]
+
+    def test_items_parsed_across_any_chunk_boundary(self):
+        """Test items, strings with brackets and multibyte characters survive any split."""
+        payload = '{"data": [{"id": 1, "name": "Gem-Knight ]Crystal,"}, {"id": 2, "name": "Dinomíst"}], "meta": {}}'
+
+        for size in (1, 2, 5, 64, len(payload)):
+            items = list(iter_json_array_items(self._chunks(payload, size), "data"))
+            assert [item["id"] for item in items] == [1, 2]
+            assert items[1]["name"] == "Dinomíst"
+
+    def test_empty_array(self):
+        """Test an empty array yields nothing."""
+        assert list(iter_json_array_items([b'{"data": []}'], "data")) == []
+
+    def test_missing_array_raises(self):
+        """Test a body without the array is an error, not an empty result."""
+        with pytest.raises(ValueError):
+            list(iter_json_array_items([b'{"error": "No card matching your query"}'], "data"))
+
+    def test_truncated_body_raises(self):
+        """Test a download cut off mid-item is reported."""
+        with pytest.raises(ValueError):
+            list(iter_json_array_items([b'{"data": [{"id": 1}, {"id": '], "data"))
+
+
 class TestSetCodeMapping:
     """Test set code mapping functions."""
 
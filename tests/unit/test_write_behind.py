@@ -0,0 +1,155 @@
+"""
+Unit tests for write_behind.py module.
+
+Tests buffering and last-write-wins coalescing, size and timer triggered
+flushes, read-your-writes visibility, failure re-queueing and statistics.
+"""
+
+import threading
+import time
+from unittest.mock import Mock
+
+import pytest
+
+from ygoapi.write_behind import WriteBehindBuffer
+
+
+@pytest.fixture
+def collection():
+    """Mock collection whose bulk_write reports every operation as upserted."""
+    collection = Mock()
+    collection.bulk_write.side_effect = lambda operations, ordered: Mock(
+        upserted_count=len(operations), modified_count=0
+    )
+    return collection
+
+
+@pytest.fixture
+def buffer(collection):
+    """Create a buffer with a long flush interval and shut it down after the test."""
+    buffer = WriteBehindBuffer(lambda: collection, max_batch_size=3, flush_interval_seconds=60)
+    yield buffer
+    buffer.shutdown(timeout=1)
+
+
+class TestWriteBehindBuffer:
+    """Test WriteBehindBuffer functionality."""
+
+    def test_flush_writes_one_unordered_bulk(self, buffer, collection):
+        """Test buffered operations are written with a single unordered bulk_write."""
+        buffer.add("a", {"k": "a"}, {"k": "a", "v": 1})
+        buffer.add("b", {"k": "b"}, {"k": "b", "v": 2})
+
+        assert buffer.flush() == 2
+
+        operations = collection.bulk_write.call_args[0][0]
+        assert len(operations) == 2
+        assert collection.bulk_write.call_args[1]["ordered"] is False
+        assert operations[0]._doc == {"k": "a", "v": 1}
+        assert buffer.size() == 0
+
+    def test_same_key_coalesced(self, buffer, collection):
+        """Test a document saved twice before a flush is written once with the latest value."""
+        buffer.add("a", {"k": "a"}, {"k": "a", "v": 1})
+        buffer.add("a", {"k": "a"}, {"k": "a", "v": 2})
+
+        buffer.flush()
+
+        operations = collection.bulk_write.call_args[0][0]
+        assert len(operations) == 1
+        assert operations[0]._doc["v"] == 2
+        assert buffer.get_stats()["coalesced"] == 1
+
+    def test_pending_documents_visible_until_flushed(self, buffer):
+        """Test readers see buffered documents before they reach MongoDB."""
+        buffer.add("a", {"k": "a"}, {"k": "a", "v": 1})
+
+        assert buffer.pending_documents() == [{"k": "a", "v": 1}]
+
+        buffer.flush()
+
+        assert buffer.pending_documents() == []
+
+    def test_full_buffer_flushes_in_background(self, buffer, collection):
+        """Test reaching max_batch_size wakes the flush thread."""
+        for key in ("a", "b", "c"):
+            buffer.add(key, {"k": key}, {"k": key})
+
+        deadline = time.time() + 5
+        while collection.bulk_write.call_count == 0 and time.time() < deadline:
+            time.sleep(0.01)
+
+        collection.bulk_write.assert_called_once()
+
+    def test_timer_flushes_partial_batch(self, collection):
+        """Test a partial batch is flushed after the flush interval."""
+        buffer = WriteBehindBuffer(lambda: collection, max_batch_size=100, flush_interval_seconds=0.05)
+        try:
+            buffer.add("a", {"k": "a"}, {"k": "a"})
+
+            deadline = time.time() + 5
+            while collection.bulk_write.call_count == 0 and time.time() < deadline:
+                time.sleep(0.01)
+
+            collection.bulk_write.assert_called_once()
+        finally:
+            buffer.shutdown(timeout=1)
+
+    def test_failed_flush_requeues_batch(self, buffer, collection):
+        """Test a failed bulk write keeps the operations for the next flush."""
+        collection.bulk_write.side_effect = Exception("network error")
+        buffer.add("a", {"k": "a"}, {"k": "a"})
+
+        assert buffer.flush() == 0
+        assert buffer.size() == 1
+        assert buffer.get_stats()["failed_flushes"] == 1
+
+        collection.bulk_write.side_effect = None
+        collection.bulk_write.return_value = Mock(upserted_count=1, modified_count=0)
+        assert buffer.flush() == 1
+
+    def test_shutdown_flushes_remaining(self, buffer, collection):
+        """Test shutdown writes whatever is still buffered."""
+        buffer.add("a", {"k": "a"}, {"k": "a"})
+
+        buffer.shutdown(timeout=1)
+
+        collection.bulk_write.assert_called_once()
+        assert buffer.size() == 0
+
+    def test_on_flush_receives_result_and_stats_recorded(self, collection):
+        """Test the flush callback gets the bulk result and batch stats are kept."""
+        flushed = []
+        buffer = WriteBehindBuffer(lambda: collection, max_batch_size=10, flush_interval_seconds=60, on_flush=flushed.append)
+        try:
+            buffer.add("a", {"k": "a"}, {"k": "a"})
+            buffer.add("b", {"k": "b"}, {"k": "b"})
+            buffer.flush()
+        finally:
+            buffer.shutdown(timeout=1)
+
+        assert flushed[0].upserted_count == 2
+        stats = buffer.get_stats()
+        assert stats["flushes"] == 1
+        assert stats["flushed_operations"] == 2
+        assert stats["max_batch_size"] == 2
+        assert stats["avg_batch_size"] == 2.0
+        assert stats["last_flush_ms"] >= 0
+
+    def test_concurrent_adds_all_written(self, collection):
+        """Test adds from many threads are all flushed exactly once."""
+        buffer = WriteBehindBuffer(lambda: collection, max_batch_size=25, flush_interval_seconds=0.01)
+
+        def add_range(start):
+            for i in range(start, start + 50):
+                buffer.add(i, {"k": i}, {"k": i})
+
+        threads = [threading.Thread(target=add_range, args=(n * 50,)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        buffer.shutdown(timeout=1)
+
+        written = sum(len(call[0][0]) for call in collection.bulk_write.call_args_list)
+        assert written == 200
@@ -133,9 +133,15 @@ def run_app():
     print("  GET /card-sets/<set_name>/cards - Get all cards from a specific set")
     print("  GET /card-sets/count - Get total count of card sets")
     print("  POST /cards/price - Scrape card prices")
+    print("  POST /cards/price/batch - Scrape prices for a list of cards")
+    print("  GET /cards/price/jobs/<job_id> - Get status or result of an async price scrape")
+    print("  POST /cards/price/refresh-products - Refresh cached prices by TCGPlayer product id")
+    print("  GET /cards/price/history - Get daily price history for a card")
     print("  GET /cards/price/cache-stats - Get price cache statistics")
+    print("  GET /cards/price/scraping-stats - Get scraping coalescing, browser pool and job queue statistics")
     print("  POST /debug/art-extraction - Debug art variant extraction")
-    print("  POST /cards/upload-variants - Upload card variants to MongoDB")
+    print("  POST /cards/upload-variants - Upload card variants to MongoDB (?mode=bulk for one full dump)")
+    print("  POST /cards/sync-variants - Sync variants for new or changed sets only")
     print("  GET /cards/variants - Get card variants from MongoDB cache")
     print("  GET /memory/stats - Get memory usage statistics")
     print("  POST /memory/cleanup - Force memory cleanup")
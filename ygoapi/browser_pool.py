@@ -0,0 +1,382 @@
+"""
+Browser Pool Module
+
+Maintains a bounded pool of warm Playwright browser contexts for price scraping.
+Each scrape leases a pre-created context and page instead of launching Chromium,
+and contexts are recycled after a number of navigations or under memory pressure.
+Contexts abort non-essential requests (images, fonts, media, trackers).
+"""
+
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlparse
+
+from playwright.async_api import async_playwright
+
+from .config import (
+    PLAYWRIGHT_ACQUIRE_TIMEOUT_SECONDS,
+    PLAYWRIGHT_BLOCK_ALLOWLIST,
+    PLAYWRIGHT_BLOCK_REQUESTS,
+    PLAYWRIGHT_BLOCKED_DOMAINS,
+    PLAYWRIGHT_BLOCKED_RESOURCE_TYPES,
+    PLAYWRIGHT_MAX_NAVIGATIONS_PER_CONTEXT,
+    PLAYWRIGHT_POOL_SIZE,
+    SELENIUM_HEADLESS,
+)
+from .scraping_runtime import ScrapingRuntime, get_scraping_runtime
+
+logger = logging.getLogger(__name__)
+
+TCGPLAYER_USER_AGENT = (
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36"
+)
+
+
+class RequestBlocker:
+    """
+    Playwright route handler that aborts requests a price scrape doesn't need.
+
+    Requests are blocked by resource type (images, fonts, media by default) or
+    by tracker domain; URLs matching the allowlist always go through.
+    """
+
+    def __init__(
+        self,
+        blocked_resource_types: Optional[List[str]] = None,
+        blocked_domains: Optional[List[str]] = None,
+        allowlist: Optional[List[str]] = None,
+    ):
+        self.blocked_resource_types = set(
+            PLAYWRIGHT_BLOCKED_RESOURCE_TYPES if blocked_resource_types is None else blocked_resource_types
+        )
+        self.blocked_domains = list(PLAYWRIGHT_BLOCKED_DOMAINS if blocked_domains is None else blocked_domains)
+        self.allowlist = list(PLAYWRIGHT_BLOCK_ALLOWLIST if allowlist is None else allowlist)
+        self._stats = {
+            "allowed_requests": 0,
+            "blocked_requests": 0,
+            "blocked_by_resource_type": {},
+            "blocked_by_domain": {},
+            "allowlisted_requests": 0,
+            "route_errors": 0,
+        }
+
+    def _match_blocked_domain(self, url: str) -> Optional[str]:
+        """Return the blocked domain a URL's host belongs to, if any."""
+        host = (urlparse(url).hostname or "").lower()
+        for domain in self.blocked_domains:
+            if host == domain or host.endswith(f".{domain}"):
+                return domain
+        return None
+
+    def get_block_reason(self, url: str, resource_type: str) -> Optional[str]:
+        """
+        Decide whether a request should be blocked.
+
+        Args:
+            url: Request URL
+            resource_type: Playwright resource type (document, image, font, ...)
+
+        Returns:
+            Optional[str]: "resource_type" or "domain" if blocked, None if allowed
+        """
+        lowered_url = url.lower()
+        if any(entry in lowered_url for entry in self.allowlist):
+            self._stats["allowlisted_requests"] += 1
+            return None
+
+        if resource_type in self.blocked_resource_types:
+            counts = self._stats["blocked_by_resource_type"]
+            counts[resource_type] = counts.get(resource_type, 0) + 1
+            return "resource_type"
+
+        domain = self._match_blocked_domain(url)
+        if domain:
+            counts = self._stats["blocked_by_domain"]
+            counts[domain] = counts.get(domain, 0) + 1
+            return "domain"
+
+        return None
+
+    async def handle(self, route: Any) -> None:
+        """Route handler registered on each pooled browser context."""
+        try:
+            request = route.request
+            if self.get_block_reason(request.url, request.resource_type):
+                self._stats["blocked_requests"] += 1
+                await route.abort("blockedbyclient")
+            else:
+                self._stats["allowed_requests"] += 1
+                await route.continue_()
+        except Exception as e:
+            # Never let interception break a scrape; the page may also have closed
+            self._stats["route_errors"] += 1
+            logger.debug(f"Request routing error: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get request blocking statistics."""
+        return {
+            **self._stats,
+            "blocked_by_resource_type": dict(self._stats["blocked_by_resource_type"]),
+            "blocked_by_domain": dict(self._stats["blocked_by_domain"]),
+        }
+
+
+class PooledContext:
+    """A browser context with its pre-created page and usage counters."""
+
+    def __init__(self, context: Any, page: Any, generation: int):
+        self.context = context
+        self.page = page
+        self.generation = generation
+        self.navigations = 0
+        self.leases = 0
+        page.on("framenavigated", self._on_frame_navigated)
+
+    def _on_frame_navigated(self, frame: Any) -> None:
+        """Count main-frame navigations only."""
+        if getattr(frame, "parent_frame", None) is None:
+            self.navigations += 1
+
+
+class BrowserPool:
+    """
+    Bounded pool of Playwright browser contexts sharing one Chromium process.
+
+    All Playwright objects live on the scraping runtime's event loop, so
+    callers from synchronous code submit their coroutines with run().
+    """
+
+    def __init__(
+        self,
+        size: int = PLAYWRIGHT_POOL_SIZE,
+        max_navigations: int = PLAYWRIGHT_MAX_NAVIGATIONS_PER_CONTEXT,
+        acquire_timeout: float = PLAYWRIGHT_ACQUIRE_TIMEOUT_SECONDS,
+        headless: bool = SELENIUM_HEADLESS,
+        memory_manager: Any = None,
+        runtime: Optional[ScrapingRuntime] = None,
+        block_requests: bool = PLAYWRIGHT_BLOCK_REQUESTS,
+    ):
+        self.size = max(1, size)
+        self.max_navigations = max(1, max_navigations)
+        self.acquire_timeout = acquire_timeout
+        self.headless = headless
+        self.memory_manager = memory_manager
+        self.runtime = runtime or get_scraping_runtime()
+        self.request_blocker = RequestBlocker() if block_requests else None
+
+        self._playwright = None
+        self._browser = None
+        self._idle: Optional[asyncio.Queue] = None
+        self._start_lock: Optional[asyncio.Lock] = None
+        self._generation = 0
+        self._bound_loop: Optional[asyncio.AbstractEventLoop] = None
+
+        self._stats = {
+            "browser_launches": 0,
+            "contexts_created": 0,
+            "contexts_recycled": 0,
+            "leases": 0,
+            "recycled_for_navigations": 0,
+            "recycled_for_memory_pressure": 0,
+            "recycled_after_error": 0,
+        }
+
+    def run(self, coro, timeout: Optional[float] = None) -> Any:
+        """
+        Run a coroutine on the scraping runtime and wait for its result.
+
+        Args:
+            coro: Coroutine to run
+            timeout: Maximum seconds to wait for the result
+
+        Returns:
+            Any: Result of the coroutine
+        """
+        return self.runtime.run(coro, timeout=timeout)
+
+    # ==================== POOL LIFECYCLE ====================
+
+    def _is_browser_connected(self) -> bool:
+        """Check whether the pooled browser is still usable."""
+        if self._browser is None:
+            return False
+        try:
+            return bool(self._browser.is_connected())
+        except Exception:
+            return False
+
+    async def _ensure_started(self) -> None:
+        """Launch the browser and pre-create contexts if the pool is not running."""
+        loop = asyncio.get_running_loop()
+        if self._bound_loop is not loop:
+            # Playwright objects and asyncio primitives belong to one loop; if the
+            # runtime was restarted, anything from the old loop is unusable.
+            self._bound_loop = loop
+            self._playwright = None
+            self._browser = None
+            self._generation += 1
+            self._start_lock = asyncio.Lock()
+            self._idle = asyncio.Queue()
+
+        if self._is_browser_connected():
+            return
+
+        async with self._start_lock:
+            if self._is_browser_connected():
+                return
+
+            # Drop anything left over from a crashed or closed browser
+            await self._close_resources()
+
+            self._playwright = await async_playwright().start()
+            self._browser = await self._playwright.chromium.launch(headless=self.headless)
+            self._stats["browser_launches"] += 1
+
+            for _ in range(self.size):
+                self._idle.put_nowait(await self._create_context())
+
+            logger.info(f"Browser pool started with {self.size} warm contexts")
+
+    async def _create_context(self) -> PooledContext:
+        """Create a new browser context with one page ready for navigation."""
+        context = await self._browser.new_context(user_agent=TCGPLAYER_USER_AGENT)
+        if self.request_blocker is not None:
+            await context.route("**/*", self.request_blocker.handle)
+        page = await context.new_page()
+        self._stats["contexts_created"] += 1
+        return PooledContext(context, page, self._generation)
+
+    async def _close_context(self, pooled: PooledContext) -> None:
+        """Close a pooled context, ignoring errors from a dead browser."""
+        try:
+            await pooled.context.close()
+        except Exception as e:
+            logger.debug(f"Error closing pooled context: {e}")
+
+    async def _close_resources(self) -> None:
+        """Close idle contexts, the browser and Playwright, invalidating leased contexts."""
+        self._generation += 1
+
+        if self._idle is not None:
+            while not self._idle.empty():
+                await self._close_context(self._idle.get_nowait())
+
+        if self._browser is not None:
+            try:
+                await self._browser.close()
+            except Exception as e:
+                logger.warning(f"Error closing pooled browser: {e}")
+            finally:
+                self._browser = None
+
+        if self._playwright is not None:
+            try:
+                await self._playwright.stop()
+            except Exception as e:
+                logger.warning(f"Error stopping Playwright: {e}")
+            finally:
+                self._playwright = None
+
+    async def close(self) -> None:
+        """Shut down the pool, closing every idle context and the browser."""
+        if self._start_lock is None:
+            await self._close_resources()
+            return
+        async with self._start_lock:
+            await self._close_resources()
+        logger.info("Browser pool closed")
+
+    def shutdown(self, timeout: float = 30.0) -> None:
+        """
+        Shut down the pool from synchronous code.
+
+        Safe to call from any thread, including memory manager cleanup callbacks.
+        """
+        if not self.runtime.is_running():
+            return
+        if self._browser is None and self._playwright is None:
+            return
+        try:
+            self.run(self.close(), timeout=timeout)
+        except Exception as e:
+            logger.error(f"Error shutting down browser pool: {e}")
+
+    # ==================== LEASING ====================
+
+    def _is_under_memory_pressure(self) -> bool:
+        """Ask the memory manager whether contexts should be recycled early."""
+        if self.memory_manager is None:
+            return False
+        try:
+            return self.memory_manager.is_memory_warning() is True
+        except Exception:
+            return False
+
+    @asynccontextmanager
+    async def acquire(self):
+        """
+        Lease a warm page from the pool.
+
+        Yields:
+            Page: Playwright page owned by the leased context
+        """
+        await self._ensure_started()
+        pooled = await asyncio.wait_for(self._idle.get(), timeout=self.acquire_timeout)
+        self._stats["leases"] += 1
+        succeeded = False
+        try:
+            yield pooled.page
+            succeeded = True
+        finally:
+            await self._release(pooled, succeeded)
+
+    async def _release(self, pooled: PooledContext, succeeded: bool) -> None:
+        """Return a context to the pool, replacing it when it should be recycled."""
+        pooled.leases += 1
+
+        if pooled.generation != self._generation:
+            # The browser was restarted or closed while this context was leased
+            await self._close_context(pooled)
+            return
+
+        reason = None
+        if not succeeded:
+            reason = "recycled_after_error"
+        elif pooled.navigations >= self.max_navigations:
+            reason = "recycled_for_navigations"
+        elif self._is_under_memory_pressure():
+            reason = "recycled_for_memory_pressure"
+
+        if reason is None:
+            self._idle.put_nowait(pooled)
+            return
+
+        self._stats[reason] += 1
+        self._stats["contexts_recycled"] += 1
+        await self._close_context(pooled)
+
+        try:
+            self._idle.put_nowait(await self._create_context())
+        except Exception as e:
+            # A context that cannot be created means the browser is unhealthy;
+            # restart it so the pool returns to full size.
+            logger.warning(f"Could not replace recycled context, restarting browser: {e}")
+            try:
+                await self.close()
+                await self._ensure_started()
+            except Exception as restart_error:
+                logger.error(f"Browser pool restart failed: {restart_error}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get pool statistics."""
+        return {
+            **self._stats,
+            "pool_size": self.size,
+            "idle_contexts": self._idle.qsize() if self._idle is not None else 0,
+            "browser_running": self._is_browser_connected(),
+            "max_navigations_per_context": self.max_navigations,
+            "request_blocking": self.request_blocker.get_stats() if self.request_blocker else None,
+        }
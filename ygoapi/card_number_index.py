@@ -0,0 +1,173 @@
+"""
+Card Number Index Module
+
+Resolves card numbers (e.g. "LOB-001") to cached card variants with an exact
+match on the canonical card_number_key field instead of regex scans, and keeps
+an in-process card number -> card name map warmed from the variants collection.
+"""
+
+import logging
+import re
+import threading
+from typing import Any, Dict, Optional
+
+from .utils import normalize_card_number
+
+logger = logging.getLogger(__name__)
+
+
+class CardNumberIndex:
+    """
+    Exact-match card number lookups backed by an in-process name map.
+
+    The map is filled by warm() (usually from a background thread) and by every
+    successful lookup, so repeated price requests for the same card number never
+    reach MongoDB just to find the card name.
+    """
+
+    def __init__(self, regex_fallback: bool = False, name: str = "card-number-index"):
+        self.regex_fallback = regex_fallback
+        self.name = name
+        self._names: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self._warm_thread: Optional[threading.Thread] = None
+        self._warmed = False
+        self._stats = {
+            "map_hits": 0,
+            "map_misses": 0,
+            "exact_hits": 0,
+            "regex_fallback_hits": 0,
+            "lookup_misses": 0,
+            "warm_runs": 0,
+            "warm_errors": 0,
+        }
+
+    # ==================== NAME MAP ====================
+
+    def get_name(self, card_number: str) -> Optional[str]:
+        """Card name for card_number from the in-process map, if known."""
+        key = normalize_card_number(card_number)
+        with self._lock:
+            card_name = self._names.get(key)
+            self._stats["map_hits" if card_name else "map_misses"] += 1
+        return card_name
+
+    def remember(self, card_number: str, card_name: Optional[str]) -> None:
+        """Add a card number -> card name pair to the map."""
+        key = normalize_card_number(card_number)
+        if key and card_name:
+            with self._lock:
+                self._names[key] = card_name
+
+    def clear(self) -> None:
+        """Forget every mapped card name, e.g. after the variants collection was rebuilt."""
+        with self._lock:
+            self._names.clear()
+            self._warmed = False
+
+    def warm(self, collection) -> int:
+        """
+        Load every card number -> card name pair from the variants collection.
+
+        Only the three fields needed are projected and the cursor is streamed,
+        so the full variant documents are never held in memory.
+
+        Returns:
+            int: Number of distinct card numbers in the map afterwards
+        """
+        try:
+            names = {}
+            cursor = collection.find({}, {"_id": 0, "card_number_key": 1, "set_code": 1, "card_name": 1})
+            for variant in cursor:
+                key = variant.get("card_number_key") or normalize_card_number(variant.get("set_code"))
+                if key and variant.get("card_name"):
+                    names[key] = variant["card_name"]
+
+            with self._lock:
+                self._names.update(names)
+                self._warmed = True
+                self._stats["warm_runs"] += 1
+                size = len(self._names)
+            logger.info(f"Warmed card number map with {size} card numbers ({self.name})")
+            return size
+
+        except Exception as e:
+            with self._lock:
+                self._stats["warm_errors"] += 1
+            logger.warning(f"Failed to warm card number map ({self.name}): {e}")
+            return 0
+
+    def warm_in_background(self, collection) -> None:
+        """Run warm() in a daemon thread unless one is already running."""
+        with self._lock:
+            if self._warm_thread is not None and self._warm_thread.is_alive():
+                return
+            self._warm_thread = threading.Thread(
+                target=self.warm,
+                args=(collection,),
+                name=f"{self.name}-warm",
+                daemon=True
+            )
+            self._warm_thread.start()
+
+    # ==================== VARIANT LOOKUP ====================
+
+    def find_variant(
+        self,
+        collection,
+        card_number: str,
+        regex_fallback: Optional[bool] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Find a cached variant for card_number.
+
+        Matches card_number_key exactly, or set_code exactly for variants
+        uploaded before card_number_key existed; both are indexed. Unanchored
+        regex scans of set_code and then card_name only run when regex
+        fallback is enabled.
+
+        Args:
+            collection: Card variants collection
+            card_number: Card number to look up
+            regex_fallback: Override the index's regex fallback setting
+
+        Returns:
+            Optional[Dict]: Variant document without _id, if found
+        """
+        key = normalize_card_number(card_number)
+        if not key:
+            return None
+
+        result = collection.find_one(
+            {"$or": [{"card_number_key": key}, {"set_code": key}]},
+            {"_id": 0}
+        )
+        if result:
+            self._increment_stat("exact_hits")
+            self.remember(key, result.get("card_name"))
+            return result
+
+        if self.regex_fallback if regex_fallback is None else regex_fallback:
+            pattern = re.escape(card_number.strip())
+            result = collection.find_one({"set_code": {"$regex": pattern, "$options": "i"}}, {"_id": 0})
+            if not result:
+                result = collection.find_one({"card_name": {"$regex": pattern, "$options": "i"}}, {"_id": 0})
+            if result:
+                self._increment_stat("regex_fallback_hits")
+                return result
+
+        self._increment_stat("lookup_misses")
+        return None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get map size and lookup statistics."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["size"] = len(self._names)
+            stats["warmed"] = self._warmed
+        stats["regex_fallback_enabled"] = self.regex_fallback
+        return stats
+
+    def _increment_stat(self, key: str) -> None:
+        with self._lock:
+            self._stats[key] += 1
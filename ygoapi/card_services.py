@@ -5,24 +5,41 @@ Provides card-related services including card set management, card variant proce
 and card data operations with memory optimization.
 """
 
+import functools
 import logging
+import random
+import threading
 import time
-from typing import Dict, List, Optional, Any, Generator
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Callable, Dict, Iterable, List, Optional, Any, Generator, Tuple
 from datetime import datetime, timezone
 from urllib.parse import quote
 import requests
+from pymongo import ReplaceOne, UpdateOne
+from pymongo.errors import BulkWriteError
 
 from .config import (
     YGO_API_BASE_URL,
-    API_RATE_LIMIT_DELAY,
+    CARD_DUMP_CHUNK_BYTES,
+    CARD_LOOKUP_REGEX_FALLBACK,
     CARD_PROCESSING_BATCH_SIZE,
-    CARD_PROCESSING_DELAY
+    CARD_PROCESSING_DELAY,
+    CARD_VARIANT_FETCH_MAX_RETRIES,
+    CARD_VARIANT_FETCH_RETRY_BACKOFF_SECONDS,
+    CARD_VARIANT_FETCH_WORKERS,
+    CARD_VARIANT_REBUILD_MAX_FAILED_FRACTION,
+    CARD_VARIANT_SYNC_MAX_REMOVED_FRACTION,
+    CARD_VARIANT_SYNC_MAX_REMOVED_SETS
 )
 from .database import (
+    get_card_set_sync_ledger_collection,
     get_card_sets_collection,
     get_card_variants_collection,
-    get_database_manager
+    get_database_manager,
+    get_staging_collection,
+    promote_staging_collection
 )
+from .card_number_index import CardNumberIndex
 from .models import ProcessingStats, CardModel, CardVariantModel
 from .utils import (
     generate_variant_id,
@@ -30,18 +47,48 @@ from .utils import (
     normalize_rarity,
     batch_process_generator,
     get_current_utc_datetime,
-    filter_cards_by_set
+    filter_cards_by_set,
+    iter_json_array_items,
+    normalize_card_number
 )
 from .memory_manager import monitor_memory, get_memory_manager
+from .rate_limiter import get_ygo_api_rate_limiter
 
 logger = logging.getLogger(__name__)
 
+
+class CacheRebuildInProgressError(Exception):
+    """Raised when a rebuild or sync of a collection starts while another one is running."""
+
+
+# Full rebuilds and incremental syncs of the same collection run one at a time in this process;
+# a variant sync during a rebuild would write into a collection that is about to be replaced
+_card_sets_write_lock = threading.Lock()
+_card_variants_write_lock = threading.Lock()
+
+
+def _exclusive_collection_write(lock: threading.Lock, description: str) -> Callable:
+    """Run the decorated method only if lock is free, raising CacheRebuildInProgressError otherwise."""
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not lock.acquire(blocking=False):
+                raise CacheRebuildInProgressError(f"Another {description} is already running")
+            try:
+                return func(*args, **kwargs)
+            finally:
+                lock.release()
+        return wrapper
+    return decorator
+
+
 class CardSetService:
     """Service for managing card sets."""
     
     def __init__(self):
         self.memory_manager = get_memory_manager()
         self.db_manager = get_database_manager()
+        self.rate_limiter = get_ygo_api_rate_limiter()
     
     @monitor_memory
     def fetch_all_card_sets(self) -> List[Dict[str, Any]]:
@@ -54,6 +101,7 @@ class CardSetService:
         try:
             logger.info("Fetching all card sets from YGO API")
             
+            self.rate_limiter.acquire()
             response = requests.get(
                 f"{YGO_API_BASE_URL}/cardsets.php",
                 timeout=30
@@ -72,10 +120,14 @@ class CardSetService:
             raise
     
     @monitor_memory
+    @_exclusive_collection_write(_card_sets_write_lock, "card set upload")
     def upload_card_sets_to_cache(self) -> Dict[str, Any]:
         """
         Upload card sets to MongoDB cache.
         
+        Sets are inserted and indexed in a staging collection that is then
+        renamed over the live one, so readers never see a partial set list.
+        
         Returns:
             Dict: Upload results and statistics
         """
@@ -92,29 +144,32 @@ class CardSetService:
                 card_set['_uploaded_at'] = upload_timestamp
                 card_set['_source'] = 'ygoprodeck_api'
             
-            # Clear existing data
-            delete_result = collection.delete_many({})
-            logger.info(f"Cleared {delete_result.deleted_count} existing documents")
-            
-            # Insert new data in batches to manage memory
-            inserted_count = 0
-            for batch in batch_process_generator(card_sets_data, CARD_PROCESSING_BATCH_SIZE):
-                insert_result = collection.insert_many(batch)
-                inserted_count += len(insert_result.inserted_ids)
+            staging_collection = get_staging_collection(collection)
+            try:
+                # Insert new data in batches to manage memory
+                inserted_count = 0
+                for batch in batch_process_generator(card_sets_data, CARD_PROCESSING_BATCH_SIZE):
+                    insert_result = staging_collection.insert_many(batch)
+                    inserted_count += len(insert_result.inserted_ids)
+                    
+                    # Check memory usage during batch processing
+                    self.memory_manager.check_memory_and_cleanup()
                 
-                # Check memory usage during batch processing
-                self.memory_manager.check_memory_and_cleanup()
-            
-            # Create indexes
-            collection.create_index("set_code")
-            collection.create_index("set_name")
-            collection.create_index("_uploaded_at")
+                # Create indexes before the swap so the live collection is never unindexed
+                staging_collection.create_index("set_code")
+                staging_collection.create_index("set_name")
+                staging_collection.create_index("_uploaded_at")
+                
+                previous_count = promote_staging_collection(staging_collection, collection)
+            except Exception:
+                staging_collection.drop()
+                raise
             
             logger.info(f"Successfully uploaded {inserted_count} card sets to MongoDB")
             
             return {
                 "total_sets_uploaded": inserted_count,
-                "previous_documents_cleared": delete_result.deleted_count,
+                "previous_documents_cleared": previous_count,
                 "upload_timestamp": upload_timestamp.isoformat()
             }
             
@@ -213,6 +268,8 @@ class CardVariantService:
     def __init__(self):
         self.memory_manager = get_memory_manager()
         self.db_manager = get_database_manager()
+        # Shared with every other YGOPRODeck API call so concurrent fetches stay within the API budget
+        self.rate_limiter = get_ygo_api_rate_limiter()
     
     @monitor_memory
     def fetch_cards_from_set(self, set_name: str) -> List[Dict[str, Any]]:
@@ -232,6 +289,7 @@ class CardVariantService:
             # Make request to YGO API
             api_url = f"{YGO_API_BASE_URL}/cardinfo.php?cardset={encoded_set_name}"
             logger.info(f"Fetching cards from set: {set_name}")
+            self.rate_limiter.acquire()
             response = requests.get(api_url, timeout=15)
             
             if response.status_code == 200:
@@ -257,13 +315,37 @@ class CardVariantService:
             logger.error(f"Error fetching cards from set {set_name}: {e}")
             raise
     
+    def _fetch_cards_from_set_with_retries(self, set_name: str) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Fetch a set's cards, retrying failures with exponential backoff.
+        
+        Args:
+            set_name: Name of the set
+            
+        Returns:
+            Tuple[List[Dict], int]: Filtered cards and the number of retries it took
+        """
+        for attempt in range(CARD_VARIANT_FETCH_MAX_RETRIES + 1):
+            try:
+                return self.fetch_cards_from_set(set_name), attempt
+            except Exception as e:
+                if attempt >= CARD_VARIANT_FETCH_MAX_RETRIES:
+                    raise
+                # Jitter keeps workers that failed together from retrying in lockstep
+                delay = CARD_VARIANT_FETCH_RETRY_BACKOFF_SECONDS * (2 ** attempt) * random.uniform(0.5, 1.5)
+                logger.warning(
+                    f"Retrying set {set_name} in {delay:.1f}s "
+                    f"(attempt {attempt + 1}/{CARD_VARIANT_FETCH_MAX_RETRIES}): {e}"
+                )
+                time.sleep(delay)
+    
     @monitor_memory
-    def create_card_variants(self, cards: List[Dict[str, Any]]) -> Generator[Dict[str, Any], None, None]:
+    def create_card_variants(self, cards: Iterable[Dict[str, Any]]) -> Generator[Dict[str, Any], None, None]:
         """
         Create card variants from card data.
         
         Args:
-            cards: List of card data
+            cards: Card data, as a list or a stream of cards
             
         Yields:
             Dict: Card variant data
@@ -317,6 +399,8 @@ class CardVariantService:
                     # Set specific info
                     "set_name": set_name,
                     "set_code": set_code,
+                    # Canonical uppercase card number for exact-match lookups
+                    "card_number_key": normalize_card_number(set_code),
                     "set_rarity": set_rarity,
                     "set_rarity_code": set_rarity_code,
                     "set_price": set_price,
@@ -327,11 +411,189 @@ class CardVariantService:
                 
                 yield variant
     
+    def _fetch_sets_concurrently(
+        self,
+        cached_sets: List[Dict[str, Any]]
+    ) -> Generator[Tuple[Dict[str, Any], Future], None, None]:
+        """
+        Fetch sets on a worker pool and yield (card_set, future) as each finishes.
+        
+        Only twice the worker count is in flight at once, so fetched sets never
+        pile up in memory faster than they are consumed.
+        
+        Args:
+            cached_sets: Card sets to fetch
+            
+        Yields:
+            Tuple[Dict, Future]: Card set and its finished fetch
+        """
+        workers = max(1, min(CARD_VARIANT_FETCH_WORKERS, len(cached_sets)))
+        remaining_sets = iter(cached_sets)
+        in_flight: Dict[Future, Dict[str, Any]] = {}
+        
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="variant-fetch") as executor:
+            while True:
+                for card_set in remaining_sets:
+                    set_name = card_set.get('set_name', '')
+                    in_flight[executor.submit(self._fetch_cards_from_set_with_retries, set_name)] = card_set
+                    if len(in_flight) >= workers * 2:
+                        break
+                
+                if not in_flight:
+                    return
+                
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield in_flight.pop(future), future
+    
+    def _stream_set_variants(
+        self,
+        cached_sets: List[Dict[str, Any]],
+        processing_stats: ProcessingStats,
+        on_set_processed: Optional[Callable[[Dict[str, Any], int], None]] = None
+    ) -> Generator[Dict[str, Any], None, None]:
+        """
+        Yield the variants of each set as soon as its cards have been fetched.
+        
+        Args:
+            cached_sets: Card sets to process
+            processing_stats: Statistics updated as sets succeed or fail
+            on_set_processed: Called with each processed set and its variant count
+            
+        Yields:
+            Dict: Card variant data
+        """
+        for index, (card_set, future) in enumerate(self._fetch_sets_concurrently(cached_sets)):
+            set_name = card_set.get('set_name', '')
+            try:
+                cards_list, retries = future.result()
+            except Exception as e:
+                error_msg = f"Error processing set {set_name}: {str(e)}"
+                logger.error(error_msg)
+                processing_stats.failed_sets += 1
+                processing_stats.processing_errors.append({
+                    "set_name": set_name,
+                    "error": error_msg
+                })
+                continue
+            
+            processing_stats.fetch_retries += retries
+            logger.info(f"Processing set {index + 1}/{len(cached_sets)}: {set_name}")
+            
+            variant_count = 0
+            for variant in self.create_card_variants(cards_list):
+                variant_count += 1
+                yield variant
+            
+            if on_set_processed is not None:
+                on_set_processed(card_set, variant_count)
+            processing_stats.processed_sets += 1
+            processing_stats.total_cards_processed += len(cards_list)
+            logger.info(f"Successfully processed {len(cards_list)} cards from {set_name}")
+            
+            # Check memory usage periodically
+            if index % 10 == 0:
+                self.memory_manager.check_memory_and_cleanup()
+    
+    def _flush_variant_batch(
+        self,
+        variants_collection,
+        operations: List[UpdateOne],
+        processing_stats: ProcessingStats
+    ) -> None:
+        """
+        Upsert a batch of variants with one unordered bulk write.
+        
+        Variants are only inserted if their _variant_id is new, so a duplicate
+        shows up as a matched document instead of a second copy.
+        """
+        upserted, matched = self._bulk_write_variants(
+            variants_collection, operations, processing_stats.processing_errors
+        )
+        processing_stats.unique_variants_created += upserted
+        processing_stats.duplicate_variants_skipped += matched
+        logger.info(f"Upserted batch: {upserted} new variants, {matched} duplicates")
+    
+    def _bulk_write_variants(
+        self,
+        variants_collection,
+        operations: List[Any],
+        processing_errors: List[Dict[str, Any]]
+    ) -> Tuple[int, int]:
+        """
+        Run one unordered bulk write, recording failures in processing_errors.
+        
+        Returns:
+            Tuple[int, int]: Upserted and matched document counts
+        """
+        try:
+            result = variants_collection.bulk_write(operations, ordered=False)
+            return result.upserted_count, result.matched_count
+        except BulkWriteError as e:
+            details = e.details or {}
+            write_errors = details.get("writeErrors", [])
+            logger.error(f"Batch upsert had {len(write_errors)} failed writes")
+            processing_errors.append({
+                "error": f"Batch upsert error: {len(write_errors)} failed writes",
+                "first_error": write_errors[0].get("errmsg") if write_errors else None
+            })
+            return details.get("nUpserted", 0), details.get("nMatched", 0)
+        except Exception as e:
+            logger.error(f"Error upserting batch: {str(e)}")
+            processing_errors.append({
+                "error": f"Batch upsert error: {str(e)}"
+            })
+            return 0, 0
+    
+    def _upsert_variant_stream(
+        self,
+        variants_collection,
+        variants: Iterable[Dict[str, Any]],
+        processing_stats: ProcessingStats
+    ) -> None:
+        """Upsert streamed variants in batches of CARD_PROCESSING_BATCH_SIZE, keyed on _variant_id."""
+        operations: List[UpdateOne] = []
+        for variant in variants:
+            operations.append(UpdateOne(
+                {"_variant_id": variant["_variant_id"]},
+                {"$setOnInsert": variant},
+                upsert=True
+            ))
+            if len(operations) >= CARD_PROCESSING_BATCH_SIZE:
+                self._flush_variant_batch(variants_collection, operations, processing_stats)
+                operations = []
+        
+        if operations:
+            self._flush_variant_batch(variants_collection, operations, processing_stats)
+    
+    def _create_variant_indexes(self, variants_collection) -> None:
+        """Create the variants collection indexes, including the unique _variant_id index."""
+        try:
+            variants_collection.create_index("_variant_id", unique=True)
+            variants_collection.create_index("card_id")
+            variants_collection.create_index("card_name")
+            variants_collection.create_index("set_code")
+            variants_collection.create_index("card_number_key")
+            variants_collection.create_index("set_name")
+            variants_collection.create_index("set_rarity")
+            variants_collection.create_index("art_variant")
+            variants_collection.create_index("_uploaded_at")
+            logger.info("Successfully created indexes for variants collection")
+        except Exception as e:
+            logger.warning(f"Failed to create indexes: {e}")
+    
     @monitor_memory
+    @_exclusive_collection_write(_card_variants_write_lock, "card variant rebuild or sync")
     def upload_card_variants_to_cache(self) -> Dict[str, Any]:
         """
         Upload card variants to MongoDB cache.
         
+        Sets are fetched concurrently and their variants are streamed into
+        batches of CARD_PROCESSING_BATCH_SIZE upserts, so memory use doesn't
+        grow with the number of sets. Variants are built in a staging
+        collection that replaces the live one only once it is complete; if no
+        set succeeded or too many sets failed, it is dropped instead.
+        
         Returns:
             Dict: Upload results and statistics
         """
@@ -350,86 +612,39 @@ class CardVariantService:
             
             # Get collection
             variants_collection = get_card_variants_collection()
+            synced_sets: List[Tuple[Dict[str, Any], int]] = []
             
-            # Clear existing data
-            delete_result = variants_collection.delete_many({})
-            logger.info(f"Cleared {delete_result.deleted_count} existing variants")
-            
-            # Track unique variants
-            all_variants = []
-            variant_ids_seen = set()
-            
-            # Process each set
-            for index, card_set in enumerate(cached_sets):
-                set_name = card_set.get('set_name', '')
-                set_code = card_set.get('set_code', '')
+            staging_collection = get_staging_collection(variants_collection)
+            try:
+                # The unique _variant_id index deduplicates variants while they are upserted
+                self._create_variant_indexes(staging_collection)
                 
-                try:
-                    logger.info(f"Processing set {index + 1}/{len(cached_sets)}: {set_name}")
-                    
-                    # Fetch cards from this set
-                    cards_list = self.fetch_cards_from_set(set_name)
-                    
-                    # Create variants for each card
-                    for variant in self.create_card_variants(cards_list):
-                        variant_id = variant["_variant_id"]
-                        
-                        # Check for duplicates
-                        if variant_id not in variant_ids_seen:
-                            all_variants.append(variant)
-                            variant_ids_seen.add(variant_id)
-                        else:
-                            processing_stats.duplicate_variants_skipped += 1
-                    
-                    processing_stats.processed_sets += 1
-                    processing_stats.total_cards_processed += len(cards_list)
-                    
-                    logger.info(f"Successfully processed {len(cards_list)} cards from {set_name}")
-                    
-                    # Rate limiting delay
-                    time.sleep(API_RATE_LIMIT_DELAY)
-                    
-                    # Check memory usage periodically
-                    if index % 10 == 0:
-                        self.memory_manager.check_memory_and_cleanup()
-                    
-                except Exception as e:
-                    error_msg = f"Error processing set {set_name}: {str(e)}"
-                    logger.error(error_msg)
-                    processing_stats.failed_sets += 1
-                    processing_stats.processing_errors.append({
-                        "set_name": set_name,
-                        "error": error_msg
-                    })
+                self._upsert_variant_stream(
+                    staging_collection,
+                    self._stream_set_variants(
+                        cached_sets,
+                        processing_stats,
+                        on_set_processed=lambda card_set, variant_count: synced_sets.append((card_set, variant_count))
+                    ),
+                    processing_stats
+                )
+                
+                max_failed_sets = processing_stats.total_sets * CARD_VARIANT_REBUILD_MAX_FAILED_FRACTION
+                if processing_stats.processed_sets == 0 or processing_stats.failed_sets > max_failed_sets:
+                    raise Exception(
+                        f"{processing_stats.failed_sets} of {processing_stats.total_sets} sets failed to fetch "
+                        f"(limit {int(max_failed_sets)}); keeping the existing card variants"
+                    )
+                
+                previous_count = promote_staging_collection(staging_collection, variants_collection)
+            except Exception:
+                staging_collection.drop()
+                raise
             
-            # Insert variants in batches
-            inserted_total = 0
-            for batch in batch_process_generator(all_variants, CARD_PROCESSING_BATCH_SIZE):
-                try:
-                    insert_result = variants_collection.insert_many(batch, ordered=False)
-                    inserted_total += len(insert_result.inserted_ids)
-                    logger.info(f"Inserted batch: {len(insert_result.inserted_ids)} variants")
-                except Exception as e:
-                    logger.error(f"Error inserting batch: {str(e)}")
-                    processing_stats.processing_errors.append({
-                        "error": f"Batch insert error: {str(e)}"
-                    })
+            # A full rebuild starts the sync ledger over with the sets processed above
+            self._reset_set_syncs(synced_sets)
             
-            processing_stats.unique_variants_created = inserted_total
-            
-            # Create indexes for better query performance
-            try:
-                variants_collection.create_index("_variant_id", unique=True)
-                variants_collection.create_index("card_id")
-                variants_collection.create_index("card_name")
-                variants_collection.create_index("set_code")
-                variants_collection.create_index("set_name")
-                variants_collection.create_index("set_rarity")
-                variants_collection.create_index("art_variant")
-                variants_collection.create_index("_uploaded_at")
-                logger.info("Successfully created indexes for variants collection")
-            except Exception as e:
-                logger.warning(f"Failed to create indexes: {e}")
+            inserted_total = processing_stats.unique_variants_created
             
             # Calculate success rate
             if processing_stats.total_sets > 0:
@@ -442,13 +657,284 @@ class CardVariantService:
             return {
                 "statistics": processing_stats.dict(),
                 "total_variants_created": inserted_total,
-                "previous_variants_cleared": delete_result.deleted_count
+                "previous_variants_cleared": previous_count
             }
             
         except Exception as e:
             logger.error(f"Error uploading card variants: {e}")
             raise
     
+    def _iter_cardinfo_dump(self) -> Generator[Dict[str, Any], None, None]:
+        """Stream every card of the unfiltered cardinfo.php response without loading it whole."""
+        self.rate_limiter.acquire()
+        logger.info("Downloading full card dump from YGO API")
+        with requests.get(f"{YGO_API_BASE_URL}/cardinfo.php", stream=True, timeout=60) as response:
+            if response.status_code != 200:
+                raise Exception(f"API returned status {response.status_code}")
+            yield from iter_json_array_items(response.iter_content(chunk_size=CARD_DUMP_CHUNK_BYTES), "data")
+    
+    @monitor_memory
+    @_exclusive_collection_write(_card_variants_write_lock, "card variant rebuild or sync")
+    def build_card_variants_from_dump(self) -> Dict[str, Any]:
+        """
+        Rebuild card variants from a single full cardinfo.php download.
+        
+        Every card in the dump carries all of its card_sets, so variants for
+        every set come out of one streaming pass instead of one API call per
+        set. Variants are upserted in batches into a staging collection as
+        they are produced, which replaces the live one once the dump is done.
+        
+        Returns:
+            Dict: Upload results and statistics
+        """
+        try:
+            processing_stats = ProcessingStats()
+            set_variant_counts: Dict[str, int] = {}
+            
+            variants_collection = get_card_variants_collection()
+            
+            def counted_cards():
+                for card in self._iter_cardinfo_dump():
+                    processing_stats.total_cards_processed += 1
+                    yield card
+                    if processing_stats.total_cards_processed % 1000 == 0:
+                        self.memory_manager.check_memory_and_cleanup()
+            
+            def counted_variants():
+                for variant in self.create_card_variants(counted_cards()):
+                    set_name = variant["set_name"]
+                    set_variant_counts[set_name] = set_variant_counts.get(set_name, 0) + 1
+                    yield variant
+            
+            staging_collection = get_staging_collection(variants_collection)
+            try:
+                self._create_variant_indexes(staging_collection)
+                self._upsert_variant_stream(staging_collection, counted_variants(), processing_stats)
+                if not set_variant_counts:
+                    raise Exception("Card dump produced no variants; keeping the existing card variants")
+                previous_count = promote_staging_collection(staging_collection, variants_collection)
+            except Exception:
+                staging_collection.drop()
+                raise
+            
+            processing_stats.total_sets = len(set_variant_counts)
+            processing_stats.processed_sets = len(set_variant_counts)
+            if processing_stats.total_sets > 0:
+                processing_stats.success_rate = 100.0
+            
+            # The dump has no set metadata, so the ledger takes it from the set list
+            try:
+                fresh_sets = CardSetService().fetch_all_card_sets()
+            except Exception as e:
+                logger.warning(f"Failed to fetch card sets for the sync ledger: {e}")
+                fresh_sets = []
+            self._reset_set_syncs([
+                (card_set, set_variant_counts[card_set['set_name']])
+                for card_set in fresh_sets
+                if card_set.get('set_name') in set_variant_counts
+            ])
+            
+            inserted_total = processing_stats.unique_variants_created
+            logger.info(
+                f"Completed bulk variant build. Created {inserted_total} unique variants "
+                f"from {processing_stats.total_cards_processed} cards in {processing_stats.total_sets} sets"
+            )
+            
+            return {
+                "statistics": processing_stats.dict(),
+                "total_variants_created": inserted_total,
+                "previous_variants_cleared": previous_count
+            }
+            
+        except Exception as e:
+            logger.error(f"Error building card variants from dump: {e}")
+            raise
+    
+    @staticmethod
+    def _set_signature(card_set: Dict[str, Any]) -> Tuple[Any, Any, Any]:
+        """Fields of a cardsets.php entry whose change means the set must be fetched again."""
+        return (card_set.get('set_code'), card_set.get('num_of_cards'), card_set.get('tcg_date'))
+    
+    @staticmethod
+    def _set_expects_cards(card_set: Dict[str, Any], ledger_entry: Optional[Dict[str, Any]]) -> bool:
+        """Whether the set list or the last sync says this set has cards."""
+        if ledger_entry and ledger_entry.get('variant_count'):
+            return True
+        try:
+            return int(card_set.get('num_of_cards') or 0) > 0
+        except (TypeError, ValueError):
+            return False
+    
+    def _record_set_syncs(self, ledger_collection, synced_sets: List[Tuple[Dict[str, Any], int]]) -> None:
+        """
+        Record in the sync ledger that these sets' variants were just fetched.
+        
+        Args:
+            ledger_collection: Card set sync ledger collection
+            synced_sets: (card set, variant count) pairs
+        """
+        fetched_at = get_current_utc_datetime()
+        operations = []
+        for card_set, variant_count in synced_sets:
+            set_name = card_set.get('set_name', '')
+            set_code, num_of_cards, tcg_date = self._set_signature(card_set)
+            operations.append(ReplaceOne(
+                {"_id": set_name},
+                {
+                    "_id": set_name,
+                    "set_name": set_name,
+                    "set_code": set_code,
+                    "num_of_cards": num_of_cards,
+                    "tcg_date": tcg_date,
+                    "variant_count": variant_count,
+                    "last_fetched_at": fetched_at
+                },
+                upsert=True
+            ))
+        
+        for batch in batch_process_generator(operations, CARD_PROCESSING_BATCH_SIZE):
+            ledger_collection.bulk_write(batch, ordered=False)
+    
+    def _reset_set_syncs(self, synced_sets: List[Tuple[Dict[str, Any], int]]) -> None:
+        """Replace the whole sync ledger with synced_sets after a full rebuild was swapped in."""
+        ledger_collection = get_card_set_sync_ledger_collection()
+        if ledger_collection is None:
+            return
+        try:
+            ledger_collection.delete_many({})
+            self._record_set_syncs(ledger_collection, synced_sets)
+        except Exception as e:
+            logger.warning(f"Failed to record set sync ledger: {e}")
+    
+    @monitor_memory
+    @_exclusive_collection_write(_card_variants_write_lock, "card variant rebuild or sync")
+    def sync_card_variants(self, force: bool = False) -> Dict[str, Any]:
+        """
+        Incrementally sync card variants with the current YGOPRODeck set list.
+        
+        The fresh cardsets.php list is compared with the sync ledger; only sets
+        that are new or whose set_code, num_of_cards or tcg_date changed are
+        fetched, their variants are upserted and any variants they no longer
+        contain are deleted. Sets that disappeared from the list lose their
+        variants. Unchanged sets cost no API calls. A fetch that comes back empty
+        for a set that should have cards counts as failed and is retried next sync.
+        
+        Args:
+            force: Delete removed sets even beyond the removal safety limits
+        
+        Returns:
+            Dict: Sync results and statistics
+        
+        Raises:
+            ValueError: If the set list is empty or would remove too many sets
+        """
+        try:
+            card_set_service = CardSetService()
+            fresh_sets = card_set_service.fetch_all_card_sets()
+            if not fresh_sets:
+                raise ValueError("YGO API returned an empty set list; refusing to sync")
+            
+            variants_collection = get_card_variants_collection()
+            ledger_collection = get_card_set_sync_ledger_collection()
+            if variants_collection is None or ledger_collection is None:
+                raise Exception("Database is not available for variant sync")
+            
+            fresh_by_name = {card_set['set_name']: card_set for card_set in fresh_sets if card_set.get('set_name')}
+            ledger = {
+                entry['_id']: entry
+                for entry in ledger_collection.find({}, {"_id": 1, "set_code": 1, "num_of_cards": 1, "tcg_date": 1, "variant_count": 1})
+            }
+            
+            new_sets = [card_set for set_name, card_set in fresh_by_name.items() if set_name not in ledger]
+            changed_sets = [
+                card_set for set_name, card_set in fresh_by_name.items()
+                if set_name in ledger and self._set_signature(card_set) != self._set_signature(ledger[set_name])
+            ]
+            removed_set_names = [set_name for set_name in ledger if set_name not in fresh_by_name]
+            
+            # Checked before any write, so a truncated set list changes nothing
+            removal_limit = max(CARD_VARIANT_SYNC_MAX_REMOVED_SETS, len(ledger) * CARD_VARIANT_SYNC_MAX_REMOVED_FRACTION)
+            if len(removed_set_names) > removal_limit and not force:
+                raise ValueError(
+                    f"Sync would remove {len(removed_set_names)} of {len(ledger)} synced sets "
+                    f"(limit {int(removal_limit)}); the set list may be incomplete - retry with force to apply"
+                )
+            
+            sync_stats = {
+                "total_sets": len(fresh_by_name),
+                "new_sets": len(new_sets),
+                "changed_sets": len(changed_sets),
+                "removed_sets": len(removed_set_names),
+                "unchanged_sets": len(fresh_by_name) - len(new_sets) - len(changed_sets),
+                "synced_sets": 0,
+                "failed_sets": 0,
+                "fetch_retries": 0,
+                "variants_upserted": 0,
+                "variants_deleted": 0,
+                "processing_errors": []
+            }
+            logger.info(
+                f"Variant sync: {len(new_sets)} new, {len(changed_sets)} changed, "
+                f"{len(removed_set_names)} removed, {sync_stats['unchanged_sets']} unchanged sets"
+            )
+            
+            for card_set, future in self._fetch_sets_concurrently(new_sets + changed_sets):
+                set_name = card_set.get('set_name', '')
+                try:
+                    cards_list, retries = future.result()
+                    sync_stats["fetch_retries"] += retries
+                    
+                    variants = list(self.create_card_variants(cards_list))
+                    # An empty fetch (e.g. a transient 400) must not wipe a set that has cards
+                    if not variants and self._set_expects_cards(card_set, ledger.get(set_name)):
+                        raise Exception("YGO API returned no cards for a set that should have some")
+                    if variants:
+                        errors_before = len(sync_stats["processing_errors"])
+                        upserted, matched = self._bulk_write_variants(
+                            variants_collection,
+                            [ReplaceOne({"_variant_id": variant["_variant_id"]}, variant, upsert=True) for variant in variants],
+                            sync_stats["processing_errors"]
+                        )
+                        if len(sync_stats["processing_errors"]) > errors_before:
+                            raise Exception("variant upsert failed")
+                        sync_stats["variants_upserted"] += upserted + matched
+                    
+                    # Variants the set no longer contains (e.g. a corrected rarity) are dropped
+                    delete_result = variants_collection.delete_many({
+                        "set_name": set_name,
+                        "_variant_id": {"$nin": [variant["_variant_id"] for variant in variants]}
+                    })
+                    sync_stats["variants_deleted"] += delete_result.deleted_count
+                    
+                    self._record_set_syncs(ledger_collection, [(card_set, len(variants))])
+                    sync_stats["synced_sets"] += 1
+                    
+                except Exception as e:
+                    # Left out of the ledger, so the next sync tries this set again
+                    error_msg = f"Error syncing set {set_name}: {str(e)}"
+                    logger.error(error_msg)
+                    sync_stats["failed_sets"] += 1
+                    sync_stats["processing_errors"].append({
+                        "set_name": set_name,
+                        "error": error_msg
+                    })
+            
+            for set_name in removed_set_names:
+                delete_result = variants_collection.delete_many({"set_name": set_name})
+                sync_stats["variants_deleted"] += delete_result.deleted_count
+                ledger_collection.delete_one({"_id": set_name})
+            
+            logger.info(
+                f"Completed variant sync: {sync_stats['synced_sets']} sets fetched, "
+                f"{sync_stats['variants_upserted']} variants upserted, {sync_stats['variants_deleted']} deleted"
+            )
+            
+            return {"statistics": sync_stats}
+            
+        except Exception as e:
+            logger.error(f"Error syncing card variants: {e}")
+            raise
+    
     @monitor_memory
     def get_cached_card_variants(self) -> List[Dict[str, Any]]:
         """
@@ -484,14 +970,22 @@ class CardLookupService:
     
     def __init__(self):
         self.memory_manager = get_memory_manager()
+        self.card_number_index = CardNumberIndex(regex_fallback=CARD_LOOKUP_REGEX_FALLBACK, name="lookup-card-numbers")
+        self.rate_limiter = get_ygo_api_rate_limiter()
     
     @monitor_memory
-    def lookup_card_info_from_cache(self, card_number: str) -> Optional[Dict[str, Any]]:
+    def lookup_card_info_from_cache(
+        self,
+        card_number: str,
+        regex_fallback: Optional[bool] = None
+    ) -> Optional[Dict[str, Any]]:
         """
         Look up card information from cached variants.
         
         Args:
             card_number: Card number to look up
+            regex_fallback: Also try regex scans of set_code and card_name when the
+                exact match misses (defaults to CARD_LOOKUP_REGEX_FALLBACK)
             
         Returns:
             Optional[Dict]: Card information if found
@@ -499,18 +993,7 @@ class CardLookupService:
         try:
             collection = get_card_variants_collection()
             
-            # Try to find by set code matching
-            query = {"set_code": {"$regex": card_number, "$options": "i"}}
-            result = collection.find_one(query, {"_id": 0})
-            
-            if result:
-                return result
-            
-            # Try broader search
-            query = {"card_name": {"$regex": card_number, "$options": "i"}}
-            result = collection.find_one(query, {"_id": 0})
-            
-            return result
+            return self.card_number_index.find_variant(collection, card_number, regex_fallback)
             
         except Exception as e:
             logger.error(f"Error looking up card info: {e}")
@@ -530,6 +1013,7 @@ class CardLookupService:
         try:
             # Use the correct cardsetsinfo endpoint as mentioned in the user's comment
             api_url = f"{YGO_API_BASE_URL}/cardsetsinfo.php?setcode={quote(card_number)}"
+            self.rate_limiter.acquire()
             response = requests.get(api_url, timeout=10)
             
             if response.status_code == 200:
@@ -0,0 +1,107 @@
+"""
+Request Coalescing Module
+
+Provides single-flight execution: concurrent callers asking for the same key
+share one in-flight call instead of each doing the work themselves.
+"""
+
+import logging
+import threading
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class _InFlightCall:
+    """A call being executed by one leader thread and awaited by followers."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Deduplicate concurrent calls that share a key.
+
+    The first caller for a key (the leader) runs the function; callers that
+    arrive while it is running block until it finishes and receive the same
+    result or exception. Once the call completes the key is forgotten, so
+    later callers start a new call.
+    """
+
+    def __init__(self, name: str = "single-flight"):
+        self.name = name
+        self._calls: Dict[Hashable, _InFlightCall] = {}
+        self._lock = threading.Lock()
+        self._stats = {
+            "calls": 0,
+            "executions": 0,
+            "deduplicated": 0,
+            "errors": 0,
+        }
+
+    def do(self, key: Hashable, fn: Callable[..., Any], *args, **kwargs) -> Tuple[Any, bool]:
+        """
+        Run fn once for all concurrent callers using the same key.
+
+        Args:
+            key: Hashable key identifying equivalent calls
+            fn: Function to execute
+            *args: Positional arguments for fn
+            **kwargs: Keyword arguments for fn
+
+        Returns:
+            Tuple[Any, bool]: (result, shared) where shared is True if this
+            caller received another caller's result
+        """
+        with self._lock:
+            self._stats["calls"] += 1
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                self._stats["deduplicated"] += 1
+                is_leader = False
+            else:
+                call = _InFlightCall()
+                self._calls[key] = call
+                self._stats["executions"] += 1
+                is_leader = True
+
+        if not is_leader:
+            logger.debug(f"Joining in-flight call for {key} ({self.name})")
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = fn(*args, **kwargs)
+        except BaseException as e:
+            call.error = e
+            with self._lock:
+                self._stats["errors"] += 1
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+            if call.waiters:
+                logger.info(f"Shared one call for {key} with {call.waiters} waiting request(s) ({self.name})")
+
+        return call.result, False
+
+    def in_flight(self) -> int:
+        """Number of keys currently being executed."""
+        with self._lock:
+            return len(self._calls)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get coalescing statistics."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["in_flight"] = len(self._calls)
+        stats["dedup_rate"] = round(stats["deduplicated"] / stats["calls"], 4) if stats["calls"] else 0.0
+        return stats
@@ -20,6 +20,12 @@ YGO_API_BASE_URL = "https://db.ygoprodeck.com/api/v7"
 MONGODB_CONNECTION_STRING = os.getenv("MONGODB_CONNECTION_STRING")
 MONGODB_COLLECTION_NAME = "YGO_SETS_CACHE_V1"
 MONGODB_CARD_VARIANTS_COLLECTION = "YGO_CARD_VARIANT_CACHE_V1"
+# Per-set record of when each set's variants were last fetched, used by incremental variant syncs
+MONGODB_CARD_SET_SYNC_LEDGER_COLLECTION = "YGO_CARD_SET_SYNC_LEDGER_V1"
+# Full rebuilds write into "<collection><suffix>_<timestamp>_<id>" and rename it over the live
+# collection when done; staging collections older than the max age are leftovers of crashed rebuilds
+MONGODB_STAGING_COLLECTION_SUFFIX = "_STAGING"
+MONGODB_STAGING_COLLECTION_MAX_AGE_HOURS = int(os.getenv("MONGODB_STAGING_COLLECTION_MAX_AGE_HOURS", "24"))
 
 # MongoDB connection settings
 MONGODB_CONNECT_TIMEOUT_MS = 60000
@@ -37,18 +43,108 @@ TCGPLAYER_MIN_VARIANTS_BEFORE_EARLY_TERMINATION = int(
 
 # Price Scraping Configuration
 PRICE_CACHE_EXPIRY_DAYS = 7
+# How long the aggregated /cards/price/cache-stats counts are reused before re-running the aggregation
+PRICE_CACHE_STATS_TTL_SECONDS = float(os.getenv("PRICE_CACHE_STATS_TTL_SECONDS", "60"))
+# Optional write-behind buffer: price saves are collected and written with one unordered
+# bulk_write when the batch fills up, every flush interval, and at shutdown
+PRICE_WRITE_BEHIND_ENABLED = os.getenv("PRICE_WRITE_BEHIND_ENABLED", "false").lower() == "true"
+PRICE_WRITE_BEHIND_BATCH_SIZE = int(os.getenv("PRICE_WRITE_BEHIND_BATCH_SIZE", "500"))
+PRICE_WRITE_BEHIND_FLUSH_SECONDS = float(os.getenv("PRICE_WRITE_BEHIND_FLUSH_SECONDS", "2"))
+# Opt-in speculative prefetch: after a card is scraped, its other rarities (from the variants
+# collection) that are missing or stale are scraped one at a time in the background, limited
+# to PRICE_SIBLING_PREFETCH_BUDGET scrapes per window across the whole process
+PRICE_SIBLING_PREFETCH_ENABLED = os.getenv("PRICE_SIBLING_PREFETCH_ENABLED", "false").lower() == "true"
+PRICE_SIBLING_PREFETCH_BUDGET = int(os.getenv("PRICE_SIBLING_PREFETCH_BUDGET", "50"))
+PRICE_SIBLING_PREFETCH_WINDOW_SECONDS = float(os.getenv("PRICE_SIBLING_PREFETCH_WINDOW_SECONDS", "3600"))
+# Stale-while-revalidate: prices stale by less than this many days are served
+# immediately while a background refresh runs (0 disables)
+PRICE_CACHE_SWR_WINDOW_DAYS = float(os.getenv("PRICE_CACHE_SWR_WINDOW_DAYS", "7"))
+# Prices older than this always force a synchronous scrape
+PRICE_CACHE_HARD_EXPIRY_DAYS = PRICE_CACHE_EXPIRY_DAYS + PRICE_CACHE_SWR_WINDOW_DAYS
+# Worker threads that run background revalidation scrapes
+PRICE_REVALIDATION_WORKERS = int(os.getenv("PRICE_REVALIDATION_WORKERS", "1"))
+# Known TCGPlayer product pages remembered in-process so refreshes can skip the search step
+PRICE_PRODUCT_URL_MEMO_SIZE = int(os.getenv("PRICE_PRODUCT_URL_MEMO_SIZE", "10000"))
+# Add price_lookup_key to cached prices saved before it existed, in a background thread at startup
+PRICE_LOOKUP_KEY_BACKFILL_ON_STARTUP = os.getenv("PRICE_LOOKUP_KEY_BACKFILL_ON_STARTUP", "true").lower() == "true"
+PRICE_LOOKUP_KEY_BACKFILL_BATCH_SIZE = int(os.getenv("PRICE_LOOKUP_KEY_BACKFILL_BATCH_SIZE", "1000"))
+# In-process L1 cache of fresh price documents in front of MongoDB; entries never outlive
+# the document's freshness and are capped at the TTL so other instances' writes show up
+PRICE_L1_CACHE_SIZE = int(os.getenv("PRICE_L1_CACHE_SIZE", "5000"))
+PRICE_L1_CACHE_TTL_SECONDS = float(os.getenv("PRICE_L1_CACHE_TTL_SECONDS", "300"))
+# Per-set rarity tables (card number -> rarities) used by rarity validation; tables built
+# from the variant cache because the YGO API was unavailable expire sooner
+PRICE_RARITY_TABLE_CACHE_SIZE = int(os.getenv("PRICE_RARITY_TABLE_CACHE_SIZE", "500"))
+PRICE_RARITY_TABLE_TTL_SECONDS = float(os.getenv("PRICE_RARITY_TABLE_TTL_SECONDS", "21600"))
+PRICE_RARITY_TABLE_FALLBACK_TTL_SECONDS = float(os.getenv("PRICE_RARITY_TABLE_FALLBACK_TTL_SECONDS", "300"))
+# Card number -> card name map warmed from the variants collection in a background thread at
+# startup; lookups it can't answer use the exact card_number_key index
+CARD_NUMBER_MAP_WARM_ON_STARTUP = os.getenv("CARD_NUMBER_MAP_WARM_ON_STARTUP", "true").lower() == "true"
+# Fall back to unanchored regex scans of set_code/card_name when the exact lookup misses
+CARD_LOOKUP_REGEX_FALLBACK = os.getenv("CARD_LOOKUP_REGEX_FALLBACK", "false").lower() == "true"
 PRICE_SCRAPING_TIMEOUT_SECONDS = 3600  # Increased from 30 to 3600 seconds (1 hour)
 PRICE_SCRAPING_MAX_RETRIES = 3
 PRICE_SCRAPING_RETRY_DELAY = 5
 
+# Batch price endpoint configuration
+PRICE_BATCH_MAX_ITEMS = int(os.getenv("PRICE_BATCH_MAX_ITEMS", "500"))
+# Maximum simultaneous scrapes per batch request (defaults to the browser pool size)
+PRICE_BATCH_MAX_CONCURRENCY = int(
+    os.getenv("PRICE_BATCH_MAX_CONCURRENCY", os.getenv("PLAYWRIGHT_POOL_SIZE", "2"))
+)
+
 # Price Cache CollectionYGO_CARD_VARIANT_PRICE_CACHE_V1"
 PRICE_CACHE_COLLECTION = "YGO_CARD_VARIANT_PRICE_CACHE_V1"
 # PRICE_CACHE_COLLECTION = "YGO_PRICE_CACHE_V1"
 # PRICE_CACHE_COLLECTION = "YGOasdf_PRICE_CACHE_V1"
 
+# Price scrape job queue configuration
+PRICE_JOBS_COLLECTION = "YGO_PRICE_SCRAPE_JOBS_V1"
+
+# Negative result cache: cards TCGPlayer doesn't list and rejected rarities are remembered
+# (in MongoDB with a TTL index, mirrored in-process) so retries skip validation and scraping
+PRICE_NEGATIVE_CACHE_COLLECTION = "YGO_PRICE_NEGATIVE_CACHE_V1"
+PRICE_NEGATIVE_CACHE_TTL_SECONDS = float(os.getenv("PRICE_NEGATIVE_CACHE_TTL_SECONDS", "3600"))  # 0 disables
+PRICE_NEGATIVE_CACHE_MEMORY_SIZE = int(os.getenv("PRICE_NEGATIVE_CACHE_MEMORY_SIZE", "5000"))
+
+# Price history: every successful scrape is appended to a time-series collection
+PRICE_HISTORY_COLLECTION = "YGO_PRICE_HISTORY_V1"
+PRICE_HISTORY_ENABLED = os.getenv("PRICE_HISTORY_ENABLED", "true").lower() == "true"
+# Range returned by /cards/price/history when no start is given, and the largest range allowed
+PRICE_HISTORY_DEFAULT_DAYS = int(os.getenv("PRICE_HISTORY_DEFAULT_DAYS", "30"))
+PRICE_HISTORY_MAX_DAYS = int(os.getenv("PRICE_HISTORY_MAX_DAYS", "366"))
+# "memory" keeps jobs in this process; "mongodb" lets several instances share work
+PRICE_JOB_QUEUE_BACKEND = os.getenv("PRICE_JOB_QUEUE_BACKEND", "memory").lower()
+PRICE_JOB_WORKERS = int(os.getenv("PRICE_JOB_WORKERS", "2"))
+# How long finished jobs (and their results) stay available for polling
+PRICE_JOB_RESULT_TTL_SECONDS = int(os.getenv("PRICE_JOB_RESULT_TTL_SECONDS", "3600"))
+# How often MongoDB queue workers poll for new jobs when idle
+PRICE_JOB_POLL_INTERVAL_SECONDS = float(os.getenv("PRICE_JOB_POLL_INTERVAL_SECONDS", "1.0"))
+# A running MongoDB job whose lease expires is assumed abandoned and re-queued
+PRICE_JOB_LEASE_SECONDS = int(os.getenv("PRICE_JOB_LEASE_SECONDS", str(PRICE_SCRAPING_TIMEOUT_SECONDS + 60)))
+
 
 # Rate Limiting Configuration
 API_RATE_LIMIT_DELAY = 0.1  # 100ms delay between requests (20 req/sec max)
+# Token bucket shared by concurrent YGOPRODeck requests (the API allows 20 requests per second)
+YGO_API_RATE_LIMIT_PER_SECOND = float(os.getenv("YGO_API_RATE_LIMIT_PER_SECOND", "15"))
+YGO_API_RATE_LIMIT_BURST = int(os.getenv("YGO_API_RATE_LIMIT_BURST", "5"))
+# Concurrent set fetches while rebuilding card variants; a failed set is retried with
+# exponential backoff (plus jitter) before it is recorded as failed
+CARD_VARIANT_FETCH_WORKERS = int(os.getenv("CARD_VARIANT_FETCH_WORKERS", "4"))
+CARD_VARIANT_FETCH_MAX_RETRIES = int(os.getenv("CARD_VARIANT_FETCH_MAX_RETRIES", "3"))
+CARD_VARIANT_FETCH_RETRY_BACKOFF_SECONDS = float(os.getenv("CARD_VARIANT_FETCH_RETRY_BACKOFF_SECONDS", "1.0"))
+# How /cards/upload-variants builds variants by default: "per_set" (one cardinfo.php call per set)
+# or "bulk" (one streamed download of the full cardinfo.php dump)
+CARD_VARIANT_UPLOAD_MODE = os.getenv("CARD_VARIANT_UPLOAD_MODE", "per_set").lower()
+CARD_DUMP_CHUNK_BYTES = int(os.getenv("CARD_DUMP_CHUNK_BYTES", "65536"))
+# An incremental sync refuses to delete more sets than both of these limits (a truncated
+# cardsets.php response would otherwise wipe most variants) unless it is forced
+CARD_VARIANT_SYNC_MAX_REMOVED_SETS = int(os.getenv("CARD_VARIANT_SYNC_MAX_REMOVED_SETS", "10"))
+CARD_VARIANT_SYNC_MAX_REMOVED_FRACTION = float(os.getenv("CARD_VARIANT_SYNC_MAX_REMOVED_FRACTION", "0.05"))
+# A full per-set rebuild is not swapped in when no set succeeded or more than this fraction
+# of sets failed (e.g. YGOPRODeck is down), so readers keep the previous variants
+CARD_VARIANT_REBUILD_MAX_FAILED_FRACTION = float(os.getenv("CARD_VARIANT_REBUILD_MAX_FAILED_FRACTION", "0.05"))
 BATCH_SIZE = 100  # Default batch size for bulk operations
 
 # Memory Management Configuration
@@ -71,9 +167,53 @@ SELENIUM_HEADLESS = os.getenv("SELENIUM_HEADLESS", "true").lower() == "true"
 SELENIUM_TIMEOUT = int(os.getenv("SELENIUM_TIMEOUT", "30"))
 SELENIUM_IMPLICIT_WAIT = int(os.getenv("SELENIUM_IMPLICIT_WAIT", "10"))
 
+# Playwright browser pool configuration
+# Number of warm browser contexts kept ready for scraping
+PLAYWRIGHT_POOL_SIZE = int(os.getenv("PLAYWRIGHT_POOL_SIZE", "2"))
+# Recycle a context after this many page navigations
+PLAYWRIGHT_MAX_NAVIGATIONS_PER_CONTEXT = int(os.getenv("PLAYWRIGHT_MAX_NAVIGATIONS_PER_CONTEXT", "50"))
+# How long a scrape waits for a free context before giving up
+PLAYWRIGHT_ACQUIRE_TIMEOUT_SECONDS = float(os.getenv("PLAYWRIGHT_ACQUIRE_TIMEOUT_SECONDS", "120"))
+# Abort non-essential requests (images, fonts, media, trackers) during scraping
+PLAYWRIGHT_BLOCK_REQUESTS = os.getenv("PLAYWRIGHT_BLOCK_REQUESTS", "true").lower() == "true"
+PLAYWRIGHT_BLOCKED_RESOURCE_TYPES = [
+    value.strip().lower()
+    for value in os.getenv("PLAYWRIGHT_BLOCKED_RESOURCE_TYPES", "image,media,font").split(",")
+    if value.strip()
+]
+PLAYWRIGHT_BLOCKED_DOMAINS = [
+    value.strip().lower()
+    for value in os.getenv(
+        "PLAYWRIGHT_BLOCKED_DOMAINS",
+        "google-analytics.com,googletagmanager.com,doubleclick.net,googlesyndication.com,"
+        "googleadservices.com,facebook.net,facebook.com,connect.facebook.net,hotjar.com,"
+        "segment.io,segment.com,newrelic.com,nr-data.net,clarity.ms,bat.bing.com,"
+        "tiktok.com,pinterest.com,criteo.com,adsrvr.org,quantserve.com,"
+        "scorecardresearch.com,optimizely.com,sentry.io,branch.io,pendo.io,fullstory.com",
+    ).split(",")
+    if value.strip()
+]
+# URLs containing any of these substrings are never blocked
+PLAYWRIGHT_BLOCK_ALLOWLIST = [
+    value.strip().lower()
+    for value in os.getenv("PLAYWRIGHT_BLOCK_ALLOWLIST", "").split(",")
+    if value.strip()
+]
+
+# Page readiness: navigate until DOMContentLoaded, then wait for the elements the scraper reads
+PLAYWRIGHT_WAIT_UNTIL = os.getenv("PLAYWRIGHT_WAIT_UNTIL", "domcontentloaded")
+PLAYWRIGHT_NAVIGATION_TIMEOUT_MS = int(os.getenv("PLAYWRIGHT_NAVIGATION_TIMEOUT_MS", "60000"))
+# How long to wait for search results or the price table before reading the page anyway
+PLAYWRIGHT_SELECTOR_TIMEOUT_MS = int(os.getenv("PLAYWRIGHT_SELECTOR_TIMEOUT_MS", "15000"))
+
 # TCGPlayer specific configuration
 TCGPLAYER_BASE_URL = "https://www.tcgplayer.com"
 TCGPLAYER_SEARCH_PATH = "/search/yugioh/product"
+# Elements that mark a page as ready to be read by the scraper
+TCGPLAYER_PRODUCT_PAGE_SELECTOR = '.product-details, .product-title, h1[data-testid="product-name"]'
+TCGPLAYER_SEARCH_READY_SELECTOR = f'h1:has-text("result"), {TCGPLAYER_PRODUCT_PAGE_SELECTOR}'
+TCGPLAYER_PRODUCT_LINK_SELECTOR = 'a[href*="/product/"]'
+TCGPLAYER_PRICE_READY_SELECTOR = 'tr:has-text("Market Price"), :text-matches("market price|tcg low", "i")'
 
 # Card processing configuration
 CARD_PROCESSING_BATCH_SIZE = int(os.getenv("CARD_PROCESSING_BATCH_SIZE", "100"))
@@ -8,7 +8,9 @@ resource management and connection pooling.
 import logging
 import os
 import ssl
+import uuid
 from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
 from typing import Any, Dict, List, Optional
 
 from pymongo import MongoClient
@@ -16,12 +18,18 @@ from pymongo.collection import Collection
 from pymongo.database import Database
 
 from .config import (
+    MONGODB_CARD_SET_SYNC_LEDGER_COLLECTION,
     MONGODB_CARD_VARIANTS_COLLECTION,
     MONGODB_COLLECTION_NAME,
     MONGODB_CONNECT_TIMEOUT_MS,
     MONGODB_CONNECTION_STRING,
     MONGODB_SERVER_SELECTION_TIMEOUT_MS,
+    MONGODB_STAGING_COLLECTION_MAX_AGE_HOURS,
+    MONGODB_STAGING_COLLECTION_SUFFIX,
     PRICE_CACHE_COLLECTION,
+    PRICE_HISTORY_COLLECTION,
+    PRICE_JOBS_COLLECTION,
+    PRICE_NEGATIVE_CACHE_COLLECTION,
 )
 from .memory_manager import get_memory_manager, monitor_memory
 
@@ -162,12 +170,36 @@ class DatabaseManager:
             return None
         return self.get_collection(MONGODB_CARD_VARIANTS_COLLECTION)
 
+    def get_card_set_sync_ledger_collection(self) -> Collection:
+        """Get card set sync ledger collection."""
+        if self._is_database_disabled():
+            return None
+        return self.get_collection(MONGODB_CARD_SET_SYNC_LEDGER_COLLECTION)
+
     def get_price_cache_collection(self) -> Collection:
         """Get price cache collection."""
         if self._is_database_disabled():
             return None
         return self.get_collection(PRICE_CACHE_COLLECTION)
 
+    def get_price_jobs_collection(self) -> Collection:
+        """Get price scrape job queue collection."""
+        if self._is_database_disabled():
+            return None
+        return self.get_collection(PRICE_JOBS_COLLECTION)
+
+    def get_price_history_collection(self) -> Collection:
+        """Get price history collection."""
+        if self._is_database_disabled():
+            return None
+        return self.get_collection(PRICE_HISTORY_COLLECTION)
+
+    def get_price_negative_cache_collection(self) -> Collection:
+        """Get negative price result cache collection."""
+        if self._is_database_disabled():
+            return None
+        return self.get_collection(PRICE_NEGATIVE_CACHE_COLLECTION)
+
     @contextmanager
     def get_connection(self):
         """
@@ -316,12 +348,101 @@ def get_card_variants_collection() -> Collection:
     return db_manager.get_card_variants_collection()
 
 
+def get_card_set_sync_ledger_collection() -> Collection:
+    """Get card set sync ledger collection."""
+    db_manager = get_database_manager()
+    return db_manager.get_card_set_sync_ledger_collection()
+
+
 def get_price_cache_collection() -> Collection:
     """Get price cache collection."""
     db_manager = get_database_manager()
     return db_manager.get_price_cache_collection()
 
 
+def get_price_jobs_collection() -> Collection:
+    """Get price scrape job queue collection."""
+    db_manager = get_database_manager()
+    return db_manager.get_price_jobs_collection()
+
+
+def get_price_history_collection() -> Collection:
+    """Get price history collection."""
+    db_manager = get_database_manager()
+    return db_manager.get_price_history_collection()
+
+
+def get_price_negative_cache_collection() -> Collection:
+    """Get negative price result cache collection."""
+    db_manager = get_database_manager()
+    return db_manager.get_price_negative_cache_collection()
+
+
+_STAGING_TIMESTAMP_FORMAT = "%Y%m%d%H%M%S"
+
+
+def get_staging_collection(live_collection: Collection) -> Collection:
+    """
+    Get a new staging collection next to live_collection for a blue/green rebuild.
+
+    Every rebuild gets its own uniquely named staging collection, so overlapping
+    rebuilds never write into or drop each other's data. Staging collections of
+    this live collection older than MONGODB_STAGING_COLLECTION_MAX_AGE_HOURS are
+    leftovers of interrupted rebuilds and are dropped.
+
+    Args:
+        live_collection: Collection that will be replaced
+
+    Returns:
+        Collection: Empty staging collection
+    """
+    prefix = f"{live_collection.name}{MONGODB_STAGING_COLLECTION_SUFFIX}_"
+    now = datetime.now(timezone.utc)
+    _drop_stale_staging_collections(live_collection.database, prefix, now)
+    staging_name = f"{prefix}{now.strftime(_STAGING_TIMESTAMP_FORMAT)}_{uuid.uuid4().hex[:8]}"
+    return live_collection.database.get_collection(staging_name)
+
+
+def _drop_stale_staging_collections(database: Database, prefix: str, now: datetime) -> None:
+    """Drop staging collections named with prefix that are older than the max age; failures are only logged."""
+    cutoff = now - timedelta(hours=MONGODB_STAGING_COLLECTION_MAX_AGE_HOURS)
+    try:
+        for name in database.list_collection_names():
+            if not name.startswith(prefix):
+                continue
+            try:
+                created_at = datetime.strptime(
+                    name[len(prefix):].split("_")[0], _STAGING_TIMESTAMP_FORMAT
+                ).replace(tzinfo=timezone.utc)
+            except ValueError:
+                continue
+            if created_at < cutoff:
+                database.drop_collection(name)
+                logger.info(f"Dropped stale staging collection {name}")
+    except Exception as e:
+        logger.warning(f"Could not clean up stale staging collections: {e}")
+
+
+def promote_staging_collection(staging_collection: Collection, live_collection: Collection) -> int:
+    """
+    Atomically replace live_collection with a fully built staging collection.
+
+    The staging collection must already have its indexes; renameCollection with
+    dropTarget swaps it in, so readers see either the old or the new data in full.
+
+    Args:
+        staging_collection: Built and indexed staging collection
+        live_collection: Collection being replaced
+
+    Returns:
+        int: Estimated number of documents in the replaced collection
+    """
+    previous_count = live_collection.estimated_document_count()
+    staging_collection.rename(live_collection.name, dropTarget=True)
+    logger.info(f"Swapped {staging_collection.name} in as {live_collection.name} (replaced ~{previous_count} documents)")
+    return previous_count
+
+
 def close_database_connections():
     """Close all database connections."""
     global _db_manager
@@ -31,6 +31,7 @@ class AdvancedCache:
         self.ttl = ttl
         self._cache: OrderedDict = OrderedDict()
         self._access_times: Dict = {}
+        self._expires_at: Dict = {}
         self._stats = defaultdict(int)
         self._lock = threading.RLock()
         
@@ -41,10 +42,14 @@ class AdvancedCache:
                 self._stats['misses'] += 1
                 return None
                 
-            # Check TTL if configured
+            # Check per-key expiry, then TTL if configured
+            expires_at = self._expires_at.get(key)
+            if expires_at is not None and time.time() >= expires_at:
+                self._remove(key)
+                self._stats['expired'] += 1
+                return None
             if self.ttl and time.time() - self._access_times[key] > self.ttl:
-                del self._cache[key]
-                del self._access_times[key]
+                self._remove(key)
                 self._stats['expired'] += 1
                 return None
                 
@@ -55,10 +60,14 @@ class AdvancedCache:
             self._stats['hits'] += 1
             return value
     
-    def set(self, key: Any, value: Any) -> None:
-        """Set value in cache with automatic eviction."""
+    def set(self, key: Any, value: Any, ttl: Optional[float] = None) -> None:
+        """Set value in cache with automatic eviction; ttl (seconds) expires this key only."""
         with self._lock:
             current_time = time.time()
+            if ttl is not None:
+                self._expires_at[key] = current_time + ttl
+            else:
+                self._expires_at.pop(key, None)
             
             if key in self._cache:
                 # Update existing
@@ -71,14 +80,37 @@ class AdvancedCache:
                 if len(self._cache) >= self.max_size:
                     # Evict least recently used
                     oldest_key = next(iter(self._cache))
-                    del self._cache[oldest_key]
-                    del self._access_times[oldest_key]
+                    self._remove(oldest_key)
                     self._stats['evictions'] += 1
                 
                 self._cache[key] = value
                 self._access_times[key] = current_time
                 self._stats['sets'] += 1
     
+    def delete(self, key: Any) -> bool:
+        """Remove a key from the cache; return True if it was present."""
+        with self._lock:
+            if key not in self._cache:
+                return False
+            self._remove(key)
+            self._stats['deletes'] += 1
+            return True
+    
+    def delete_matching(self, predicate: Callable[[Any], bool]) -> int:
+        """Remove every key for which predicate(key) is true; return how many were removed."""
+        with self._lock:
+            keys = [key for key in self._cache if predicate(key)]
+            for key in keys:
+                self._remove(key)
+            self._stats['deletes'] += len(keys)
+            return len(keys)
+    
+    def _remove(self, key: Any) -> None:
+        """Drop a key and its bookkeeping; caller must hold the lock."""
+        del self._cache[key]
+        del self._access_times[key]
+        self._expires_at.pop(key, None)
+    
     def size(self) -> int:
         """Get current cache size."""
         with self._lock:
@@ -89,6 +121,7 @@ class AdvancedCache:
         with self._lock:
             self._cache.clear()
             self._access_times.clear()
+            self._expires_at.clear()
             self._stats['clears'] += 1
     
     def get_stats(self) -> Dict[str, int]:
@@ -152,6 +152,7 @@ class ProcessingStats(BaseModel):
     total_cards_processed: int = 0
     unique_variants_created: int = 0
     duplicate_variants_skipped: int = 0
+    fetch_retries: int = 0
     processing_errors: List[Dict[str, Any]] = Field(default_factory=list)
     success_rate: Optional[float] = None
 
@@ -0,0 +1,450 @@
+"""
+Price Job Queue Module
+
+Runs price scrapes as background jobs so API threads don't block on
+Playwright navigations. Requests enqueue a job and poll for its result by id.
+Jobs are kept in-process by default; a MongoDB-backed queue lets several
+API instances share the same work.
+"""
+
+import itertools
+import logging
+import queue
+import socket
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from datetime import timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+from pymongo import ASCENDING, ReturnDocument
+
+from .config import (
+    PRICE_JOB_LEASE_SECONDS,
+    PRICE_JOB_POLL_INTERVAL_SECONDS,
+    PRICE_JOB_QUEUE_BACKEND,
+    PRICE_JOB_RESULT_TTL_SECONDS,
+    PRICE_JOB_WORKERS,
+)
+from .database import get_price_jobs_collection
+from .utils import get_current_utc_datetime
+
+logger = logging.getLogger(__name__)
+
+JOB_STATUS_QUEUED = "queued"
+JOB_STATUS_RUNNING = "running"
+JOB_STATUS_COMPLETED = "completed"
+JOB_STATUS_FAILED = "failed"
+
+# Priority of request-submitted jobs; lower values run first
+JOB_PRIORITY_INTERACTIVE = 0
+
+
+class PriceJobQueue(ABC):
+    """
+    Base class for price scrape job queues.
+
+    Subclasses store jobs; this class owns the worker threads that claim
+    queued jobs, run the handler and record the outcome.
+    """
+
+    backend = "base"
+
+    def __init__(
+        self,
+        handler: Callable[[Dict[str, Any]], Dict[str, Any]],
+        workers: int = PRICE_JOB_WORKERS,
+    ):
+        self.handler = handler
+        self.worker_count = max(1, workers)
+        self._workers: List[threading.Thread] = []
+        self._workers_lock = threading.Lock()
+        self._stop_event = threading.Event()
+
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            "submitted": 0,
+            "completed": 0,
+            "failed": 0,
+        }
+
+    # ==================== PUBLIC API ====================
+
+    def submit(self, payload: Dict[str, Any], priority: int = JOB_PRIORITY_INTERACTIVE) -> str:
+        """
+        Enqueue a price scrape job.
+
+        Args:
+            payload: Scrape parameters (card_number, card_name, card_rarity, art_variant, force_refresh)
+            priority: Lower values are claimed first
+
+        Returns:
+            str: Job id
+        """
+        job_id = uuid.uuid4().hex
+        now = get_current_utc_datetime()
+        job = {
+            "job_id": job_id,
+            "status": JOB_STATUS_QUEUED,
+            "priority": priority,
+            "payload": payload,
+            "result": None,
+            "error": None,
+            "created_at": now,
+            "started_at": None,
+            "finished_at": None,
+        }
+        self._enqueue(job)
+        self._increment("submitted")
+        self.start()
+        logger.info(f"Queued price job {job_id} for {payload.get('card_number')} ({self.backend} queue)")
+        return job_id
+
+    @abstractmethod
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a job's status and, once finished, its result.
+
+        Args:
+            job_id: Job id returned by submit()
+
+        Returns:
+            Optional[Dict]: Job document, or None if unknown or expired
+        """
+
+    def start(self) -> None:
+        """Start the worker threads if they are not running."""
+        with self._workers_lock:
+            self._workers = [worker for worker in self._workers if worker.is_alive()]
+            if self._workers:
+                return
+            self._stop_event.clear()
+            for index in range(self.worker_count):
+                worker = threading.Thread(
+                    target=self._worker_loop,
+                    name=f"price-job-worker-{index}",
+                    daemon=True,
+                )
+                worker.start()
+                self._workers.append(worker)
+            logger.info(f"Started {self.worker_count} price job workers ({self.backend} queue)")
+
+    def shutdown(self, timeout: float = 5.0) -> None:
+        """Stop the worker threads after their current job."""
+        self._stop_event.set()
+        self._wake_workers()
+        with self._workers_lock:
+            for worker in self._workers:
+                worker.join(timeout)
+            self._workers = []
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get queue statistics."""
+        with self._stats_lock:
+            stats = dict(self._stats)
+        with self._workers_lock:
+            stats["workers"] = sum(1 for worker in self._workers if worker.is_alive())
+        stats["backend"] = self.backend
+        stats.update(self._get_depth_stats())
+        return stats
+
+    # ==================== WORKERS ====================
+
+    def _worker_loop(self) -> None:
+        """Claim and run jobs until the queue is shut down."""
+        while not self._stop_event.is_set():
+            try:
+                job = self._claim()
+            except Exception as e:
+                logger.error(f"Error claiming price job: {e}")
+                self._stop_event.wait(PRICE_JOB_POLL_INTERVAL_SECONDS)
+                continue
+
+            if job is None:
+                continue
+
+            self._run_job(job)
+
+    def _run_job(self, job: Dict[str, Any]) -> None:
+        """Run the handler for a claimed job and record the outcome."""
+        job_id = job["job_id"]
+        try:
+            result = self.handler(job["payload"])
+            self._finish(job_id, JOB_STATUS_COMPLETED, result=result)
+            self._increment("completed")
+            logger.info(f"Price job {job_id} completed")
+        except Exception as e:
+            logger.error(f"Price job {job_id} failed: {e}")
+            self._finish(job_id, JOB_STATUS_FAILED, error=str(e))
+            self._increment("failed")
+
+    def _increment(self, key: str) -> None:
+        with self._stats_lock:
+            self._stats[key] += 1
+
+    # ==================== STORAGE (implemented by subclasses) ====================
+
+    @abstractmethod
+    def _enqueue(self, job: Dict[str, Any]) -> None:
+        """Store a new queued job."""
+
+    @abstractmethod
+    def _claim(self) -> Optional[Dict[str, Any]]:
+        """Claim the next queued job, waiting briefly; return None if there is none."""
+
+    @abstractmethod
+    def _finish(self, job_id: str, status: str, result: Any = None, error: Optional[str] = None) -> None:
+        """Record a job's outcome."""
+
+    def _wake_workers(self) -> None:
+        """Unblock workers waiting in _claim() so they can observe shutdown."""
+
+    def _get_depth_stats(self) -> Dict[str, Any]:
+        return {}
+
+
+class InProcessPriceJobQueue(PriceJobQueue):
+    """Job queue held in this process's memory."""
+
+    backend = "memory"
+
+    def __init__(
+        self,
+        handler: Callable[[Dict[str, Any]], Dict[str, Any]],
+        workers: int = PRICE_JOB_WORKERS,
+        result_ttl_seconds: int = PRICE_JOB_RESULT_TTL_SECONDS,
+    ):
+        super().__init__(handler, workers)
+        self.result_ttl_seconds = result_ttl_seconds
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+        self._jobs_lock = threading.Lock()
+        self._queue: "queue.PriorityQueue" = queue.PriorityQueue()
+        # Tie-breaker so equal priorities are served first-in, first-out
+        self._sequence = itertools.count()
+
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._jobs_lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job else None
+
+    def _enqueue(self, job: Dict[str, Any]) -> None:
+        self._purge_expired()
+        with self._jobs_lock:
+            self._jobs[job["job_id"]] = job
+        self._queue.put((job["priority"], next(self._sequence), job["job_id"]))
+
+    def _claim(self) -> Optional[Dict[str, Any]]:
+        try:
+            _, _, job_id = self._queue.get(timeout=PRICE_JOB_POLL_INTERVAL_SECONDS)
+        except queue.Empty:
+            return None
+        if job_id is None:
+            # Shutdown sentinel
+            return None
+
+        with self._jobs_lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            job["status"] = JOB_STATUS_RUNNING
+            job["started_at"] = get_current_utc_datetime()
+            return dict(job)
+
+    def _finish(self, job_id: str, status: str, result: Any = None, error: Optional[str] = None) -> None:
+        with self._jobs_lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return
+            job["status"] = status
+            job["result"] = result
+            job["error"] = error
+            job["finished_at"] = get_current_utc_datetime()
+
+    def _wake_workers(self) -> None:
+        for _ in range(self.worker_count):
+            self._queue.put((float("-inf"), next(self._sequence), None))
+
+    def _purge_expired(self) -> None:
+        """Forget finished jobs older than the result TTL."""
+        cutoff = get_current_utc_datetime() - timedelta(seconds=self.result_ttl_seconds)
+        with self._jobs_lock:
+            expired = [
+                job_id for job_id, job in self._jobs.items()
+                if job["finished_at"] is not None and job["finished_at"] < cutoff
+            ]
+            for job_id in expired:
+                del self._jobs[job_id]
+
+    def _get_depth_stats(self) -> Dict[str, Any]:
+        with self._jobs_lock:
+            statuses = [job["status"] for job in self._jobs.values()]
+        return {
+            "queued": statuses.count(JOB_STATUS_QUEUED),
+            "running": statuses.count(JOB_STATUS_RUNNING),
+            "retained_jobs": len(statuses),
+        }
+
+
+class MongoPriceJobQueue(PriceJobQueue):
+    """
+    Job queue stored in MongoDB so several instances can share work.
+
+    Workers claim jobs atomically with find_one_and_update. Running jobs hold
+    a lease; if an instance dies mid-job the lease expires and another worker
+    picks the job up again. Finished jobs are removed by a TTL index.
+    """
+
+    backend = "mongodb"
+
+    def __init__(
+        self,
+        handler: Callable[[Dict[str, Any]], Dict[str, Any]],
+        collection: Any,
+        workers: int = PRICE_JOB_WORKERS,
+        result_ttl_seconds: int = PRICE_JOB_RESULT_TTL_SECONDS,
+        lease_seconds: int = PRICE_JOB_LEASE_SECONDS,
+    ):
+        super().__init__(handler, workers)
+        self.collection = collection
+        self.result_ttl_seconds = result_ttl_seconds
+        self.lease_seconds = lease_seconds
+        self.worker_id = f"{socket.gethostname()}-{uuid.uuid4().hex[:8]}"
+        self._ensure_indexes()
+
+    def _ensure_indexes(self) -> None:
+        """Create the claim and TTL indexes."""
+        try:
+            self.collection.create_index(
+                [("status", ASCENDING), ("priority", ASCENDING), ("created_at", ASCENDING)],
+                name="status_priority_created",
+                background=True,
+            )
+            self.collection.create_index(
+                "finished_at",
+                name="finished_at_ttl",
+                expireAfterSeconds=self.result_ttl_seconds,
+                background=True,
+            )
+        except Exception as e:
+            logger.warning(f"Could not create price job indexes: {e}")
+
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        document = self.collection.find_one({"_id": job_id})
+        if not document:
+            return None
+        document.pop("_id", None)
+        document.pop("lease_expires_at", None)
+        document.pop("worker_id", None)
+        return document
+
+    def _enqueue(self, job: Dict[str, Any]) -> None:
+        self.collection.insert_one({"_id": job["job_id"], **job})
+
+    def _claim(self) -> Optional[Dict[str, Any]]:
+        now = get_current_utc_datetime()
+        job = self.collection.find_one_and_update(
+            {
+                "$or": [
+                    {"status": JOB_STATUS_QUEUED},
+                    {"status": JOB_STATUS_RUNNING, "lease_expires_at": {"$lt": now}},
+                ]
+            },
+            {
+                "$set": {
+                    "status": JOB_STATUS_RUNNING,
+                    "started_at": now,
+                    "lease_expires_at": now + timedelta(seconds=self.lease_seconds),
+                    "worker_id": self.worker_id,
+                }
+            },
+            sort=[("priority", ASCENDING), ("created_at", ASCENDING)],
+            return_document=ReturnDocument.AFTER,
+        )
+        if job is None:
+            self._stop_event.wait(PRICE_JOB_POLL_INTERVAL_SECONDS)
+        return job
+
+    def _finish(self, job_id: str, status: str, result: Any = None, error: Optional[str] = None) -> None:
+        self.collection.update_one(
+            {"_id": job_id, "worker_id": self.worker_id},
+            {
+                "$set": {
+                    "status": status,
+                    "result": result,
+                    "error": error,
+                    "finished_at": get_current_utc_datetime(),
+                },
+                "$unset": {"lease_expires_at": ""},
+            },
+        )
+
+    def _get_depth_stats(self) -> Dict[str, Any]:
+        try:
+            return {
+                "queued": self.collection.count_documents({"status": JOB_STATUS_QUEUED}),
+                "running": self.collection.count_documents({"status": JOB_STATUS_RUNNING}),
+            }
+        except Exception as e:
+            logger.warning(f"Could not count price jobs: {e}")
+            return {}
+
+
+def run_price_job(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Default job handler: look up the card name if needed and scrape its price.
+
+    Args:
+        payload: Scrape parameters from the request
+
+    Returns:
+        Dict: scrape_card_price result
+    """
+    # Imported here to avoid a circular import with the price scraping module
+    from .price_scraping import price_scraping_service
+
+    card_number = payload.get("card_number") or ""
+    card_name = payload.get("card_name") or ""
+    if not card_name and card_number:
+        card_name = price_scraping_service.lookup_card_name(card_number) or ""
+
+    return price_scraping_service.scrape_card_price(
+        card_number=card_number,
+        card_name=card_name,
+        card_rarity=payload.get("card_rarity") or "",
+        art_variant=payload.get("art_variant"),
+        force_refresh=bool(payload.get("force_refresh")),
+    )
+
+
+def create_price_job_queue(
+    handler: Callable[[Dict[str, Any]], Dict[str, Any]] = run_price_job,
+    backend: str = PRICE_JOB_QUEUE_BACKEND,
+) -> PriceJobQueue:
+    """
+    Create a job queue for the configured backend.
+
+    Falls back to the in-process queue if MongoDB is requested but unavailable.
+    """
+    if backend == "mongodb":
+        collection = get_price_jobs_collection()
+        if collection is not None:
+            return MongoPriceJobQueue(handler, collection)
+        logger.warning("MongoDB price job queue requested but database is unavailable - using in-process queue")
+    elif backend != "memory":
+        logger.warning(f"Unknown PRICE_JOB_QUEUE_BACKEND '{backend}' - using in-process queue")
+    return InProcessPriceJobQueue(handler)
+
+
+# Global job queue instance
+_price_job_queue: Optional[PriceJobQueue] = None
+_price_job_queue_lock = threading.Lock()
+
+
+def get_price_job_queue() -> PriceJobQueue:
+    """Get the global price job queue instance."""
+    global _price_job_queue
+    with _price_job_queue_lock:
+        if _price_job_queue is None:
+            _price_job_queue = create_price_job_queue()
+        return _price_job_queue
@@ -5,22 +5,58 @@ Handles price data collection from TCGPlayer with caching and validation.
 This module provides synchronous price scraping functionality with memory optimization.
 """
 
-import asyncio
 import logging
 import re
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
-from typing import Dict, List, Optional, Any, Tuple
-from playwright.async_api import async_playwright
+from typing import Dict, List, Optional, Any, Set, Tuple
 from urllib.parse import quote
 import requests
+from pymongo import DESCENDING, ReturnDocument, UpdateOne
 
 from .config import (
+    CARD_LOOKUP_REGEX_FALLBACK,
+    CARD_NUMBER_MAP_WARM_ON_STARTUP,
+    PRICE_BATCH_MAX_CONCURRENCY,
+    PRICE_BATCH_MAX_ITEMS,
     PRICE_CACHE_EXPIRY_DAYS,
+    PRICE_CACHE_STATS_TTL_SECONDS,
+    PRICE_CACHE_HARD_EXPIRY_DAYS,
+    PRICE_CACHE_SWR_WINDOW_DAYS,
+    PRICE_L1_CACHE_SIZE,
+    PRICE_L1_CACHE_TTL_SECONDS,
+    PRICE_HISTORY_COLLECTION,
+    PRICE_HISTORY_ENABLED,
+    PRICE_LOOKUP_KEY_BACKFILL_BATCH_SIZE,
+    PRICE_NEGATIVE_CACHE_MEMORY_SIZE,
+    PRICE_NEGATIVE_CACHE_TTL_SECONDS,
+    PRICE_RARITY_TABLE_CACHE_SIZE,
+    PRICE_RARITY_TABLE_FALLBACK_TTL_SECONDS,
+    PRICE_RARITY_TABLE_TTL_SECONDS,
+    PRICE_LOOKUP_KEY_BACKFILL_ON_STARTUP,
+    PRICE_PRODUCT_URL_MEMO_SIZE,
+    PRICE_REVALIDATION_WORKERS,
     PRICE_SCRAPING_TIMEOUT_SECONDS,
     PRICE_SCRAPING_MAX_RETRIES,
     PRICE_SCRAPING_RETRY_DELAY,
+    PRICE_SIBLING_PREFETCH_BUDGET,
+    PRICE_SIBLING_PREFETCH_ENABLED,
+    PRICE_SIBLING_PREFETCH_WINDOW_SECONDS,
+    PRICE_WRITE_BEHIND_BATCH_SIZE,
+    PRICE_WRITE_BEHIND_ENABLED,
+    PRICE_WRITE_BEHIND_FLUSH_SECONDS,
+    PLAYWRIGHT_NAVIGATION_TIMEOUT_MS,
+    PLAYWRIGHT_SELECTOR_TIMEOUT_MS,
+    PLAYWRIGHT_WAIT_UNTIL,
     TCGPLAYER_BASE_URL,
     TCGPLAYER_SEARCH_PATH,
+    TCGPLAYER_PRODUCT_PAGE_SELECTOR,
+    TCGPLAYER_SEARCH_READY_SELECTOR,
+    TCGPLAYER_PRODUCT_LINK_SELECTOR,
+    TCGPLAYER_PRICE_READY_SELECTOR,
     TCGPLAYER_MAX_PREFERRED_RESULTS,
     TCGPLAYER_MAX_ACCEPTABLE_RESULTS,
     TCGPLAYER_DEFAULT_VARIANT_LIMIT,
@@ -28,7 +64,17 @@ from .config import (
     TCGPLAYER_MIN_VARIANTS_BEFORE_EARLY_TERMINATION,
     YGO_API_BASE_URL
 )
-from .database import get_price_cache_collection, get_card_variants_collection
+from .browser_pool import BrowserPool
+from .card_number_index import CardNumberIndex
+from .coalescing import SingleFlight
+from .scraping_runtime import get_scraping_runtime
+from .write_behind import WriteBehindBuffer
+from .database import (
+    get_card_variants_collection,
+    get_price_cache_collection,
+    get_price_history_collection,
+    get_price_negative_cache_collection,
+)
 from .models import CardPriceModel, PriceScrapingRequest, PriceScrapingResponse
 from .utils import (
     normalize_rarity,
@@ -36,17 +82,41 @@ from .utils import (
     normalize_art_variant,
     clean_card_data,
     is_cache_fresh,
+    get_cache_age_hours,
     get_current_utc_datetime,
     extract_art_version,
     extract_set_code,
     map_rarity_to_tcgplayer_filter,
     extract_booster_set_name,
-    map_set_code_to_tcgplayer_name
+    extract_tcgplayer_product_id,
+    map_set_code_to_tcgplayer_name,
+    normalize_card_number
 )
-from .memory_manager import monitor_memory, get_memory_manager
+from .memory_manager import AdvancedCache, monitor_memory, get_memory_manager
+from .rate_limiter import get_ygo_api_rate_limiter
 
 logger = logging.getLogger(__name__)
 
+# Phases of a TCGPlayer scrape, in the order they run
+SCRAPE_PHASES = ("goto", "results_wait", "variant_extraction", "product_load", "price_extraction", "total")
+
+
+def _elapsed_ms(started: float) -> float:
+    """Milliseconds elapsed since a time.perf_counter() reading."""
+    return round((time.perf_counter() - started) * 1000, 1)
+
+
+# Scrape errors that mean TCGPlayer doesn't list the card, as opposed to a transient failure
+NO_RESULTS_ERROR = "No results found on TCGPlayer"
+NO_VARIANT_ERROR = "No suitable variant found"
+NEGATIVE_CACHEABLE_ERRORS = (NO_RESULTS_ERROR, NO_VARIANT_ERROR)
+
+
+def _is_tcgplayer_product_url(url: Any) -> bool:
+    """Check that a stored URL points at a TCGPlayer product page."""
+    return isinstance(url, str) and "/product/" in url
+
+
 class PriceScrapingService:
     """Service for managing price scraping operations."""
     
@@ -54,9 +124,102 @@ class PriceScrapingService:
         self.memory_manager = get_memory_manager()
         self.cache_collection = None
         self.variants_collection = None
+        self.negative_cache_collection = None
+        self.history_collection = None
         self._initialized = False
-        self._browser = None
-        self._playwright = None
+        # True while cached prices without price_lookup_key exist; lookups then also try the legacy query
+        self._legacy_lookup_fallback = False
+        # Long-lived event loop shared by all async scraping work
+        self.runtime = get_scraping_runtime()
+        # Warm browser contexts shared by all scrapes; launched lazily on first use
+        self.browser_pool = BrowserPool(memory_manager=self.memory_manager, runtime=self.runtime)
+        # Concurrent requests for the same card share one in-flight scrape
+        self.scrape_coalescer = SingleFlight("price-scrapes")
+        # Background refreshes for stale prices served within the revalidate window
+        self._revalidation_executor = ThreadPoolExecutor(
+            max_workers=max(1, PRICE_REVALIDATION_WORKERS), thread_name_prefix="price-revalidate"
+        )
+        self._revalidating = set()
+        self._revalidation_lock = threading.Lock()
+        self._revalidation_stats = {
+            "stale_served": 0,
+            "scheduled": 0,
+            "deduplicated": 0,
+            "completed": 0,
+            "failed": 0,
+        }
+        # Speculative scrapes of sibling rarities run on a single low-priority worker
+        self._prefetch_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="price-prefetch")
+        self._prefetching = set()
+        self._prefetch_lock = threading.Lock()
+        # Start times of prefetch scrapes inside the current budget window
+        self._prefetch_started_at = deque()
+        # Prices warmed by prefetch, so later fresh hits on them can be counted
+        self._prefetched_keys = AdvancedCache(
+            max_size=max(1, PRICE_SIBLING_PREFETCH_BUDGET) * 4,
+            ttl=PRICE_CACHE_EXPIRY_DAYS * 86400
+        )
+        self._prefetch_stats = {
+            "triggered": 0,
+            "queued": 0,
+            "completed": 0,
+            "failed": 0,
+            "hits": 0,
+            "skipped_fresh": 0,
+            "skipped_negative": 0,
+            "skipped_budget": 0,
+            "skipped_memory": 0,
+            "deduplicated": 0,
+        }
+        # Per-phase scrape timings (milliseconds) and selector wait timeouts
+        self._phase_lock = threading.Lock()
+        self._phase_stats = {phase: {"count": 0, "total_ms": 0.0, "max_ms": 0.0} for phase in SCRAPE_PHASES}
+        self._selector_timeouts = {}
+        # Product pages already resolved through search, keyed like scrapes, so refreshes can skip the search
+        self.product_url_memo = AdvancedCache(max_size=PRICE_PRODUCT_URL_MEMO_SIZE)
+        self._product_url_lock = threading.Lock()
+        self._product_url_stats = {
+            "memo_hits": 0,
+            "db_hits": 0,
+            "misses": 0,
+            "reused": 0,
+            "mismatches": 0,
+        }
+        # Fresh price documents keyed by price lookup key, so repeated reads skip MongoDB
+        self.price_l1_cache = AdvancedCache(max_size=PRICE_L1_CACHE_SIZE)
+        # Set code -> {card number: canonical rarities}, so validating a set costs one upstream call
+        self.rarity_tables = AdvancedCache(max_size=PRICE_RARITY_TABLE_CACHE_SIZE)
+        self.rarity_table_loader = SingleFlight("rarity-tables")
+        # Same token bucket as the card services, so validation can't overrun a concurrent rebuild's budget
+        self.ygo_api_rate_limiter = get_ygo_api_rate_limiter()
+        # Card number -> card name map and exact card_number_key lookups for requests without a name
+        self.card_number_index = CardNumberIndex(regex_fallback=CARD_LOOKUP_REGEX_FALLBACK, name="price-card-numbers")
+        # In-process mirror of the negative result collection, keyed by price lookup key
+        self.negative_cache = AdvancedCache(max_size=PRICE_NEGATIVE_CACHE_MEMORY_SIZE)
+        self._negative_cache_lock = threading.Lock()
+        self._negative_cache_stats = {
+            "memory_hits": 0,
+            "db_hits": 0,
+            "stored": 0,
+            "cleared": 0,
+        }
+        # Last aggregated cache counts and the saves made since, so stats don't rescan the collection
+        self._cache_stats_lock = threading.Lock()
+        self._cache_counts = None
+        self._cache_counts_computed_at = 0.0
+        self._cache_count_deltas = {"inserted": 0, "refreshed": 0, "updated": 0}
+        # Saves that found the stored prices and URL unchanged only touch last_price_updt
+        self._price_change_stats = {"new": 0, "changed": 0, "unchanged": 0}
+        # Price saves batched into unordered bulk writes when write-behind is enabled
+        self.price_writer = None
+        if PRICE_WRITE_BEHIND_ENABLED:
+            self.price_writer = WriteBehindBuffer(
+                lambda: self.cache_collection,
+                max_batch_size=PRICE_WRITE_BEHIND_BATCH_SIZE,
+                flush_interval_seconds=PRICE_WRITE_BEHIND_FLUSH_SECONDS,
+                on_flush=self._count_bulk_saved_prices,
+                name="price-write-behind",
+            )
         # Register cleanup callback with memory manager
         self.memory_manager.register_cleanup_callback("price_scraper_cleanup", self.cleanup_playwright)
     
@@ -67,24 +230,10 @@ class PriceScrapingService:
             self._initialized = True
             
     def cleanup_playwright(self):
-        """Force cleanup of Playwright resources."""
+        """Force cleanup of Playwright resources by shutting down the browser pool."""
         try:
-            if hasattr(self, '_browser') and self._browser:
-                try:
-                    self._browser.close()
-                except Exception as e:
-                    logger.warning(f"Error closing browser during cleanup: {e}")
-                finally:
-                    self._browser = None
-                    
-            if hasattr(self, '_playwright') and self._playwright:
-                try:
-                    self._playwright.stop()
-                except Exception as e:
-                    logger.warning(f"Error stopping Playwright during cleanup: {e}")
-                finally:
-                    self._playwright = None
-                    
+            self.browser_pool.shutdown()
+            
             # Force garbage collection
             import gc
             gc.collect()
@@ -93,16 +242,14 @@ class PriceScrapingService:
             
         except Exception as e:
             logger.error(f"Error during Playwright cleanup: {e}")
-        finally:
-            # Ensure we don't leave any references
-            self._browser = None
-            self._playwright = None
     
     def _initialize_collections(self):
         """Initialize MongoDB collections for price scraping."""
         try:
             self.cache_collection = get_price_cache_collection()
             self.variants_collection = get_card_variants_collection()
+            self._initialize_negative_cache_collection()
+            self._initialize_history_collection()
             
             # Check if database is disabled
             if self.cache_collection is None or self.variants_collection is None:
@@ -122,7 +269,9 @@ class PriceScrapingService:
                 {'fields': [('card_name', 1)], 'name': 'card_name_idx'},
                 {'fields': [('card_rarity', 1)], 'name': 'card_rarity_idx'},
                 {'fields': [('last_price_updt', 1)], 'name': 'last_price_updt_idx'},
-                {'fields': [('card_number', 1), ('card_rarity', 1)], 'name': 'card_number_rarity_idx'}
+                {'fields': [('card_number', 1), ('card_rarity', 1)], 'name': 'card_number_rarity_idx'},
+                {'fields': [('tcgplayer_product_id', 1)], 'name': 'tcgplayer_product_id_idx'},
+                {'fields': [('price_lookup_key', 1), ('last_price_updt', -1)], 'name': 'price_lookup_key_updated_idx'}
             ]
             
             # Create only the indexes that don't already exist
@@ -142,6 +291,25 @@ class PriceScrapingService:
                     except Exception as e:
                         logger.warning(f"Could not create index {idx_spec['name']}: {str(e)}")
             
+            # Prices saved before price_lookup_key existed need the legacy query until they are backfilled
+            if self.cache_collection.find_one({"price_lookup_key": {"$exists": False}}, {"_id": 1}) is not None:
+                self._legacy_lookup_fallback = True
+                if PRICE_LOOKUP_KEY_BACKFILL_ON_STARTUP:
+                    threading.Thread(
+                        target=self._backfill_price_lookup_keys,
+                        args=(self.cache_collection,),
+                        name="price-lookup-key-backfill",
+                        daemon=True
+                    ).start()
+            
+            # Indexing and backfilling card_number_key can take a while on a large variants collection
+            threading.Thread(
+                target=self._prepare_card_number_index,
+                args=(self.variants_collection,),
+                name="card-number-index",
+                daemon=True
+            ).start()
+            
             logger.info("Successfully initialized price scraping collections")
             
         except Exception as e:
@@ -149,6 +317,75 @@ class PriceScrapingService:
             self.cache_collection = None
             self.variants_collection = None
     
+    def _prepare_card_number_index(self, collection) -> None:
+        """Index card_number_key, backfill it on older variants, then warm the card name map."""
+        try:
+            collection.create_index("card_number_key")
+            # Variants uploaded before card_number_key existed only have set_code
+            if collection.find_one({"card_number_key": {"$exists": False}}, {"_id": 1}) is not None:
+                result = collection.update_many(
+                    {"card_number_key": {"$exists": False}, "set_code": {"$type": "string"}},
+                    [{"$set": {"card_number_key": {"$toUpper": {"$trim": {"input": "$set_code"}}}}}]
+                )
+                logger.info(f"Backfilled card_number_key on {result.modified_count} card variants")
+        except Exception as e:
+            logger.warning(f"Could not prepare card_number_key index: {e}")
+        
+        if CARD_NUMBER_MAP_WARM_ON_STARTUP:
+            self.card_number_index.warm(collection)
+    
+    def invalidate_variant_caches(self) -> None:
+        """Forget card names and rarity tables taken from a variants collection that was just replaced."""
+        self.card_number_index.clear()
+        self.rarity_tables.clear()
+        if self.variants_collection is not None and CARD_NUMBER_MAP_WARM_ON_STARTUP:
+            self.card_number_index.warm_in_background(self.variants_collection)
+        logger.info("Invalidated card number map and rarity tables after variant rebuild")
+    
+    def _initialize_negative_cache_collection(self):
+        """Get the negative result collection and ensure its lookup and TTL indexes."""
+        try:
+            self.negative_cache_collection = get_price_negative_cache_collection()
+            if self.negative_cache_collection is None:
+                return
+            # Each entry carries its own expiry, so the TTL index expires documents at expires_at
+            self.negative_cache_collection.create_index(
+                "expires_at", name="expires_at_ttl", expireAfterSeconds=0, background=True
+            )
+        except Exception as e:
+            logger.warning(f"Could not initialize negative price cache collection: {e}")
+            self.negative_cache_collection = None
+    
+    def _initialize_history_collection(self):
+        """
+        Get the price history collection, creating it as a time-series
+        collection (recorded_at, metaField "card") when it doesn't exist yet.
+        """
+        if not PRICE_HISTORY_ENABLED:
+            return
+        try:
+            collection = get_price_history_collection()
+            if collection is None:
+                return
+            database = collection.database
+            if PRICE_HISTORY_COLLECTION not in database.list_collection_names():
+                try:
+                    database.create_collection(
+                        PRICE_HISTORY_COLLECTION,
+                        timeseries={"timeField": "recorded_at", "metaField": "card", "granularity": "hours"}
+                    )
+                    logger.info(f"Created time-series collection {PRICE_HISTORY_COLLECTION}")
+                except Exception as e:
+                    # Servers without time-series support get a regular collection on first insert
+                    logger.warning(f"Could not create time-series collection {PRICE_HISTORY_COLLECTION}: {e}")
+            collection.create_index(
+                [("card.price_lookup_key", 1), ("recorded_at", 1)], name="price_lookup_key_recorded_idx", background=True
+            )
+            self.history_collection = collection
+        except Exception as e:
+            logger.warning(f"Could not initialize price history collection: {e}")
+            self.history_collection = None
+    
     def _normalize_art_variant(self, art_variant: str) -> str:
         """
         Normalize art variant to handle numbered variants flexibly.
@@ -252,40 +489,16 @@ class PriceScrapingService:
                 logger.debug("Database disabled, skipping cache lookup")
                 return None
             
-            # Normalize inputs
-            normalized_rarity = card_rarity.lower().strip()
-            normalized_art_variant = self._normalize_art_variant(art_variant) if art_variant else None
-            
-            logger.debug(f"Searching cache - Number: {card_number}, Rarity: {normalized_rarity}, "
-                        f"Art Variant: {normalized_art_variant or 'None'}")
-            
-            # Build base query with card number and rarity
-            query = {
-                "card_number": card_number,
-                "card_rarity": {"$regex": f"^{re.escape(normalized_rarity)}$", "$options": "i"}
-            }
-            
-            # Handle art variant if provided
-            if normalized_art_variant:
-                # Match either the exact variant or any document without an art variant
-                query["$or"] = [
-                    {"art_variant": {"$exists": False}},
-                    {"art_variant": ""},
-                    {"art_variant": {"$in": self._get_art_variant_alternatives(normalized_art_variant)}}
-                ]
+            logger.debug(f"Searching cache - Number: {card_number}, Rarity: {card_rarity}, "
+                        f"Art Variant: {art_variant or 'None'}")
             
-            # Find all matching documents
-            documents = list(self.cache_collection.find(query))
+            # Most recent price for the exact variant or without an art variant
+            document = self._find_latest_cached_document(card_number, card_rarity, art_variant)
             
-            if not documents:
+            if not document:
                 logger.info(f"No cached price data found for {card_number} (no matches)")
                 return None
-                
-            # Sort by last_price_updt in descending order to get the most recent
-            documents.sort(key=lambda x: x.get('last_price_updt', datetime.min.replace(tzinfo=timezone.utc)), reverse=True)
             
-            # Get the most recent document
-            document = documents[0]
             last_updated = document.get('last_price_updt')
             
             if not last_updated:
@@ -332,77 +545,22 @@ class PriceScrapingService:
                 logger.info(f"Could not extract set code from {card_number} - allowing scrape to proceed")
                 return True
             
-            # Try to validate against YGO API set data (original source of truth)
-            try:
-                api_url = f"{YGO_API_BASE_URL}/cardinfo.php?cardset={quote(set_code)}"
-                response = requests.get(api_url, timeout=10)
-                
-                if response.status_code == 200:
-                    api_data = response.json()
-                    if 'data' in api_data and api_data['data']:
-                        # Find our specific card in the API results
-                        for card in api_data['data']:
-                            card_sets = card.get('card_sets', [])
-                            for card_set in card_sets:
-                                if card_set.get('set_code') == card_number:
-                                    set_rarity = card_set.get('set_rarity', '')
-                                    if normalize_rarity(card_rarity) == normalize_rarity(set_rarity):
-                                        logger.info(f"✓ Rarity '{card_rarity}' validated against YGO API for {card_number}")
-                                        return True
-                                    elif self._are_rarities_equivalent(normalize_rarity(card_rarity), normalize_rarity(set_rarity)):
-                                        logger.info(f"✓ Rarity '{card_rarity}' validated as equivalent to '{set_rarity}' for {card_number}")
-                                        return True
-                
-                logger.info(f"Card {card_number} rarity '{card_rarity}' not found in YGO API - checking cache as fallback")
-            except Exception as api_error:
-                logger.warning(f"YGO API validation failed for {card_number}: {api_error} - falling back to cache")
-            
-            # Fallback: Check our cache (but acknowledge it may be incomplete)
-            # Find ALL entries for this card number (cards can have multiple rarities)
-            query = {"set_code": card_number}
-            all_card_entries = list(self.variants_collection.find(query))
-            
-            if not all_card_entries:
-                logger.info(f"Card {card_number} not found in cache - allowing scrape to proceed (fallback behavior)")
-                # If card is not found in our database, allow the scrape to proceed
-                # This handles cases where our database might not be complete
-                return True
-            
-            # Extract all available rarities for this specific card number from cache
-            available_rarities = []
-            for entry in all_card_entries:
-                card_set_rarity = entry.get('set_rarity')
-                if card_set_rarity:
-                    available_rarities.append(card_set_rarity)
-            
-            if not available_rarities:
-                logger.info(f"No rarities found for card {card_number} in cache - allowing scrape to proceed")
-                return True
-            
-            # Normalize the requested rarity for comparison
+            # Validate against the set's rarity table (YGO API set data is the source of truth)
+            table, source = self._get_set_rarity_table(set_code)
+            set_rarities = table.get(card_number.strip().upper(), set())
             normalized_requested = normalize_rarity(card_rarity)
-            
-            # Check if the normalized requested rarity matches any available rarity in cache
-            for available_rarity in available_rarities:
-                normalized_available = normalize_rarity(available_rarity)
-                
-                # Check for exact match
-                if normalized_requested == normalized_available:
-                    logger.info(f"✓ Rarity '{card_rarity}' validated for card {card_number} in cache (matches '{available_rarity}')")
-                    return True
-                
-                # Check for special equivalences (e.g., Ultimate Rare vs Prismatic Ultimate Rare)
-                if self._are_rarities_equivalent(normalized_requested, normalized_available):
-                    logger.info(f"✓ Rarity '{card_rarity}' validated for card {card_number} (equivalent to '{available_rarity}' in cache)")
+            if normalized_requested in set_rarities:
+                logger.info(f"✓ Rarity '{card_rarity}' validated against {source} rarity table for {card_number}")
+                return True
+            for set_rarity in set_rarities:
+                if self._are_rarities_equivalent(normalized_requested, set_rarity):
+                    logger.info(f"✓ Rarity '{card_rarity}' validated as equivalent to '{set_rarity}' for {card_number}")
                     return True
             
-            # Cache validation failed - but cache might be incomplete
-            # Log warning but allow scrape with caution
-            logger.warning(f"⚠ Rarity '{card_rarity}' not found in cache for card {card_number}")
-            logger.warning(f"Available rarities in cache: {', '.join(available_rarities)}")
-            logger.warning(f"Allowing scrape to proceed - cache may be incomplete")
-            
-            # CHANGED: Allow scrape to proceed even if not in cache, since cache may be incomplete
+            # A loaded table is authoritative for its set, so the card's variants aren't queried
+            # again; with no table ("none") the variant cache has nothing for this set either
+            logger.warning(f"⚠ Rarity '{card_rarity}' not found in {source} rarity table for {card_number} - "
+                           f"allowing scrape to proceed, set data may be incomplete")
             return True
             
         except Exception as e:
@@ -411,6 +569,78 @@ class PriceScrapingService:
             logger.info(f"Validation error for {card_number} - allowing scrape to proceed as fallback")
             return True
     
+    def warm_set_rarity_table(self, set_code: str) -> int:
+        """
+        Load a set's rarity table ahead of validating its cards.
+        
+        Args:
+            set_code: Set code (e.g., "LOB")
+            
+        Returns:
+            int: Number of card numbers in the table
+        """
+        table, _ = self._get_set_rarity_table(set_code)
+        return len(table)
+
+    def _get_set_rarity_table(self, set_code: str) -> Tuple[Dict[str, Set[str]], str]:
+        """
+        Get the {card number: canonical rarities} table for a set, loading it once
+        per TTL; concurrent validations for the same set share one load.
+        
+        Returns:
+            Tuple[Dict, str]: (table, source) where source is "ygo_api", "variant_cache" or "none"
+        """
+        set_key = set_code.strip().upper()
+        cached = self.rarity_tables.get(set_key)
+        if cached is not None:
+            return cached
+        
+        def load():
+            entry = self.rarity_tables.get(set_key)
+            if entry is None:
+                entry = self._load_set_rarity_table(set_key)
+                ttl = PRICE_RARITY_TABLE_TTL_SECONDS if entry[1] == "ygo_api" else PRICE_RARITY_TABLE_FALLBACK_TTL_SECONDS
+                self.rarity_tables.set(set_key, entry, ttl=ttl)
+            return entry
+        
+        entry, _ = self.rarity_table_loader.do(set_key, load)
+        return entry
+
+    def _load_set_rarity_table(self, set_code: str) -> Tuple[Dict[str, Set[str]], str]:
+        """Build a set's rarity table from one YGO API call, or from the variant cache if that fails."""
+        table: Dict[str, Set[str]] = {}
+        try:
+            api_url = f"{YGO_API_BASE_URL}/cardinfo.php?cardset={quote(set_code)}"
+            self.ygo_api_rate_limiter.acquire()
+            response = requests.get(api_url, timeout=10)
+            if response.status_code == 200:
+                for card in response.json().get('data') or []:
+                    for card_set in card.get('card_sets', []):
+                        card_number = (card_set.get('set_code') or '').strip().upper()
+                        if card_number.startswith(f"{set_code}-") and card_set.get('set_rarity'):
+                            table.setdefault(card_number, set()).add(normalize_rarity(card_set['set_rarity']))
+                if table:
+                    logger.info(f"Loaded rarity table for {set_code} from YGO API ({len(table)} cards)")
+                    return table, "ygo_api"
+            logger.info(f"YGO API returned no rarities for set {set_code} (status {response.status_code})")
+        except Exception as api_error:
+            logger.warning(f"YGO API rarity table load failed for {set_code}: {api_error} - falling back to cache")
+        
+        try:
+            if self.variants_collection is not None:
+                cursor = self.variants_collection.find(
+                    {"set_code": {"$regex": f"^{re.escape(set_code)}-", "$options": "i"}},
+                    {"set_code": 1, "set_rarity": 1}
+                )
+                for entry in cursor:
+                    card_number = (entry.get('set_code') or '').strip().upper()
+                    if card_number and entry.get('set_rarity'):
+                        table.setdefault(card_number, set()).add(normalize_rarity(entry['set_rarity']))
+        except Exception as e:
+            logger.warning(f"Variant cache rarity table load failed for {set_code}: {e}")
+        
+        return table, "variant_cache" if table else "none"
+
     def _are_rarities_equivalent(self, rarity1: str, rarity2: str) -> bool:
         """
         Check if two rarities are equivalent based on special rules.
@@ -467,11 +697,17 @@ class PriceScrapingService:
                 "tcgplayer_price": price_data.get("tcgplayer_price"),
                 "tcgplayer_market_price": price_data.get("tcgplayer_market_price"),
                 "tcgplayer_url": price_data.get("tcgplayer_url"),
-                "tcgplayer_product_id": price_data.get("tcgplayer_product_id"),
+                "tcgplayer_product_id": (
+                    price_data.get("tcgplayer_product_id")
+                    or extract_tcgplayer_product_id(price_data.get("tcgplayer_url"))
+                ),
                 "tcgplayer_variant_selected": price_data.get("tcgplayer_variant_selected"),
                 "last_price_updt": get_current_utc_datetime(),
                 "created_at": get_current_utc_datetime(),
-                "source": "tcgplayer"
+                "source": "tcgplayer",
+                "price_lookup_key": self._get_price_lookup_key(
+                    price_data.get("card_number"), price_data.get("card_rarity"), requested_art_variant
+                )
             }
             
             # Use upsert to replace existing document
@@ -482,30 +718,191 @@ class PriceScrapingService:
                 "art_variant": document["art_variant"]
             }
             
-            result = self.cache_collection.replace_one(
-                query,
-                document,
-                upsert=True
-            )
+            if self.price_writer is not None:
+                # Written with the next bulk flush; readers in this process see it through the buffer
+                self.price_writer.add(tuple(query.values()), query, document)
+                result = None
+            else:
+                result = self._write_price_document(query, document)
+            # Any L1 entry for this card and rarity may now resolve to the new document
+            self._invalidate_l1_prices(document["card_number"], document["card_rarity"])
+            self._record_price_history(document)
             
-            if result.upserted_id or result.modified_count > 0:
-                logger.info(f"Successfully saved price data for {document['card_number']}")
+            if result is None:
+                logger.info(f"Buffered price data for {document['card_number']}")
                 return True
-            else:
-                logger.warning(f"No changes made when saving price data for {document['card_number']}")
-                return False
+            self._count_saved_price(result)
+            
+            logger.info(f"Successfully saved price data for {document['card_number']}")
+            return True
                 
         except Exception as e:
             logger.error(f"Error saving price data: {e}")
             return False
     
+    def _write_price_document(self, query: Dict[str, Any], document: Dict[str, Any]) -> Dict[str, bool]:
+        """
+        Write a price document, updating only the timestamp and lookup fields
+        when the stored prices and URL are unchanged and replacing the
+        document otherwise.
+        
+        The identity fields are part of the query, so an unchanged match
+        already has them; the lookup fields are set again so documents saved
+        before price_lookup_key or tcgplayer_product_id existed pick them up.
+        
+        Both writes return the previous last_price_updt, so the memoized cache
+        counts know whether the save refreshed a stale entry.
+        
+        Returns:
+            Dict: {"inserted": True if no document existed,
+                   "previous_stale": True if the replaced document had expired}
+        """
+        unchanged_query = {
+            **query,
+            "tcgplayer_price": document["tcgplayer_price"],
+            "tcgplayer_market_price": document["tcgplayer_market_price"],
+            "tcgplayer_url": document["tcgplayer_url"],
+        }
+        touch = {
+            "last_price_updt": document["last_price_updt"],
+            "price_lookup_key": document["price_lookup_key"],
+            "tcgplayer_variant_selected": document["tcgplayer_variant_selected"],
+            "source": document["source"],
+        }
+        # Never clear a stored product id because this scrape couldn't extract one
+        if document.get("tcgplayer_product_id"):
+            touch["tcgplayer_product_id"] = document["tcgplayer_product_id"]
+        previous_projection = {"_id": 0, "last_price_updt": 1}
+        previous = self.cache_collection.find_one_and_update(
+            unchanged_query,
+            {"$set": touch},
+            projection=previous_projection,
+            return_document=ReturnDocument.BEFORE
+        )
+        if previous is not None:
+            self._increment_price_change_stat("unchanged")
+        else:
+            # With upsert and the pre-image requested, None means the document was inserted
+            previous = self.cache_collection.find_one_and_replace(
+                query,
+                document,
+                projection=previous_projection,
+                upsert=True,
+                return_document=ReturnDocument.BEFORE
+            )
+            self._increment_price_change_stat("new" if previous is None else "changed")
+        
+        return {
+            "inserted": previous is None,
+            "previous_stale": previous is not None and not is_cache_fresh(
+                previous.get("last_price_updt"), PRICE_CACHE_EXPIRY_DAYS
+            ),
+        }
+
+    def _increment_price_change_stat(self, key: str) -> None:
+        with self._cache_stats_lock:
+            self._price_change_stats[key] += 1
+
+    def get_price_change_stats(self) -> Dict[str, Any]:
+        """Get how often saved prices were new, changed or unchanged."""
+        with self._cache_stats_lock:
+            stats = dict(self._price_change_stats)
+        refreshed = stats["changed"] + stats["unchanged"]
+        stats["change_rate"] = round(stats["changed"] / refreshed, 4) if refreshed else 0.0
+        return stats
+
+    def _record_price_history(self, document: Dict[str, Any]) -> None:
+        """Append a saved price snapshot to the history collection; failures are only logged."""
+        if self.history_collection is None:
+            return
+        try:
+            self.history_collection.insert_one({
+                "recorded_at": document["last_price_updt"],
+                "card": {
+                    "price_lookup_key": document["price_lookup_key"],
+                    "card_number": document["card_number"],
+                    "card_rarity": document["card_rarity"],
+                    "art_variant": document["art_variant"],
+                    "tcgplayer_product_id": document.get("tcgplayer_product_id"),
+                },
+                "tcgplayer_price": document.get("tcgplayer_price"),
+                "tcgplayer_market_price": document.get("tcgplayer_market_price"),
+            })
+        except Exception as e:
+            logger.warning(f"Could not record price history for {document.get('card_number')}: {e}")
+
+    @monitor_memory
+    def get_price_history(
+        self,
+        card_number: str,
+        card_rarity: str,
+        art_variant: Optional[str] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Get a card's recorded prices between start and end, downsampled
+        server-side to one point per UTC day.
+        
+        Args:
+            card_number: Card number
+            card_rarity: Card rarity
+            art_variant: Art variant (optional; history is kept per exact art variant)
+            start: Start of the range (inclusive)
+            end: End of the range (exclusive)
+            
+        Returns:
+            Optional[List[Dict]]: Daily points with min, max and last prices, oldest first,
+            or None if price history is unavailable
+        """
+        self._ensure_initialized()
+        if self.history_collection is None:
+            return None
+        
+        match: Dict[str, Any] = {"card.price_lookup_key": self._get_price_lookup_key(card_number, card_rarity, art_variant)}
+        time_range = {}
+        if start is not None:
+            time_range["$gte"] = start
+        if end is not None:
+            time_range["$lt"] = end
+        if time_range:
+            match["recorded_at"] = time_range
+        
+        pipeline = [
+            {"$match": match},
+            {"$sort": {"recorded_at": 1}},
+            {"$group": {
+                "_id": {"$dateToString": {"format": "%Y-%m-%d", "date": "$recorded_at"}},
+                "min_price": {"$min": "$tcgplayer_price"},
+                "max_price": {"$max": "$tcgplayer_price"},
+                "last_price": {"$last": "$tcgplayer_price"},
+                "min_market_price": {"$min": "$tcgplayer_market_price"},
+                "max_market_price": {"$max": "$tcgplayer_market_price"},
+                "last_market_price": {"$last": "$tcgplayer_market_price"},
+                "last_recorded_at": {"$last": "$recorded_at"},
+                "samples": {"$sum": 1},
+            }},
+            {"$sort": {"_id": 1}},
+        ]
+        points = []
+        for bucket in self.history_collection.aggregate(pipeline):
+            bucket["date"] = bucket.pop("_id")
+            points.append(bucket)
+        return points
+
     @monitor_memory
-    def lookup_card_info_from_cache(self, card_number: str) -> Optional[Dict[str, Any]]:
+    def lookup_card_info_from_cache(
+        self,
+        card_number: str,
+        regex_fallback: Optional[bool] = None
+    ) -> Optional[Dict[str, Any]]:
         """
         Look up card information from cached variants.
         
         Args:
             card_number: Card number to look up
+            regex_fallback: Also try regex scans of set_code and card_name when the
+                exact match misses (defaults to CARD_LOOKUP_REGEX_FALLBACK)
             
         Returns:
             Optional[Dict]: Card information if found
@@ -518,18 +915,7 @@ class PriceScrapingService:
                 logger.info("Database disabled, skipping card info lookup")
                 return None
             
-            # Try to find by set code matching
-            query = {"set_code": {"$regex": card_number, "$options": "i"}}
-            result = self.variants_collection.find_one(query, {"_id": 0})
-            
-            if result:
-                return result
-            
-            # Try broader search by card name
-            query = {"card_name": {"$regex": card_number, "$options": "i"}}
-            result = self.variants_collection.find_one(query, {"_id": 0})
-            
-            return result
+            return self.card_number_index.find_variant(self.variants_collection, card_number, regex_fallback)
             
         except Exception as e:
             logger.error(f"Error looking up card info: {e}")
@@ -546,6 +932,10 @@ class PriceScrapingService:
         Returns:
             Optional[str]: Card name if found
         """
+        card_name = self.card_number_index.get_name(card_number)
+        if card_name:
+            return card_name
+        
         card_info = self.lookup_card_info_from_cache(card_number)
         if card_info:
             return card_info.get('card_name')
@@ -565,6 +955,7 @@ class PriceScrapingService:
         try:
             # Use the correct cardsetsinfo endpoint as mentioned in the user's comment
             api_url = f"{YGO_API_BASE_URL}/cardsetsinfo.php?setcode={quote(card_number)}"
+            self.ygo_api_rate_limiter.acquire()
             response = requests.get(api_url, timeout=10)
             
             if response.status_code == 200:
@@ -600,7 +991,9 @@ class PriceScrapingService:
             return card_name
         
         # Fallback to API
-        return self.lookup_card_name_from_ygo_api(card_number)
+        card_name = self.lookup_card_name_from_ygo_api(card_number)
+        self.card_number_index.remember(card_number, card_name)
+        return card_name
     
     @monitor_memory
     def get_cache_stats(self) -> Dict[str, Any]:
@@ -622,40 +1015,300 @@ class PriceScrapingService:
                     "stale_entries": 0,
                     "unique_cards": 0,
                     "cache_hit_rate": 0.0,
-                    "database_status": "disabled"
+                    "database_status": "disabled",
+                    "l1_cache": self.price_l1_cache.get_stats(),
+                    "negative_cache": self.get_negative_cache_stats()
                 }
             
-            total_entries = self.cache_collection.count_documents({})
-            
-            # Count fresh vs stale entries
-            fresh_cutoff = get_current_utc_datetime() - timedelta(days=PRICE_CACHE_EXPIRY_DAYS)
-            fresh_entries = self.cache_collection.count_documents({
-                "last_price_updt": {"$gte": fresh_cutoff}
-            })
-            stale_entries = total_entries - fresh_entries
-            
-            # Get unique cards count
-            unique_cards = len(self.cache_collection.distinct("card_number"))
+            counts = self._get_cache_counts()
             
             return {
-                "total_entries": total_entries,
-                "fresh_entries": fresh_entries,
-                "stale_entries": stale_entries,
-                "unique_cards": unique_cards,
-                "cache_expiry_days": PRICE_CACHE_EXPIRY_DAYS
+                **counts,
+                "cache_expiry_days": PRICE_CACHE_EXPIRY_DAYS,
+                "l1_cache": self.price_l1_cache.get_stats(),
+                "negative_cache": self.get_negative_cache_stats(),
+                "price_changes": self.get_price_change_stats(),
+                "write_behind": self.price_writer.get_stats() if self.price_writer is not None else None
             }
             
         except Exception as e:
             logger.error(f"Error getting cache stats: {e}")
             return {}
     
+    def _get_cache_counts(self) -> Dict[str, Any]:
+        """
+        Get total, fresh, stale and unique-card counts from one $facet aggregation,
+        reused for PRICE_CACHE_STATS_TTL_SECONDS with saves made since applied on top.
+        """
+        with self._cache_stats_lock:
+            if self._cache_counts is not None and time.monotonic() - self._cache_counts_computed_at < PRICE_CACHE_STATS_TTL_SECONDS:
+                return self._apply_cache_count_deltas()
+        
+        fresh_cutoff = get_current_utc_datetime() - timedelta(days=PRICE_CACHE_EXPIRY_DAYS)
+        pipeline = [{"$facet": {
+            "total": [{"$count": "count"}],
+            "fresh": [{"$match": {"last_price_updt": {"$gte": fresh_cutoff}}}, {"$count": "count"}],
+            "unique_cards": [{"$group": {"_id": "$card_number"}}, {"$count": "count"}],
+        }}]
+        facets = next(iter(self.cache_collection.aggregate(pipeline)), {})
+        
+        def facet_count(name):
+            return facets.get(name)[0]["count"] if facets.get(name) else 0
+        
+        with self._cache_stats_lock:
+            self._cache_counts = {
+                "total_entries": facet_count("total"),
+                "fresh_entries": facet_count("fresh"),
+                "unique_cards": facet_count("unique_cards"),
+                "counted_at": get_current_utc_datetime(),
+            }
+            self._cache_counts_computed_at = time.monotonic()
+            self._cache_count_deltas = {"inserted": 0, "refreshed": 0, "updated": 0}
+            return self._apply_cache_count_deltas()
+
+    def _apply_cache_count_deltas(self) -> Dict[str, Any]:
+        """
+        Combine the last aggregated counts with saves made since; caller must hold
+        _cache_stats_lock. New prices and refreshes of expired prices add fresh
+        entries; re-saves of prices that were still fresh, and bulk updates whose
+        previous state is unknown, change nothing until the next aggregation.
+        """
+        inserted = self._cache_count_deltas["inserted"]
+        refreshed = self._cache_count_deltas["refreshed"]
+        updated = self._cache_count_deltas["updated"]
+        total_entries = self._cache_counts["total_entries"] + inserted
+        fresh_entries = self._cache_counts["fresh_entries"] + inserted + refreshed
+        return {
+            "total_entries": total_entries,
+            "fresh_entries": fresh_entries,
+            "stale_entries": total_entries - fresh_entries,
+            "unique_cards": self._cache_counts["unique_cards"],
+            "counted_at": self._cache_counts["counted_at"],
+            "saves_since_count": inserted + refreshed + updated,
+        }
+
+    def _count_saved_price(self, result: Dict[str, bool]) -> None:
+        """Track a price save from _write_price_document against the memoized cache counts."""
+        with self._cache_stats_lock:
+            if result["inserted"]:
+                self._cache_count_deltas["inserted"] += 1
+            elif result["previous_stale"]:
+                self._cache_count_deltas["refreshed"] += 1
+            else:
+                self._cache_count_deltas["updated"] += 1
+
+    def _count_bulk_saved_prices(self, result: Any) -> None:
+        """Track a write-behind flush against the memoized cache counts."""
+        with self._cache_stats_lock:
+            self._cache_count_deltas["inserted"] += result.upserted_count
+            self._cache_count_deltas["updated"] += result.modified_count
+
+    def get_scraping_stats(self) -> Dict[str, Any]:
+        """
+        Get in-process scraping statistics.
+        
+        Returns:
+            Dict: Coalescing, browser pool and scraping runtime statistics
+        """
+        return {
+            "coalescing": self.scrape_coalescer.get_stats(),
+            "browser_pool": self.browser_pool.get_stats(),
+            "runtime": self.runtime.get_stats(),
+            "revalidation": self.get_revalidation_stats(),
+            "phase_timings": self.get_phase_timing_stats(),
+            "product_url_memo": self.get_product_url_memo_stats(),
+            "card_number_index": self.card_number_index.get_stats(),
+            "sibling_prefetch": self.get_prefetch_stats(),
+            "rarity_tables": {
+                **self.rarity_tables.get_stats(),
+                "loads": self.rarity_table_loader.get_stats(),
+            },
+        }
+
+    def get_revalidation_stats(self) -> Dict[str, Any]:
+        """Get stale-while-revalidate statistics."""
+        with self._revalidation_lock:
+            stats = dict(self._revalidation_stats)
+            stats["pending"] = len(self._revalidating)
+        stats["window_days"] = PRICE_CACHE_SWR_WINDOW_DAYS
+        stats["hard_expiry_days"] = PRICE_CACHE_HARD_EXPIRY_DAYS
+        return stats
+
+    def get_phase_timing_stats(self) -> Dict[str, Any]:
+        """Get per-phase TCGPlayer scrape timings in milliseconds."""
+        with self._phase_lock:
+            phases = {}
+            for phase, stats in self._phase_stats.items():
+                phases[phase] = {
+                    **stats,
+                    "avg_ms": round(stats["total_ms"] / stats["count"], 1) if stats["count"] else 0.0,
+                }
+            selector_timeouts = dict(self._selector_timeouts)
+        return {"phases": phases, "selector_timeouts": selector_timeouts}
+
+    def _record_phase_timings(self, phase_timings: Dict[str, float]) -> None:
+        """Add one scrape's phase timings to the running metrics."""
+        with self._phase_lock:
+            for phase, elapsed_ms in phase_timings.items():
+                stats = self._phase_stats.get(phase)
+                if stats is None:
+                    continue
+                stats["count"] += 1
+                stats["total_ms"] = round(stats["total_ms"] + elapsed_ms, 1)
+                stats["max_ms"] = max(stats["max_ms"], elapsed_ms)
+
+    def get_product_url_memo_stats(self) -> Dict[str, Any]:
+        """Get product URL memo statistics."""
+        with self._product_url_lock:
+            stats = dict(self._product_url_stats)
+        stats["size"] = self.product_url_memo.size()
+        return stats
+
+    def _increment_product_url_stat(self, key: str) -> None:
+        with self._product_url_lock:
+            self._product_url_stats[key] += 1
+
+    def _get_known_product_url(
+        self,
+        card_number: str,
+        card_rarity: str,
+        art_variant: Optional[str]
+    ) -> Optional[str]:
+        """
+        Get the TCGPlayer product page resolved by an earlier scrape of this card.
+        
+        Checks the in-process memo first, then the newest cached price document
+        for the same card number, rarity and art variant.
+        
+        Returns:
+            Optional[str]: Product page URL, or None if the card must be searched
+        """
+        key = self._get_scrape_key(card_number, card_rarity, art_variant)
+        if not key[0]:
+            return None
+        
+        product_url = self.product_url_memo.get(key)
+        if product_url:
+            self._increment_product_url_stat("memo_hits")
+            return product_url
+        
+        product_url = self._find_product_url_in_cache(card_number, card_rarity, art_variant)
+        if product_url:
+            self.product_url_memo.set(key, product_url)
+            self._increment_product_url_stat("db_hits")
+        else:
+            self._increment_product_url_stat("misses")
+        return product_url
+
+    def _find_product_url_in_cache(
+        self,
+        card_number: str,
+        card_rarity: str,
+        art_variant: Optional[str]
+    ) -> Optional[str]:
+        """Look up the product URL stored with the newest cached price for a card."""
+        try:
+            self._ensure_initialized()
+            if self.cache_collection is None:
+                return None
+            
+            # Unlike price lookups, a different art is a different product page, so match the exact key
+            query = {
+                "price_lookup_key": self._get_price_lookup_key(card_number, card_rarity, art_variant),
+                "tcgplayer_url": {"$regex": "/product/"},
+            }
+            
+            document = self.cache_collection.find_one(query, sort=[("last_price_updt", DESCENDING)])
+            product_url = document.get("tcgplayer_url") if isinstance(document, dict) else None
+            return product_url if _is_tcgplayer_product_url(product_url) else None
+        except Exception as e:
+            logger.warning(f"Error looking up known product URL for {card_number}: {e}")
+            return None
+
+    def _remember_product_url(
+        self,
+        card_number: str,
+        card_rarity: str,
+        art_variant: Optional[str],
+        product_url: Optional[str]
+    ) -> None:
+        """Remember the product page a scrape ended on."""
+        key = self._get_scrape_key(card_number, card_rarity, art_variant)
+        if key[0] and _is_tcgplayer_product_url(product_url):
+            self.product_url_memo.set(key, product_url)
+
+    def _forget_product_url(self, card_number: str, card_rarity: str, art_variant: Optional[str]) -> None:
+        """Drop a remembered product page that no longer matches the card."""
+        self.product_url_memo.delete(self._get_scrape_key(card_number, card_rarity, art_variant))
+
+    async def _open_known_product_page(
+        self,
+        page,
+        product_url: str,
+        card_number: Optional[str],
+        phase_timings: Dict[str, float]
+    ) -> bool:
+        """
+        Navigate straight to a known product page and check it still shows the card.
+        
+        Returns:
+            bool: True if the page can be read; False to fall back to search
+        """
+        logger.info(f"Opening known product page: {product_url}")
+        phase_started = time.perf_counter()
+        try:
+            await page.goto(product_url, wait_until=PLAYWRIGHT_WAIT_UNTIL, timeout=PLAYWRIGHT_NAVIGATION_TIMEOUT_MS)
+            await self._wait_for_selector(page, TCGPLAYER_PRICE_READY_SELECTOR, "product_load")
+            matches = await page.evaluate("""
+                ({selector, cardNumber}) => {
+                    if (!document.querySelector(selector)) return false;
+                    if (!cardNumber) return true;
+                    const text = (document.body?.innerText || '').toUpperCase();
+                    return text.includes(cardNumber.toUpperCase());
+                }
+            """, {"selector": TCGPLAYER_PRODUCT_PAGE_SELECTOR, "cardNumber": card_number or ""})
+        except Exception as e:
+            logger.warning(f"Error opening known product page {product_url}: {e}")
+            matches = False
+        finally:
+            phase_timings["product_load"] = _elapsed_ms(phase_started)
+        
+        if matches:
+            self._increment_product_url_stat("reused")
+            return True
+        
+        logger.info(f"Known product page no longer matches {card_number} - falling back to search")
+        self._increment_product_url_stat("mismatches")
+        return False
+
+    async def _wait_for_selector(self, page, selector: str, phase: str) -> bool:
+        """
+        Wait for an element the scraper depends on.
+        
+        A timeout is not fatal: the page is read as-is, the same way it was
+        after a networkidle wait.
+        
+        Returns:
+            bool: True if the selector appeared in time
+        """
+        try:
+            await page.wait_for_selector(selector, state="attached", timeout=PLAYWRIGHT_SELECTOR_TIMEOUT_MS)
+            return True
+        except Exception as e:
+            logger.warning(f"Timed out waiting for '{selector}' during {phase}: {e}")
+            with self._phase_lock:
+                self._selector_timeouts[phase] = self._selector_timeouts.get(phase, 0) + 1
+            return False
+    
     @monitor_memory
     async def scrape_price_from_tcgplayer_basic(
         self,
         card_name: str,
         card_rarity: str,
         art_variant: Optional[str] = None,
-        card_number: Optional[str] = None
+        card_number: Optional[str] = None,
+        product_url: Optional[str] = None,
+        product_id: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Price scraping from TCGPlayer using Playwright.
@@ -664,10 +1317,17 @@ class PriceScrapingService:
             card_name: Card name to search for
             card_rarity: Card rarity
             art_variant: Art variant (optional)
+            card_number: Card number, used to score variants and verify product pages
+            product_url: Product page resolved by an earlier scrape; search is skipped
+                while the page still matches the card
+            product_id: TCGPlayer product id; opens /product/<id> directly when no
+                product_url is given
             
         Returns:
-            Dict: Scraped price data
+            Dict: Scraped price data, including per-phase timings in milliseconds
         """
+        phase_timings: Dict[str, float] = {}
+        scrape_started = time.perf_counter()
         try:
             logger.info(f"Scraping price for {card_name} ({card_rarity})")
             
@@ -675,117 +1335,142 @@ class PriceScrapingService:
             if not art_variant and card_name:
                 art_variant = extract_art_version(card_name)
             
-            async with async_playwright() as p:
-                browser = await p.chromium.launch(headless=True)
-                context = await browser.new_context(
-                    user_agent="Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36"
-                )
-                page = await context.new_page()
-                
-                # Build search URL for TCGPlayer  
-                search_card_name = card_name
-                
-                # Include art variant in search if provided
-                if art_variant:
-                    # Try to build a more specific search query with art variant
-                    art_search_terms = []
-                    
-                    # Handle numbered art variants (like "8", "7", "1st", etc.)
-                    if art_variant.isdigit():
-                        art_search_terms = [
-                            f"{card_name} {art_variant}th art",
-                            f"{card_name} {art_variant}th",
-                            f"{card_name} {art_variant}",
-                        ]
-                    elif art_variant.lower() in ["arkana", "kaiba", "joey wheeler", "pharaoh"]:
-                        # Handle named art variants
-                        art_search_terms = [
-                            f"{card_name} {art_variant}",
-                            f"{card_name}-{art_variant}",
-                        ]
-                    else:
-                        # Generic handling for other art variants
-                        art_search_terms = [
-                            f"{card_name} {art_variant}",
-                            f"{card_name} {art_variant} art",
-                        ]
-                    
-                    # Use the first art variant search term as our primary search
-                    if art_search_terms:
-                        search_card_name = art_search_terms[0]
-                        logger.info(f"Searching with art variant: '{search_card_name}' (original: '{card_name}', art: '{art_variant}')")
-                
-                search_url = f"https://www.tcgplayer.com/search/yugioh/product?Language=English&productLineName=yugioh&q={quote(search_card_name)}&view=grid"
-                
-                # Add rarity filter if available
-                if card_rarity:
-                    tcgplayer_rarity_filter = map_rarity_to_tcgplayer_filter(card_rarity)
-                    if tcgplayer_rarity_filter:
-                        search_url += f"&Rarity={quote(tcgplayer_rarity_filter)}"
-                
-                logger.info(f"Searching TCGPlayer: {search_url}")
-                
-                await page.goto(search_url, wait_until='networkidle', timeout=60000)
-                
-                # Check if we got results
-                results_count = await page.evaluate("""
-                    () => {
-                        const resultText = document.querySelector('h1')?.textContent || '';
-                        const match = resultText.match(/(\\d+)\\s+results?\\s+for/);
-                        return match ? parseInt(match[1]) : 0;
-                    }
-                """)
-                
-                if results_count == 0:
-                    logger.warning(f"No results found for {card_name}")
-                    await browser.close()
-                    return {
-                        "tcgplayer_price": None,
-                        "tcgplayer_market_price": None,
-                        "tcgplayer_url": None,
-                        "tcgplayer_product_id": None,
-                        "tcgplayer_variant_selected": None,
-                        "error": "No results found on TCGPlayer"
-                    }
-                
-                # Check if we landed directly on a product page or on search results
-                is_product_page = await page.evaluate("() => document.querySelector('.product-details, .product-title, h1[data-testid=\"product-name\"]') !== null")
-                
-                if not is_product_page:
-                    # We're on search results, select best variant
-                    best_variant_url = await self.select_best_tcgplayer_variant(
-                        page, card_number, card_name, card_rarity, art_variant
+            if product_id and not product_url:
+                product_url = f"{TCGPLAYER_BASE_URL}/product/{product_id}"
+            
+            async with self.browser_pool.acquire() as page:
+                # Refreshes go straight to the product page resolved by an earlier search
+                reused_product_url = False
+                if product_url:
+                    reused_product_url = await self._open_known_product_page(
+                        page, product_url, card_number, phase_timings
                     )
-                    
-                    if best_variant_url:
-                        logger.info(f"Selected best variant: {best_variant_url}")
-                        await page.goto(best_variant_url, wait_until='networkidle', timeout=60000)
-                    else:
-                        logger.warning(f"No suitable variant found for {card_name}")
-                        await browser.close()
-                        return {
-                            "tcgplayer_price": None,
-                            "tcgplayer_market_price": None,
-                            "tcgplayer_url": None,
-                            "tcgplayer_product_id": None,
+                
+                if not reused_product_url:
+                    # Build search URL for TCGPlayer
+                    search_card_name = card_name
+
+                    # Include art variant in search if provided
+                    if art_variant:
+                        # Try to build a more specific search query with art variant
+                        art_search_terms = []
+
+                        # Handle numbered art variants (like "8", "7", "1st", etc.)
+                        if art_variant.isdigit():
+                            art_search_terms = [
+                                f"{card_name} {art_variant}th art",
+                                f"{card_name} {art_variant}th",
+                                f"{card_name} {art_variant}",
+                            ]
+                        elif art_variant.lower() in ["arkana", "kaiba", "joey wheeler", "pharaoh"]:
+                            # Handle named art variants
+                            art_search_terms = [
+                                f"{card_name} {art_variant}",
+                                f"{card_name}-{art_variant}",
+                            ]
+                        else:
+                            # Generic handling for other art variants
+                            art_search_terms = [
+                                f"{card_name} {art_variant}",
+                                f"{card_name} {art_variant} art",
+                            ]
+
+                        # Use the first art variant search term as our primary search
+                        if art_search_terms:
+                            search_card_name = art_search_terms[0]
+                            logger.info(f"Searching with art variant: '{search_card_name}' (original: '{card_name}', art: '{art_variant}')")
+
+                    search_url = f"https://www.tcgplayer.com/search/yugioh/product?Language=English&productLineName=yugioh&q={quote(search_card_name)}&view=grid"
+
+                    # Add rarity filter if available
+                    if card_rarity:
+                        tcgplayer_rarity_filter = map_rarity_to_tcgplayer_filter(card_rarity)
+                        if tcgplayer_rarity_filter:
+                            search_url += f"&Rarity={quote(tcgplayer_rarity_filter)}"
+
+                    logger.info(f"Searching TCGPlayer: {search_url}")
+
+                    phase_started = time.perf_counter()
+                    await page.goto(search_url, wait_until=PLAYWRIGHT_WAIT_UNTIL, timeout=PLAYWRIGHT_NAVIGATION_TIMEOUT_MS)
+                    phase_timings["goto"] = _elapsed_ms(phase_started)
+
+                    # Wait for the results header (or a product page) instead of network idle
+                    phase_started = time.perf_counter()
+                    await self._wait_for_selector(page, TCGPLAYER_SEARCH_READY_SELECTOR, "results_wait")
+
+                    # Check if we got results
+                    results_count = await page.evaluate("""
+                        () => {
+                            const resultText = document.querySelector('h1')?.textContent || '';
+                            const match = resultText.match(/(\\d+)\\s+results?\\s+for/);
+                            return match ? parseInt(match[1]) : 0;
+                        }
+                    """)
+
+                    if results_count == 0:
+                        phase_timings["results_wait"] = _elapsed_ms(phase_started)
+                        logger.warning(f"No results found for {card_name}")
+                        return {
+                            "tcgplayer_price": None,
+                            "tcgplayer_market_price": None,
+                            "tcgplayer_url": None,
+                            "tcgplayer_product_id": None,
                             "tcgplayer_variant_selected": None,
-                            "error": "No suitable variant found"
+                            "phase_timings_ms": phase_timings,
+                            "error": NO_RESULTS_ERROR
                         }
+
+                    # Check if we landed directly on a product page or on search results
+                    is_product_page = await page.evaluate(f"() => document.querySelector('{TCGPLAYER_PRODUCT_PAGE_SELECTOR}') !== null")
+                    phase_timings["results_wait"] = _elapsed_ms(phase_started)
+
+                    if not is_product_page:
+                        # We're on search results, select best variant once the product links have rendered
+                        phase_started = time.perf_counter()
+                        await self._wait_for_selector(page, TCGPLAYER_PRODUCT_LINK_SELECTOR, "variant_extraction")
+                        best_variant_url = await self.select_best_tcgplayer_variant(
+                            page, card_number, card_name, card_rarity, art_variant
+                        )
+                        phase_timings["variant_extraction"] = _elapsed_ms(phase_started)
+
+                        if best_variant_url:
+                            logger.info(f"Selected best variant: {best_variant_url}")
+                            phase_started = time.perf_counter()
+                            await page.goto(best_variant_url, wait_until=PLAYWRIGHT_WAIT_UNTIL, timeout=PLAYWRIGHT_NAVIGATION_TIMEOUT_MS)
+                        else:
+                            logger.warning(f"No suitable variant found for {card_name}")
+                            return {
+                                "tcgplayer_price": None,
+                                "tcgplayer_market_price": None,
+                                "tcgplayer_url": None,
+                                "tcgplayer_product_id": None,
+                                "tcgplayer_variant_selected": None,
+                                "phase_timings_ms": phase_timings,
+                                "error": NO_VARIANT_ERROR
+                            }
+                    else:
+                        phase_started = time.perf_counter()
+
+                    # Wait for the price table the DOM extraction reads
+                    await self._wait_for_selector(page, TCGPLAYER_PRICE_READY_SELECTOR, "product_load")
+                    phase_timings["product_load"] = round(phase_timings.get("product_load", 0.0) + _elapsed_ms(phase_started), 1)
                 
                 # Extract prices from the product page
+                phase_started = time.perf_counter()
                 price_data = await self.extract_prices_from_tcgplayer_dom(page)
+                phase_timings["price_extraction"] = _elapsed_ms(phase_started)
                 
                 # Get final URL
                 final_url = page.url
                 
-                await browser.close()
-                
                 return {
                     "tcgplayer_price": price_data.get('tcg_price'),
                     "tcgplayer_market_price": price_data.get('tcg_market_price'),
                     "tcgplayer_url": final_url,
-                    "tcgplayer_product_id": None,  # Could be extracted from URL if needed
-                    "tcgplayer_variant_selected": None
+                    "tcgplayer_product_id": extract_tcgplayer_product_id(final_url),
+                    "tcgplayer_variant_selected": None,
+                    "product_url_reused": reused_product_url,
+                    "phase_timings_ms": phase_timings
                 }
                 
         except Exception as e:
@@ -796,8 +1481,13 @@ class PriceScrapingService:
                 "tcgplayer_url": None,
                 "tcgplayer_product_id": None,
                 "tcgplayer_variant_selected": None,
+                "phase_timings_ms": phase_timings,
                 "error": str(e)
             }
+        finally:
+            # The returned dict holds phase_timings by reference, so the total lands in the result too
+            phase_timings["total"] = _elapsed_ms(scrape_started)
+            self._record_phase_timings(phase_timings)
     
     @monitor_memory
     def scrape_card_price(
@@ -813,7 +1503,8 @@ class PriceScrapingService:
         
         Flow:
         1. Cache Hit (Fresh) → Return immediately 
-        2. Cache Hit (Stale) → Skip validation (rarity proven valid) → Scrape fresh
+        2a. Cache Hit (Stale, within revalidate window) → Return stale data, refresh in background
+        2b. Cache Hit (Stale, past hard expiry) → Skip validation (rarity proven valid) → Scrape fresh
         3. Cache Miss → Validate rarity → If valid scrape, if invalid fail
         
         Args:
@@ -837,121 +1528,969 @@ class PriceScrapingService:
                 cached_data = self._find_cached_price_data_with_staleness_info(
                     card_number, card_name, card_rarity, art_variant
                 )
+                cache_status = self._get_cache_status(card_number, cached_data)
                 
-                if cached_data:
-                    if cached_data["is_fresh"]:
-                        # CASE 1: Cache Hit (Fresh) - Return immediately
-                        logger.info(f"✓ Fresh cache hit for {card_number} - returning immediately")
-                        cache_status = "fresh_hit"
-                        cleaned_data = clean_card_data(cached_data["data"])
-                        return {
-                            "success": True,
-                            "card_number": card_number,
-                            "card_name": card_name,
-                            "card_rarity": card_rarity,
-                            "art_variant": art_variant,
-                            "cached": True,
-                            "last_updated": cached_data["data"].get('last_price_updt'),
-                            **cleaned_data
-                        }
-                    else:
-                        # CASE 2: Cache Hit (Stale) - Rarity already proven valid, skip validation
-                        logger.info(f"⏰ Stale cache hit for {card_number} - rarity already validated, proceeding to fresh scrape")
-                        cache_status = "stale_hit"
-                        # Continue to scraping without validation
-                else:
-                    # CASE 3: Cache Miss - Need to validate rarity
-                    logger.info(f"❌ Cache miss for {card_number} - will validate rarity before scraping")
-                    cache_status = "miss"
+                if cache_status == "fresh_hit":
+                    # CASE 1: Cache Hit (Fresh) - Return immediately
+                    self._count_prefetch_hit(card_number, card_rarity, art_variant)
+                    return self._build_cached_response(
+                        card_number, card_name, card_rarity, art_variant, cached_data
+                    )
+                if cache_status == "stale_revalidate":
+                    # CASE 2a: Stale but within the revalidate window - serve it and refresh in the background
+                    return self._serve_stale_and_revalidate(
+                        card_number, card_name, card_rarity, art_variant, cached_data
+                    )
             else:
                 logger.info(f"🔄 Force refresh requested for {card_number} - skipping cache")
                 cache_status = "force_refresh"
 
-            # STEP 2: Rarity validation (only for cache miss or force refresh)
-            if cache_status in ["miss", "force_refresh"] and card_number:
-                logger.info(f"🔍 Validating rarity '{card_rarity}' for card {card_number} (cache {cache_status})")
-                try:
-                    is_valid_rarity = self.validate_card_rarity(card_number, card_rarity)
-                    if not is_valid_rarity:
-                        logger.warning(f"✗ Invalid rarity '{card_rarity}' for card {card_number} - stopping price scraping")
-                        return {
-                            "success": False,
-                            "card_number": card_number,
-                            "card_name": card_name,
-                            "card_rarity": card_rarity,
-                            "art_variant": art_variant,
-                            "error": f"Invalid rarity '{card_rarity}' for card {card_number}. This rarity does not exist for this card in its set."
-                        }
-                    else:
-                        logger.info(f"✓ Rarity validation passed for {card_number} - proceeding with fresh scrape")
-                except Exception as validation_error:
-                    logger.error(f"Error during rarity validation for {card_number}: {validation_error}")
-                    return {
-                        "success": False,
-                        "card_number": card_number,
-                        "card_name": card_name,
-                        "card_rarity": card_rarity,
-                        "art_variant": art_variant,
-                        "error": f"Validation error: {str(validation_error)}"
-                    }
-            elif cache_status == "stale_hit":
-                logger.info(f"⚡ Skipping validation for {card_number} - rarity already proven valid by stale cache")
+            return self._coalesced_validate_and_scrape(card_number, card_name, card_rarity, art_variant, cache_status)
+                
+        except Exception as e:
+            logger.error(f"Error in scrape_card_price: {e}")
+            return {
+                "success": False,
+                "card_number": card_number,
+                "card_name": card_name,
+                "card_rarity": card_rarity,
+                "art_variant": art_variant,
+                "error": str(e)
+            }
+
+    def _get_cache_status(self, card_number: str, cached_data: Optional[Dict[str, Any]]) -> str:
+        """
+        Classify a cache lookup result as fresh_hit, stale_hit or miss.
+        
+        Args:
+            card_number: Card number (for logging)
+            cached_data: Result of a staleness-aware cache lookup
             
-            # STEP 3: Scrape from source (validation passed or proven valid by stale cache)
-            logger.info(f"🌐 Scraping fresh price data from TCGPlayer for {card_name} ({card_rarity})")
+        Returns:
+            str: Cache status
+        """
+        if cached_data:
+            if cached_data["is_fresh"]:
+                logger.info(f"✓ Fresh cache hit for {card_number} - returning immediately")
+                return "fresh_hit"
+            if cached_data.get("within_revalidate_window"):
+                logger.info(f"⏳ Stale cache hit for {card_number} within revalidate window - serving stale data")
+                return "stale_revalidate"
+            # CASE 2: Cache Hit (Stale) - Rarity already proven valid, skip validation
+            logger.info(f"⏰ Stale cache hit for {card_number} - rarity already validated, proceeding to fresh scrape")
+            return "stale_hit"
+        # CASE 3: Cache Miss - Need to validate rarity
+        logger.info(f"❌ Cache miss for {card_number} - will validate rarity before scraping")
+        return "miss"
+
+    def _build_cached_response(
+        self,
+        card_number: str,
+        card_name: str,
+        card_rarity: str,
+        art_variant: Optional[str],
+        cached_data: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Build the scrape_card_price response for a fresh cache hit."""
+        cleaned_data = clean_card_data(cached_data["data"])
+        return {
+            "success": True,
+            "card_number": card_number,
+            "card_name": card_name,
+            "card_rarity": card_rarity,
+            "art_variant": art_variant,
+            "cached": True,
+            "last_updated": cached_data["data"].get('last_price_updt'),
+            **cleaned_data
+        }
+
+    def _get_scrape_key(self, card_number: str, card_rarity: str, art_variant: Optional[str]) -> Tuple[str, str, str]:
+        """Build the coalescing key for a scrape from normalized card identity fields."""
+        return (
+            (card_number or "").strip().upper(),
+            normalize_rarity(card_rarity),
+            self._normalize_art_variant(art_variant) if art_variant else "",
+        )
+
+    def _coalesced_validate_and_scrape(
+        self,
+        card_number: str,
+        card_name: str,
+        card_rarity: str,
+        art_variant: Optional[str],
+        cache_status: str
+    ) -> Dict[str, Any]:
+        """
+        Run _validate_and_scrape, sharing one in-flight scrape between
+        concurrent requests for the same card, rarity and art variant.
+        """
+        key = self._get_scrape_key(card_number, card_rarity, art_variant)
+        result, shared = self.scrape_coalescer.do(
+            key, self._validate_and_scrape, card_number, card_name, card_rarity, art_variant, cache_status
+        )
+        if shared:
+            logger.info(f"♻️ Reused in-flight scrape for {card_number} ({card_rarity})")
+            # Followers get their own copy so callers can't mutate each other's results
+            return dict(result)
+        return result
+
+    def get_negative_cache_stats(self) -> Dict[str, Any]:
+        """Get negative result cache statistics."""
+        with self._negative_cache_lock:
+            stats = dict(self._negative_cache_stats)
+        stats["memory_size"] = self.negative_cache.size()
+        stats["ttl_seconds"] = PRICE_NEGATIVE_CACHE_TTL_SECONDS
+        return stats
+
+    def _increment_negative_cache_stat(self, key: str) -> None:
+        with self._negative_cache_lock:
+            self._negative_cache_stats[key] += 1
+
+    def _find_negative_result(
+        self,
+        card_number: str,
+        card_rarity: str,
+        art_variant: Optional[str]
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Look up an unexpired negative result, in memory first and then in MongoDB.
+        
+        Returns:
+            Optional[Dict]: {"reason", "error", "expires_at"} or None
+        """
+        if PRICE_NEGATIVE_CACHE_TTL_SECONDS <= 0:
+            return None
+        lookup_key = self._get_price_lookup_key(card_number, card_rarity, art_variant)
+        entry = self.negative_cache.get(lookup_key)
+        if entry is not None:
+            self._increment_negative_cache_stat("memory_hits")
+            return entry
+        
+        if self.negative_cache_collection is None:
+            return None
+        try:
+            # The TTL monitor only runs periodically, so filter on expires_at as well
+            document = self.negative_cache_collection.find_one(
+                {"_id": lookup_key, "expires_at": {"$gt": get_current_utc_datetime()}}
+            )
+        except Exception as e:
+            logger.warning(f"Negative cache lookup failed for {card_number}: {e}")
+            return None
+        if not isinstance(document, dict):
+            return None
+        
+        expires_at = document["expires_at"]
+        if expires_at.tzinfo is None:
+            expires_at = expires_at.replace(tzinfo=timezone.utc)
+        entry = {"reason": document.get("reason"), "error": document.get("error"), "expires_at": expires_at}
+        remaining_seconds = (expires_at - get_current_utc_datetime()).total_seconds()
+        if remaining_seconds > 0:
+            self.negative_cache.set(lookup_key, entry, ttl=remaining_seconds)
+        self._increment_negative_cache_stat("db_hits")
+        return entry
+
+    def _remember_negative_result(
+        self,
+        card_number: str,
+        card_rarity: str,
+        art_variant: Optional[str],
+        reason: str,
+        error: str
+    ) -> None:
+        """Remember that a card can't be priced, for PRICE_NEGATIVE_CACHE_TTL_SECONDS."""
+        if PRICE_NEGATIVE_CACHE_TTL_SECONDS <= 0 or not card_number:
+            return
+        lookup_key = self._get_price_lookup_key(card_number, card_rarity, art_variant)
+        now = get_current_utc_datetime()
+        expires_at = now + timedelta(seconds=PRICE_NEGATIVE_CACHE_TTL_SECONDS)
+        self.negative_cache.set(
+            lookup_key,
+            {"reason": reason, "error": error, "expires_at": expires_at},
+            ttl=PRICE_NEGATIVE_CACHE_TTL_SECONDS
+        )
+        self._increment_negative_cache_stat("stored")
+        
+        if self.negative_cache_collection is None:
+            return
+        try:
+            self.negative_cache_collection.replace_one(
+                {"_id": lookup_key},
+                {
+                    "card_number": card_number,
+                    "card_rarity": card_rarity,
+                    "art_variant": art_variant,
+                    "reason": reason,
+                    "error": error,
+                    "created_at": now,
+                    "expires_at": expires_at
+                },
+                upsert=True
+            )
+        except Exception as e:
+            logger.warning(f"Could not save negative result for {card_number}: {e}")
+
+    def _clear_negative_result(self, card_number: str, card_rarity: str, art_variant: Optional[str]) -> None:
+        """Forget a negative result once the card has been priced."""
+        lookup_key = self._get_price_lookup_key(card_number, card_rarity, art_variant)
+        removed = self.negative_cache.delete(lookup_key)
+        if self.negative_cache_collection is not None:
             try:
-                # Use asyncio to run the async scraping function
-                price_data = asyncio.run(
-                    self.scrape_price_from_tcgplayer_basic(card_name, card_rarity, art_variant, card_number)
-                )
+                removed = self.negative_cache_collection.delete_one({"_id": lookup_key}).deleted_count > 0 or removed
+            except Exception as e:
+                logger.warning(f"Could not clear negative result for {card_number}: {e}")
+        if removed:
+            self._increment_negative_cache_stat("cleared")
+
+    def _serve_stale_and_revalidate(
+        self,
+        card_number: str,
+        card_name: str,
+        card_rarity: str,
+        art_variant: Optional[str],
+        cached_data: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        Return a stale cached price immediately and schedule a background refresh.
+        
+        Returns:
+            Dict: Cached response marked as stale, with its age in hours
+        """
+        revalidating = self._schedule_revalidation(card_number, card_name, card_rarity, art_variant)
+        with self._revalidation_lock:
+            self._revalidation_stats["stale_served"] += 1
+        
+        response = self._build_cached_response(card_number, card_name, card_rarity, art_variant, cached_data)
+        response["stale"] = True
+        response["cache_age_hours"] = round(get_cache_age_hours(cached_data["last_updated"]), 2)
+        response["revalidating"] = revalidating
+        return response
+
+    def _schedule_revalidation(
+        self,
+        card_number: str,
+        card_name: str,
+        card_rarity: str,
+        art_variant: Optional[str]
+    ) -> bool:
+        """
+        Schedule a background refresh for a card unless one is already pending.
+        
+        Returns:
+            bool: True if a refresh is pending or was scheduled
+        """
+        key = self._get_scrape_key(card_number, card_rarity, art_variant)
+        with self._revalidation_lock:
+            if key in self._revalidating:
+                self._revalidation_stats["deduplicated"] += 1
+                return True
+            self._revalidating.add(key)
+            self._revalidation_stats["scheduled"] += 1
+        
+        try:
+            self._revalidation_executor.submit(
+                self._revalidate, key, card_number, card_name, card_rarity, art_variant
+            )
+            logger.info(f"🔁 Scheduled background refresh for {card_number} ({card_rarity})")
+            return True
+        except Exception as e:
+            logger.error(f"Could not schedule background refresh for {card_number}: {e}")
+            with self._revalidation_lock:
+                self._revalidating.discard(key)
+            return False
+
+    def _revalidate(
+        self,
+        key: Tuple[str, str, str],
+        card_number: str,
+        card_name: str,
+        card_rarity: str,
+        art_variant: Optional[str]
+    ) -> None:
+        """Refresh a stale price in the background."""
+        try:
+            if not card_name and card_number:
+                card_name = self.lookup_card_name(card_number) or ""
+            # Rarity is already proven valid by the stale cache entry
+            result = self._coalesced_validate_and_scrape(
+                card_number, card_name, card_rarity, art_variant, "stale_hit"
+            )
+            outcome = "completed" if result.get("success") else "failed"
+        except Exception as e:
+            logger.error(f"Background refresh failed for {card_number}: {e}")
+            outcome = "failed"
+        finally:
+            with self._revalidation_lock:
+                self._revalidating.discard(key)
+        
+        with self._revalidation_lock:
+            self._revalidation_stats[outcome] += 1
+
+    def get_prefetch_stats(self) -> Dict[str, Any]:
+        """Get sibling prefetch statistics and the remaining budget."""
+        with self._prefetch_lock:
+            self._expire_prefetch_budget(time.monotonic())
+            stats = dict(self._prefetch_stats)
+            stats["pending"] = len(self._prefetching)
+            stats["budget_used"] = len(self._prefetch_started_at)
+        stats["enabled"] = PRICE_SIBLING_PREFETCH_ENABLED
+        stats["budget"] = PRICE_SIBLING_PREFETCH_BUDGET
+        stats["window_seconds"] = PRICE_SIBLING_PREFETCH_WINDOW_SECONDS
+        return stats
+
+    def _increment_prefetch_stat(self, key: str, amount: int = 1) -> None:
+        with self._prefetch_lock:
+            self._prefetch_stats[key] += amount
+
+    def _expire_prefetch_budget(self, now: float) -> None:
+        """Drop prefetch start times that fell out of the budget window. Caller holds _prefetch_lock."""
+        while self._prefetch_started_at and now - self._prefetch_started_at[0] >= PRICE_SIBLING_PREFETCH_WINDOW_SECONDS:
+            self._prefetch_started_at.popleft()
+
+    def _take_prefetch_budget(self) -> bool:
+        """Reserve one prefetch scrape from the global budget, if any is left in this window."""
+        now = time.monotonic()
+        with self._prefetch_lock:
+            self._expire_prefetch_budget(now)
+            if len(self._prefetch_started_at) >= PRICE_SIBLING_PREFETCH_BUDGET:
+                return False
+            self._prefetch_started_at.append(now)
+            return True
+
+    def _count_prefetch_hit(self, card_number: str, card_rarity: str, art_variant: Optional[str]) -> None:
+        """Count a fresh cache hit on a price that was warmed by prefetch."""
+        if not PRICE_SIBLING_PREFETCH_ENABLED:
+            return
+        key = self._get_scrape_key(card_number, card_rarity, art_variant)
+        if self._prefetched_keys.get(key) is not None:
+            self._prefetched_keys.delete(key)
+            self._increment_prefetch_stat("hits")
+
+    def _schedule_sibling_prefetch(
+        self,
+        card_number: str,
+        card_name: str,
+        card_rarity: str,
+        art_variant: Optional[str]
+    ) -> bool:
+        """
+        Queue a background prefetch of the other rarities of a card that was just scraped.
+        
+        Returns:
+            bool: True if sibling discovery was queued
+        """
+        if not PRICE_SIBLING_PREFETCH_ENABLED or not card_number or self.variants_collection is None:
+            return False
+        try:
+            self._prefetch_executor.submit(
+                self._prefetch_siblings, card_number, card_name, card_rarity, art_variant
+            )
+            self._increment_prefetch_stat("triggered")
+            return True
+        except Exception as e:
+            logger.error(f"Could not schedule sibling prefetch for {card_number}: {e}")
+            return False
+
+    def _find_sibling_variants(
+        self,
+        card_number: str,
+        card_rarity: str,
+        art_variant: Optional[str]
+    ) -> List[Dict[str, Any]]:
+        """Other rarities of card_number known to the variants collection, one item per scrape key."""
+        key = normalize_card_number(card_number)
+        requested_rarity = self._get_scrape_key(card_number, card_rarity, art_variant)[1]
+        cursor = self.variants_collection.find(
+            {"$or": [{"card_number_key": key}, {"set_code": key}]},
+            {"_id": 0, "set_rarity": 1, "art_variant": 1}
+        )
+        
+        siblings = []
+        seen = set()
+        for variant in cursor:
+            rarity = variant.get("set_rarity")
+            if not rarity:
+                continue
+            scrape_key = self._get_scrape_key(card_number, rarity, variant.get("art_variant"))
+            if scrape_key[1] == requested_rarity or scrape_key in seen:
+                continue
+            seen.add(scrape_key)
+            siblings.append({
+                "card_number": card_number,
+                "card_rarity": rarity,
+                "art_variant": variant.get("art_variant")
+            })
+        return siblings
+
+    def _prefetch_siblings(
+        self,
+        card_number: str,
+        card_name: str,
+        card_rarity: str,
+        art_variant: Optional[str]
+    ) -> None:
+        """Queue scrapes for sibling rarities whose prices are missing or stale, within the budget."""
+        try:
+            siblings = self._find_sibling_variants(card_number, card_rarity, art_variant)
+            if not siblings:
+                return
+            
+            cached_entries = self._find_cached_price_data_bulk(siblings)
+            for position, (sibling, cached_data) in enumerate(zip(siblings, cached_entries)):
+                sibling_rarity = sibling["card_rarity"]
+                sibling_art = sibling["art_variant"]
+                if self._get_cache_status(card_number, cached_data) == "fresh_hit":
+                    self._increment_prefetch_stat("skipped_fresh")
+                    continue
+                if self._find_negative_result(card_number, sibling_rarity, sibling_art):
+                    self._increment_prefetch_stat("skipped_negative")
+                    continue
                 
-                # Save to cache if successful
-                if price_data and not price_data.get('error'):
-                    logger.info(f"✓ Successfully scraped price for {card_number} - saving to cache")
-                    full_price_data = {
-                        "card_number": card_number,
-                        "card_name": card_name,
-                        "card_rarity": card_rarity,
-                        **price_data
-                    }
-                    self.save_price_data(full_price_data, art_variant)
-                else:
-                    logger.warning(f"Price scraping failed for {card_number}: {price_data.get('error', 'Unknown error')}")
+                key = self._get_scrape_key(card_number, sibling_rarity, sibling_art)
+                with self._prefetch_lock:
+                    if key in self._prefetching:
+                        self._prefetch_stats["deduplicated"] += 1
+                        continue
+                
+                # Speculative work is the first thing to go when memory or budget runs short
+                if self.memory_manager.is_memory_warning():
+                    self._increment_prefetch_stat("skipped_memory", len(siblings) - position)
+                    return
+                if not self._take_prefetch_budget():
+                    self._increment_prefetch_stat("skipped_budget", len(siblings) - position)
+                    return
                 
+                with self._prefetch_lock:
+                    self._prefetching.add(key)
+                    self._prefetch_stats["queued"] += 1
+                self._prefetch_executor.submit(
+                    self._prefetch_sibling, key, card_number, card_name, sibling_rarity, sibling_art
+                )
+            
+        except Exception as e:
+            logger.error(f"Sibling prefetch failed for {card_number}: {e}")
+
+    def _prefetch_sibling(
+        self,
+        key: Tuple[str, str, str],
+        card_number: str,
+        card_name: str,
+        card_rarity: str,
+        art_variant: Optional[str]
+    ) -> None:
+        """Scrape one sibling rarity in the background."""
+        outcome = "failed"
+        try:
+            result = self._coalesced_validate_and_scrape(
+                card_number, card_name, card_rarity, art_variant, "prefetch"
+            )
+            if result.get("success"):
+                outcome = "completed"
+                self._prefetched_keys.set(key, True)
+        except Exception as e:
+            logger.error(f"Prefetch scrape failed for {card_number} ({card_rarity}): {e}")
+        finally:
+            with self._prefetch_lock:
+                self._prefetching.discard(key)
+                self._prefetch_stats[outcome] += 1
+
+    def _validate_and_scrape(
+        self,
+        card_number: str,
+        card_name: str,
+        card_rarity: str,
+        art_variant: Optional[str],
+        cache_status: str
+    ) -> Dict[str, Any]:
+        """
+        Validate rarity when needed, scrape TCGPlayer and save the result.
+        
+        Args:
+            card_number: Card number
+            card_name: Card name
+            card_rarity: Card rarity
+            art_variant: Art variant (optional)
+            cache_status: Result of the cache lookup (miss, stale_hit or force_refresh),
+                or prefetch for speculative sibling scrapes
+            
+        Returns:
+            Dict: Price scraping response
+        """
+        # Known not-found cards and rejected rarities are answered without validating or scraping
+        if cache_status != "force_refresh":
+            negative_result = self._find_negative_result(card_number, card_rarity, art_variant)
+            if negative_result:
+                logger.info(f"🚫 Negative cache hit for {card_number} ({card_rarity}): {negative_result['error']}")
                 return {
-                    "success": not bool(price_data.get('error')),
+                    "success": False,
                     "card_number": card_number,
                     "card_name": card_name,
                     "card_rarity": card_rarity,
                     "art_variant": art_variant,
                     "cached": False,
-                    "last_updated": get_current_utc_datetime(),
-                    **price_data
+                    "negative_cached": True,
+                    "negative_cache_expires_at": negative_result["expires_at"],
+                    "error": negative_result["error"]
                 }
-                
-            except Exception as e:
-                logger.error(f"Error scraping price for {card_number}: {e}")
+        
+        # STEP 2: Rarity validation (only for cache miss or force refresh)
+        if cache_status in ["miss", "force_refresh"] and card_number:
+            logger.info(f"🔍 Validating rarity '{card_rarity}' for card {card_number} (cache {cache_status})")
+            try:
+                is_valid_rarity = self.validate_card_rarity(card_number, card_rarity)
+                if not is_valid_rarity:
+                    logger.warning(f"✗ Invalid rarity '{card_rarity}' for card {card_number} - stopping price scraping")
+                    error = f"Invalid rarity '{card_rarity}' for card {card_number}. This rarity does not exist for this card in its set."
+                    self._remember_negative_result(card_number, card_rarity, art_variant, "invalid_rarity", error)
+                    return {
+                        "success": False,
+                        "card_number": card_number,
+                        "card_name": card_name,
+                        "card_rarity": card_rarity,
+                        "art_variant": art_variant,
+                        "error": error
+                    }
+                else:
+                    logger.info(f"✓ Rarity validation passed for {card_number} - proceeding with fresh scrape")
+            except Exception as validation_error:
+                logger.error(f"Error during rarity validation for {card_number}: {validation_error}")
                 return {
                     "success": False,
                     "card_number": card_number,
                     "card_name": card_name,
                     "card_rarity": card_rarity,
                     "art_variant": art_variant,
-                    "cached": False,
-                    "error": str(e)
+                    "error": f"Validation error: {str(validation_error)}"
                 }
-                
+        elif cache_status == "stale_hit":
+            logger.info(f"⚡ Skipping validation for {card_number} - rarity already proven valid by stale cache")
+        elif cache_status == "prefetch":
+            logger.info(f"⚡ Skipping validation for {card_number} - prefetched rarity comes from the variant cache")
+        
+        # STEP 3: Scrape from source (validation passed or proven valid by stale cache)
+        logger.info(f"🌐 Scraping fresh price data from TCGPlayer for {card_name} ({card_rarity})")
+        try:
+            # Skip the search step when an earlier scrape already resolved the product page
+            product_url = self._get_known_product_url(card_number, card_rarity, art_variant)
+            
+            # Run the async scraping function on the shared scraping runtime
+            price_data = self.runtime.run(
+                self.scrape_price_from_tcgplayer_basic(
+                    card_name, card_rarity, art_variant, card_number, product_url=product_url
+                ),
+                timeout=PRICE_SCRAPING_TIMEOUT_SECONDS
+            )
+            
+            if product_url and not price_data.get('product_url_reused'):
+                self._forget_product_url(card_number, card_rarity, art_variant)
+            
+            # Save to cache if successful
+            if price_data and not price_data.get('error'):
+                logger.info(f"✓ Successfully scraped price for {card_number} - saving to cache")
+                self._remember_product_url(card_number, card_rarity, art_variant, price_data.get('tcgplayer_url'))
+                full_price_data = {
+                    "card_number": card_number,
+                    "card_name": card_name,
+                    "card_rarity": card_rarity,
+                    **price_data
+                }
+                self.save_price_data(full_price_data, art_variant)
+                if cache_status == "force_refresh":
+                    self._clear_negative_result(card_number, card_rarity, art_variant)
+                if cache_status in ("miss", "force_refresh"):
+                    self._schedule_sibling_prefetch(card_number, card_name, card_rarity, art_variant)
+            else:
+                logger.warning(f"Price scraping failed for {card_number}: {price_data.get('error', 'Unknown error')}")
+                if price_data.get('error') in NEGATIVE_CACHEABLE_ERRORS:
+                    self._remember_negative_result(card_number, card_rarity, art_variant, "not_found", price_data['error'])
+            
+            return {
+                "success": not bool(price_data.get('error')),
+                "card_number": card_number,
+                "card_name": card_name,
+                "card_rarity": card_rarity,
+                "art_variant": art_variant,
+                "cached": False,
+                "last_updated": get_current_utc_datetime(),
+                **price_data
+            }
+            
         except Exception as e:
-            logger.error(f"Error in scrape_card_price: {e}")
+            logger.error(f"Error scraping price for {card_number}: {e}")
             return {
                 "success": False,
                 "card_number": card_number,
                 "card_name": card_name,
                 "card_rarity": card_rarity,
                 "art_variant": art_variant,
+                "cached": False,
                 "error": str(e)
             }
 
+    @monitor_memory
+    def scrape_card_prices_batch(
+        self,
+        items: List[Dict[str, Any]],
+        force_refresh: bool = False,
+        max_concurrency: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Get prices for many cards, resolving cache hits in one query and
+        scraping the misses concurrently.
+        
+        Args:
+            items: Dicts with card_number, card_rarity and optional card_name/art_variant
+            force_refresh: Force refresh from source for every item
+            max_concurrency: Maximum number of simultaneous scrapes
+            
+        Returns:
+            List[Dict]: One scrape_card_price-shaped result per item, in input order
+        """
+        results: List[Optional[Dict[str, Any]]] = [None] * len(items)
+        pending: List[Tuple[int, str]] = []
+        
+        # STEP 1: Resolve every cache lookup in a single round trip
+        if force_refresh:
+            cached_entries = [None] * len(items)
+        else:
+            cached_entries = self._find_cached_price_data_bulk(items)
+        
+        for index, (item, cached_data) in enumerate(zip(items, cached_entries)):
+            if force_refresh:
+                cache_status = "force_refresh"
+            else:
+                cache_status = self._get_cache_status(item.get("card_number", ""), cached_data)
+            
+            if cache_status == "fresh_hit":
+                self._count_prefetch_hit(item.get("card_number", ""), item.get("card_rarity", ""), item.get("art_variant"))
+                results[index] = self._build_cached_response(
+                    item.get("card_number", ""),
+                    item.get("card_name", ""),
+                    item.get("card_rarity", ""),
+                    item.get("art_variant"),
+                    cached_data
+                )
+            elif cache_status == "stale_revalidate":
+                results[index] = self._serve_stale_and_revalidate(
+                    item.get("card_number", ""),
+                    item.get("card_name", ""),
+                    item.get("card_rarity", ""),
+                    item.get("art_variant"),
+                    cached_data
+                )
+            else:
+                pending.append((index, cache_status))
+        
+        logger.info(f"Batch price request: {len(items) - len(pending)} cache hits, {len(pending)} to scrape")
+        
+        # STEP 2: Scrape the misses concurrently, bounded by the concurrency cap
+        if pending:
+            concurrency = max(1, min(max_concurrency or PRICE_BATCH_MAX_CONCURRENCY, len(pending)))
+            with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="price-batch") as executor:
+                futures = {
+                    executor.submit(self._scrape_batch_item, items[index], cache_status): index
+                    for index, cache_status in pending
+                }
+                for future, index in futures.items():
+                    try:
+                        results[index] = future.result()
+                    except Exception as e:
+                        item = items[index]
+                        logger.error(f"Error scraping batch item {item.get('card_number')}: {e}")
+                        results[index] = {
+                            "success": False,
+                            "card_number": item.get("card_number", ""),
+                            "card_name": item.get("card_name", ""),
+                            "card_rarity": item.get("card_rarity", ""),
+                            "art_variant": item.get("art_variant"),
+                            "error": str(e)
+                        }
+        
+        return results
+
+    def _scrape_batch_item(self, item: Dict[str, Any], cache_status: str) -> Dict[str, Any]:
+        """Look up the card name if needed and scrape a single batch item."""
+        card_number = item.get("card_number", "")
+        card_name = item.get("card_name", "")
+        
+        if not card_name and card_number:
+            card_name = self.lookup_card_name(card_number) or ""
+        
+        return self._coalesced_validate_and_scrape(
+            card_number, card_name, item.get("card_rarity", ""), item.get("art_variant"), cache_status
+        )
+
+    def refresh_prices_by_product_id(
+        self,
+        product_ids: Optional[List[str]] = None,
+        limit: Optional[int] = None,
+        max_concurrency: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Re-scrape cached prices straight from their TCGPlayer product pages.
+        
+        Cached documents are grouped by tcgplayer_product_id so each product
+        page is scraped once, skipping the search step, and every document
+        sharing the id is saved from that one scrape.
+        
+        Args:
+            product_ids: Product ids to refresh; defaults to the stalest cached products
+            limit: Maximum number of cached documents to load
+            max_concurrency: Maximum number of simultaneous scrapes
+            
+        Returns:
+            List[Dict]: One result per product id
+        """
+        documents = self._find_documents_by_product_id(product_ids, limit or PRICE_BATCH_MAX_ITEMS)
+        
+        groups: Dict[str, List[Dict[str, Any]]] = {}
+        for document in documents:
+            groups.setdefault(str(document["tcgplayer_product_id"]), []).append(document)
+        
+        logger.info(f"Refreshing {len(groups)} products by id ({len(documents)} cached prices)")
+        if not groups:
+            return []
+        
+        results = []
+        concurrency = max(1, min(max_concurrency or PRICE_BATCH_MAX_CONCURRENCY, len(groups)))
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="price-product-refresh") as executor:
+            futures = {
+                executor.submit(self._refresh_product, product_id, group): product_id
+                for product_id, group in groups.items()
+            }
+            for future, product_id in futures.items():
+                try:
+                    results.append(future.result())
+                except Exception as e:
+                    logger.error(f"Error refreshing product {product_id}: {e}")
+                    results.append({
+                        "success": False,
+                        "tcgplayer_product_id": product_id,
+                        "documents": len(groups[product_id]),
+                        "error": str(e)
+                    })
+        
+        return results
+
+    def _find_documents_by_product_id(
+        self,
+        product_ids: Optional[List[str]],
+        limit: int
+    ) -> List[Dict[str, Any]]:
+        """Load cached prices for the given product ids, or the stalest ones with a known id."""
+        try:
+            self._ensure_initialized()
+            if self.cache_collection is None:
+                return []
+            
+            if product_ids:
+                query = {"tcgplayer_product_id": {"$in": [str(product_id) for product_id in product_ids]}}
+            else:
+                expiry_cutoff = get_current_utc_datetime() - timedelta(days=PRICE_CACHE_EXPIRY_DAYS)
+                query = {
+                    "tcgplayer_product_id": {"$nin": [None, ""]},
+                    "last_price_updt": {"$lt": expiry_cutoff}
+                }
+            
+            return list(self.cache_collection.find(query, sort=[("last_price_updt", 1)], limit=limit))
+        except Exception as e:
+            logger.error(f"Error loading cached prices by product id: {e}")
+            return []
+
+    def _refresh_product(self, product_id: str, documents: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Scrape one product page and save it to every cached document that shares the id."""
+        leader = documents[0]
+        card_number = leader.get("card_number") or ""
+        card_rarity = leader.get("card_rarity") or ""
+        art_variant = leader.get("art_variant")
+        
+        def scrape() -> Dict[str, Any]:
+            return self.runtime.run(
+                self.scrape_price_from_tcgplayer_basic(
+                    leader.get("card_name") or "", card_rarity, art_variant, card_number, product_id=product_id
+                ),
+                timeout=PRICE_SCRAPING_TIMEOUT_SECONDS
+            )
+        
+        # Shares the in-flight scrape with any concurrent refresh of the same product
+        price_data, _ = self.scrape_coalescer.do(("product_id", product_id), scrape)
+        
+        if price_data.get("error"):
+            logger.warning(f"Refresh of product {product_id} failed: {price_data['error']}")
+            return {
+                "success": False,
+                "tcgplayer_product_id": product_id,
+                "documents": len(documents),
+                "error": price_data["error"]
+            }
+        
+        saved = 0
+        for document in documents:
+            full_price_data = {
+                "card_number": document.get("card_number"),
+                "card_name": document.get("card_name"),
+                "card_rarity": document.get("card_rarity"),
+                **price_data
+            }
+            if self.save_price_data(full_price_data, document.get("art_variant")):
+                saved += 1
+        self._remember_product_url(card_number, card_rarity, art_variant, price_data.get("tcgplayer_url"))
+        
+        return {
+            "success": True,
+            "tcgplayer_product_id": product_id,
+            "resolved_product_id": price_data.get("tcgplayer_product_id"),
+            "documents": len(documents),
+            "saved": saved,
+            "tcgplayer_price": price_data.get("tcgplayer_price"),
+            "tcgplayer_market_price": price_data.get("tcgplayer_market_price"),
+            "product_url_reused": price_data.get("product_url_reused", False)
+        }
+
+    def _get_price_lookup_key(self, card_number: str, card_rarity: str, art_variant: Optional[str]) -> str:
+        """
+        Build the normalized lookup key stored with every cached price.
+        
+        Format: "<CARD NUMBER>|<canonical rarity>|<canonical art variant>"; the
+        art part is empty for prices without an art variant.
+        """
+        return "|".join(self._get_scrape_key(card_number, card_rarity, art_variant))
+
+    def _build_cache_query(
+        self,
+        card_number: str,
+        card_rarity: str,
+        art_variant: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Build the indexed price cache query for a card number, rarity and art variant.
+        
+        A request with an art variant matches prices for that art or without one;
+        a request without an art variant matches any art (an anchored prefix,
+        which still uses the price_lookup_key index).
+        
+        Args:
+            card_number: Card number
+            card_rarity: Card rarity
+            art_variant: Art variant (optional, handles numbered variants flexibly)
+            
+        Returns:
+            Dict: MongoDB query
+        """
+        card_key, rarity_key, art_key = self._get_scrape_key(card_number, card_rarity, art_variant)
+        prefix = f"{card_key}|{rarity_key}|"
+        
+        if art_key:
+            return {"price_lookup_key": {"$in": [prefix + art_key, prefix]}}
+        return {"price_lookup_key": {"$regex": f"^{re.escape(prefix)}"}}
+
+    def _build_legacy_cache_query(
+        self,
+        card_number: str,
+        card_rarity: str,
+        art_variant: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Build the pre-price_lookup_key cache query (case-insensitive rarity regex).
+        
+        Only used until cached prices have been backfilled with price_lookup_key.
+        """
+        normalized_rarity = card_rarity.lower().strip()
+        normalized_art_variant = self._normalize_art_variant(art_variant) if art_variant else None
+        
+        query = {
+            "card_number": card_number,
+            "card_rarity": {"$regex": f"^{re.escape(normalized_rarity)}$", "$options": "i"}
+        }
+        
+        # Handle art variant if provided
+        if normalized_art_variant:
+            query["$or"] = [
+                {"art_variant": {"$exists": False}},
+                {"art_variant": ""},
+                {"art_variant": {"$in": self._get_art_variant_alternatives(normalized_art_variant)}}
+            ]
+        
+        return query
+
+    def _document_matches_cache_query(
+        self,
+        document: Dict[str, Any],
+        card_number: str,
+        card_rarity: str,
+        art_variant: Optional[str] = None
+    ) -> bool:
+        """Check a cached document against the same rules as _build_cache_query."""
+        if document.get("price_lookup_key"):
+            card_key, rarity_key, art_key = self._get_scrape_key(card_number, card_rarity, art_variant)
+            prefix = f"{card_key}|{rarity_key}|"
+            if art_key:
+                return document["price_lookup_key"] in (prefix + art_key, prefix)
+            return document["price_lookup_key"].startswith(prefix)
+        return self._document_matches_legacy_cache_query(document, card_number, card_rarity, art_variant)
+
+    def _document_matches_legacy_cache_query(
+        self,
+        document: Dict[str, Any],
+        card_number: str,
+        card_rarity: str,
+        art_variant: Optional[str] = None
+    ) -> bool:
+        """Check a document without price_lookup_key against _build_legacy_cache_query."""
+        if document.get("card_number") != card_number:
+            return False
+        if str(document.get("card_rarity", "")).lower() != card_rarity.lower().strip():
+            return False
+        
+        normalized_art_variant = self._normalize_art_variant(art_variant) if art_variant else None
+        if not normalized_art_variant:
+            return True
+        if "art_variant" not in document or document["art_variant"] == "":
+            return True
+        return document["art_variant"] in self._get_art_variant_alternatives(normalized_art_variant)
+
+    def _get_staleness_info(self, card_number: str, documents: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """
+        Pick the most recent cached document and report whether it is fresh.
+        
+        Args:
+            card_number: Card number (for logging)
+            documents: Cached documents matching the card
+            
+        Returns:
+            Optional[Dict]: {"data", "is_fresh", "last_updated"} or None if unusable
+        """
+        if not documents:
+            logger.debug(f"No cached data found for {card_number}")
+            return None
+            
+        # Sort by last_price_updt in descending order to get the most recent
+        documents.sort(key=lambda x: x.get('last_price_updt', datetime.min.replace(tzinfo=timezone.utc)), reverse=True)
+        
+        # Get the most recent document
+        document = documents[0]
+        last_updated = document.get('last_price_updt')
+        
+        if not last_updated:
+            logger.debug(f"Found cached data for {card_number} but missing last_price_updt")
+            return None
+        
+        # Check if data is fresh, or stale but still servable while it is refreshed
+        is_fresh = is_cache_fresh(last_updated, PRICE_CACHE_EXPIRY_DAYS)
+        within_revalidate_window = (
+            not is_fresh
+            and PRICE_CACHE_SWR_WINDOW_DAYS > 0
+            and is_cache_fresh(last_updated, PRICE_CACHE_HARD_EXPIRY_DAYS)
+        )
+        
+        logger.debug(f"Found cached data for {card_number} - Fresh: {is_fresh}, Updated: {last_updated}")
+        
+        return {
+            "data": document,
+            "is_fresh": is_fresh,
+            "within_revalidate_window": within_revalidate_window,
+            "last_updated": last_updated
+        }
+
     def _find_cached_price_data_with_staleness_info(
         self,
         card_number: str,
@@ -976,59 +2515,214 @@ class PriceScrapingService:
                 logger.debug("Database disabled, skipping cache lookup")
                 return None
             
-            # Normalize inputs
-            normalized_rarity = card_rarity.lower().strip()
-            normalized_art_variant = self._normalize_art_variant(art_variant) if art_variant else None
+            logger.debug(f"Searching cache with staleness check - Number: {card_number}, Rarity: {card_rarity}, "
+                        f"Art Variant: {art_variant or 'None'}")
             
-            logger.debug(f"Searching cache with staleness check - Number: {card_number}, Rarity: {normalized_rarity}, "
-                        f"Art Variant: {normalized_art_variant or 'None'}")
+            document = self._find_latest_cached_document(card_number, card_rarity, art_variant)
             
-            # Build base query with card number and rarity
-            query = {
-                "card_number": card_number,
-                "card_rarity": {"$regex": f"^{re.escape(normalized_rarity)}$", "$options": "i"}
-            }
-            
-            # Handle art variant if provided
-            if normalized_art_variant:
-                query["$or"] = [
-                    {"art_variant": {"$exists": False}},
-                    {"art_variant": ""},
-                    {"art_variant": {"$in": self._get_art_variant_alternatives(normalized_art_variant)}}
-                ]
-            
-            # Find all matching documents
-            documents = list(self.cache_collection.find(query))
-            
-            if not documents:
-                logger.debug(f"No cached data found for {card_number}")
-                return None
+            return self._get_staleness_info(card_number, [document] if document else [])
                 
-            # Sort by last_price_updt in descending order to get the most recent
-            documents.sort(key=lambda x: x.get('last_price_updt', datetime.min.replace(tzinfo=timezone.utc)), reverse=True)
+        except Exception as e:
+            logger.error(f"Error finding cached price data with staleness info for {card_number}: {e}")
+            return None
+
+    def _find_latest_cached_document(
+        self,
+        card_number: str,
+        card_rarity: str,
+        art_variant: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Get the most recent cached price for a card, from the L1 cache or with
+        one indexed find_one sorted server-side on last_price_updt.
+        """
+        document = self._find_buffered_price_document(card_number, card_rarity, art_variant)
+        if document is not None:
+            return document
+        
+        lookup_key = self._get_price_lookup_key(card_number, card_rarity, art_variant)
+        document = self.price_l1_cache.get(lookup_key)
+        if document is not None:
+            return document
+        
+        sort = [("last_price_updt", DESCENDING)]
+        document = self.cache_collection.find_one(
+            self._build_cache_query(card_number, card_rarity, art_variant), sort=sort
+        )
+        if document is None and self._legacy_lookup_fallback:
+            document = self.cache_collection.find_one(
+                self._build_legacy_cache_query(card_number, card_rarity, art_variant), sort=sort
+            )
+        self._remember_l1_document(lookup_key, document)
+        return document
+
+    def _find_buffered_price_document(
+        self,
+        card_number: str,
+        card_rarity: str,
+        art_variant: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Most recent price saved in this process but not yet flushed by the write-behind buffer."""
+        if self.price_writer is None:
+            return None
+        matches = [
+            document for document in self.price_writer.pending_documents()
+            if self._document_matches_cache_query(document, card_number, card_rarity, art_variant)
+        ]
+        if not matches:
+            return None
+        return max(matches, key=lambda document: document["last_price_updt"])
+
+    def _remember_l1_document(self, lookup_key: str, document: Optional[Dict[str, Any]]) -> None:
+        """
+        Keep a fresh cached price in the L1 cache until it goes stale, capped
+        at PRICE_L1_CACHE_TTL_SECONDS. Stale and missing documents are not kept.
+        """
+        if not isinstance(document, dict) or PRICE_L1_CACHE_TTL_SECONDS <= 0:
+            return
+        last_updated = document.get("last_price_updt")
+        if not isinstance(last_updated, datetime):
+            return
+        if last_updated.tzinfo is None:
+            last_updated = last_updated.replace(tzinfo=timezone.utc)
+        
+        expires_at = last_updated + timedelta(days=PRICE_CACHE_EXPIRY_DAYS)
+        remaining_seconds = (expires_at - get_current_utc_datetime()).total_seconds()
+        ttl = min(PRICE_L1_CACHE_TTL_SECONDS, remaining_seconds)
+        if ttl > 0:
+            self.price_l1_cache.set(lookup_key, document, ttl=ttl)
+
+    def _invalidate_l1_prices(self, card_number: Optional[str], card_rarity: Optional[str]) -> int:
+        """Drop every L1 entry for a card number and rarity, whatever the art variant."""
+        card_key, rarity_key, _ = self._get_scrape_key(card_number, card_rarity, None)
+        prefix = f"{card_key}|{rarity_key}|"
+        return self.price_l1_cache.delete_matching(lambda key: key.startswith(prefix))
+
+    def backfill_price_lookup_keys(self, batch_size: int = PRICE_LOOKUP_KEY_BACKFILL_BATCH_SIZE) -> Dict[str, Any]:
+        """
+        Add price_lookup_key to cached prices saved before it existed.
+        
+        Args:
+            batch_size: Number of updates sent per bulk write
             
-            # Get the most recent document
-            document = documents[0]
-            last_updated = document.get('last_price_updt')
+        Returns:
+            Dict: Migration statistics
+        """
+        self._ensure_initialized()
+        if self.cache_collection is None:
+            return {"scanned": 0, "updated": 0, "error": "Database disabled"}
+        return self._backfill_price_lookup_keys(self.cache_collection, batch_size)
+
+    def _backfill_price_lookup_keys(
+        self,
+        collection: Any,
+        batch_size: int = PRICE_LOOKUP_KEY_BACKFILL_BATCH_SIZE
+    ) -> Dict[str, Any]:
+        """Write price_lookup_key to every document missing it, in unordered bulk batches."""
+        start_time = time.time()
+        stats = {"scanned": 0, "updated": 0}
+        try:
+            logger.info("Backfilling price_lookup_key on cached prices")
+            cursor = collection.find(
+                {"price_lookup_key": {"$exists": False}},
+                {"card_number": 1, "card_rarity": 1, "art_variant": 1}
+            )
             
-            if not last_updated:
-                logger.debug(f"Found cached data for {card_number} but missing last_price_updt")
-                return None
+            operations = []
+            for document in cursor:
+                stats["scanned"] += 1
+                lookup_key = self._get_price_lookup_key(
+                    document.get("card_number"), document.get("card_rarity"), document.get("art_variant")
+                )
+                operations.append(UpdateOne({"_id": document["_id"]}, {"$set": {"price_lookup_key": lookup_key}}))
+                if len(operations) >= batch_size:
+                    stats["updated"] += collection.bulk_write(operations, ordered=False).modified_count
+                    operations = []
+            if operations:
+                stats["updated"] += collection.bulk_write(operations, ordered=False).modified_count
+            
+            self._legacy_lookup_fallback = False
+            stats["duration_seconds"] = round(time.time() - start_time, 3)
+            logger.info(f"Backfilled price_lookup_key on {stats['updated']} of {stats['scanned']} cached prices")
+        except Exception as e:
+            logger.error(f"Error backfilling price_lookup_key: {e}")
+            stats["error"] = str(e)
+        return stats
+
+    def _find_cached_price_data_bulk(self, items: List[Dict[str, Any]]) -> List[Optional[Dict[str, Any]]]:
+        """
+        Staleness-aware cache lookup for many cards in one query.
+        
+        Args:
+            items: Dicts with card_number, card_rarity and optional art_variant
             
-            # Check if data is fresh
-            is_fresh = is_cache_fresh(last_updated, PRICE_CACHE_EXPIRY_DAYS)
+        Returns:
+            List[Optional[Dict]]: Lookup result per item, in input order
+        """
+        try:
+            self._ensure_initialized()
             
-            logger.debug(f"Found cached data for {card_number} - Fresh: {is_fresh}, Updated: {last_updated}")
+            if self.cache_collection is None or not items:
+                return [None] * len(items)
+            
+            # Serve what the L1 cache has; only the rest goes to MongoDB
+            entries: List[Optional[Dict[str, Any]]] = [None] * len(items)
+            pending = []
+            for index, item in enumerate(items):
+                document = self.price_l1_cache.get(self._get_price_lookup_key(
+                    item.get("card_number", ""), item.get("card_rarity", ""), item.get("art_variant")
+                ))
+                if document is not None:
+                    entries[index] = self._get_staleness_info(item.get("card_number", ""), [document])
+                else:
+                    pending.append(index)
+            if not pending:
+                return entries
+            
+            queries = [
+                self._build_cache_query(
+                    items[index].get("card_number", ""), items[index].get("card_rarity", ""), items[index].get("art_variant")
+                )
+                for index in pending
+            ]
+            if self._legacy_lookup_fallback:
+                queries += [
+                    self._build_legacy_cache_query(
+                        items[index].get("card_number", ""), items[index].get("card_rarity", ""), items[index].get("art_variant")
+                    )
+                    for index in pending
+                ]
+            documents = list(self.cache_collection.find({"$or": queries}))
+            if self.price_writer is not None:
+                # Read-your-writes: prices still in the write-behind buffer are newer than MongoDB's
+                documents.extend(self.price_writer.pending_documents())
+            
+            # Group candidate documents by canonical card number, then apply each item's rules
+            documents_by_number: Dict[str, List[Dict[str, Any]]] = {}
+            for document in documents:
+                card_key = (document.get("card_number") or "").strip().upper()
+                documents_by_number.setdefault(card_key, []).append(document)
+            
+            for index in pending:
+                item = items[index]
+                card_number = item.get("card_number", "")
+                matches = [
+                    document for document in documents_by_number.get(card_number.strip().upper(), [])
+                    if self._document_matches_cache_query(
+                        document, card_number, item.get("card_rarity", ""), item.get("art_variant")
+                    )
+                ]
+                entries[index] = self._get_staleness_info(card_number, matches)
+                if entries[index]:
+                    self._remember_l1_document(
+                        self._get_price_lookup_key(card_number, item.get("card_rarity", ""), item.get("art_variant")),
+                        entries[index]["data"]
+                    )
+            return entries
             
-            return {
-                "data": document,
-                "is_fresh": is_fresh,
-                "last_updated": last_updated
-            }
-                
         except Exception as e:
-            logger.error(f"Error finding cached price data with staleness info for {card_number}: {e}")
-            return None
+            logger.error(f"Error in bulk cache lookup: {e}")
+            return [None] * len(items)
     
     @monitor_memory
     async def select_best_tcgplayer_variant(
@@ -0,0 +1,107 @@
+"""
+Rate Limiter Module
+
+Provides a thread-safe token bucket so concurrent workers calling the same
+upstream API share one request budget instead of each sleeping on its own.
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from .config import YGO_API_RATE_LIMIT_BURST, YGO_API_RATE_LIMIT_PER_SECOND
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """
+    Token bucket rate limiter.
+
+    Tokens are added continuously at rate_per_second up to capacity; each
+    request takes one. Bursts up to capacity go through immediately, after
+    which callers block just long enough to stay at the configured rate.
+    A rate of zero or less disables limiting.
+    """
+
+    def __init__(self, rate_per_second: float, capacity: Optional[int] = None, name: str = "token-bucket"):
+        self.rate_per_second = rate_per_second
+        self.capacity = max(1, capacity if capacity is not None else int(rate_per_second) or 1)
+        self.name = name
+        self._tokens = float(self.capacity)
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+        self._stats = {
+            "acquired": 0,
+            "waited": 0,
+            "total_wait_ms": 0.0,
+            "timeouts": 0,
+        }
+
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        """
+        Take one token, blocking until one is available.
+
+        Args:
+            timeout: Maximum seconds to wait (None waits indefinitely)
+
+        Returns:
+            bool: True if a token was taken, False if the timeout expired first
+        """
+        if self.rate_per_second <= 0:
+            return True
+
+        started = time.monotonic()
+        waited = False
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate_per_second)
+                self._updated_at = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    self._stats["acquired"] += 1
+                    if waited:
+                        self._stats["waited"] += 1
+                        self._stats["total_wait_ms"] = round(
+                            self._stats["total_wait_ms"] + (now - started) * 1000, 1
+                        )
+                    return True
+                wait_seconds = (1 - self._tokens) / self.rate_per_second
+
+            if timeout is not None:
+                remaining = timeout - (time.monotonic() - started)
+                if remaining <= 0:
+                    with self._lock:
+                        self._stats["timeouts"] += 1
+                    return False
+                wait_seconds = min(wait_seconds, remaining)
+            waited = True
+            time.sleep(wait_seconds)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get limiter settings and wait statistics."""
+        with self._lock:
+            stats = dict(self._stats)
+        stats["rate_per_second"] = self.rate_per_second
+        stats["capacity"] = self.capacity
+        stats["avg_wait_ms"] = round(stats["total_wait_ms"] / stats["waited"], 1) if stats["waited"] else 0.0
+        return stats
+
+
+# Global limiter shared by every YGOPRODeck API call in this process (card images have their own delay)
+_ygo_api_rate_limiter: Optional[TokenBucket] = None
+_ygo_api_rate_limiter_lock = threading.Lock()
+
+
+def get_ygo_api_rate_limiter() -> TokenBucket:
+    """Get the global YGOPRODeck API rate limiter."""
+    global _ygo_api_rate_limiter
+    if _ygo_api_rate_limiter is None:
+        with _ygo_api_rate_limiter_lock:
+            if _ygo_api_rate_limiter is None:
+                _ygo_api_rate_limiter = TokenBucket(
+                    YGO_API_RATE_LIMIT_PER_SECOND, YGO_API_RATE_LIMIT_BURST, name="ygo-api"
+                )
+    return _ygo_api_rate_limiter
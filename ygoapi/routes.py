@@ -9,18 +9,175 @@ import logging
 import time
 import requests
 from flask import Flask, jsonify, request, Response
-from typing import Dict, Any
+from typing import Dict, Any, Optional, Tuple
 from urllib.parse import unquote
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 
-from .card_services import card_set_service, card_variant_service, card_lookup_service
+from .card_services import CacheRebuildInProgressError, card_set_service, card_variant_service, card_lookup_service
 from .price_scraping import price_scraping_service
+from .price_jobs import JOB_STATUS_COMPLETED, JOB_STATUS_FAILED, JOB_STATUS_QUEUED, get_price_job_queue
 from .memory_manager import get_memory_stats, force_memory_cleanup, monitor_memory
+from .rate_limiter import get_ygo_api_rate_limiter
 from .utils import extract_art_version, clean_card_data, extract_set_code, extract_booster_set_name
-from .config import API_RATE_LIMIT_DELAY, YGO_API_BASE_URL
+from .config import (
+    API_RATE_LIMIT_DELAY,
+    CARD_VARIANT_UPLOAD_MODE,
+    PRICE_BATCH_MAX_ITEMS,
+    PRICE_HISTORY_DEFAULT_DAYS,
+    PRICE_HISTORY_MAX_DAYS,
+    YGO_API_BASE_URL,
+)
 
 logger = logging.getLogger(__name__)
 
+def _parse_price_request_item(data: Dict[str, Any]) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+    """
+    Parse and validate the card fields of a price request.
+    
+    Args:
+        data: Request JSON (or one item of a batch request)
+        
+    Returns:
+        Tuple: (parsed item, None) on success or (None, error message) on failure
+    """
+    card_number = data.get('card_number', '').strip() if data.get('card_number') else None
+    card_name = data.get('card_name', '').strip() if data.get('card_name') else None
+    
+    # Validate required parameters
+    if not card_number and not card_name:
+        return None, "Either card_number or card_name is required"
+    
+    card_rarity = data.get('card_rarity', '').strip() if data.get('card_rarity') else None
+    
+    # Handle art_variant parameter
+    if 'art_variant' in data:
+        if data['art_variant'] is None:
+            art_variant = None
+        else:
+            art_variant = data['art_variant'].strip() if data['art_variant'] else ''
+    else:
+        art_variant = None
+    
+    # Validate card_rarity
+    if not card_rarity:
+        return None, "card_rarity is required and cannot be empty"
+    
+    return {
+        "card_number": card_number,
+        "card_name": card_name,
+        "card_rarity": card_rarity,
+        "art_variant": art_variant,
+    }, None
+
+def _build_price_response(
+    result: Dict[str, Any],
+    card_number: Optional[str],
+    card_name: Optional[str],
+    card_rarity: str
+) -> Tuple[Dict[str, Any], int]:
+    """
+    Format a scrape_card_price result into the /cards/price response body.
+    
+    Args:
+        result: Result from the price scraping service
+        card_number: Requested card number
+        card_name: Card name used for the scrape
+        card_rarity: Requested card rarity
+        
+    Returns:
+        Tuple: (response body, HTTP status code)
+    """
+    # Format response to match original API format
+    # Create the data object that matches original implementation
+    data_object = {
+        "card_number": card_number or "",
+        "card_name": card_name or "",
+        "card_rarity": card_rarity,
+        "set_code": extract_set_code(card_number) if card_number else None,
+        "booster_set_name": extract_booster_set_name(result.get('tcgplayer_url', '')) if result.get('tcgplayer_url') else None,
+        "tcg_price": result.get('tcgplayer_price'),
+        "tcg_market_price": result.get('tcgplayer_market_price'),
+        "source_url": result.get('tcgplayer_url'),
+        "scrape_success": result.get('success', False),
+        "last_price_updt": result.get('last_updated', ''),
+    }
+
+    # Format last_price_updt to match original format
+    if result.get('last_updated'):
+        last_updated = result['last_updated']
+        if hasattr(last_updated, 'strftime'):
+            data_object['last_price_updt'] = last_updated.strftime("%a, %d %b %Y %H:%M:%S GMT")
+        else:
+            data_object['last_price_updt'] = str(last_updated)
+
+    # Add error if present
+    if result.get('error'):
+        data_object['error_message'] = result['error']
+
+    # Calculate cache age if data is cached
+    cache_age_hours = 0.0
+    is_cached = result.get('cached', False)
+    message = "Price data scraped and saved successfully"
+
+    if is_cached and result.get('last_updated'):
+        try:
+            last_updated = result['last_updated']
+            if hasattr(last_updated, 'timestamp'):
+                # It's already a datetime object
+                current_time = datetime.now(timezone.utc)
+                cache_age = current_time - last_updated.replace(tzinfo=timezone.utc) if last_updated.tzinfo is None else current_time - last_updated
+                cache_age_hours = cache_age.total_seconds() / 3600
+            message = "Price data retrieved from cache"
+            if result.get('stale'):
+                message = "Stale price data retrieved from cache"
+        except Exception as e:
+            logger.warning(f"Could not calculate cache age: {e}")
+            cache_age_hours = 0.0
+
+    if result.get('negative_cached'):
+        message = "Card previously could not be priced; skipped until the negative cache entry expires"
+
+    # Build final response matching original format
+    response = {
+        "success": result.get('success', False),
+        "data": data_object,
+        "message": message,
+        "is_cached": is_cached,
+        "is_stale": bool(result.get('stale', False)),
+        "cache_age_hours": cache_age_hours
+    }
+
+    if result.get('success'):
+        return response, 200
+
+    # Check if it's a user error (404) or server error (500)
+    error_msg = result.get('error', '').lower()
+    if 'not found' in error_msg or 'could not find' in error_msg or 'no card' in error_msg:
+        return response, 404
+    elif 'invalid' in error_msg or 'required' in error_msg:
+        return response, 400
+    else:
+        return response, 500
+
+def _parse_history_datetime(value: Optional[str]) -> Optional[datetime]:
+    """
+    Parse an ISO 8601 date or datetime query parameter as UTC.
+    
+    Raises:
+        ValueError: If the value is not ISO 8601
+    """
+    if not value:
+        return None
+    parsed = datetime.fromisoformat(value.strip())
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc)
+
+def _invalidate_variant_caches() -> None:
+    """Drop in-process card number maps and rarity tables built from the variants collection."""
+    price_scraping_service.invalidate_variant_caches()
+    card_lookup_service.card_number_index.clear()
+
 def register_routes(app: Flask) -> None:
     """
     Register all routes with the Flask application.
@@ -52,38 +209,41 @@ def register_routes(app: Flask) -> None:
                     "error": "Request body must be JSON"
                 }), 400
             
-            card_number = data.get('card_number', '').strip() if data.get('card_number') else None
-            card_name = data.get('card_name', '').strip() if data.get('card_name') else None
-            
-            # Validate required parameters
-            if not card_number and not card_name:
+            item, error = _parse_price_request_item(data)
+            if error:
                 return jsonify({
                     "success": False,
-                    "error": "Either card_number or card_name is required"
+                    "error": error
                 }), 400
             
-            card_rarity = data.get('card_rarity', '').strip() if data.get('card_rarity') else None
-            
-            # Handle art_variant parameter
-            if 'art_variant' in data:
-                if data['art_variant'] is None:
-                    art_variant = None
-                else:
-                    art_variant = data['art_variant'].strip() if data['art_variant'] else ''
-            else:
-                art_variant = None
+            card_number = item["card_number"]
+            card_name = item["card_name"]
+            card_rarity = item["card_rarity"]
+            art_variant = item["art_variant"]
             
             # Convert force_refresh to boolean
             force_refresh = str(data.get('force_refresh', '')).lower() == 'true'
             
-            # Validate card_rarity
-            if not card_rarity:
-                return jsonify({
-                    "success": False,
-                    "error": "card_rarity is required and cannot be empty"
-                }), 400
+            # Async mode: enqueue the scrape and let the client poll for the result
+            run_async = str(data.get('async', '')).lower() == 'true'
+            
+            logger.info(f"Price request for card: {card_number or 'None'}, name: {card_name or 'None'}, rarity: {card_rarity}, art: {art_variant}, force_refresh: {force_refresh}, async: {run_async}")
             
-            logger.info(f"Price request for card: {card_number or 'None'}, name: {card_name or 'None'}, rarity: {card_rarity}, art: {art_variant}, force_refresh: {force_refresh}")
+            if run_async:
+                job_id = get_price_job_queue().submit({
+                    "card_number": card_number or "",
+                    "card_name": card_name or "",
+                    "card_rarity": card_rarity,
+                    "art_variant": art_variant,
+                    "force_refresh": force_refresh
+                })
+                return jsonify({
+                    "success": True,
+                    "job_id": job_id,
+                    "status": JOB_STATUS_QUEUED,
+                    "status_url": f"/cards/price/jobs/{job_id}",
+                    "message": "Price scrape queued"
+                }), 202
             
             # Look up card name if not provided
             if not card_name and card_number:
@@ -104,74 +264,263 @@ def register_routes(app: Flask) -> None:
                 force_refresh=force_refresh
             )
             
-            # Format response to match original API format
-            # Create the data object that matches original implementation
-            data_object = {
-                "card_number": card_number or "",
-                "card_name": card_name or "",
-                "card_rarity": card_rarity,
-                "set_code": extract_set_code(card_number) if card_number else None,
-                "booster_set_name": extract_booster_set_name(result.get('tcgplayer_url', '')) if result.get('tcgplayer_url') else None,
-                "tcg_price": result.get('tcgplayer_price'),
-                "tcg_market_price": result.get('tcgplayer_market_price'),
-                "source_url": result.get('tcgplayer_url'),
-                "scrape_success": result.get('success', False),
-                "last_price_updt": result.get('last_updated', ''),
-            }
+            response, status_code = _build_price_response(result, card_number, card_name, card_rarity)
+            if status_code == 200:
+                return jsonify(response)
+            return jsonify(response), status_code
             
-            # Format last_price_updt to match original format
-            if result.get('last_updated'):
-                last_updated = result['last_updated']
-                if hasattr(last_updated, 'strftime'):
-                    data_object['last_price_updt'] = last_updated.strftime("%a, %d %b %Y %H:%M:%S GMT")
-                else:
-                    data_object['last_price_updt'] = str(last_updated)
+        except Exception as e:
+            logger.error(f"Error in scrape_card_price: {e}")
+            return jsonify({
+                "success": False,
+                "error": "Internal server error"
+            }), 500
+    
+    @app.route('/cards/price/jobs/<string:job_id>', methods=['GET'])
+    @monitor_memory
+    def get_price_job(job_id: str):
+        """Get the status, and once finished the result, of an async price scrape."""
+        try:
+            job = get_price_job_queue().get_job(job_id)
             
-            # Add error if present
-            if result.get('error'):
-                data_object['error_message'] = result['error']
+            if not job:
+                return jsonify({
+                    "success": False,
+                    "error": f"Price job '{job_id}' not found or expired"
+                }), 404
             
-            # Calculate cache age if data is cached
-            cache_age_hours = 0.0
-            is_cached = result.get('cached', False)
-            message = "Price data scraped and saved successfully"
-            
-            if is_cached and result.get('last_updated'):
-                try:
-                    last_updated = result['last_updated']
-                    if hasattr(last_updated, 'timestamp'):
-                        # It's already a datetime object
-                        current_time = datetime.now(timezone.utc)
-                        cache_age = current_time - last_updated.replace(tzinfo=timezone.utc) if last_updated.tzinfo is None else current_time - last_updated
-                        cache_age_hours = cache_age.total_seconds() / 3600
-                    message = "Price data retrieved from cache"
-                except Exception as e:
-                    logger.warning(f"Could not calculate cache age: {e}")
-                    cache_age_hours = 0.0
-            
-            # Build final response matching original format
             response = {
-                "success": result.get('success', False),
-                "data": data_object,
-                "message": message,
-                "is_cached": is_cached,
-                "cache_age_hours": cache_age_hours
+                "success": True,
+                "job_id": job_id,
+                "status": job["status"],
+                "created_at": job.get("created_at"),
+                "started_at": job.get("started_at"),
+                "finished_at": job.get("finished_at")
             }
             
-            if result.get('success'):
-                return jsonify(response)
-            else:
-                # Check if it's a user error (404) or server error (500)
-                error_msg = result.get('error', '').lower()
-                if 'not found' in error_msg or 'could not find' in error_msg or 'no card' in error_msg:
-                    return jsonify(response), 404
-                elif 'invalid' in error_msg or 'required' in error_msg:
-                    return jsonify(response), 400
+            if job["status"] == JOB_STATUS_COMPLETED and job.get("result") is not None:
+                payload = job.get("payload", {})
+                result = job["result"]
+                response["result"], response["result_status_code"] = _build_price_response(
+                    result,
+                    payload.get("card_number"),
+                    payload.get("card_name") or result.get("card_name"),
+                    payload.get("card_rarity")
+                )
+            elif job["status"] == JOB_STATUS_FAILED:
+                response["error"] = job.get("error")
+            
+            return jsonify(response)
+            
+        except Exception as e:
+            logger.error(f"Error getting price job {job_id}: {e}")
+            return jsonify({
+                "success": False,
+                "error": "Internal server error"
+            }), 500
+    
+    @app.route('/cards/price/batch', methods=['POST'])
+    @monitor_memory
+    def scrape_card_prices_batch():
+        """Get prices for a list of cards, scraping cache misses concurrently."""
+        try:
+            data = request.get_json()
+            
+            if not data:
+                return jsonify({
+                    "success": False,
+                    "error": "Request body must be JSON"
+                }), 400
+            
+            raw_items = data.get('items')
+            if not isinstance(raw_items, list) or not raw_items:
+                return jsonify({
+                    "success": False,
+                    "error": "items must be a non-empty list"
+                }), 400
+            
+            if len(raw_items) > PRICE_BATCH_MAX_ITEMS:
+                return jsonify({
+                    "success": False,
+                    "error": f"A batch may contain at most {PRICE_BATCH_MAX_ITEMS} items"
+                }), 400
+            
+            # Convert force_refresh to boolean
+            force_refresh = str(data.get('force_refresh', '')).lower() == 'true'
+            
+            # Invalid items are reported in place; only valid items reach the service
+            results = [None] * len(raw_items)
+            valid_indexes = []
+            valid_items = []
+            for index, raw_item in enumerate(raw_items):
+                if not isinstance(raw_item, dict):
+                    item, error = None, "Each item must be a JSON object"
+                else:
+                    item, error = _parse_price_request_item(raw_item)
+                
+                if error:
+                    results[index] = {
+                        "success": False,
+                        "card_number": raw_item.get('card_number') if isinstance(raw_item, dict) else None,
+                        "card_rarity": raw_item.get('card_rarity') if isinstance(raw_item, dict) else None,
+                        "error": error
+                    }
                 else:
-                    return jsonify(response), 500
+                    item["card_number"] = item["card_number"] or ""
+                    item["card_name"] = item["card_name"] or ""
+                    valid_indexes.append(index)
+                    valid_items.append(item)
+            
+            logger.info(f"Batch price request for {len(raw_items)} items ({len(valid_items)} valid), force_refresh: {force_refresh}")
+            
+            start_time = time.time()
+            if valid_items:
+                batch_results = price_scraping_service.scrape_card_prices_batch(
+                    valid_items,
+                    force_refresh=force_refresh
+                )
+                for index, result in zip(valid_indexes, batch_results):
+                    results[index] = result
+            
+            successful = sum(1 for result in results if result.get('success'))
+            cached = sum(1 for result in results if result.get('cached'))
+            
+            return jsonify({
+                "success": True,
+                "results": results,
+                "summary": {
+                    "total": len(results),
+                    "successful": successful,
+                    "failed": len(results) - successful,
+                    "cached": cached,
+                    "scraped": successful - cached,
+                    "duration_seconds": round(time.time() - start_time, 3)
+                }
+            })
             
         except Exception as e:
-            logger.error(f"Error in scrape_card_price: {e}")
+            logger.error(f"Error in scrape_card_prices_batch: {e}")
+            return jsonify({
+                "success": False,
+                "error": "Internal server error"
+            }), 500
+    
+    @app.route('/cards/price/refresh-products', methods=['POST'])
+    @monitor_memory
+    def refresh_prices_by_product_id():
+        """Re-scrape cached prices directly from their TCGPlayer product pages."""
+        try:
+            data = request.get_json(silent=True) or {}
+            
+            product_ids = data.get('product_ids')
+            if product_ids is not None and (
+                not isinstance(product_ids, list)
+                or not all(isinstance(product_id, (str, int)) and str(product_id).isdigit() for product_id in product_ids)
+            ):
+                return jsonify({
+                    "success": False,
+                    "error": "product_ids must be a list of numeric TCGPlayer product ids"
+                }), 400
+            
+            if product_ids and len(product_ids) > PRICE_BATCH_MAX_ITEMS:
+                return jsonify({
+                    "success": False,
+                    "error": f"At most {PRICE_BATCH_MAX_ITEMS} product ids may be refreshed at once"
+                }), 400
+            
+            try:
+                limit = int(data.get('limit', PRICE_BATCH_MAX_ITEMS))
+            except (TypeError, ValueError):
+                limit = 0
+            if limit < 1 or limit > PRICE_BATCH_MAX_ITEMS:
+                return jsonify({
+                    "success": False,
+                    "error": f"limit must be between 1 and {PRICE_BATCH_MAX_ITEMS}"
+                }), 400
+            
+            logger.info(f"Product refresh request for {len(product_ids) if product_ids else 'stale'} products (limit {limit})")
+            
+            start_time = time.time()
+            results = price_scraping_service.refresh_prices_by_product_id(
+                [str(product_id) for product_id in product_ids] if product_ids else None,
+                limit=limit
+            )
+            successful = sum(1 for result in results if result.get('success'))
+            
+            return jsonify({
+                "success": True,
+                "results": results,
+                "summary": {
+                    "products": len(results),
+                    "documents": sum(result.get('documents', 0) for result in results),
+                    "successful": successful,
+                    "failed": len(results) - successful,
+                    "duration_seconds": round(time.time() - start_time, 3)
+                }
+            })
+            
+        except Exception as e:
+            logger.error(f"Error in refresh_prices_by_product_id: {e}")
+            return jsonify({
+                "success": False,
+                "error": "Internal server error"
+            }), 500
+    
+    @app.route('/cards/price/history', methods=['GET'])
+    @monitor_memory
+    def get_price_history():
+        """Get a card's recorded prices downsampled to daily min, max and last."""
+        try:
+            card_number = (request.args.get('card_number') or '').strip()
+            card_rarity = (request.args.get('card_rarity') or '').strip()
+            art_variant = (request.args.get('art_variant') or '').strip() or None
+            
+            if not card_number or not card_rarity:
+                return jsonify({
+                    "success": False,
+                    "error": "card_number and card_rarity are required"
+                }), 400
+            
+            try:
+                end = _parse_history_datetime(request.args.get('end')) or datetime.now(timezone.utc)
+                start = _parse_history_datetime(request.args.get('start')) or end - timedelta(days=PRICE_HISTORY_DEFAULT_DAYS)
+            except ValueError:
+                return jsonify({
+                    "success": False,
+                    "error": "start and end must be ISO 8601 dates or datetimes"
+                }), 400
+            
+            if start >= end:
+                return jsonify({
+                    "success": False,
+                    "error": "start must be before end"
+                }), 400
+            if end - start > timedelta(days=PRICE_HISTORY_MAX_DAYS):
+                return jsonify({
+                    "success": False,
+                    "error": f"Time range may not exceed {PRICE_HISTORY_MAX_DAYS} days"
+                }), 400
+            
+            points = price_scraping_service.get_price_history(card_number, card_rarity, art_variant, start, end)
+            if points is None:
+                return jsonify({
+                    "success": False,
+                    "error": "Price history is not available"
+                }), 503
+            
+            return jsonify({
+                "success": True,
+                "card_number": card_number,
+                "card_rarity": card_rarity,
+                "art_variant": art_variant,
+                "start": start.isoformat(),
+                "end": end.isoformat(),
+                "interval": "day",
+                "points": points
+            })
+            
+        except Exception as e:
+            logger.error(f"Error getting price history: {e}")
             return jsonify({
                 "success": False,
                 "error": "Internal server error"
@@ -194,6 +543,24 @@ def register_routes(app: Flask) -> None:
                 "error": "Internal server error"
             }), 500
     
+    @app.route('/cards/price/scraping-stats', methods=['GET'])
+    @monitor_memory
+    def get_price_scraping_stats():
+        """Get in-process scraping statistics (coalescing, browser pool, runtime, job queue)."""
+        try:
+            stats = price_scraping_service.get_scraping_stats()
+            stats["job_queue"] = get_price_job_queue().get_stats()
+            return jsonify({
+                "success": True,
+                "scraping_stats": stats
+            })
+        except Exception as e:
+            logger.error(f"Error getting scraping stats: {e}")
+            return jsonify({
+                "success": False,
+                "error": "Internal server error"
+            }), 500
+    
     @app.route('/debug/cache-lookup', methods=['POST'])
     @monitor_memory
     def debug_cache_lookup():
@@ -306,6 +673,11 @@ def register_routes(app: Flask) -> None:
                 "message": "Card sets uploaded successfully to MongoDB",
                 "statistics": result
             })
+        except CacheRebuildInProgressError as e:
+            return jsonify({
+                "success": False,
+                "error": str(e)
+            }), 409
         except Exception as e:
             logger.error(f"Error uploading card sets: {e}")
             return jsonify({
@@ -368,6 +740,7 @@ def register_routes(app: Flask) -> None:
             # Make request to YGO API for cards in this set
             logger.info(f"Fetching cards from set: {set_name}")
             api_url = f"{YGO_API_BASE_URL}/cardinfo.php?cardset={encoded_set_name}"
+            get_ygo_api_rate_limiter().acquire()
             response = requests.get(api_url, timeout=15)
             
             if response.status_code == 200:
@@ -461,14 +834,32 @@ def register_routes(app: Flask) -> None:
     @app.route('/cards/upload-variants', methods=['POST'])
     @monitor_memory
     def upload_card_variants_to_mongodb():
-        """Upload card variants to MongoDB."""
+        """Upload card variants to MongoDB, per set or from the full card dump (?mode=bulk)."""
+        mode = request.args.get('mode', CARD_VARIANT_UPLOAD_MODE).lower()
+        if mode not in ('per_set', 'bulk'):
+            return jsonify({
+                "success": False,
+                "error": "mode must be 'per_set' or 'bulk'"
+            }), 400
+        
         try:
-            result = card_variant_service.upload_card_variants_to_cache()
+            if mode == 'bulk':
+                result = card_variant_service.build_card_variants_from_dump()
+            else:
+                result = card_variant_service.upload_card_variants_to_cache()
+            # The rebuilt collection was swapped in, so in-process views of the old one are stale
+            _invalidate_variant_caches()
             return jsonify({
                 "success": True,
                 "message": "Card variants uploaded successfully to MongoDB",
+                "mode": mode,
                 **result
             })
+        except CacheRebuildInProgressError as e:
+            return jsonify({
+                "success": False,
+                "error": str(e)
+            }), 409
         except Exception as e:
             logger.error(f"Error uploading card variants: {e}")
             return jsonify({
@@ -476,6 +867,39 @@ def register_routes(app: Flask) -> None:
                 "error": "Internal server error during variant upload"
             }), 500
     
+    @app.route('/cards/sync-variants', methods=['POST'])
+    @monitor_memory
+    def sync_card_variants_with_mongodb():
+        """Fetch variants only for new or changed sets and drop those of removed sets (?force=true skips the removal limits)."""
+        force = request.args.get('force', '').lower() == 'true'
+        try:
+            result = card_variant_service.sync_card_variants(force=force)
+            # Synced sets may have lost or changed variants
+            _invalidate_variant_caches()
+            return jsonify({
+                "success": True,
+                "message": "Card variants synced successfully with MongoDB",
+                **result
+            })
+        except CacheRebuildInProgressError as e:
+            return jsonify({
+                "success": False,
+                "error": str(e)
+            }), 409
+        except ValueError as e:
+            # The set list looked incomplete, so nothing was changed
+            logger.warning(f"Variant sync refused: {e}")
+            return jsonify({
+                "success": False,
+                "error": str(e)
+            }), 409
+        except Exception as e:
+            logger.error(f"Error syncing card variants: {e}")
+            return jsonify({
+                "success": False,
+                "error": "Internal server error during variant sync"
+            }), 500
+    
     @app.route('/cards/variants', methods=['GET'])
     @monitor_memory
     def get_card_variants_from_cache():
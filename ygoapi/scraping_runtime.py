@@ -0,0 +1,173 @@
+"""
+Scraping Runtime Module
+
+Provides one long-lived asyncio event loop, running on a background thread,
+for all Playwright and other async scraping work. Synchronous Flask routes
+submit coroutines to it and wait on the returned concurrent.futures.Future,
+so browsers, pages and connections can be shared across requests.
+"""
+
+import asyncio
+import concurrent.futures
+import logging
+import threading
+from typing import Any, Coroutine, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class ScrapingRuntime:
+    """Background thread owning a persistent asyncio event loop."""
+
+    def __init__(self, name: str = "scraping-runtime"):
+        self.name = name
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            "submitted": 0,
+            "completed": 0,
+            "failed": 0,
+            "cancelled": 0,
+            "timed_out": 0,
+            "loop_starts": 0,
+        }
+
+    def is_running(self) -> bool:
+        """Check whether the event loop thread is alive."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> asyncio.AbstractEventLoop:
+        """
+        Start the event loop thread if it is not already running.
+
+        Returns:
+            asyncio.AbstractEventLoop: The runtime's event loop
+        """
+        with self._lock:
+            if not self.is_running():
+                loop = asyncio.new_event_loop()
+                started = threading.Event()
+
+                def _run_loop():
+                    asyncio.set_event_loop(loop)
+                    loop.call_soon(started.set)
+                    loop.run_forever()
+
+                self._loop = loop
+                self._thread = threading.Thread(target=_run_loop, name=self.name, daemon=True)
+                self._thread.start()
+                started.wait()
+                self._increment("loop_starts")
+                logger.info(f"Scraping runtime event loop started ({self.name})")
+            return self._loop
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """The runtime's event loop, starting it on first access."""
+        return self.start()
+
+    def submit(self, coro: Coroutine) -> concurrent.futures.Future:
+        """
+        Schedule a coroutine on the runtime loop from any thread.
+
+        Args:
+            coro: Coroutine to run
+
+        Returns:
+            concurrent.futures.Future: Future resolved with the coroutine's result
+        """
+        loop = self.start()
+        future = asyncio.run_coroutine_threadsafe(coro, loop)
+        self._increment("submitted")
+        future.add_done_callback(self._record_outcome)
+        return future
+
+    def run(self, coro: Coroutine, timeout: Optional[float] = None) -> Any:
+        """
+        Run a coroutine on the runtime loop and block until it finishes.
+
+        Args:
+            coro: Coroutine to run
+            timeout: Maximum seconds to wait for the result
+
+        Returns:
+            Any: Result of the coroutine
+        """
+        future = self.submit(coro)
+        try:
+            return future.result(timeout)
+        except concurrent.futures.TimeoutError:
+            # Cancel the task so it releases any browser resources it holds
+            self._increment("timed_out")
+            future.cancel()
+            raise
+
+    def shutdown(self, timeout: float = 10.0) -> None:
+        """
+        Cancel outstanding tasks, stop the event loop and join its thread.
+
+        Args:
+            timeout: Maximum seconds to wait for the loop thread to exit
+        """
+        with self._lock:
+            if not self.is_running():
+                return
+            loop, thread = self._loop, self._thread
+
+            async def _cancel_pending():
+                current = asyncio.current_task()
+                tasks = [task for task in asyncio.all_tasks() if task is not current]
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+
+            try:
+                asyncio.run_coroutine_threadsafe(_cancel_pending(), loop).result(timeout)
+            except Exception as e:
+                logger.warning(f"Error cancelling scraping runtime tasks: {e}")
+
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join(timeout)
+            if not thread.is_alive():
+                loop.close()
+            self._loop = None
+            self._thread = None
+            logger.info(f"Scraping runtime event loop stopped ({self.name})")
+
+    def _record_outcome(self, future: concurrent.futures.Future) -> None:
+        """Update counters when a submitted coroutine finishes."""
+        if future.cancelled():
+            self._increment("cancelled")
+        elif future.exception() is not None:
+            self._increment("failed")
+        else:
+            self._increment("completed")
+
+    def _increment(self, key: str) -> None:
+        with self._stats_lock:
+            self._stats[key] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get runtime statistics."""
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats["running"] = self.is_running()
+        stats["in_flight"] = stats["submitted"] - stats["completed"] - stats["failed"] - stats["cancelled"]
+        return stats
+
+
+# Global runtime instance
+_scraping_runtime: Optional[ScrapingRuntime] = None
+_scraping_runtime_lock = threading.Lock()
+
+
+def get_scraping_runtime() -> ScrapingRuntime:
+    """Get the global scraping runtime instance."""
+    global _scraping_runtime
+    with _scraping_runtime_lock:
+        if _scraping_runtime is None:
+            _scraping_runtime = ScrapingRuntime()
+        return _scraping_runtime
@@ -5,9 +5,11 @@ Provides utility functions for data processing, normalization, and cleaning
 used throughout the YGO API application.
 """
 
+import codecs
+import json
 import re
 import logging
-from typing import Optional, List, Dict, Any, Generator
+from typing import Optional, List, Dict, Any, Generator, Iterable, Union
 from datetime import datetime, timedelta, timezone
 from .memory_manager import monitor_memory
 
@@ -531,6 +533,73 @@ def batch_process_generator(items: List[Any], batch_size: int = 100) -> Generato
     for i in range(0, len(items), batch_size):
         yield items[i:i + batch_size]
 
+def iter_json_array_items(
+    chunks: Iterable[Union[bytes, str]],
+    array_key: str
+) -> Generator[Any, None, None]:
+    """
+    Incrementally parse the items of a top-level JSON array from a chunked response.
+    
+    Only the current item and one chunk are held in memory, so multi-hundred
+    megabyte responses such as the full cardinfo.php dump can be processed
+    without loading them whole. The first occurrence of the "array_key": [
+    sequence is taken as the start of the array, whose items are expected to
+    be objects.
+    
+    Args:
+        chunks: Response body chunks (bytes are decoded as UTF-8)
+        array_key: Key of the array to stream, e.g. "data"
+        
+    Yields:
+        Any: Each decoded array item
+        
+    Raises:
+        ValueError: If the array is missing or the body ends mid-item
+    """
+    decoder = json.JSONDecoder()
+    utf8_decoder = codecs.getincrementaldecoder("utf-8")()
+    array_start = re.compile(r'"' + re.escape(array_key) + r'"\s*:\s*\[')
+    buffer = ""
+    position = 0
+    in_array = False
+    
+    def decoded_chunks():
+        for chunk in chunks:
+            yield utf8_decoder.decode(chunk) if isinstance(chunk, bytes) else chunk
+        yield utf8_decoder.decode(b"", final=True)
+    
+    for text in decoded_chunks():
+        buffer = buffer[position:] + text
+        position = 0
+        
+        if not in_array:
+            match = array_start.search(buffer)
+            if match is None:
+                # Keep enough of the tail to match a key split across chunks
+                position = max(0, len(buffer) - len(array_key) - 16)
+                continue
+            in_array = True
+            position = match.end()
+        
+        while True:
+            while position < len(buffer) and buffer[position] in " \t\r\n,":
+                position += 1
+            if position >= len(buffer):
+                break
+            if buffer[position] == "]":
+                return
+            try:
+                item, end = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                # Item continues in the next chunk
+                break
+            position = end
+            yield item
+    
+    if not in_array:
+        raise ValueError(f"JSON array '{array_key}' not found in response")
+    raise ValueError(f"Response ended before JSON array '{array_key}' was closed")
+
 @monitor_memory
 def validate_card_number(card_number: str) -> bool:
     """
@@ -557,6 +626,20 @@ def validate_card_number(card_number: str) -> bool:
     
     return any(re.match(pattern, card_number.upper()) for pattern in patterns)
 
+def normalize_card_number(card_number: Optional[str]) -> str:
+    """
+    Canonical form of a card number used for exact-match lookups.
+    
+    Args:
+        card_number: Card number as typed or stored (e.g. " lob-001")
+        
+    Returns:
+        str: Trimmed, uppercase card number (e.g. "LOB-001"), or "" if missing
+    """
+    if not card_number:
+        return ""
+    return card_number.strip().upper()
+
 @monitor_memory
 def calculate_success_rate(processed: int, total: int) -> float:
     """
@@ -624,6 +707,20 @@ def is_cache_fresh(last_updated: datetime, cache_days: int = 7) -> bool:
     
     return current_time < expiry_time
 
+def get_cache_age_hours(last_updated: datetime) -> float:
+    """
+    Get the age of cached data in hours.
+    
+    Args:
+        last_updated: Last update timestamp (naive values are treated as UTC)
+        
+    Returns:
+        float: Hours since last_updated
+    """
+    if last_updated.tzinfo is None:
+        last_updated = last_updated.replace(tzinfo=timezone.utc)
+    return (datetime.now(timezone.utc) - last_updated).total_seconds() / 3600
+
 @monitor_memory
 def sanitize_string(value: str) -> str:
     """
@@ -785,6 +882,19 @@ def extract_booster_set_name(source_url: str) -> Optional[str]:
         return None
 
 
+def extract_tcgplayer_product_id(url: Optional[str]) -> Optional[str]:
+    """
+    Extract the numeric product id from a TCGPlayer product URL.
+    
+    Example: https://www.tcgplayer.com/product/626754/yugioh-... -> "626754"
+    """
+    if not url or not isinstance(url, str):
+        return None
+    
+    match = re.search(r'/product/(\d+)(?:[/?#]|$)', url)
+    return match.group(1) if match else None
+
+
 def map_set_code_to_tcgplayer_name(set_code: str) -> Optional[str]:
     """Map YGO set code to TCGPlayer set name using MongoDB cache."""
     if not set_code:
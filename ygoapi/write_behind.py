@@ -0,0 +1,194 @@
+"""
+Write-Behind Buffer Module
+
+Collects MongoDB upserts in memory and flushes them with one unordered
+bulk_write when the buffer fills up, on a timer, or at shutdown, so bulk
+refreshes pay one round trip per batch instead of one per document.
+"""
+
+import atexit
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, List, Optional
+
+from pymongo import ReplaceOne
+
+logger = logging.getLogger(__name__)
+
+
+class WriteBehindBuffer:
+    """
+    Buffer replace-with-upsert operations and flush them in batches.
+
+    Operations are keyed so a document saved twice before a flush is only
+    written once (last write wins). Buffered documents stay readable through
+    pending_documents() until their batch has been written.
+    """
+
+    def __init__(
+        self,
+        collection_getter: Callable[[], Any],
+        max_batch_size: int = 500,
+        flush_interval_seconds: float = 2.0,
+        on_flush: Optional[Callable[[Any], None]] = None,
+        name: str = "write-behind",
+    ):
+        self.collection_getter = collection_getter
+        self.max_batch_size = max(1, max_batch_size)
+        self.flush_interval_seconds = flush_interval_seconds
+        self.on_flush = on_flush
+        self.name = name
+
+        self._pending: Dict[Hashable, Dict[str, Any]] = {}
+        # Batch currently being written; still visible to readers until the write returns
+        self._flushing: Dict[Hashable, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake_event = threading.Event()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._atexit_registered = False
+        self._stats = {
+            "buffered": 0,
+            "coalesced": 0,
+            "flushes": 0,
+            "flushed_operations": 0,
+            "failed_flushes": 0,
+            "max_batch_size": 0,
+            "total_flush_ms": 0.0,
+            "max_flush_ms": 0.0,
+            "last_flush_ms": 0.0,
+        }
+
+    # ==================== PUBLIC API ====================
+
+    def add(self, key: Hashable, filter_document: Dict[str, Any], document: Dict[str, Any]) -> None:
+        """
+        Buffer a replace-with-upsert of document matching filter_document.
+
+        Args:
+            key: Identity of the target document; later adds with the same key replace earlier ones
+            filter_document: Query selecting the document to replace
+            document: Replacement document
+        """
+        self.start()
+        with self._lock:
+            if key in self._pending:
+                self._stats["coalesced"] += 1
+            self._pending[key] = {"filter": filter_document, "document": document}
+            self._stats["buffered"] += 1
+            full = len(self._pending) >= self.max_batch_size
+        if full:
+            self._wake_event.set()
+
+    def pending_documents(self) -> List[Dict[str, Any]]:
+        """Documents saved but not yet written, including a batch being flushed."""
+        with self._lock:
+            merged = {**self._flushing, **self._pending}
+            return [operation["document"] for operation in merged.values()]
+
+    def flush(self) -> int:
+        """
+        Write every buffered operation with one unordered bulk_write.
+
+        Returns:
+            int: Number of operations written
+        """
+        with self._flush_lock:
+            with self._lock:
+                if not self._pending:
+                    return 0
+                self._flushing = self._pending
+                self._pending = {}
+                batch = list(self._flushing.items())
+
+            started = time.perf_counter()
+            try:
+                collection = self.collection_getter()
+                if collection is None:
+                    raise RuntimeError("collection unavailable")
+                result = collection.bulk_write(
+                    [ReplaceOne(operation["filter"], operation["document"], upsert=True) for _, operation in batch],
+                    ordered=False,
+                )
+            except Exception as e:
+                logger.error(f"Write-behind flush of {len(batch)} operations failed ({self.name}): {e}")
+                with self._lock:
+                    # Re-queue the batch unless newer writes for the same keys arrived meanwhile
+                    for key, operation in batch:
+                        self._pending.setdefault(key, operation)
+                    self._flushing = {}
+                    self._stats["failed_flushes"] += 1
+                return 0
+
+            elapsed_ms = round((time.perf_counter() - started) * 1000, 1)
+            with self._lock:
+                self._flushing = {}
+                self._stats["flushes"] += 1
+                self._stats["flushed_operations"] += len(batch)
+                self._stats["max_batch_size"] = max(self._stats["max_batch_size"], len(batch))
+                self._stats["total_flush_ms"] = round(self._stats["total_flush_ms"] + elapsed_ms, 1)
+                self._stats["max_flush_ms"] = max(self._stats["max_flush_ms"], elapsed_ms)
+                self._stats["last_flush_ms"] = elapsed_ms
+            logger.debug(f"Flushed {len(batch)} buffered writes in {elapsed_ms}ms ({self.name})")
+
+            if self.on_flush is not None:
+                try:
+                    self.on_flush(result)
+                except Exception as e:
+                    logger.warning(f"Write-behind flush callback failed ({self.name}): {e}")
+            return len(batch)
+
+    def start(self) -> None:
+        """Start the background flush thread if it is not running."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop_event.clear()
+            self._thread = threading.Thread(target=self._flush_loop, name=self.name, daemon=True)
+            self._thread.start()
+            if not self._atexit_registered:
+                # Daemon threads die with the interpreter, so flush what's left on the way out
+                atexit.register(self.shutdown)
+                self._atexit_registered = True
+
+    def shutdown(self, timeout: float = 10.0) -> None:
+        """Stop the flush thread and write whatever is still buffered."""
+        self._stop_event.set()
+        self._wake_event.set()
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+            self._thread = None
+        self.flush()
+
+    def size(self) -> int:
+        """Number of operations waiting to be flushed."""
+        with self._lock:
+            return len(self._pending)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get buffer and flush statistics."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["pending"] = len(self._pending)
+        stats["avg_batch_size"] = round(stats["flushed_operations"] / stats["flushes"], 1) if stats["flushes"] else 0.0
+        stats["avg_flush_ms"] = round(stats["total_flush_ms"] / stats["flushes"], 1) if stats["flushes"] else 0.0
+        return stats
+
+    # ==================== INTERNALS ====================
+
+    def _flush_loop(self) -> None:
+        """Flush when the buffer fills up or every flush_interval_seconds."""
+        while not self._stop_event.is_set():
+            self._wake_event.wait(self.flush_interval_seconds)
+            self._wake_event.clear()
+            if self._stop_event.is_set():
+                break
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"Unexpected write-behind flush error ({self.name}): {e}")